@@ -652,6 +652,18 @@ class AuthAuditLog(BaseModel):
         ("permission_revoked", "Permission Revoked"),
     ]
 
+    # Never dropped when the audit buffer is full (written inline instead)
+    CRITICAL_EVENTS = {
+        "login_failed",
+        "2fa_failed",
+        "account_locked",
+        "suspicious_login",
+        "password_change",
+        "password_reset_complete",
+        "permission_granted",
+        "permission_revoked",
+    }
+
     # User can be null for failed login attempts
     user = models.ForeignKey(
         User,
@@ -721,7 +733,8 @@ class AuthAuditLog(BaseModel):
         **kwargs: Any,
     ) -> "AuthAuditLog":
         """
-        Create an audit log entry.
+        Create an audit log entry. The row is queued for a batched write
+        and the unsaved instance is returned.
 
         Args:
             event_type: One of the EVENT_TYPES choices
@@ -783,5 +796,9 @@ class AuthAuditLog(BaseModel):
             if key not in ["ip_address", "user_agent"] and hasattr(cls, key):
                 log_data[key] = value
 
-        # Create the audit log
-        return cls.objects.create(**log_data)
+        # Written in the next batch by the audit flusher (apps.shared.audit)
+        from apps.shared.audit import enqueue_audit
+
+        log = cls(**log_data)
+        enqueue_audit(log, critical=event_type in cls.CRITICAL_EVENTS)
+        return log
@@ -10,12 +10,14 @@ from django.utils.safestring import mark_safe
 from .models import (
     Alert,
     AlertHistory,
+    ClubDailyFact,
     Dashboard,
     DashboardWidget,
     DataSource,
     Metric,
     MetricValue,
     Report,
+    ReservationHourlyFact,
     Widget,
 )
 
@@ -573,3 +575,36 @@ class DashboardWidgetAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("dashboard", "widget")
+
+
+@admin.register(ClubDailyFact)
+class ClubDailyFactAdmin(admin.ModelAdmin):
+    list_display = [
+        "club",
+        "date",
+        "bookings",
+        "cancellations",
+        "unique_players",
+        "revenue",
+        "transactions",
+        "new_clients",
+    ]
+    list_filter = ["organization", "club"]
+    search_fields = ["club__name"]
+    readonly_fields = ["created_at", "updated_at"]
+    date_hierarchy = "date"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("organization", "club")
+
+
+@admin.register(ReservationHourlyFact)
+class ReservationHourlyFactAdmin(admin.ModelAdmin):
+    list_display = ["club", "court", "date", "hour", "bookings", "booking_value"]
+    list_filter = ["organization", "club"]
+    search_fields = ["club__name", "court__name"]
+    readonly_fields = ["created_at", "updated_at"]
+    date_hierarchy = "date"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("club", "court")
@@ -5,3 +5,7 @@ class BiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.bi"
     verbose_name = "Business Intelligence"
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.bi.signals  # noqa
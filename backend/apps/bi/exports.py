@@ -0,0 +1,87 @@
+"""
+Row-level BI exports (see apps.shared.exports).
+"""
+
+from django.utils.dateparse import parse_date
+
+from apps.reservations.models import Reservation
+from apps.shared.exports import Export, register_export
+
+from .models import MetricValue
+
+
+@register_export("bi.reservations")
+def reservations_export(
+    organization_id, club_id=None, start_date=None, end_date=None, include_metadata=False
+):
+    """Reservations by play date, optionally for one club."""
+    queryset = Reservation.objects.filter(organization_id=organization_id)
+    if club_id:
+        queryset = queryset.filter(club_id=club_id)
+    if start_date:
+        queryset = queryset.filter(date__gte=parse_date(start_date))
+    if end_date:
+        queryset = queryset.filter(date__lte=parse_date(end_date))
+
+    columns = [
+        ("Fecha", "date"),
+        ("Inicio", "start_time"),
+        ("Fin", "end_time"),
+        ("Club", "club__name"),
+        ("Cancha", "court__name"),
+        ("Tipo", "reservation_type"),
+        ("Estado", "status"),
+        ("Estado de pago", "payment_status"),
+        ("Jugador", "player_name"),
+        ("Email", "player_email"),
+        ("Jugadores", "player_count"),
+        ("Minutos", "duration_minutes"),
+        ("Total", "total_price"),
+    ]
+    if include_metadata:
+        columns += [("ID", "id"), ("Creada", "created_at")]
+
+    return Export(
+        "reservaciones",
+        queryset.order_by("date", "start_time", "id"),
+        columns,
+    )
+
+
+@register_export("bi.metric_values")
+def metric_values_export(
+    organization_id,
+    club_id=None,
+    start_date=None,
+    end_date=None,
+    include_metadata=False,
+    metric_ids=None,
+):
+    """Stored metric values by timestamp, optionally for given metrics."""
+    queryset = MetricValue.objects.filter(metric__organization_id=organization_id)
+    if club_id:
+        queryset = queryset.filter(metric__club_id=club_id)
+    if metric_ids:
+        queryset = queryset.filter(metric_id__in=metric_ids)
+    if start_date:
+        queryset = queryset.filter(timestamp__date__gte=parse_date(start_date))
+    if end_date:
+        queryset = queryset.filter(timestamp__date__lte=parse_date(end_date))
+
+    columns = [
+        ("Fecha", "timestamp"),
+        ("Métrica", "metric__name"),
+        ("Tipo", "metric__metric_type"),
+        ("Valor", "value"),
+        ("Unidad", "metric__unit"),
+        ("Desde", "period_start"),
+        ("Hasta", "period_end"),
+    ]
+    if include_metadata:
+        columns += [("ID", "id"), ("Métrica ID", "metric_id")]
+
+    return Export(
+        "metricas",
+        queryset.order_by("timestamp", "id"),
+        columns,
+    )
@@ -0,0 +1,420 @@
+"""
+BI fact layer: daily (club, court, hour) and (club, day) rollups.
+
+Facts are rebuilt per partition (club + date range) from the raw
+``Reservation``, ``Payment`` and ``ClientProfile`` tables, either
+incrementally from signals (one club-day at a time) or in bulk by the
+nightly reconciliation task. Analytics endpoints read them through
+``FactQueryService`` so a range costs O(days) rows instead of O(rows).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import (
+    ExtractHour,
+    TruncDate,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils import timezone
+
+from .models import ClubDailyFact, ReservationHourlyFact
+
+logger = logging.getLogger(__name__)
+
+BOOKED_STATUSES = ("confirmed", "completed")
+PAYMENT_METHOD_COLUMNS = {
+    "cash": "cash_revenue",
+    "card": "card_revenue",
+    "transfer": "transfer_revenue",
+}
+ZERO = Decimal("0")
+
+
+def fact_date_range(start, end) -> Tuple[date, date]:
+    """
+    Map a datetime range onto the inclusive list of fact days it covers.
+
+    Every local day that ``[start, end)`` touches is included, partial
+    first and last days too; an end at local midnight is exclusive.
+    Plain dates are taken as an inclusive range.
+
+    Args:
+        start: Range start (date or datetime)
+        end: Range end (date or datetime)
+
+    Returns:
+        Tuple of (first_day, last_day), both inclusive
+    """
+    if not isinstance(start, datetime):
+        first_day = start
+    else:
+        local_start = timezone.localtime(start) if timezone.is_aware(start) else start
+        first_day = local_start.date()
+
+    if not isinstance(end, datetime):
+        last_day = end
+    else:
+        local_end = timezone.localtime(end) if timezone.is_aware(end) else end
+        last_day = local_end.date()
+        if local_end.time() == time.min:
+            last_day -= timedelta(days=1)
+
+    return first_day, last_day
+
+
+class FactBuilder:
+    """
+    Rebuild fact rows for a set of clubs over a date range.
+    """
+
+    @classmethod
+    def rebuild(
+        cls,
+        start_day: date,
+        end_day: date,
+        club_ids: Optional[Iterable] = None,
+    ) -> Dict[str, int]:
+        """
+        Recompute and replace facts for ``[start_day, end_day]``.
+
+        Uses four grouped queries regardless of the number of clubs or
+        rows, then swaps the partition atomically.
+
+        Args:
+            start_day: First day to rebuild (inclusive)
+            end_day: Last day to rebuild (inclusive)
+            club_ids: Restrict to these clubs (all clubs when None)
+
+        Returns:
+            Dict with the number of hourly and daily rows written
+        """
+        from apps.clients.models import ClientProfile
+        from apps.clubs.models import Club
+        from apps.finance.models import Payment
+        from apps.reservations.models import Reservation
+
+        club_ids = list(club_ids) if club_ids is not None else None
+        club_filter = Q(club_id__in=club_ids) if club_ids is not None else Q()
+
+        clubs = Club.objects.all()
+        if club_ids is not None:
+            clubs = clubs.filter(id__in=club_ids)
+        club_orgs = dict(clubs.values_list("id", "organization_id"))
+
+        booked = Q(status__in=BOOKED_STATUSES)
+        reservation_rows = (
+            Reservation.objects.filter(
+                club_filter, date__gte=start_day, date__lte=end_day
+            )
+            .annotate(hour=ExtractHour("start_time"))
+            .values("club_id", "court_id", "date", "hour")
+            .annotate(
+                total=Count("id"),
+                bookings=Count("id", filter=booked),
+                cancellations=Count("id", filter=Q(status="cancelled")),
+                no_shows=Count("id", filter=Q(status="no_show")),
+                booked_minutes=Sum("duration_minutes", filter=booked),
+                booking_value=Sum("total_price", filter=booked),
+            )
+        )
+
+        player_rows = (
+            Reservation.objects.filter(
+                club_filter, booked, date__gte=start_day, date__lte=end_day
+            )
+            .values("club_id", "date")
+            .annotate(players=Count("player_email", distinct=True))
+        )
+
+        payment_rows = (
+            Payment.objects.filter(
+                club_filter,
+                status="completed",
+                created_at__date__gte=start_day,
+                created_at__date__lte=end_day,
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values("club_id", "day", "payment_type", "payment_method")
+            .annotate(total=Sum("amount"), count=Count("id"), largest=Max("amount"))
+        )
+
+        client_rows = (
+            ClientProfile.objects.filter(
+                club_filter,
+                club__isnull=False,
+                created_at__date__gte=start_day,
+                created_at__date__lte=end_day,
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values("club_id", "day")
+            .annotate(count=Count("id"))
+        )
+
+        hourly = []
+        daily: Dict[Tuple[Any, date], Dict[str, Any]] = defaultdict(
+            lambda: {"revenue_by_type": {}}
+        )
+
+        def add(row, field, value):
+            row[field] = row.get(field, 0) + (value or 0)
+
+        for row in reservation_rows:
+            organization_id = club_orgs.get(row["club_id"])
+            if organization_id is None:
+                continue
+            hourly.append(
+                ReservationHourlyFact(
+                    organization_id=organization_id,
+                    club_id=row["club_id"],
+                    court_id=row["court_id"],
+                    date=row["date"],
+                    hour=row["hour"],
+                    bookings=row["bookings"],
+                    cancellations=row["cancellations"],
+                    no_shows=row["no_shows"],
+                    booked_minutes=row["booked_minutes"] or 0,
+                    booking_value=row["booking_value"] or ZERO,
+                )
+            )
+            day = daily[(row["club_id"], row["date"])]
+            add(day, "total_reservations", row["total"])
+            add(day, "bookings", row["bookings"])
+            add(day, "cancellations", row["cancellations"])
+            add(day, "no_shows", row["no_shows"])
+            add(day, "booked_minutes", row["booked_minutes"])
+            add(day, "booking_value", row["booking_value"])
+
+        for row in player_rows:
+            daily[(row["club_id"], row["date"])]["unique_players"] = row["players"]
+
+        for row in payment_rows:
+            day = daily[(row["club_id"], row["day"])]
+            add(day, "revenue", row["total"])
+            add(day, "transactions", row["count"])
+            day["max_transaction"] = max(
+                day.get("max_transaction", ZERO), row["largest"] or ZERO
+            )
+            column = PAYMENT_METHOD_COLUMNS.get(row["payment_method"])
+            if column:
+                add(day, column, row["total"])
+            by_type = day["revenue_by_type"].setdefault(
+                row["payment_type"], {"amount": "0", "count": 0}
+            )
+            by_type["amount"] = str(Decimal(by_type["amount"]) + (row["total"] or ZERO))
+            by_type["count"] += row["count"]
+
+        for row in client_rows:
+            daily[(row["club_id"], row["day"])]["new_clients"] = row["count"]
+
+        daily_objects = [
+            ClubDailyFact(
+                organization_id=club_orgs[club_id],
+                club_id=club_id,
+                date=day,
+                **values,
+            )
+            for (club_id, day), values in daily.items()
+            if club_id in club_orgs
+        ]
+
+        with transaction.atomic():
+            scope = Q(date__gte=start_day, date__lte=end_day) & club_filter
+            ReservationHourlyFact.objects.filter(scope).delete()
+            ClubDailyFact.objects.filter(scope).delete()
+            ReservationHourlyFact.objects.bulk_create(hourly, batch_size=1000)
+            ClubDailyFact.objects.bulk_create(daily_objects, batch_size=1000)
+
+        return {"hourly": len(hourly), "daily": len(daily_objects)}
+
+    @classmethod
+    def rebuild_club_day(cls, club_id, day: date) -> Dict[str, int]:
+        """Rebuild facts for a single club and day (incremental path)."""
+        return cls.rebuild(day, day, [club_id])
+
+    @classmethod
+    def reconcile(
+        cls, days: int = 3, club_ids: Optional[Iterable] = None, chunk_days: int = 31
+    ) -> Dict[str, int]:
+        """
+        Rebuild the trailing ``days`` (up to today) in bounded chunks.
+
+        Args:
+            days: How many days back to reconcile
+            club_ids: Restrict to these clubs (all clubs when None)
+            chunk_days: Days rebuilt per transaction
+
+        Returns:
+            Dict with total hourly and daily rows written
+        """
+        today = timezone.localdate()
+        totals = {"hourly": 0, "daily": 0}
+        chunk_start = today - timedelta(days=days - 1)
+        while chunk_start <= today:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), today)
+            written = cls.rebuild(chunk_start, chunk_end, club_ids)
+            totals["hourly"] += written["hourly"]
+            totals["daily"] += written["daily"]
+            chunk_start = chunk_end + timedelta(days=1)
+        return totals
+
+
+class FactQueryService:
+    """
+    Read helpers over the fact tables, mirroring the shapes returned by
+    the raw-table optimizers in ``apps.bi.optimizations``.
+    """
+
+    @staticmethod
+    def _scope(
+        model,
+        start,
+        end,
+        club_ids: Optional[List[str]] = None,
+        organization=None,
+    ):
+        first_day, last_day = fact_date_range(start, end)
+        queryset = model.objects.filter(date__gte=first_day, date__lte=last_day)
+        if club_ids:
+            queryset = queryset.filter(club_id__in=club_ids)
+        if organization is not None:
+            queryset = queryset.filter(organization=organization)
+        return queryset
+
+    @classmethod
+    def daily(cls, start, end, club_ids=None, organization=None):
+        """ClubDailyFact queryset for the range."""
+        return cls._scope(ClubDailyFact, start, end, club_ids, organization)
+
+    @classmethod
+    def hourly(cls, start, end, club_ids=None, organization=None):
+        """ReservationHourlyFact queryset for the range."""
+        return cls._scope(ReservationHourlyFact, start, end, club_ids, organization)
+
+    @classmethod
+    def get_revenue_kpis(
+        cls, start, end, club_ids=None, organization=None
+    ) -> Dict[str, Any]:
+        """Revenue KPIs with the same keys as KPIQueryOptimizer."""
+        totals = cls.daily(start, end, club_ids, organization).aggregate(
+            total_revenue=Sum("revenue"),
+            total_transactions=Sum("transactions"),
+            max_transaction=Max("max_transaction"),
+            cash_revenue=Sum("cash_revenue"),
+            card_revenue=Sum("card_revenue"),
+            transfer_revenue=Sum("transfer_revenue"),
+        )
+        for key, value in totals.items():
+            totals[key] = value or (0 if key == "total_transactions" else ZERO)
+        transactions = totals["total_transactions"]
+        totals["avg_transaction"] = (
+            totals["total_revenue"] / transactions if transactions else ZERO
+        )
+        return totals
+
+    @classmethod
+    def get_usage_kpis(
+        cls, start, end, club_ids=None, organization=None
+    ) -> Dict[str, Any]:
+        """Usage KPIs with the same keys as KPIQueryOptimizer."""
+        from apps.reservations.models import Reservation
+
+        hourly = cls.hourly(start, end, club_ids, organization).filter(bookings__gt=0)
+        usage = hourly.aggregate(
+            total_bookings=Sum("bookings"),
+            unique_courts=Count("court", distinct=True),
+            morning_bookings=Sum("bookings", filter=Q(hour__lt=12)),
+            afternoon_bookings=Sum("bookings", filter=Q(hour__gte=12, hour__lt=18)),
+            evening_bookings=Sum("bookings", filter=Q(hour__gte=18)),
+        )
+        usage = {key: value or 0 for key, value in usage.items()}
+
+        # Distinct players are not additive across days, so this one count
+        # still reads reservations (index on club/date/status).
+        first_day, last_day = fact_date_range(start, end)
+        players = Reservation.objects.filter(
+            date__gte=first_day, date__lte=last_day, status__in=BOOKED_STATUSES
+        )
+        if club_ids:
+            players = players.filter(club_id__in=club_ids)
+        if organization is not None:
+            players = players.filter(organization=organization)
+        usage["unique_users"] = players.aggregate(
+            count=Count("player_email", distinct=True)
+        )["count"]
+        return usage
+
+    @classmethod
+    def get_revenue_time_series(
+        cls, start, end, period="day", club_ids=None, organization=None
+    ) -> List[Dict[str, Any]]:
+        """Revenue per day/week/month, keyed like RevenueQueryOptimizer."""
+        trunc = {"week": TruncWeek, "month": TruncMonth}.get(period)
+        queryset = cls.daily(start, end, club_ids, organization)
+        queryset = queryset.annotate(
+            period_date=trunc("date") if trunc else F("date")
+        )
+
+        rows = (
+            queryset.values("period_date")
+            .annotate(
+                revenue=Sum("revenue"),
+                transaction_count=Sum("transactions"),
+                cash_amount=Sum("cash_revenue"),
+                card_amount=Sum("card_revenue"),
+                transfer_amount=Sum("transfer_revenue"),
+            )
+            .order_by("period_date")
+        )
+        series = []
+        for row in rows:
+            count = row["transaction_count"] or 0
+            row["avg_transaction"] = (row["revenue"] or ZERO) / count if count else ZERO
+            series.append(row)
+        return series
+
+    @classmethod
+    def get_revenue_by_source(
+        cls, start, end, club_ids=None, organization=None
+    ) -> List[Dict[str, Any]]:
+        """Revenue by payment type, keyed like RevenueQueryOptimizer."""
+        totals: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"total_amount": ZERO, "transaction_count": 0}
+        )
+        for breakdown in cls.daily(start, end, club_ids, organization).values_list(
+            "revenue_by_type", flat=True
+        ):
+            for payment_type, values in (breakdown or {}).items():
+                totals[payment_type]["total_amount"] += Decimal(values["amount"])
+                totals[payment_type]["transaction_count"] += values["count"]
+
+        rows = []
+        for payment_type, values in totals.items():
+            count = values["transaction_count"]
+            rows.append(
+                {
+                    "payment_type": payment_type,
+                    "total_amount": values["total_amount"],
+                    "transaction_count": count,
+                    "avg_amount": values["total_amount"] / count if count else ZERO,
+                }
+            )
+        return sorted(rows, key=lambda row: row["total_amount"], reverse=True)
+
+    @classmethod
+    def get_daily_values(
+        cls, field: str, start, end, club_ids=None, organization=None
+    ) -> Dict[date, Any]:
+        """Map of day -> summed ``field`` across the selected clubs."""
+        return dict(
+            cls.daily(start, end, club_ids, organization)
+            .values("date")
+            .annotate(value=Sum(field))
+            .values_list("date", "value")
+        )
@@ -0,0 +1,34 @@
+"""
+Django management command to (re)build the BI fact tables.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.bi.facts import FactBuilder
+
+
+class Command(BaseCommand):
+    help = "Rebuilds BI daily/hourly fact tables from reservations and payments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Number of trailing days to rebuild (default: 365)",
+        )
+        parser.add_argument(
+            "--club",
+            action="append",
+            dest="clubs",
+            help="Restrict to a club id (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Rebuilding BI facts for the last {options['days']} days...")
+        written = FactBuilder.reconcile(days=options["days"], club_ids=options["clubs"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written['daily']} daily and {written['hourly']} hourly fact rows"
+            )
+        )
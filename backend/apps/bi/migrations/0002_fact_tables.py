@@ -0,0 +1,88 @@
+# Generated by Django 4.2.23 on 2026-10-18 21:55
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bi', '0001_initial'),
+        ('root', '0002_platformmetricssnapshot'),
+        ('clubs', '0004_add_advanced_club_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationHourlyFact',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='root.organization')),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_facts', to='clubs.club')),
+                ('court', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_facts', to='clubs.court')),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(23)])),
+                ('bookings', models.IntegerField(default=0, help_text='Confirmed/completed')),
+                ('cancellations', models.IntegerField(default=0)),
+                ('no_shows', models.IntegerField(default=0)),
+                ('booked_minutes', models.IntegerField(default=0)),
+                ('booking_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'verbose_name': 'Reservation Hourly Fact',
+                'verbose_name_plural': 'Reservation Hourly Facts',
+                'ordering': ['date', 'hour'],
+                'unique_together': {('club', 'court', 'date', 'hour')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reservationhourlyfact',
+            index=models.Index(fields=['club', 'date'], name='bi_reservat_club_id_892608_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservationhourlyfact',
+            index=models.Index(fields=['organization', 'date'], name='bi_reservat_organiz_418f0b_idx'),
+        ),
+        migrations.CreateModel(
+            name='ClubDailyFact',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='root.organization')),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_facts', to='clubs.club')),
+                ('date', models.DateField()),
+                ('total_reservations', models.IntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0, help_text='Confirmed/completed')),
+                ('cancellations', models.IntegerField(default=0)),
+                ('no_shows', models.IntegerField(default=0)),
+                ('booked_minutes', models.IntegerField(default=0)),
+                ('booking_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('unique_players', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transactions', models.IntegerField(default=0)),
+                ('max_transaction', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('cash_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('card_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transfer_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('revenue_by_type', models.JSONField(default=dict, help_text='payment_type -> {amount, count}')),
+                ('new_clients', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Club Daily Fact',
+                'verbose_name_plural': 'Club Daily Facts',
+                'ordering': ['date'],
+                'unique_together': {('club', 'date')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='clubdailyfact',
+            index=models.Index(fields=['organization', 'date'], name='bi_clubdail_organiz_0fce72_idx'),
+        ),
+    ]
@@ -833,3 +833,98 @@ class AlertHistory(BaseModel):
 
     def __str__(self):
         return f"{self.alert.name} - {self.get_action_display()} ({self.timestamp})"
+
+
+class ReservationHourlyFact(BaseModel):
+    """
+    Pre-aggregated reservations per (club, court, day, hour).
+
+    Maintained by ``apps.bi.facts`` from reservation signals and the nightly
+    reconciliation task; usage analytics read this table instead of scanning
+    raw reservations.
+    """
+
+    organization = models.ForeignKey(
+        "root.Organization", on_delete=models.CASCADE, related_name="+"
+    )
+    club = models.ForeignKey(
+        "clubs.Club", on_delete=models.CASCADE, related_name="hourly_facts"
+    )
+    court = models.ForeignKey(
+        "clubs.Court", on_delete=models.CASCADE, related_name="hourly_facts"
+    )
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(0), MaxValueValidator(23)]
+    )
+
+    bookings = models.IntegerField(default=0, help_text="Confirmed/completed")
+    cancellations = models.IntegerField(default=0)
+    no_shows = models.IntegerField(default=0)
+    booked_minutes = models.IntegerField(default=0)
+    booking_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["date", "hour"]
+        unique_together = ["club", "court", "date", "hour"]
+        indexes = [
+            models.Index(fields=["club", "date"]),
+            models.Index(fields=["organization", "date"]),
+        ]
+        verbose_name = "Reservation Hourly Fact"
+        verbose_name_plural = "Reservation Hourly Facts"
+
+    def __str__(self):
+        return f"{self.court_id} {self.date} {self.hour:02d}h - {self.bookings}"
+
+
+class ClubDailyFact(BaseModel):
+    """
+    Pre-aggregated reservation and payment totals per (club, day).
+
+    KPI, revenue and growth analytics sum these rows so a year-long range
+    costs ~365 rows instead of every reservation and payment in it.
+    """
+
+    organization = models.ForeignKey(
+        "root.Organization", on_delete=models.CASCADE, related_name="+"
+    )
+    club = models.ForeignKey(
+        "clubs.Club", on_delete=models.CASCADE, related_name="daily_facts"
+    )
+    date = models.DateField()
+
+    # Reservations (by reservation date)
+    total_reservations = models.IntegerField(default=0)
+    bookings = models.IntegerField(default=0, help_text="Confirmed/completed")
+    cancellations = models.IntegerField(default=0)
+    no_shows = models.IntegerField(default=0)
+    booked_minutes = models.IntegerField(default=0)
+    booking_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    unique_players = models.IntegerField(default=0)
+
+    # Completed payments (by local creation date)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transactions = models.IntegerField(default=0)
+    max_transaction = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    cash_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    card_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transfer_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    revenue_by_type = models.JSONField(
+        default=dict, help_text="payment_type -> {amount, count}"
+    )
+
+    # Clients
+    new_clients = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        unique_together = ["club", "date"]
+        indexes = [
+            models.Index(fields=["organization", "date"]),
+        ]
+        verbose_name = "Club Daily Fact"
+        verbose_name_plural = "Club Daily Facts"
+
+    def __str__(self):
+        return f"{self.club_id} {self.date} - {self.bookings} bookings"
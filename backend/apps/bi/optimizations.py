@@ -148,107 +148,39 @@ class KPIQueryOptimizer:
     def get_revenue_kpis(
         start_date: datetime,
         end_date: datetime,
-        club_ids: Optional[List[str]] = None
+        club_ids: Optional[List[str]] = None,
+        organization=None
     ) -> Dict[str, Any]:
         """
-        Optimized query for revenue KPIs.
+        Revenue KPIs summed from the ClubDailyFact rollup.
         
         Returns:
             Dict with revenue KPIs
         """
-        from apps.reservations.models import Reservation
-        from apps.finance.models import Payment
+        from .facts import FactQueryService
         
-        # Build filter conditions
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='created_at'
+        return FactQueryService.get_revenue_kpis(
+            start_date, end_date, club_ids, organization
         )
-        
-        # Single query for all revenue metrics
-        revenue_data = Payment.objects.filter(
-            conditions,
-            status='completed'
-        ).aggregate(
-            total_revenue=Coalesce(Sum('amount'), Value(0)),
-            total_transactions=Count('id'),
-            avg_transaction=Coalesce(Avg('amount'), Value(0)),
-            max_transaction=Coalesce(Max('amount'), Value(0)),
-            
-            # Payment method breakdown in single query
-            cash_revenue=Sum(
-                Case(
-                    When(payment_method='cash', then='amount'),
-                    default=Value(0),
-                    output_field=DecimalField()
-                )
-            ),
-            card_revenue=Sum(
-                Case(
-                    When(payment_method='card', then='amount'),
-                    default=Value(0),
-                    output_field=DecimalField()
-                )
-            ),
-            transfer_revenue=Sum(
-                Case(
-                    When(payment_method='transfer', then='amount'),
-                    default=Value(0),
-                    output_field=DecimalField()
-                )
-            )
-        )
-        
-        return revenue_data
     
     @staticmethod
     def get_usage_kpis(
         start_date: datetime,
         end_date: datetime,
-        club_ids: Optional[List[str]] = None
+        club_ids: Optional[List[str]] = None,
+        organization=None
     ) -> Dict[str, Any]:
         """
-        Optimized query for court usage KPIs.
+        Court usage KPIs summed from the ReservationHourlyFact rollup.
         
         Returns:
             Dict with usage KPIs
         """
-        from apps.reservations.models import Reservation
+        from .facts import FactQueryService
         
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='date'
+        return FactQueryService.get_usage_kpis(
+            start_date, end_date, club_ids, organization
         )
-        
-        # Single aggregation query for usage metrics
-        usage_data = Reservation.objects.filter(
-            conditions,
-            status__in=['confirmed', 'completed']
-        ).aggregate(
-            total_bookings=Count('id'),
-            unique_users=Count('user', distinct=True),
-            unique_courts=Count('court', distinct=True),
-            
-            # Time slot distribution
-            morning_bookings=Count(
-                Case(
-                    When(time__hour__lt=12, then=1),
-                    output_field=IntegerField()
-                )
-            ),
-            afternoon_bookings=Count(
-                Case(
-                    When(time__hour__gte=12, time__hour__lt=18, then=1),
-                    output_field=IntegerField()
-                )
-            ),
-            evening_bookings=Count(
-                Case(
-                    When(time__hour__gte=18, then=1),
-                    output_field=IntegerField()
-                )
-            )
-        )
-        
-        return usage_data
     
     @staticmethod
     def get_growth_kpis(
@@ -317,8 +249,9 @@ class RevenueQueryOptimizer:
         start_date: datetime,
         end_date: datetime,
         period: str = 'day',
-        club_ids: Optional[List[str]] = None
-    ) -> QuerySet:
+        club_ids: Optional[List[str]] = None,
+        organization=None
+    ) -> List[Dict[str, Any]]:
         """
         Get revenue time series data optimized for charting.
         
@@ -327,69 +260,35 @@ class RevenueQueryOptimizer:
             end_date: End date
             period: 'day', 'week', 'month'
             club_ids: Optional club filtering
+            organization: Optional organization scoping
             
         Returns:
-            QuerySet with time series data
+            List of dicts with time series data (from ClubDailyFact)
         """
-        from apps.finance.models import Payment
-        
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='created_at'
-        )
+        from .facts import FactQueryService
         
-        # Time series annotations
-        time_annotations = QueryOptimizer.get_time_series_annotations(
-            period, 'created_at'
+        return FactQueryService.get_revenue_time_series(
+            start_date, end_date, period, club_ids, organization
         )
-        
-        return Payment.objects.filter(
-            conditions,
-            status='completed'
-        ).annotate(
-            **time_annotations
-        ).values('period_date').annotate(
-            revenue=Sum('amount'),
-            transaction_count=Count('id'),
-            avg_transaction=Avg('amount'),
-            
-            # Payment method breakdown
-            cash_amount=Sum(
-                Case(When(payment_method='cash', then='amount'), default=0)
-            ),
-            card_amount=Sum(
-                Case(When(payment_method='card', then='amount'), default=0)
-            ),
-            transfer_amount=Sum(
-                Case(When(payment_method='transfer', then='amount'), default=0)
-            )
-        ).order_by('period_date')
     
     @staticmethod
     def get_revenue_by_source(
         start_date: datetime,
         end_date: datetime,
-        club_ids: Optional[List[str]] = None
-    ) -> QuerySet:
+        club_ids: Optional[List[str]] = None,
+        organization=None
+    ) -> List[Dict[str, Any]]:
         """
         Get revenue breakdown by source (reservations, memberships, etc).
         
         Returns:
-            QuerySet with revenue by source
+            List of dicts with revenue by source (from ClubDailyFact)
         """
-        from apps.finance.models import Payment
+        from .facts import FactQueryService
         
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='created_at'
+        return FactQueryService.get_revenue_by_source(
+            start_date, end_date, club_ids, organization
         )
-        
-        return Payment.objects.filter(
-            conditions,
-            status='completed'
-        ).values('payment_type').annotate(
-            total_amount=Sum('amount'),
-            transaction_count=Count('id'),
-            avg_amount=Avg('amount')
-        ).order_by('-total_amount')
 
 
 class UsageQueryOptimizer:
@@ -407,25 +306,18 @@ class UsageQueryOptimizer:
         Get court utilization data for heatmap visualization.
         
         Returns:
-            QuerySet with heatmap data
+            QuerySet with heatmap data (from ReservationHourlyFact)
         """
-        from apps.reservations.models import Reservation
-        
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='date'
-        )
+        from .facts import FactQueryService
         
-        return Reservation.objects.filter(
-            conditions,
-            status__in=['confirmed', 'completed']
+        return FactQueryService.hourly(start_date, end_date, club_ids).filter(
+            bookings__gt=0
         ).annotate(
-            hour=Extract('time', lookup_name='hour'),
             day_of_week=Extract('date', lookup_name='week_day'),
         ).values(
             'court_id', 'court__name', 'hour', 'day_of_week'
         ).annotate(
-            booking_count=Count('id'),
-            unique_users=Count('user', distinct=True)
+            booking_count=Sum('bookings'),
         ).order_by('court_id', 'day_of_week', 'hour')
     
     @staticmethod
@@ -438,22 +330,15 @@ class UsageQueryOptimizer:
         Analyze peak hours across all courts.
         
         Returns:
-            QuerySet with peak hours data
+            QuerySet with peak hours data (from ReservationHourlyFact)
         """
-        from apps.reservations.models import Reservation
-        
-        conditions = QueryOptimizer.build_filter_conditions(
-            start_date, end_date, club_ids, date_field='date'
-        )
+        from .facts import FactQueryService
         
-        return Reservation.objects.filter(
-            conditions,
-            status__in=['confirmed', 'completed']
-        ).annotate(
-            hour=Extract('time', lookup_name='hour')
+        return FactQueryService.hourly(start_date, end_date, club_ids).filter(
+            bookings__gt=0
         ).values('hour').annotate(
-            total_bookings=Count('id'),
-            utilization_rate=Count('id') * 100.0 / Count('court', distinct=True)
+            total_bookings=Sum('bookings'),
+            utilization_rate=Sum('bookings') * 100.0 / Count('court', distinct=True)
         ).order_by('-total_bookings')
 
 
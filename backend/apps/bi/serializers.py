@@ -350,6 +350,7 @@ class ReportGenerateSerializer(serializers.Serializer):
     start_date = serializers.DateTimeField(required=False)
     end_date = serializers.DateTimeField(required=False)
     format = serializers.ChoiceField(choices=Report.FORMAT_CHOICES, required=False)
+    background = serializers.BooleanField(default=False)
 
     def validate(self, data):
         if "start_date" in data and "end_date" in data:
@@ -497,10 +498,20 @@ class ClubAnalyticsSerializer(serializers.Serializer):
 class ExportDataSerializer(serializers.Serializer):
     """Serializer for data export requests."""
 
+    DATASET_CHOICES = [
+        ("reservations", "Reservaciones"),
+        ("revenues", "Ingresos"),
+        ("payments", "Pagos"),
+        ("metric_values", "Valores de métricas"),
+    ]
+
     format = serializers.ChoiceField(
         choices=[("csv", "CSV"), ("excel", "Excel"), ("json", "JSON")], default="csv"
     )
+    dataset = serializers.ChoiceField(choices=DATASET_CHOICES, default="reservations")
+    club = serializers.UUIDField(required=False)
     include_metadata = serializers.BooleanField(default=True)
+    background = serializers.BooleanField(default=False)
     start_date = serializers.DateTimeField(required=False)
     end_date = serializers.DateTimeField(required=False)
 
@@ -20,6 +20,8 @@ from apps.clubs.models import Club
 # from apps.finance.models import Transaction
 from apps.reservations.models import Reservation  # ReservationPayment
 
+from .facts import FactQueryService, fact_date_range
+
 # Define Transaction as None when finance module is disabled
 Transaction = None
 ClassEnrollment = None
@@ -67,15 +69,37 @@ class MetricsCalculator:
             logger.error(f"Error calculating metric {self.metric.name}: {str(e)}")
             return 0
 
+    def _fact_scope(self):
+        """Club/organization filter for FactQueryService lookups."""
+        if self.club:
+            return {"club_ids": [self.club.id]}
+        return {"organization": self.organization}
+
+    def _daily_facts(self, start_date, end_date):
+        return FactQueryService.daily(start_date, end_date, **self._fact_scope())
+
     def _calculate_revenue_metric(self, start_date, end_date):
         """Calculate revenue-related metrics."""
+        config = self.metric.calculation_config
+        calculation_type = self.metric.calculation_type
+
+        # Uncategorised revenue is pre-aggregated in the daily fact table
+        if not config.get("category"):
+            totals = self._daily_facts(start_date, end_date).aggregate(
+                revenue=Sum("revenue"), transactions=Sum("transactions")
+            )
+            revenue = float(totals["revenue"] or 0)
+            transactions = totals["transactions"] or 0
+            if calculation_type == "count":
+                return transactions
+            elif calculation_type == "avg":
+                return revenue / transactions if transactions else 0
+            return revenue
+
         # Return 0 if Transaction model is not available
         if Transaction is None:
             return 0
 
-        config = self.metric.calculation_config
-        calculation_type = self.metric.calculation_type
-
         # Base query for revenue transactions
         revenue_query = Transaction.objects.filter(
             organization=self.organization,
@@ -107,23 +131,21 @@ class MetricsCalculator:
         config = self.metric.calculation_config
         calculation_type = self.metric.calculation_type
 
-        # Get reservations in period
-        reservations_query = Reservation.objects.filter(
-            club=self.club,
-            date__gte=start_date.date(),
-            date__lte=end_date.date(),
-            status__in=["confirmed", "completed"],
+        # Booked reservations in period, from the daily fact rollup
+        total_reservations = (
+            self._daily_facts(start_date, end_date).aggregate(
+                total=Sum("bookings")
+            )["total"]
+            or 0
         )
 
         if calculation_type == "count":
-            return reservations_query.count()
+            return total_reservations
         elif calculation_type == "percentage":
-            # Calculate occupancy percentage
-            total_reservations = reservations_query.count()
-
             # Calculate total available slots
+            first_day, last_day = fact_date_range(start_date, end_date)
             courts_count = self.club.courts.filter(is_active=True).count()
-            days_count = (end_date.date() - start_date.date()).days + 1
+            days_count = (last_day - first_day).days + 1
             hours_per_day = config.get("hours_per_day", 12)  # Default 12 hours
 
             total_slots = courts_count * days_count * hours_per_day
@@ -132,7 +154,7 @@ class MetricsCalculator:
                 return (total_reservations / total_slots) * 100
             return 0
         else:
-            return reservations_query.count()
+            return total_reservations
 
     def _calculate_customer_metric(self, start_date, end_date):
         """Calculate customer-related metrics."""
@@ -335,24 +357,19 @@ class MetricsCalculator:
         metric_name = config.get("name", "total_bookings")
 
         if metric_name == "total_bookings":
-            return Reservation.objects.filter(
-                club=self.club,
-                date__gte=start_date.date(),
-                date__lte=end_date.date(),
-                status__in=["confirmed", "completed"],
-            ).count()
+            return (
+                self._daily_facts(start_date, end_date).aggregate(
+                    total=Sum("bookings")
+                )["total"]
+                or 0
+            )
 
         elif metric_name == "cancellation_rate":
-            total_reservations = Reservation.objects.filter(
-                club=self.club, date__gte=start_date.date(), date__lte=end_date.date()
-            ).count()
-
-            cancelled_reservations = Reservation.objects.filter(
-                club=self.club,
-                date__gte=start_date.date(),
-                date__lte=end_date.date(),
-                status="cancelled",
-            ).count()
+            totals = self._daily_facts(start_date, end_date).aggregate(
+                total=Sum("total_reservations"), cancelled=Sum("cancellations")
+            )
+            total_reservations = totals["total"] or 0
+            cancelled_reservations = totals["cancelled"] or 0
 
             if total_reservations > 0:
                 return (cancelled_reservations / total_reservations) * 100
@@ -381,6 +398,62 @@ class MetricsCalculator:
         else:
             return 0
 
+    def _fact_series_field(self):
+        """
+        Daily fact column whose per-day values equal this metric, or None
+        when the metric has to be computed one day at a time.
+        """
+        config = self.metric.calculation_config
+        metric_type = self.metric.metric_type
+        calculation_type = self.metric.calculation_type
+
+        if metric_type == "occupancy" and calculation_type != "percentage":
+            return "bookings"
+        if metric_type == "revenue" and not config.get("category"):
+            if calculation_type == "count":
+                return "transactions"
+            if calculation_type != "avg":
+                return "revenue"
+        if (
+            metric_type == "operational"
+            and config.get("name", "total_bookings") == "total_bookings"
+        ):
+            return "bookings"
+        return None
+
+    def calculate_series(self, days):
+        """
+        Calculate the metric for each day in ``days``.
+
+        Additive metrics are read with a single grouped query over the
+        daily fact table; everything else falls back to ``calculate``
+        per day.
+
+        Args:
+            days: Ordered list of dates
+
+        Returns:
+            List of values aligned with ``days``
+        """
+        if not days:
+            return []
+
+        field = self._fact_series_field()
+        if field is None:
+            series = []
+            for day in days:
+                day_start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+                day_end = timezone.make_aware(datetime.combine(day, datetime.max.time()))
+                series.append(self.calculate(day_start, day_end))
+            return series
+
+        values = FactQueryService.get_daily_values(
+            field, days[0], days[-1], **self._fact_scope()
+        )
+        if field == "revenue":
+            return [float(values.get(day) or 0) for day in days]
+        return [values.get(day) or 0 for day in days]
+
     def _calculate_custom_metric(self, start_date, end_date):
         """Calculate custom metrics based on configuration."""
         config = self.metric.calculation_config
@@ -477,23 +550,11 @@ class WidgetDataService:
             data["labels"].append(current_date.isoformat())
             current_date += timedelta(days=1)
 
+        days = [date.fromisoformat(label) for label in data["labels"]]
+
         # Get data for each metric
         for metric in self.widget.metrics.all():
-            metric_data = []
-            calculator = MetricsCalculator(metric)
-
-            current_date = start_date.date()
-            while current_date <= end_date_only:
-                day_start = timezone.make_aware(
-                    datetime.combine(current_date, datetime.min.time())
-                )
-                day_end = timezone.make_aware(
-                    datetime.combine(current_date, datetime.max.time())
-                )
-
-                value = calculator.calculate(day_start, day_end)
-                metric_data.append(value)
-                current_date += timedelta(days=1)
+            metric_data = MetricsCalculator(metric).calculate_series(days)
 
             data["datasets"].append(
                 {
@@ -590,17 +651,29 @@ class ReportGenerator:
     Service for generating reports.
     """
 
+    # Row-level dataset behind each report type for CSV/Excel exports
+    EXPORT_DATASETS = {
+        "financial": "finance.revenues",
+        "operational": "bi.reservations",
+        "customer": "bi.reservations",
+    }
+
     def __init__(self, report):
         self.report = report
 
-    def generate(self, start_date=None, end_date=None):
-        """
-        Generate report data.
-        """
+    @staticmethod
+    def _period(start_date=None, end_date=None):
         if not start_date:
             start_date = timezone.now() - timedelta(days=30)
         if not end_date:
             end_date = timezone.now()
+        return start_date, end_date
+
+    def generate(self, start_date=None, end_date=None):
+        """
+        Generate report data.
+        """
+        start_date, end_date = self._period(start_date, end_date)
 
         report_data = {
             "report_name": self.report.name,
@@ -644,13 +717,35 @@ class ReportGenerator:
         # Generate summary
         report_data["summary"] = self._generate_summary(start_date, end_date)
 
-        # Update report status
+        self.mark_generated()
+
+        return report_data
+
+    def export_params(self, start_date=None, end_date=None):
+        """
+        Export name and params for the report's detail rows, streamed by
+        ``apps.shared.exports`` instead of being built in memory.
+        """
+        start_date, end_date = self._period(start_date, end_date)
+        name = self.EXPORT_DATASETS.get(self.report.report_type, "bi.metric_values")
+        params = {
+            "organization_id": str(self.report.organization_id),
+            "club_id": str(self.report.club_id) if self.report.club_id else None,
+            "start_date": start_date.date().isoformat(),
+            "end_date": end_date.date().isoformat(),
+        }
+        if name == "bi.metric_values":
+            params["metric_ids"] = [
+                str(pk) for pk in self.report.metrics.values_list("pk", flat=True)
+            ]
+        return name, params
+
+    def mark_generated(self):
+        """Update report status."""
         self.report.last_generated = timezone.now()
         self.report.calculate_next_generation()
         self.report.save()
 
-        return report_data
-
     def _generate_summary(self, start_date, end_date):
         """Generate report summary."""
         summary = {}
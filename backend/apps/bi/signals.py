@@ -0,0 +1,89 @@
+"""
+Signals keeping the BI fact tables in sync with reservations and payments.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.clients.models import ClientProfile
+from apps.finance.models import Payment
+from apps.reservations.models import Reservation
+
+from .facts import FactBuilder
+
+logger = logging.getLogger(__name__)
+
+
+def _facts_sync_enabled():
+    return getattr(settings, "BI_FACTS_SYNC_ENABLED", True)
+
+
+class _PartitionFlush:
+    """
+    on_commit callback rebuilding every club-day touched by one transaction
+    once. Living in the connection's commit hooks, it is discarded together
+    with them when the transaction or its savepoint rolls back.
+    """
+
+    def __init__(self):
+        self.partitions = set()
+
+    def __call__(self):
+        for club_id, day in self.partitions:
+            try:
+                FactBuilder.rebuild_club_day(club_id, day)
+            except Exception as e:
+                # The nightly reconciliation repairs any partition missed here.
+                logger.error(f"Error refreshing BI facts for {club_id} {day}: {str(e)}")
+
+
+def schedule_fact_refresh(club_id, day):
+    """Queue a club-day fact rebuild for after the current transaction commits."""
+    if not club_id or not day or not _facts_sync_enabled():
+        return
+    connection = transaction.get_connection()
+    for _, callback, *_ in connection.run_on_commit:
+        if isinstance(callback, _PartitionFlush):
+            callback.partitions.add((club_id, day))
+            return
+    # Outside an atomic block on_commit runs the flush right away
+    flush = _PartitionFlush()
+    flush.partitions.add((club_id, day))
+    transaction.on_commit(flush)
+
+
+@receiver(post_init, sender=Reservation)
+def remember_reservation_partition(sender, instance, **kwargs):
+    """Keep the original club/date so moved reservations refresh both days."""
+    instance._fact_partition = (instance.club_id, instance.__dict__.get("date"))
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def refresh_reservation_facts(sender, instance, **kwargs):
+    """Refresh facts for the reservation's old and new club-day."""
+    schedule_fact_refresh(instance.club_id, instance.date)
+    previous = getattr(instance, "_fact_partition", None)
+    if previous and previous != (instance.club_id, instance.date):
+        schedule_fact_refresh(*previous)
+    instance._fact_partition = (instance.club_id, instance.date)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def refresh_payment_facts(sender, instance, **kwargs):
+    """Refresh revenue facts for the payment's club-day."""
+    if instance.created_at:
+        schedule_fact_refresh(instance.club_id, timezone.localdate(instance.created_at))
+
+
+@receiver(post_save, sender=ClientProfile)
+def refresh_client_facts(sender, instance, created, **kwargs):
+    """Count new clients for the club-day they registered."""
+    if created and instance.created_at:
+        schedule_fact_refresh(instance.club_id, timezone.localdate(instance.created_at))
@@ -0,0 +1,29 @@
+"""
+Celery tasks for Business Intelligence module.
+"""
+
+import logging
+
+from celery import shared_task
+
+from .facts import FactBuilder
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_fact_tables(days=3):
+    """
+    Nightly task rebuilding the trailing days of BI facts from raw rows.
+    Repairs any partition a signal missed (bulk updates, raw SQL, errors).
+    """
+    try:
+        written = FactBuilder.reconcile(days=days)
+        logger.info(
+            f"Reconciled BI facts for last {days} days: "
+            f"{written['daily']} daily, {written['hourly']} hourly rows"
+        )
+        return written
+    except Exception as e:
+        logger.error(f"Error reconciling BI facts: {str(e)}")
+        raise
@@ -0,0 +1,203 @@
+"""
+Tests for the BI fact tables.
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.bi.facts import FactBuilder, FactQueryService, fact_date_range
+from apps.bi.models import ClubDailyFact, ReservationHourlyFact
+from apps.clubs.models import Club, Court
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+
+User = get_user_model()
+
+
+class FactDateRangeTest(TestCase):
+    """Test cases for fact_date_range."""
+
+    def test_half_open_datetime_range(self):
+        start = timezone.make_aware(datetime(2025, 3, 1))
+        end = timezone.make_aware(datetime(2025, 3, 8))
+        self.assertEqual(fact_date_range(start, end), (date(2025, 3, 1), date(2025, 3, 7)))
+
+    def test_partial_days_are_included(self):
+        start = timezone.make_aware(datetime(2025, 3, 1, 10, 30))
+        end = timezone.make_aware(datetime(2025, 3, 3, 18))
+        self.assertEqual(fact_date_range(start, end), (date(2025, 3, 1), date(2025, 3, 3)))
+
+    def test_dates_are_inclusive(self):
+        self.assertEqual(
+            fact_date_range(date(2025, 3, 1), date(2025, 3, 1)),
+            (date(2025, 3, 1), date(2025, 3, 1)),
+        )
+
+
+@override_settings(BI_FACTS_SYNC_ENABLED=False)
+class FactBuilderTest(TestCase):
+    """Test cases for FactBuilder and FactQueryService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.organization = Organization.objects.create(
+            type="club",
+            business_name="Facts Org",
+            trade_name="Facts Org",
+            rfc="FAC010101XY1",
+            primary_email="facts@test.com",
+            primary_phone="+521234567890",
+            legal_representative="Jane Doe",
+            state="active",
+        )
+        self.club = Club.objects.create(
+            organization=self.organization,
+            name="Facts Club",
+            slug="facts-club",
+            email="club@facts.com",
+            phone="1234567890",
+        )
+        self.courts = [
+            Court.objects.create(
+                club=self.club,
+                organization=self.organization,
+                name=f"Court {number}",
+                number=number,
+            )
+            for number in (1, 2)
+        ]
+        self.user = User.objects.create_user(
+            username="factsuser", email="user@facts.com", password="TEST_PASSWORD"
+        )
+        self.day = timezone.localdate() + timedelta(days=2)
+
+        for index, (court, hour, status) in enumerate(
+            [
+                (self.courts[0], 10, "confirmed"),
+                (self.courts[1], 10, "completed"),
+                (self.courts[0], 18, "confirmed"),
+                (self.courts[1], 19, "cancelled"),
+            ]
+        ):
+            Reservation.objects.create(
+                organization=self.organization,
+                club=self.club,
+                court=court,
+                created_by=self.user,
+                date=self.day,
+                start_time=time(hour, 0),
+                end_time=time(hour + 1, 0),
+                status=status,
+                player_name=f"Player {index}",
+                player_email=f"player{index % 2}@test.com",
+                price_per_hour=Decimal("400.00"),
+                total_price=Decimal("400.00"),
+            )
+
+    def test_rebuild_creates_hourly_and_daily_rows(self):
+        FactBuilder.rebuild(self.day, self.day)
+
+        hourly = {
+            (fact.court_id, fact.hour): fact
+            for fact in ReservationHourlyFact.objects.filter(club=self.club)
+        }
+        self.assertEqual(hourly[(self.courts[0].id, 10)].bookings, 1)
+        self.assertEqual(hourly[(self.courts[1].id, 10)].bookings, 1)
+        self.assertEqual(hourly[(self.courts[0].id, 18)].bookings, 1)
+        self.assertEqual(hourly[(self.courts[1].id, 19)].cancellations, 1)
+
+        daily = ClubDailyFact.objects.get(club=self.club, date=self.day)
+        self.assertEqual(daily.total_reservations, 4)
+        self.assertEqual(daily.bookings, 3)
+        self.assertEqual(daily.cancellations, 1)
+        self.assertEqual(daily.unique_players, 2)
+
+    def test_rebuild_is_idempotent(self):
+        FactBuilder.rebuild(self.day, self.day)
+        FactBuilder.rebuild(self.day, self.day)
+
+        self.assertEqual(ClubDailyFact.objects.filter(club=self.club).count(), 1)
+        self.assertEqual(
+            ReservationHourlyFact.objects.filter(club=self.club, hour=10).count(), 2
+        )
+
+    def test_usage_kpis_read_facts(self):
+        FactBuilder.rebuild(self.day, self.day)
+
+        usage = FactQueryService.get_usage_kpis(
+            self.day, self.day, club_ids=[self.club.id]
+        )
+
+        self.assertEqual(usage["total_bookings"], 3)
+        self.assertEqual(usage["morning_bookings"], 2)
+        self.assertEqual(usage["evening_bookings"], 1)
+        self.assertEqual(usage["unique_users"], 2)
+
+
+class FactSignalTest(TransactionTestCase):
+    """Test that reservation saves refresh facts through the real commit path."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            trade_name="Signal Org", business_name="Signal Org LLC"
+        )
+        self.club = Club.objects.create(
+            organization=self.organization,
+            name="Signal Club",
+            slug="signal-club",
+            email="club@signal.com",
+            phone="1234567890",
+        )
+        self.court = Court.objects.create(
+            club=self.club, organization=self.organization, name="Court 1", number=1
+        )
+        self.user = User.objects.create_user(
+            username="signaluser", email="user@signal.com", password="TEST_PASSWORD"
+        )
+        self.day = timezone.localdate() + timedelta(days=2)
+
+    def reserve(self, hour):
+        return Reservation.objects.create(
+            organization=self.organization,
+            club=self.club,
+            court=self.court,
+            created_by=self.user,
+            date=self.day,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+            status="confirmed",
+            player_name="Player",
+            player_email="player@test.com",
+            price_per_hour=Decimal("400.00"),
+            total_price=Decimal("400.00"),
+        )
+
+    def bookings(self):
+        fact = ClubDailyFact.objects.filter(club=self.club, date=self.day).first()
+        return fact.bookings if fact else None
+
+    def test_autocommit_save_refreshes_facts(self):
+        self.reserve(10)
+        self.assertEqual(self.bookings(), 1)
+
+    def test_transaction_refreshes_once_on_commit(self):
+        with transaction.atomic():
+            self.reserve(10)
+            self.reserve(11)
+            self.assertIsNone(self.bookings())
+        self.assertEqual(self.bookings(), 2)
+
+    def test_rolled_back_transaction_does_not_block_later_refreshes(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.reserve(10)
+                raise RuntimeError()
+        self.assertIsNone(self.bookings())
+
+        self.reserve(11)
+        self.assertEqual(self.bookings(), 1)
@@ -9,6 +9,7 @@ from django.db.models import Q, Sum, Count, Avg
 from django.utils import timezone
 
 from .cache import cache_analytics_data, KPI_CACHE_TIMEOUT, REVENUE_CACHE_TIMEOUT, USAGE_CACHE_TIMEOUT, GROWTH_CACHE_TIMEOUT
+from .facts import FactQueryService, fact_date_range
 from .optimizations import (
     KPIQueryOptimizer, RevenueQueryOptimizer, UsageQueryOptimizer,
     DatabaseOptimizer, performance_monitor
@@ -58,9 +59,18 @@ from .services import (
     ReportGenerator,
     WidgetDataService,
 )
+from apps.shared.exports import CSV, XLSX, export_response
 
 logger = logging.getLogger(__name__)
 
+# ExportDataSerializer datasets -> registered exports
+EXPORT_DATASETS = {
+    "reservations": "bi.reservations",
+    "revenues": "finance.revenues",
+    "payments": "finance.payments",
+    "metric_values": "bi.metric_values",
+}
+
 
 def get_user_organization(user):
     """Get user's organization safely."""
@@ -585,9 +595,23 @@ class ReportViewSet(viewsets.ModelViewSet):
             start_date = serializer.validated_data.get("start_date")
             end_date = serializer.validated_data.get("end_date")
             format_override = serializer.validated_data.get("format")
+            format_type = format_override or report.format
 
             try:
                 generator = ReportGenerator(report)
+
+                if format_type in (CSV, XLSX):
+                    name, params = generator.export_params(start_date, end_date)
+                    response = export_response(
+                        request,
+                        name,
+                        params,
+                        format_type,
+                        background=serializer.validated_data["background"],
+                    )
+                    generator.mark_generated()
+                    return response
+
                 report_data = generator.generate(start_date, end_date)
 
                 return Response(
@@ -951,28 +975,40 @@ class AnalyticsView(viewsets.ViewSet):
 
     @action(detail=False, methods=["post"])
     def export(self, request):
-        """Export analytics data."""
+        """
+        Export analytics rows as a streamed CSV/Excel/JSON download, or in
+        the background for large date ranges (answers 202 and notifies the
+        user when the file is ready).
+        """
         serializer = ExportDataSerializer(data=request.data)
 
         if serializer.is_valid():
-            format_type = serializer.validated_data.get("format", "csv")
-            include_metadata = serializer.validated_data.get("include_metadata", True)
-            start_date = serializer.validated_data.get("start_date")
-            end_date = serializer.validated_data.get("end_date")
-
-            try:
-                # TODO: Implement actual data export logic
-                # This would generate the requested format and return download URL
+            data = serializer.validated_data
+            end_date = data.get("end_date") or timezone.now()
+            start_date = data.get("start_date") or end_date - timedelta(days=30)
+            organization = get_user_organization(request.user)
 
+            if organization is None:
                 return Response(
-                    {
-                        "message": "Export generated successfully",
-                        "format": format_type,
-                        "download_url": "/api/bi/downloads/export_123.csv",  # Placeholder
-                        "expires_at": (
-                            timezone.now() + timedelta(hours=24)
-                        ).isoformat(),
-                    }
+                    {"error": "User has no organization"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            params = {
+                "organization_id": str(organization.id),
+                "club_id": str(data["club"]) if data.get("club") else None,
+                "start_date": start_date.date().isoformat(),
+                "end_date": end_date.date().isoformat(),
+                "include_metadata": data["include_metadata"],
+            }
+
+            try:
+                return export_response(
+                    request,
+                    EXPORT_DATASETS[data["dataset"]],
+                    params,
+                    data["format"],
+                    background=data["background"],
                 )
 
             except Exception as e:
@@ -1013,10 +1049,10 @@ class AnalyticsView(viewsets.ViewSet):
             try:
                 # Use optimized query optimizer
                 revenue_kpis = KPIQueryOptimizer.get_revenue_kpis(
-                    start_date, end_date, club_ids
+                    start_date, end_date, club_ids, organization
                 )
                 usage_kpis = KPIQueryOptimizer.get_usage_kpis(
-                    start_date, end_date, club_ids
+                    start_date, end_date, club_ids, organization
                 )
                 
                 # Calculate period for comparison
@@ -1025,10 +1061,10 @@ class AnalyticsView(viewsets.ViewSet):
                 prev_end = start_date
                 
                 prev_revenue_kpis = KPIQueryOptimizer.get_revenue_kpis(
-                    prev_start, prev_end, club_ids
+                    prev_start, prev_end, club_ids, organization
                 )
                 prev_usage_kpis = KPIQueryOptimizer.get_usage_kpis(
-                    prev_start, prev_end, club_ids
+                    prev_start, prev_end, club_ids, organization
                 )
                 
                 # Build response with optimized data
@@ -1368,7 +1404,7 @@ class AnalyticsView(viewsets.ViewSet):
             try:
                 # Use RevenueQueryOptimizer for time series data
                 revenue_time_series = RevenueQueryOptimizer.get_revenue_time_series(
-                    start_date, end_date, grouping, club_ids
+                    start_date, end_date, grouping, club_ids, organization
                 )
                 
                 # Convert QuerySet to list for processing
@@ -1376,7 +1412,7 @@ class AnalyticsView(viewsets.ViewSet):
                 
                 # Get revenue by source
                 revenue_by_source = RevenueQueryOptimizer.get_revenue_by_source(
-                    start_date, end_date, club_ids
+                    start_date, end_date, club_ids, organization
                 )
                 source_data = list(revenue_by_source)
                 
@@ -1565,19 +1601,19 @@ class AnalyticsView(viewsets.ViewSet):
                 from apps.clubs.models import Club
                 club = Club.objects.get(id=club_id, organization=organization)
                 
-                # Get all reservations for the period
-                reservations = Reservation.objects.filter(
-                    club=club,
-                    date__gte=start_date.date(),
-                    date__lte=end_date.date(),
-                    status__in=["confirmed", "completed"]
-                )
+                # All usage figures come from the hourly fact rollup
+                hourly_facts = FactQueryService.hourly(
+                    start_date, end_date, [club.id]
+                ).filter(bookings__gt=0)
+                first_day, last_day = fact_date_range(start_date, end_date)
                 
-                total_reservations = reservations.count()
+                total_reservations = (
+                    hourly_facts.aggregate(total=Sum("bookings"))["total"] or 0
+                )
                 
                 # Calculate overall utilization
                 courts_count = club.courts.filter(is_active=True).count()
-                days_count = (end_date.date() - start_date.date()).days + 1
+                days_count = (last_day - first_day).days + 1
                 hours_per_day = 12  # Operating hours
                 total_possible_slots = courts_count * days_count * hours_per_day
                 
@@ -1589,11 +1625,17 @@ class AnalyticsView(viewsets.ViewSet):
                 # Peak hours analysis
                 from collections import defaultdict
                 hour_counts = defaultdict(int)
+                dow_counts = defaultdict(int)
+                heatmap = {}
                 
-                for reservation in reservations:
-                    if reservation.time:
-                        hour = reservation.time.hour
-                        hour_counts[hour] += 1
+                for row in hourly_facts.values("date", "hour").annotate(
+                    count=Sum("bookings")
+                ):
+                    dow = row["date"].weekday()  # 0=Monday
+                    hour_counts[row["hour"]] += row["count"]
+                    dow_counts[dow] += row["count"]
+                    key = f"{dow}_{row['hour']}"
+                    heatmap[key] = heatmap.get(key, 0) + row["count"]
                 
                 # Sort by usage and get top hours
                 sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
@@ -1608,8 +1650,8 @@ class AnalyticsView(viewsets.ViewSet):
                 
                 # Usage by court
                 court_usage = (
-                    reservations.values("court__name", "court__id")
-                    .annotate(count=Count("id"))
+                    hourly_facts.values("court__name", "court__id")
+                    .annotate(count=Sum("bookings"))
                     .order_by("-count")
                 )
                 
@@ -1625,11 +1667,6 @@ class AnalyticsView(viewsets.ViewSet):
                     })
                 
                 # Usage by day of week
-                dow_counts = defaultdict(int)
-                for reservation in reservations:
-                    dow = reservation.date.weekday()  # 0=Monday
-                    dow_counts[dow] += 1
-                
                 days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
                 for dow, name in enumerate(days_of_week):
                     count = dow_counts[dow]
@@ -1644,14 +1681,6 @@ class AnalyticsView(viewsets.ViewSet):
                     })
                 
                 # Heatmap data (hour vs day of week)
-                heatmap = {}
-                for reservation in reservations:
-                    if reservation.time:
-                        hour = reservation.time.hour
-                        dow = reservation.date.weekday()
-                        key = f"{dow}_{hour}"
-                        heatmap[key] = heatmap.get(key, 0) + 1
-                
                 for dow in range(7):
                     for hour in range(6, 24):  # 6 AM to 11 PM
                         key = f"{dow}_{hour}"
@@ -1755,27 +1784,22 @@ class AnalyticsView(viewsets.ViewSet):
             
             # User growth timeline
             if grouping == "day":
+                fact_scope = {
+                    "club_ids": [club_id] if club_id else None,
+                    "organization": None if club_id else organization,
+                }
+                active_by_day = FactQueryService.get_daily_values(
+                    "unique_players", start_date, end_date, **fact_scope
+                )
+                new_by_day = FactQueryService.get_daily_values(
+                    "new_clients", start_date, end_date, **fact_scope
+                )
                 current_date = start_date.date()
                 while current_date <= end_date.date():
-                    # Active users on this date
-                    day_users = ClientProfile.objects.filter(
-                        user__reservations__date=current_date,
-                        user__reservations__status__in=["confirmed", "completed"]
-                    )
-                    if club_id:
-                        day_users = day_users.filter(user__reservations__club_id=club_id)
-                    
-                    active_count = day_users.distinct().count()
-                    
-                    # New registrations on this date
-                    new_count = day_users.filter(
-                        created_at__date=current_date
-                    ).distinct().count()
-                    
                     growth_data["user_growth_timeline"].append({
                         "date": current_date.isoformat(),
-                        "active_users": active_count,
-                        "new_users": new_count
+                        "active_users": active_by_day.get(current_date) or 0,
+                        "new_users": new_by_day.get(current_date) or 0
                     })
                     
                     current_date += timedelta(days=1)
@@ -7,7 +7,7 @@ from datetime import timedelta
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
 
 from core.models import BaseModel, MultiTenantModel
@@ -416,6 +416,17 @@ class ClassSession(MultiTenantModel):
     def __str__(self):
         return f"{self.schedule.name} - {self.scheduled_datetime}"
 
+    def save(self, *args, **kwargs):
+        # enrolled_count is owned by EnrollmentService's conditional UPDATEs;
+        # a full save of a stale instance must not write it back
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "enrolled_count"
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def is_full(self):
         """Check if class is full."""
@@ -523,38 +534,10 @@ class ClassEnrollment(BaseModel):
         return f"{self.student} - {self.session} ({self.get_status_display()})"
 
     def cancel(self, reason=""):
-        """Cancel enrollment."""
-        self.status = "cancelled"
-        self.cancelled_at = timezone.now()
-        self.cancellation_reason = reason
-        self.save()
+        """Cancel enrollment, promoting the head of the waitlist."""
+        from .services import EnrollmentService
 
-        # Update session enrolled count
-        self.session.enrolled_count = self.session.enrollments.filter(
-            status="enrolled"
-        ).count()
-        self.session.save()
-
-        # Promote from waitlist if applicable
-        if self.session.schedule.allow_waitlist:
-            next_waitlisted = (
-                self.session.enrollments.filter(status="waitlisted")
-                .order_by("waitlist_position")
-                .first()
-            )
-
-            if next_waitlisted:
-                next_waitlisted.status = "enrolled"
-                next_waitlisted.waitlist_position = None
-                next_waitlisted.save()
-
-                # Update remaining waitlist positions
-                remaining_waitlist = self.session.enrollments.filter(
-                    status="waitlisted"
-                ).order_by("waitlist_position")
-                for i, enrollment in enumerate(remaining_waitlist):
-                    enrollment.waitlist_position = i + 1
-                    enrollment.save()
+        return EnrollmentService.cancel(self, reason)
 
     def check_in(self):
         """Check in student for class."""
@@ -735,10 +718,14 @@ class StudentPackage(BaseModel):
         )
 
     def use_class(self):
-        """Use one class from package."""
-        if self.classes_remaining > 0:
-            self.classes_remaining -= 1
-            self.classes_used += 1
-            self.save()
-            return True
-        return False
+        """Use one class from package, atomically."""
+        used = StudentPackage.objects.filter(
+            pk=self.pk, is_active=True, classes_remaining__gt=0
+        ).update(
+            classes_remaining=F("classes_remaining") - 1,
+            classes_used=F("classes_used") + 1,
+            updated_at=timezone.now(),
+        )
+        if used:
+            self.refresh_from_db(fields=["classes_remaining", "classes_used", "updated_at"])
+        return bool(used)
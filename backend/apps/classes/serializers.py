@@ -3,7 +3,6 @@ Serializers for classes module.
 """
 
 from django.contrib.auth import get_user_model
-from django.db import models
 from django.utils import timezone
 
 from rest_framework import serializers
@@ -20,6 +19,8 @@ from apps.classes.models import (
     InstructorEvaluation,
     StudentPackage,
 )
+from apps.classes.services import EnrollmentService
+from apps.shared.seats import SeatsUnavailable
 
 # Avoid circular imports - will import where needed
 ClientProfile = None
@@ -395,8 +396,10 @@ class ClassEnrollmentSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        # Seats change hands only through EnrollmentService
         read_only_fields = [
             "id",
+            "status",
             "enrolled_at",
             "cancelled_at",
             "waitlist_position",
@@ -421,28 +424,31 @@ class ClassEnrollmentSerializer(serializers.ModelSerializer):
         if not can_enroll:
             raise serializers.ValidationError(reason)
 
-        # Determine if enrollment or waitlist
-        if session.is_full:
-            validated_data["status"] = "waitlisted"
-            # Calculate waitlist position
-            last_position = (
-                session.enrollments.filter(status="waitlisted").aggregate(
-                    max_position=models.Max("waitlist_position")
-                )["max_position"]
-                or 0
+        try:
+            enrollment = EnrollmentService.enroll(
+                session,
+                student,
+                **{
+                    key: value
+                    for key, value in validated_data.items()
+                    if key not in ("session", "student", "status")
+                },
             )
-            validated_data["waitlist_position"] = last_position + 1
-        else:
-            validated_data["status"] = "enrolled"
-
-        enrollment = super().create(validated_data)
-
-        # Update session enrolled count
-        session.enrolled_count = session.enrollments.filter(status="enrolled").count()
-        session.save()
+        except SeatsUnavailable:
+            raise serializers.ValidationError("La clase está llena")
 
         return enrollment
 
+    def update(self, instance, validated_data):
+        """Update enrollment details; changing session takes a new enrollment."""
+        session = validated_data.pop("session", instance.session)
+        student = validated_data.pop("student", instance.student)
+        if session != instance.session or student != instance.student:
+            raise serializers.ValidationError(
+                "Cancela la inscripción y vuelve a inscribirte para cambiar de clase"
+            )
+        return super().update(instance, validated_data)
+
 
 class ClassAttendanceSerializer(serializers.ModelSerializer):
     """Serializer for ClassAttendance model."""
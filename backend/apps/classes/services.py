@@ -0,0 +1,96 @@
+"""
+Services for classes module.
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.shared.seats import SeatAllocator
+
+from .models import ClassEnrollment, ClassSession
+
+logger = logging.getLogger(__name__)
+
+
+class EnrollmentService:
+    """
+    Seat allocation for class sessions.
+
+    ``ClassSession.enrolled_count`` is the seat counter: enrolling takes a
+    seat with a conditional UPDATE, a full session puts the student on the
+    FIFO waitlist (up to ``ClassSchedule.waitlist_size``), and cancelling an
+    enrolled seat promotes the head of the waitlist.
+    """
+
+    @staticmethod
+    def seats(session: ClassSession) -> SeatAllocator:
+        return SeatAllocator(
+            ClassSession,
+            session.pk,
+            taken_field="enrolled_count",
+            capacity_field="max_participants",
+            entries=ClassEnrollment.objects.filter(session_id=session.pk),
+            seated="enrolled",
+            waiting="waitlisted",
+            position_field="waitlist_position",
+        )
+
+    @staticmethod
+    def waitlist_size(session: ClassSession) -> int:
+        schedule = session.schedule
+        return schedule.waitlist_size if schedule.allow_waitlist else 0
+
+    @staticmethod
+    @transaction.atomic
+    def enroll(session: ClassSession, student, **fields) -> ClassEnrollment:
+        """
+        Enroll ``student`` or add them to the waitlist; raises
+        ``SeatsUnavailable`` when the session and its waitlist are full.
+        """
+        status, position = EnrollmentService.seats(session).allocate(
+            waitlist_size=EnrollmentService.waitlist_size(session)
+        )
+        return ClassEnrollment.objects.create(
+            session=session,
+            student=student,
+            status=status,
+            waitlist_position=position,
+            **fields,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def cancel(enrollment: ClassEnrollment, reason: str = ""):
+        """Cancel ``enrollment``; returns the waitlisted enrollment promoted, if any."""
+        seats = EnrollmentService.seats(enrollment.session)
+        locked = seats.lock_entry(enrollment)
+        if locked is None or locked.status == "cancelled":
+            return None
+
+        enrollment.status = "cancelled"
+        enrollment.cancelled_at = timezone.now()
+        enrollment.cancellation_reason = reason
+        enrollment.save(
+            update_fields=["status", "cancelled_at", "cancellation_reason", "updated_at"]
+        )
+
+        return seats.vacate(locked, locked.status)
+
+    @staticmethod
+    @transaction.atomic
+    def delete(enrollment: ClassEnrollment):
+        """Delete ``enrollment``, handing its seat on like a cancellation."""
+        seats = EnrollmentService.seats(enrollment.session)
+        locked = seats.lock_entry(enrollment)
+        if locked is None:
+            return None
+
+        enrollment.delete()
+        return seats.vacate(locked, locked.status)
+
+    @staticmethod
+    def reconcile(session: ClassSession) -> int:
+        """Recount the seat counter from enrolled students."""
+        return EnrollmentService.seats(session).reconcile()
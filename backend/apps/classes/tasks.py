@@ -0,0 +1,35 @@
+"""
+Celery tasks for classes module.
+"""
+
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from .models import ClassSession
+from .services import EnrollmentService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_enrollment_seats():
+    """
+    Periodic task recounting the seats of upcoming class sessions, promoting
+    waitlisted students into seats that free up.
+    """
+    sessions = ClassSession.objects.filter(
+        status__in=["scheduled", "confirmed"],
+        scheduled_datetime__gte=timezone.now(),
+    )
+    reconciled = 0
+    for session in sessions.iterator():
+        try:
+            EnrollmentService.reconcile(session)
+        except Exception as e:
+            logger.error(f"Error reconciling seats of class session {session.id}: {str(e)}")
+            continue
+        reconciled += 1
+    logger.info(f"Reconciled enrollment seats of {reconciled} class sessions")
+    return reconciled
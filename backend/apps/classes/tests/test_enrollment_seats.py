@@ -0,0 +1,231 @@
+"""
+Tests for class session seat allocation and the FIFO waitlist.
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.classes.models import (
+    ClassEnrollment,
+    ClassLevel,
+    ClassPackage,
+    ClassSchedule,
+    ClassSession,
+    ClassType,
+    Instructor,
+    StudentPackage,
+)
+from apps.classes.serializers import ClassEnrollmentSerializer
+from apps.classes.services import EnrollmentService
+from apps.classes.tasks import reconcile_enrollment_seats
+from apps.clients.models import ClientProfile
+from apps.root.models import Organization
+from apps.shared.seats import SeatsUnavailable
+
+User = get_user_model()
+
+
+class EnrollmentSeatsTest(TestCase):
+    """Test the seat counter, waitlist positions and promotion."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Classes Org", business_name="Classes Org LLC"
+        )
+        instructor_user = User.objects.create_user(
+            username="coach", email="coach@example.com", password="TEST_PASSWORD"
+        )
+        cls.instructor = Instructor.objects.create(
+            organization=cls.organization, user=instructor_user
+        )
+        cls.class_type = ClassType.objects.create(
+            organization=cls.organization,
+            name="group",
+            display_name="Grupal",
+            base_price=Decimal("200.00"),
+        )
+        cls.schedule = ClassSchedule.objects.create(
+            organization=cls.organization,
+            name="Clínica de volea",
+            class_type=cls.class_type,
+            level=ClassLevel.objects.create(name="all_levels", display_name="Todos"),
+            instructor=cls.instructor,
+            start_date=date.today(),
+            start_time=time(18),
+            duration_minutes=60,
+            min_participants=1,
+            max_participants=2,
+            price=Decimal("200.00"),
+            waitlist_size=2,
+        )
+        cls.students = []
+        for index in range(5):
+            user = User.objects.create_user(
+                username=f"student{index}",
+                email=f"student{index}@example.com",
+                password="TEST_PASSWORD",
+            )
+            cls.students.append(
+                ClientProfile.objects.create(organization=cls.organization, user=user)
+            )
+
+    def setUp(self):
+        self.session = ClassSession.objects.create(
+            organization=self.organization,
+            schedule=self.schedule,
+            scheduled_datetime=timezone.now() + timedelta(days=2),
+            duration_minutes=60,
+            instructor=self.instructor,
+            max_participants=2,
+        )
+
+    def enroll(self, index):
+        return EnrollmentService.enroll(self.session, self.students[index])
+
+    def test_full_session_fills_the_waitlist_in_order(self):
+        statuses = [(e.status, e.waitlist_position) for e in map(self.enroll, range(4))]
+
+        self.assertEqual(
+            statuses,
+            [("enrolled", None), ("enrolled", None), ("waitlisted", 1), ("waitlisted", 2)],
+        )
+        with self.assertRaises(SeatsUnavailable):
+            self.enroll(4)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 2)
+        self.assertEqual(ClassEnrollment.objects.count(), 4)
+
+    def test_cancelling_a_seat_promotes_the_head_of_the_waitlist(self):
+        first, _, head, second = map(self.enroll, range(4))
+
+        promoted = first.cancel("No puedo asistir")
+
+        self.assertEqual(promoted.pk, head.pk)
+        head.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((head.status, head.waitlist_position), ("enrolled", None))
+        self.assertEqual(second.waitlist_position, 1)
+        self.session.refresh_from_db()
+        # The seat changed hands
+        self.assertEqual(self.session.enrolled_count, 2)
+
+    def test_cancelling_without_waitlist_frees_the_seat(self):
+        first, _ = map(self.enroll, range(2))
+
+        self.assertIsNone(first.cancel())
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 1)
+        self.assertEqual(self.enroll(2).status, "enrolled")
+
+    def test_stale_double_cancel_promotes_only_once(self):
+        first, _, head, second = map(self.enroll, range(4))
+        stale = ClassEnrollment.objects.get(pk=first.pk)
+
+        first.cancel()
+        self.assertIsNone(stale.cancel())
+
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.waitlist_position), ("waitlisted", 1))
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 2)
+
+    def test_leaving_the_waitlist_closes_the_gap(self):
+        enrollments = list(map(self.enroll, range(4)))
+
+        enrollments[2].cancel()
+
+        enrollments[3].refresh_from_db()
+        self.assertEqual(enrollments[3].waitlist_position, 1)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 2)
+
+    def test_saving_a_stale_session_keeps_the_counter(self):
+        stale = ClassSession.objects.get(pk=self.session.pk)
+        self.enroll(0)
+
+        stale.notes = "Traer pelotas"
+        stale.save()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 1)
+        self.assertEqual(self.session.notes, "Traer pelotas")
+
+    def test_deleting_a_seat_promotes_the_head_of_the_waitlist(self):
+        first, _, head, second = map(self.enroll, range(4))
+
+        promoted = EnrollmentService.delete(first)
+
+        self.assertEqual(promoted.pk, head.pk)
+        second.refresh_from_db()
+        self.assertEqual(second.waitlist_position, 1)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.enrolled_count, 2)
+
+    def test_status_cannot_be_written_through_the_api(self):
+        waitlisted = list(map(self.enroll, range(3)))[2]
+
+        serializer = ClassEnrollmentSerializer(
+            waitlisted, data={"status": "enrolled", "notes": "Llego tarde"}, partial=True
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        waitlisted.refresh_from_db()
+        self.assertEqual((waitlisted.status, waitlisted.notes), ("waitlisted", "Llego tarde"))
+
+    def test_raised_capacity_is_handed_to_the_waitlist(self):
+        enrollments = list(map(self.enroll, range(4)))
+        ClassSession.objects.filter(pk=self.session.pk).update(max_participants=3)
+
+        self.assertEqual(reconcile_enrollment_seats(), 1)
+
+        for enrollment in enrollments:
+            enrollment.refresh_from_db()
+        self.assertEqual(
+            [(e.status, e.waitlist_position) for e in enrollments[2:]],
+            [("enrolled", None), ("waitlisted", 1)],
+        )
+        # Newcomers queue behind the remaining waitlist
+        newcomer = self.enroll(4)
+        self.assertEqual((newcomer.status, newcomer.waitlist_position), ("waitlisted", 2))
+
+
+class StudentPackageUseClassTest(TestCase):
+    """Test that package credits are consumed atomically."""
+
+    def test_stale_instances_cannot_overspend(self):
+        organization = Organization.objects.create(
+            trade_name="Package Org", business_name="Package Org LLC"
+        )
+        user = User.objects.create_user(
+            username="buyer", email="buyer@example.com", password="TEST_PASSWORD"
+        )
+        package = StudentPackage.objects.create(
+            student=ClientProfile.objects.create(organization=organization, user=user),
+            package=ClassPackage.objects.create(
+                organization=organization,
+                name="Paquete 1",
+                num_classes=1,
+                validity_days=30,
+                price=Decimal("180.00"),
+            ),
+            expires_at=timezone.now() + timedelta(days=30),
+            classes_remaining=1,
+            payment_amount=Decimal("180.00"),
+            payment_reference="PKG-1",
+        )
+        stale = StudentPackage.objects.get(pk=package.pk)
+
+        self.assertTrue(package.use_class())
+        self.assertEqual((package.classes_remaining, package.classes_used), (0, 1))
+        # The stale copy still believes one class is left
+        self.assertFalse(stale.use_class())
+
+        package.refresh_from_db()
+        self.assertEqual((package.classes_remaining, package.classes_used), (0, 1))
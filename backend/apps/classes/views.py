@@ -4,6 +4,7 @@ Views for classes module.
 
 from datetime import date, datetime, timedelta
 
+from django.db import transaction
 from django.db.models import Avg, Count, Q
 from django.utils import timezone
 
@@ -35,10 +36,12 @@ from apps.classes.serializers import (
     InstructorSerializer,
     StudentPackageSerializer,
 )
+from apps.classes.services import EnrollmentService
 from core.pagination import StandardResultsSetPagination
 from core.permissions import IsAuthenticated, IsOrganizationMember
 from apps.finance.models import Payment
 from apps.finance.services import PaymentService
+from apps.shared.seats import SeatsUnavailable
 
 
 class ClassLevelViewSet(viewsets.ModelViewSet):
@@ -603,6 +606,16 @@ class ClassEnrollmentViewSet(viewsets.ModelViewSet):
         enrollment.check_in()
 
         return Response({"checked_in": True, "message": "Check-in realizado"})
+
+    def perform_update(self, serializer):
+        # status is read-only; a PATCH to "cancelled" cancels through the service
+        with transaction.atomic():
+            enrollment = serializer.save()
+            if self.request.data.get("status") == "cancelled":
+                enrollment.cancel(self.request.data.get("reason", ""))
+
+    def perform_destroy(self, instance):
+        EnrollmentService.delete(instance)
     
     def create(self, request, *args, **kwargs):
         """Create enrollment with payment processing."""
@@ -634,76 +647,80 @@ class ClassEnrollmentViewSet(viewsets.ModelViewSet):
         # Check if using package
         package_id = request.data.get("student_package")
         payment_method = request.data.get("payment_method", "cash")
-        
-        enrollment_data = {
-            "session": session,
-            "student": student,
-            "status": "enrolled" if not session.is_full else "waitlisted",
-        }
-        
-        if package_id:
-            # Use package for payment
-            try:
-                package = StudentPackage.objects.get(
-                    id=package_id,
-                    student=student,
-                    is_active=True,
-                    classes_remaining__gt=0
-                )
-                
-                # Check if package is valid for this class type
-                if session.schedule.class_type not in package.package.class_types.all():
-                    return Response(
-                        {"error": "Package not valid for this class type"},
-                        status=status.HTTP_400_BAD_REQUEST
+
+        enrollment_data = {}
+
+        try:
+            # Package use, payment and seat commit or roll back together; the
+            # seat is taken last so the session row is locked briefly
+            with transaction.atomic():
+                if package_id:
+                    # Use package for payment
+                    try:
+                        package = StudentPackage.objects.get(
+                            id=package_id,
+                            student=student,
+                            is_active=True,
+                            classes_remaining__gt=0
+                        )
+                    except StudentPackage.DoesNotExist:
+                        return Response(
+                            {"error": "Invalid or expired package"},
+                            status=status.HTTP_400_BAD_REQUEST
+                        )
+
+                    # Check if package is valid for this class type
+                    if session.schedule.class_type not in package.package.class_types.all():
+                        return Response(
+                            {"error": "Package not valid for this class type"},
+                            status=status.HTTP_400_BAD_REQUEST
+                        )
+
+                    # Use one class from package
+                    if not package.use_class():
+                        return Response(
+                            {"error": "Invalid or expired package"},
+                            status=status.HTTP_400_BAD_REQUEST
+                        )
+                    enrollment_data["paid"] = True
+                    enrollment_data["payment_method"] = "package"
+                    enrollment_data["payment_reference"] = f"PKG-{package.id}"
+                else:
+                    # Process regular payment
+                    amount = session.schedule.price
+                    if hasattr(student, "is_member") and student.is_member and session.schedule.member_price:
+                        amount = session.schedule.member_price
+
+                    # Create payment
+                    payment = PaymentService.create_payment(
+                        amount=amount,
+                        payment_type="class",
+                        payment_method=payment_method,
+                        organization=session.organization,
+                        club=session.club,
+                        user=request.user,
+                        client=student,
+                        description=f"Class enrollment: {session.schedule.name}",
+                        metadata={
+                            "session_id": str(session.id),
+                            "class_name": session.schedule.name,
+                            "instructor": session.instructor.user.get_full_name()
+                        }
                     )
-                
-                # Use one class from package
-                package.use_class()
-                enrollment_data["paid"] = True
-                enrollment_data["payment_method"] = "package"
-                enrollment_data["payment_reference"] = f"PKG-{package.id}"
-                
-            except StudentPackage.DoesNotExist:
-                return Response(
-                    {"error": "Invalid or expired package"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        else:
-            # Process regular payment
-            amount = session.schedule.price
-            if hasattr(student, "is_member") and student.is_member and session.schedule.member_price:
-                amount = session.schedule.member_price
-            
-            # Create payment
-            payment = PaymentService.create_payment(
-                amount=amount,
-                payment_type="class",
-                payment_method=payment_method,
-                organization=session.organization,
-                club=session.club,
-                user=request.user,
-                client=student,
-                description=f"Class enrollment: {session.schedule.name}",
-                metadata={
-                    "session_id": str(session.id),
-                    "class_name": session.schedule.name,
-                    "instructor": session.instructor.user.get_full_name()
-                }
+
+                    enrollment_data["paid"] = payment.status == "completed"
+                    enrollment_data["payment_amount"] = amount
+                    enrollment_data["payment_method"] = payment_method
+                    enrollment_data["payment_reference"] = payment.reference_number
+
+                # Take a seat or a waitlist place
+                enrollment = EnrollmentService.enroll(session, student, **enrollment_data)
+        except SeatsUnavailable:
+            return Response(
+                {"error": "La clase está llena"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            enrollment_data["paid"] = payment.status == "completed"
-            enrollment_data["payment_amount"] = amount
-            enrollment_data["payment_method"] = payment_method
-            enrollment_data["payment_reference"] = payment.reference_number
-        
-        # Create enrollment
-        enrollment = ClassEnrollment.objects.create(**enrollment_data)
-        
-        # Update session enrolled count
-        session.enrolled_count = session.enrollments.filter(status="enrolled").count()
-        session.save()
-        
+
         serializer = self.get_serializer(enrollment)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
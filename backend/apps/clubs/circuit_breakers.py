@@ -4,199 +4,66 @@ Prevents cascade failures and provides fallback mechanisms for critical operatio
 """
 
 import logging
-import threading
-import time
-from datetime import datetime, timedelta
-from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError, OperationalError
 from django.utils import timezone
 
-logger = logging.getLogger('clubs.circuit_breakers')
-
-
-class CircuitState(Enum):
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
-
+from apps.shared.circuit_breaker import CircuitBreaker as SharedCircuitBreaker
+from apps.shared.circuit_breaker import (
+    CircuitBreakerError,
+    CircuitState,
+    circuit_breaker_registry,
+)
 
-class CircuitBreakerError(Exception):
-    """Custom exception for circuit breaker failures."""
-    pass
+logger = logging.getLogger('clubs.circuit_breakers')
 
 
-class CircuitBreaker:
+class CircuitBreaker(SharedCircuitBreaker):
     """
-    Generic circuit breaker implementation with configurable thresholds and timeouts.
+    Circuit breaker for club operations.
+    Blocked calls return the fallback payload; failures are always re-raised.
     """
-    
+
     def __init__(
         self,
         name: str,
         failure_threshold: int = 5,
         recovery_timeout: int = 60,  # seconds
-        expected_exception: Union[Exception, tuple] = Exception,
-        fallback_function: Optional[Callable] = None
+        namespace: str = 'clubs',
+        **options
     ):
-        self.name = name
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.fallback_function = fallback_function
-        
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = CircuitState.CLOSED
-        self.lock = threading.RLock()
-        
-        # Cache keys
-        self.failure_count_key = f"circuit_breaker_{name}_failures"
-        self.state_key = f"circuit_breaker_{name}_state"
-        self.last_failure_key = f"circuit_breaker_{name}_last_failure"
-        
-        # Load state from cache
-        self._load_state_from_cache()
-    
-    def _load_state_from_cache(self):
-        """Load circuit breaker state from cache."""
-        try:
-            self.failure_count = cache.get(self.failure_count_key, 0)
-            self.state = CircuitState(cache.get(self.state_key, CircuitState.CLOSED.value))
-            self.last_failure_time = cache.get(self.last_failure_key)
-        except Exception as e:
-            logger.warning(f"Failed to load circuit breaker state from cache: {e}")
-    
-    def _save_state_to_cache(self):
-        """Save circuit breaker state to cache."""
-        try:
-            cache.set(self.failure_count_key, self.failure_count, 3600)  # 1 hour
-            cache.set(self.state_key, self.state.value, 3600)
-            cache.set(self.last_failure_key, self.last_failure_time, 3600)
-        except Exception as e:
-            logger.warning(f"Failed to save circuit breaker state to cache: {e}")
-    
-    def __call__(self, func: Callable) -> Callable:
-        """Decorator interface for circuit breaker."""
-        def wrapper(*args, **kwargs):
-            return self.call(func, *args, **kwargs)
-        return wrapper
-    
-    def call(self, func: Callable, *args, **kwargs) -> Any:
-        """
-        Execute function with circuit breaker protection.
-        """
-        with self.lock:
-            # Check if we should attempt the call
-            if not self._can_attempt():
-                return self._handle_blocked_call(func.__name__)
-            
-            try:
-                # Attempt the function call
-                result = func(*args, **kwargs)
-                
-                # Success - reset failure count
-                self._handle_success()
-                
-                return result
-                
-            except self.expected_exception as e:
-                # Expected failure - increment failure count
-                self._handle_failure(e, func.__name__)
-                raise
-            except Exception as e:
-                # Unexpected error - don't count as failure for circuit breaker
-                logger.error(f"Unexpected error in circuit breaker {self.name}: {e}")
-                raise
-    
-    def _can_attempt(self) -> bool:
-        """Check if we can attempt the call based on circuit breaker state."""
-        if self.state == CircuitState.CLOSED:
-            return True
-        
-        if self.state == CircuitState.OPEN:
-            # Check if recovery timeout has passed
-            if (self.last_failure_time and 
-                time.time() - self.last_failure_time > self.recovery_timeout):
-                self.state = CircuitState.HALF_OPEN
-                logger.info(f"Circuit breaker {self.name} transitioning to HALF_OPEN")
-                self._save_state_to_cache()
-                return True
-            return False
-        
-        if self.state == CircuitState.HALF_OPEN:
-            # Allow one attempt in half-open state
-            return True
-        
-        return False
-    
-    def _handle_success(self):
-        """Handle successful function execution."""
-        if self.failure_count > 0 or self.state != CircuitState.CLOSED:
-            logger.info(f"Circuit breaker {self.name} resetting to CLOSED state")
-        
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
-        self.last_failure_time = None
-        self._save_state_to_cache()
-    
-    def _handle_failure(self, exception: Exception, func_name: str):
-        """Handle function execution failure."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        logger.warning(f"Circuit breaker {self.name} recorded failure {self.failure_count}: {exception}")
-        
-        if self.state == CircuitState.HALF_OPEN:
-            # Failed in half-open, go back to open
-            self.state = CircuitState.OPEN
-            logger.warning(f"Circuit breaker {self.name} transitioning back to OPEN from HALF_OPEN")
-        elif self.failure_count >= self.failure_threshold:
-            # Threshold reached, open the circuit
-            self.state = CircuitState.OPEN
-            logger.error(f"Circuit breaker {self.name} OPENING due to {self.failure_count} failures")
-        
-        self._save_state_to_cache()
-    
-    def _handle_blocked_call(self, func_name: str) -> Any:
+        super().__init__(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            namespace=namespace,
+            **options
+        )
+
+    def _handle_blocked(self, func: Callable, args: tuple, kwargs: dict) -> Any:
         """Handle call when circuit breaker is open."""
-        logger.warning(f"Circuit breaker {self.name} BLOCKED call to {func_name}")
-        
+        logger.warning(f"Circuit breaker {self.name} BLOCKED call to {func.__name__}")
+
         if self.fallback_function:
             try:
                 logger.info(f"Circuit breaker {self.name} executing fallback function")
                 return self.fallback_function()
             except Exception as e:
                 logger.error(f"Circuit breaker {self.name} fallback function failed: {e}")
-        
-        raise CircuitBreakerError(
-            f"Circuit breaker {self.name} is OPEN. "
-            f"Service is temporarily unavailable."
-        )
-    
-    def reset(self):
-        """Manually reset circuit breaker to closed state."""
-        with self.lock:
-            self.failure_count = 0
-            self.state = CircuitState.CLOSED
-            self.last_failure_time = None
-            self._save_state_to_cache()
-            logger.info(f"Circuit breaker {self.name} manually reset")
-    
+
+        raise self.open_error()
+
+    def _can_attempt(self) -> bool:
+        """Check if we can attempt the call based on circuit breaker state."""
+        return self.allow_request()
+
     def get_state(self) -> Dict[str, Any]:
         """Get current circuit breaker state information."""
-        return {
-            'name': self.name,
-            'state': self.state.value,
-            'failure_count': self.failure_count,
-            'failure_threshold': self.failure_threshold,
-            'last_failure_time': self.last_failure_time,
-            'recovery_timeout': self.recovery_timeout,
-            'is_available': self._can_attempt()
-        }
+        stats = self.get_stats()
+        stats['is_available'] = self._can_attempt()
+        return stats
 
 
 class ClubCircuitBreaker:
@@ -212,8 +79,10 @@ class ClubCircuitBreaker:
         """Initialize all circuit breakers for club operations."""
         
         # Club availability checking
-        self.circuit_breakers['club_availability'] = CircuitBreaker(
-            name='club_availability',
+        self.circuit_breakers['club_availability'] = circuit_breaker_registry.get_or_create(
+            'club_availability',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=3,
             recovery_timeout=30,
             expected_exception=(DatabaseError, OperationalError, ValidationError),
@@ -221,8 +90,10 @@ class ClubCircuitBreaker:
         )
         
         # Court availability checking
-        self.circuit_breakers['court_availability'] = CircuitBreaker(
-            name='court_availability',
+        self.circuit_breakers['court_availability'] = circuit_breaker_registry.get_or_create(
+            'court_availability',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=5,
             recovery_timeout=60,
             expected_exception=(DatabaseError, OperationalError, ValidationError),
@@ -230,8 +101,10 @@ class ClubCircuitBreaker:
         )
         
         # Reservation creation
-        self.circuit_breakers['reservation_creation'] = CircuitBreaker(
-            name='reservation_creation',
+        self.circuit_breakers['reservation_creation'] = circuit_breaker_registry.get_or_create(
+            'reservation_creation',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=3,
             recovery_timeout=120,
             expected_exception=(DatabaseError, OperationalError, ValidationError),
@@ -239,8 +112,10 @@ class ClubCircuitBreaker:
         )
         
         # Pricing calculation
-        self.circuit_breakers['pricing_calculation'] = CircuitBreaker(
-            name='pricing_calculation',
+        self.circuit_breakers['pricing_calculation'] = circuit_breaker_registry.get_or_create(
+            'pricing_calculation',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=10,
             recovery_timeout=30,
             expected_exception=(DatabaseError, OperationalError, ArithmeticError),
@@ -248,8 +123,10 @@ class ClubCircuitBreaker:
         )
         
         # Club dashboard data
-        self.circuit_breakers['club_dashboard'] = CircuitBreaker(
-            name='club_dashboard',
+        self.circuit_breakers['club_dashboard'] = circuit_breaker_registry.get_or_create(
+            'club_dashboard',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=5,
             recovery_timeout=60,
             expected_exception=(DatabaseError, OperationalError),
@@ -257,8 +134,10 @@ class ClubCircuitBreaker:
         )
         
         # Maintenance checking
-        self.circuit_breakers['maintenance_check'] = CircuitBreaker(
-            name='maintenance_check',
+        self.circuit_breakers['maintenance_check'] = circuit_breaker_registry.get_or_create(
+            'maintenance_check',
+            namespace='clubs',
+            breaker_class=CircuitBreaker,
             failure_threshold=5,
             recovery_timeout=30,
             expected_exception=(DatabaseError, OperationalError),
@@ -12,6 +12,7 @@ from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from .occupancy import OccupancyEngine
 from .serializers import BulkAvailabilityRequestSerializer
 
 
@@ -370,68 +371,23 @@ class CourtActionsMixin:
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days)
 
-        # Get all reservations in date range
-        reservations = court.reservations.filter(
-            date__range=[start_date, end_date], status="confirmed"
+        matrix = OccupancyEngine(court.club, courts=[court]).compute(
+            start_date, end_date
         )
-
-        # Calculate total available hours
-        total_hours = 0
-        current_date = start_date
-
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-            schedule = court.club.schedules.filter(weekday=weekday).first()
-
-            if schedule and not schedule.is_closed:
-                opening = datetime.combine(current_date, schedule.opening_time)
-                closing = datetime.combine(current_date, schedule.closing_time)
-                daily_hours = (closing - opening).seconds / 3600
-                total_hours += daily_hours
-
-            current_date += timedelta(days=1)
-
-        # Calculate occupied hours
-        occupied_hours = sum(
-            [
-                (
-                    datetime.combine(r.date, r.end_time)
-                    - datetime.combine(r.date, r.start_time)
-                ).seconds
-                / 3600
-                for r in reservations
-            ]
-        )
-
-        occupancy_rate = (occupied_hours / total_hours * 100) if total_hours > 0 else 0
+        total_hours = matrix.available_hours()
+        occupied_hours = matrix.occupied_hours()
+        occupancy_rate = matrix.occupancy_rate()
 
         # Daily breakdown
-        daily_stats = []
-        current_date = start_date
-
-        while current_date <= end_date:
-            daily_reservations = reservations.filter(date=current_date)
-            daily_hours = sum(
-                [
-                    (
-                        datetime.combine(r.date, r.end_time)
-                        - datetime.combine(r.date, r.start_time)
-                    ).seconds
-                    / 3600
-                    for r in daily_reservations
-                ]
-            )
-
-            daily_stats.append(
-                {
-                    "date": current_date.isoformat(),
-                    "reservations_count": daily_reservations.count(),
-                    "occupied_hours": daily_hours,
-                    "revenue": float(daily_hours * court.price_per_hour),
-                }
-            )
-
-            current_date += timedelta(days=1)
+        daily_stats = [
+            {
+                "date": day["date"].isoformat(),
+                "reservations_count": day["reservations"],
+                "occupied_hours": day["occupied_hours"],
+                "revenue": day["occupied_hours"] * float(court.price_per_hour),
+            }
+            for day in matrix.by_day()
+        ]
 
         return Response(
             {
@@ -446,8 +402,8 @@ class CourtActionsMixin:
                     "total_available_hours": round(total_hours, 1),
                     "total_occupied_hours": round(occupied_hours, 1),
                     "occupancy_rate": round(occupancy_rate, 1),
-                    "total_reservations": reservations.count(),
-                    "total_revenue": float(occupied_hours * court.price_per_hour),
+                    "total_reservations": matrix.reservation_count(),
+                    "total_revenue": occupied_hours * float(court.price_per_hour),
                 },
                 "daily_breakdown": daily_stats[-7:],  # Last 7 days for brevity
             }
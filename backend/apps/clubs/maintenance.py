@@ -0,0 +1,226 @@
+"""
+Bulk generation of scheduled maintenance records.
+
+``MaintenanceGenerator`` expands the occurrences of every active
+auto-generating ``MaintenanceSchedule`` of a club in memory, across its
+courts and each schedule's horizon. It diffs them against the open records
+already there with one query, inserts the missing ones with one
+``bulk_create`` and flags the new records that overlap confirmed or pending
+reservations, found with one more query. Schedules remember how far they
+generated, the date of the last occurrence, so the nightly run continues
+the cadence and only adds the new tail of the horizon.
+
+Usage:
+    result = MaintenanceGenerator(club).run()
+    result["records"], result["conflicts"]
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.conditional import bump_resource_version, tracked_update
+
+from .models import Court, MaintenanceRecord, MaintenanceSchedule
+from .sync import record_changes
+
+logger = logging.getLogger(__name__)
+
+# Records that an identical occurrence must not duplicate
+OPEN_STATUSES = ("scheduled", "in_progress")
+
+# Reservations a maintenance window should not overlap
+ACTIVE_RESERVATION_STATUSES = ("pending", "confirmed")
+
+
+class MaintenanceGenerator:
+    """Generate the missing maintenance records of a club's schedules."""
+
+    def __init__(
+        self,
+        club,
+        schedules: Optional[Iterable[MaintenanceSchedule]] = None,
+        today: Optional[date] = None,
+    ):
+        self.club = club
+        if schedules is None:
+            schedules = club.maintenance_schedules.filter(
+                is_active=True, auto_generate=True
+            ).select_related("maintenance_type")
+        self.schedules = [schedule for schedule in schedules if schedule.auto_generate]
+        self.today = today or timezone.localdate()
+        self.last_occurrences = {}
+
+    def _occurrences(self, schedule: MaintenanceSchedule, days_ahead=None) -> List[date]:
+        target_date = self.today + timedelta(
+            days=days_ahead or schedule.generate_days_ahead
+        )
+        if schedule.end_date:
+            target_date = min(target_date, schedule.end_date)
+
+        if schedule.last_generated_date:
+            # Resume the cadence after the last occurrence generated
+            current_date = schedule.get_next_occurrence_date(schedule.last_generated_date)
+        else:
+            current_date = schedule.start_date
+            if schedule.frequency == "weekly" and schedule.preferred_weekday is not None:
+                # Start on the preferred weekday rather than on the start date
+                current_date += timedelta(
+                    days=(schedule.preferred_weekday - current_date.weekday()) % 7
+                )
+
+        dates = []
+        while current_date <= target_date:
+            if current_date >= self.today:
+                dates.append(current_date)
+            current_date = schedule.get_next_occurrence_date(current_date)
+        return dates
+
+    def _build(self, days_ahead=None) -> List[MaintenanceRecord]:
+        """Unsaved records for every occurrence x court, duplicates removed."""
+        courts = None
+        records, seen = [], set()
+        for schedule in self.schedules:
+            if schedule.court_id:
+                court_ids = [schedule.court_id]
+            else:
+                if courts is None:
+                    courts = list(
+                        Court.objects.filter(club=self.club, is_active=True).values_list(
+                            "id", flat=True
+                        )
+                    )
+                court_ids = courts
+
+            duration = timedelta(hours=float(schedule.duration_hours))
+            maintenance_type = schedule.maintenance_type
+            occurrences = self._occurrences(schedule, days_ahead)
+            if occurrences:
+                self.last_occurrences[schedule.pk] = occurrences[-1]
+            for day in occurrences:
+                scheduled_date = timezone.make_aware(
+                    datetime.combine(day, schedule.preferred_time)
+                )
+                for court_id in court_ids:
+                    key = (court_id, scheduled_date)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    records.append(
+                        MaintenanceRecord(
+                            club_id=self.club.id,
+                            court_id=court_id,
+                            organization_id=schedule.organization_id,
+                            maintenance_type=maintenance_type,
+                            scheduled_date=scheduled_date,
+                            scheduled_end_date=scheduled_date + duration,
+                            title=schedule.title,
+                            description=schedule.description,
+                            estimated_cost=(
+                                maintenance_type.estimated_cost if maintenance_type else 0
+                            ),
+                            assigned_to_id=schedule.default_assigned_to_id,
+                            created_by_id=schedule.created_by_id,
+                        )
+                    )
+        return records
+
+    def _existing(self, records: List[MaintenanceRecord]) -> set:
+        if not records:
+            return set()
+        dates = [record.scheduled_date for record in records]
+        return set(
+            MaintenanceRecord.objects.filter(
+                club=self.club,
+                status__in=OPEN_STATUSES,
+                scheduled_date__range=(min(dates), max(dates)),
+            ).values_list("court_id", "scheduled_date")
+        )
+
+    def _flag_conflicts(self, records: List[MaintenanceRecord]) -> List[Dict]:
+        """Note overlapping reservations on the new records before they are saved."""
+        from apps.reservations.models import Reservation
+
+        if not records:
+            return []
+
+        windows = defaultdict(list)
+        for record in records:
+            start = timezone.localtime(record.scheduled_date)
+            end = timezone.localtime(record.scheduled_end_date)
+            windows[(record.court_id, start.date())].append((record, start, end))
+
+        day_list = [day for _, day in windows]
+        reservations = Reservation.objects.filter(
+            club=self.club,
+            court_id__in={court_id for court_id, _ in windows},
+            date__range=(min(day_list), max(day_list)),
+            status__in=ACTIVE_RESERVATION_STATUSES,
+        ).values_list("id", "court_id", "date", "start_time", "end_time")
+
+        conflicts = []
+        tz = timezone.get_current_timezone()
+        for reservation_id, court_id, day, start_time, end_time in reservations:
+            reserved_start = datetime.combine(day, start_time, tzinfo=tz)
+            reserved_end = datetime.combine(day, end_time, tzinfo=tz)
+            for record, start, end in windows.get((court_id, day), []):
+                if reserved_start < end and start < reserved_end:
+                    conflicts.append(
+                        {"record": record, "reservation_id": reservation_id}
+                    )
+
+        by_record = defaultdict(int)
+        for conflict in conflicts:
+            by_record[conflict["record"]] += 1
+        for record, count in by_record.items():
+            record.additional_notes = (
+                f"Se traslapa con {count} reserva(s) existente(s)"
+            )
+        return conflicts
+
+    def _update_court_flags(self, records: List[MaintenanceRecord]):
+        # Same rule as MaintenanceRecord._update_court_maintenance_status
+        soon = timezone.now() + timedelta(hours=24)
+        court_ids = {record.court_id for record in records if record.scheduled_date <= soon}
+        if court_ids:
+            # Plain update() would leave the Court ETags stale
+            tracked_update(
+                Court.objects.filter(id__in=court_ids, is_maintenance=False),
+                is_maintenance=True,
+            )
+            # update() skips the post_save signal that feeds offline sync
+            record_changes(self.club.id, "court", court_ids)
+
+    def run(self, days_ahead=None) -> Dict:
+        candidates = self._build(days_ahead)
+        existing = self._existing(candidates)
+        records = [
+            record
+            for record in candidates
+            if (record.court_id, record.scheduled_date) not in existing
+        ]
+        conflicts = self._flag_conflicts(records)
+
+        with transaction.atomic():
+            MaintenanceRecord.objects.bulk_create(records)
+            if records:
+                bump_resource_version("clubs.MaintenanceRecord")
+            for schedule in self.schedules:
+                schedule.last_generated_date = self.last_occurrences.get(
+                    schedule.pk, schedule.last_generated_date
+                )
+            MaintenanceSchedule.objects.bulk_update(
+                self.schedules, ["last_generated_date"]
+            )
+            self._update_court_flags(records)
+
+        if conflicts:
+            logger.warning(
+                f"Generated maintenance overlaps {len(conflicts)} reservations "
+                f"in club {self.club.id}"
+            )
+        return {"records": records, "conflicts": conflicts}
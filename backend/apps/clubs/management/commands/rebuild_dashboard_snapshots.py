@@ -0,0 +1,29 @@
+"""
+Django management command to rebuild club dashboard snapshots.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.clubs.models import Club
+from apps.clubs.snapshots import ClubSnapshotService
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the dashboard snapshots of all active clubs from raw data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--club",
+            action="append",
+            dest="clubs",
+            help="Only rebuild the club with this slug (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        club_ids = None
+        if options["clubs"]:
+            club_ids = list(
+                Club.objects.filter(slug__in=options["clubs"]).values_list("id", flat=True)
+            )
+        rebuilt = ClubSnapshotService.reconcile(club_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} dashboard snapshots"))
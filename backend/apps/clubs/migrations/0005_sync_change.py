@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_add_advanced_club_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_changes', to='clubs.club')),
+                ('entity', models.CharField(choices=[('club', 'Club'), ('court', 'Cancha'), ('schedule', 'Horario'), ('pricing', 'Precio especial'), ('reservation', 'Reserva'), ('announcement', 'Anuncio')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['club', 'id'], name='clubs_syncc_club_id_9f5457_idx'),
+        ),
+    ]
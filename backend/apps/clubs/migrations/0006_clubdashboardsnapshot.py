@@ -0,0 +1,61 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_sync_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubDashboardSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('club', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshot', to='clubs.club')),
+                ('day', models.DateField()),
+                ('rebuilt_at', models.DateTimeField()),
+                ('today_reservations', models.IntegerField(default=0)),
+                ('today_booked_minutes', models.IntegerField(default=0)),
+                ('today_capacity_minutes', models.IntegerField(default=0)),
+                ('today_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('today_payments', models.IntegerField(default=0)),
+                ('month_reservations', models.IntegerField(default=0)),
+                ('month_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('active_members', models.IntegerField(default=0)),
+                ('active_courts', models.IntegerField(default=0)),
+                ('yesterday_reservations', models.IntegerField(default=0)),
+                ('yesterday_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('last_7_days_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('last_30_days_reservations', models.IntegerField(default=0)),
+                ('last_30_days_confirmed', models.IntegerField(default=0)),
+                ('last_30_days_cancelled', models.IntegerField(default=0)),
+                ('last_30_days_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('last_30_days_payments', models.IntegerField(default=0)),
+                ('last_month_reservations', models.IntegerField(default=0)),
+                ('last_month_booked_minutes', models.IntegerField(default=0)),
+                ('last_month_capacity_minutes', models.IntegerField(default=0)),
+                ('last_month_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('last_month_members', models.IntegerField(default=0)),
+                ('recent_players', models.IntegerField(default=0)),
+                ('new_recent_players', models.IntegerField(default=0)),
+                ('top_courts', models.JSONField(default=list)),
+                ('top_clients', models.JSONField(default=list)),
+                ('court_usage', models.JSONField(default=list)),
+                ('upcoming_reservations', models.JSONField(default=list)),
+                ('recent_activity', models.JSONField(default=list)),
+                ('recent_reservations', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-19 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('clubs', '0006_clubdashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncchange',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
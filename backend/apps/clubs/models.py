@@ -392,16 +392,27 @@ class Court(BaseModel):
     def __str__(self):
         return f"{self.club.name} - Cancha {self.number}"
     
-    def get_effective_price(self, date_time=None, is_member=False):
-        """Calculate effective price considering dynamic pricing and special pricing."""
+    def get_effective_price(self, date_time=None, is_member=False, special_pricing=None):
+        """
+        Calculate effective price considering dynamic pricing and special pricing.
+
+        ``special_pricing`` may hold this court's active pricing periods,
+        already loaded in priority order, to skip the lookup query.
+        """
         if not date_time:
             from django.utils import timezone
             date_time = timezone.now()
         
         # Check for special pricing first
-        special_price = CourtSpecialPricing.get_effective_price_for_court_datetime(
-            self, date_time.date(), date_time.time()
-        )
+        if special_pricing is None:
+            special_price = CourtSpecialPricing.get_effective_price_for_court_datetime(
+                self, date_time.date(), date_time.time()
+            )
+        else:
+            period = CourtSpecialPricing.first_applicable(
+                special_pricing, date_time.date(), date_time.time()
+            )
+            special_price = period.price_per_hour if period else self.price_per_hour
         if special_price != self.price_per_hour:
             return special_price
         
@@ -424,38 +435,15 @@ class Court(BaseModel):
     
     def get_utilization_rate(self, start_date=None, end_date=None):
         """Calculate court utilization rate for a period."""
+        from .occupancy import OccupancyEngine
+
         if not start_date:
             from datetime import date, timedelta
             end_date = date.today()
             start_date = end_date - timedelta(days=30)
         
-        try:
-            from apps.reservations.models import Reservation
-            
-            # Total possible hours (assuming 12 hours/day operation)
-            total_days = (end_date - start_date).days + 1
-            total_possible_hours = total_days * 12
-            
-            # Calculate actual booked hours
-            reservations = Reservation.objects.filter(
-                court=self,
-                date__gte=start_date,
-                date__lte=end_date,
-                status__in=['confirmed', 'completed']
-            )
-            
-            total_booked_minutes = sum(
-                (r.end_time.hour * 60 + r.end_time.minute) - 
-                (r.start_time.hour * 60 + r.start_time.minute)
-                for r in reservations
-            )
-            
-            total_booked_hours = total_booked_minutes / 60
-            utilization = (total_booked_hours / total_possible_hours) * 100 if total_possible_hours > 0 else 0
-            
-            return round(utilization, 2)
-        except ImportError:
-            return 0
+        matrix = OccupancyEngine(self.club, courts=[self]).compute(start_date, end_date)
+        return round(matrix.occupancy_rate(), 2)
     
     def update_utilization_rate(self):
         """Update the stored utilization rate."""
@@ -717,7 +705,14 @@ class CourtSpecialPricing(BaseModel):
             end_date__gte=date
         ).order_by('-priority', '-created_at')
 
-        # Find the first (highest priority) applicable period
+        return cls.first_applicable(pricing_periods, date, time)
+
+    @staticmethod
+    def first_applicable(pricing_periods, date, time=None):
+        """
+        Return the first period in ``pricing_periods`` (highest priority
+        first) that applies to the given date and time, or None.
+        """
         for period in pricing_periods:
             if period.is_applicable_for_datetime(date, time):
                 return period
@@ -1212,59 +1207,106 @@ class MaintenanceSchedule(BaseModel):
     
     def generate_maintenance_records(self, days_ahead=None):
         """Generate maintenance records based on this schedule."""
-        from datetime import date, datetime, timedelta
-        from django.utils import timezone
+        from .maintenance import MaintenanceGenerator
         
         if not self.auto_generate:
             return []
         
-        days_ahead = days_ahead or self.generate_days_ahead
-        target_date = date.today() + timedelta(days=days_ahead)
-        
-        # Start from last generated date or start date
-        current_date = self.last_generated_date or self.start_date
-        if current_date < date.today():
-            current_date = date.today()
-        
-        generated_records = []
-        
-        while current_date <= target_date:
-            if self.end_date and current_date > self.end_date:
-                break
-            
-            # Check if record already exists
-            scheduled_datetime = timezone.make_aware(
-                datetime.combine(current_date, self.preferred_time)
-            )
-            
-            courts_to_schedule = [self.court] if self.court else self.club.courts.filter(is_active=True)
-            
-            for court in courts_to_schedule:
-                if not MaintenanceRecord.objects.filter(
-                    court=court,
-                    scheduled_date=scheduled_datetime,
-                    status__in=["scheduled", "in_progress"]
-                ).exists():
-                    
-                    record = MaintenanceRecord.objects.create(
-                        club=self.club,
-                        court=court,
-                        organization=self.organization,
-                        maintenance_type=self.maintenance_type,
-                        scheduled_date=scheduled_datetime,
-                        scheduled_end_date=scheduled_datetime + timedelta(hours=float(self.duration_hours)),
-                        title=self.title,
-                        description=self.description,
-                        estimated_cost=self.maintenance_type.estimated_cost if self.maintenance_type else 0,
-                        assigned_to=self.default_assigned_to,
-                        created_by=self.created_by,
-                    )
-                    generated_records.append(record)
-            
-            current_date = self.get_next_occurrence_date(current_date)
-        
-        # Update last generated date
-        self.last_generated_date = target_date
-        self.save(update_fields=["last_generated_date"])
-        
-        return generated_records
+        generator = MaintenanceGenerator(self.club, schedules=[self])
+        return generator.run(days_ahead)["records"]
+
+
+class SyncChange(models.Model):
+    """
+    Append-only change log behind the offline sync feed.
+
+    Not a BaseModel: the auto-incrementing id is the sequence number clients
+    hold as their sync cursor, so it has to be monotonically increasing.
+    """
+
+    ENTITIES = [
+        ("club", "Club"),
+        ("court", "Cancha"),
+        ("schedule", "Horario"),
+        ("pricing", "Precio especial"),
+        ("reservation", "Reserva"),
+        ("announcement", "Anuncio"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    club = models.ForeignKey(
+        Club, on_delete=models.CASCADE, related_name="sync_changes"
+    )
+    entity = models.CharField(max_length=20, choices=ENTITIES)
+    object_id = models.UUIDField()
+    deleted = models.BooleanField(default=False)
+    # Owner of a per-user object (reservations); only their feed sees the change
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["club", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.club_id} #{self.id} {self.entity} {self.object_id}"
+
+
+class ClubDashboardSnapshot(BaseModel):
+    """
+    Denormalized dashboard figures of one club (see ``apps.clubs.snapshots``).
+
+    ``day`` is the day the live counters belong to. Reservation, payment and
+    client saves adjust them with atomic increments; the trailing windows
+    (yesterday, last 7/30 days, last month) end the day before ``day`` and
+    are recomputed when the snapshot is rebuilt.
+    """
+
+    club = models.OneToOneField(
+        Club, on_delete=models.CASCADE, related_name="dashboard_snapshot"
+    )
+    day = models.DateField()
+    rebuilt_at = models.DateTimeField()
+
+    # Live counters
+    today_reservations = models.IntegerField(default=0)
+    today_booked_minutes = models.IntegerField(default=0)
+    today_capacity_minutes = models.IntegerField(default=0)
+    today_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    today_payments = models.IntegerField(default=0)
+    month_reservations = models.IntegerField(default=0)
+    month_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    active_members = models.IntegerField(default=0)
+    active_courts = models.IntegerField(default=0)
+
+    # Trailing windows
+    yesterday_reservations = models.IntegerField(default=0)
+    yesterday_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_7_days_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_30_days_reservations = models.IntegerField(default=0)
+    last_30_days_confirmed = models.IntegerField(default=0)
+    last_30_days_cancelled = models.IntegerField(default=0)
+    last_30_days_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_30_days_payments = models.IntegerField(default=0)
+    last_month_reservations = models.IntegerField(default=0)
+    last_month_booked_minutes = models.IntegerField(default=0)
+    last_month_capacity_minutes = models.IntegerField(default=0)
+    last_month_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_month_members = models.IntegerField(default=0)
+    recent_players = models.IntegerField(default=0)
+    new_recent_players = models.IntegerField(default=0)
+    top_courts = models.JSONField(default=list)
+    top_clients = models.JSONField(default=list)
+    court_usage = models.JSONField(default=list)
+
+    # Feeds, refreshed once the transaction of each event commits
+    upcoming_reservations = models.JSONField(default=list)
+    recent_activity = models.JSONField(default=list)
+    recent_reservations = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"Snapshot {self.club_id} - {self.day}"
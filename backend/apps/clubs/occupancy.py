@@ -0,0 +1,317 @@
+"""
+Schedule-aware court occupancy.
+
+Every occupancy figure (court utilization, the court occupancy action,
+revenue utilization reports, dashboard rates) is derived from one
+``OccupancyMatrix``: minutes of capacity and minutes occupied per
+court x day x hour, held in NumPy arrays.
+
+Capacity comes from the club's weekly ``Schedule`` (falling back to the
+club's opening hours for weekdays without a row) minus ``BlockedSlot``
+blocks and maintenance windows. Occupied minutes come from reservations
+grouped by court, date and time range. Besides the club's courts and
+schedules (prefetched on most callers), a matrix costs two queries: one
+for the exclusions and one for the reservations, whatever the length of
+the period.
+
+Usage:
+    matrix = OccupancyEngine(club).compute(start_date, end_date)
+    matrix.occupancy_rate()
+    matrix.weekday_hour_heatmap()
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from django.db.models import Count, DecimalField, Q, Value
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+HOURS = 24
+
+# Reservation statuses that hold a court
+OCCUPIED_STATUSES = ("confirmed", "completed")
+
+# Maintenance statuses that take a court out of service
+BLOCKING_MAINTENANCE_STATUSES = ("scheduled", "in_progress", "completed")
+
+# Maintenance without an end date or a type is assumed to last this long
+DEFAULT_MAINTENANCE_HOURS = Decimal("1")
+
+
+def _minutes(value) -> int:
+    if isinstance(value, str):
+        # Unsaved model defaults such as Club.opening_time="07:00"
+        value = time.fromisoformat(value)
+    return value.hour * 60 + value.minute
+
+
+def _hour_overlap(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Minutes of each [start, end) range falling in each hour, shape (N, 24)."""
+    hour_starts = np.arange(HOURS) * 60
+    overlap = np.minimum(ends[:, None], hour_starts + 60) - np.maximum(
+        starts[:, None], hour_starts
+    )
+    return np.clip(overlap, 0, 60)
+
+
+def _rate(occupied, capacity) -> float:
+    return float(occupied) / float(capacity) * 100 if capacity else 0.0
+
+
+class OccupancyMatrix:
+    """Capacity and occupied minutes per court x day x hour."""
+
+    def __init__(
+        self,
+        court_ids: List,
+        dates: List[date],
+        capacity: np.ndarray,
+        occupied: np.ndarray,
+        reservations: np.ndarray,
+    ):
+        self.court_ids = court_ids
+        self.dates = dates
+        self.capacity = capacity
+        self.occupied = occupied
+        self.reservations = reservations
+        self._court_index = {court_id: i for i, court_id in enumerate(court_ids)}
+
+    def _select(self, court_id=None):
+        if court_id is None:
+            return slice(None)
+        return self._court_index[court_id]
+
+    def available_hours(self, court_id=None) -> float:
+        return float(self.capacity[self._select(court_id)].sum()) / 60
+
+    def occupied_hours(self, court_id=None) -> float:
+        return float(self.occupied[self._select(court_id)].sum()) / 60
+
+    def reservation_count(self, court_id=None) -> int:
+        return int(self.reservations[self._select(court_id)].sum())
+
+    def occupancy_rate(self, court_id=None) -> float:
+        """Occupied over available minutes, as a percentage."""
+        index = self._select(court_id)
+        return _rate(self.occupied[index].sum(), self.capacity[index].sum())
+
+    def by_court(self) -> Dict:
+        capacity = self.capacity.sum(axis=(1, 2))
+        occupied = self.occupied.sum(axis=(1, 2))
+        reservations = self.reservations.sum(axis=1)
+        return {
+            court_id: {
+                "available_hours": float(capacity[i]) / 60,
+                "occupied_hours": float(occupied[i]) / 60,
+                "reservations": int(reservations[i]),
+                "occupancy_rate": _rate(occupied[i], capacity[i]),
+            }
+            for i, court_id in enumerate(self.court_ids)
+        }
+
+    def by_day(self, court_id=None) -> List[Dict]:
+        index = self._select(court_id)
+        capacity = self.capacity[index].reshape(-1, len(self.dates), HOURS).sum(axis=(0, 2))
+        occupied = self.occupied[index].reshape(-1, len(self.dates), HOURS).sum(axis=(0, 2))
+        reservations = self.reservations[index].reshape(-1, len(self.dates)).sum(axis=0)
+        return [
+            {
+                "date": day,
+                "available_hours": float(capacity[i]) / 60,
+                "occupied_hours": float(occupied[i]) / 60,
+                "reservations": int(reservations[i]),
+                "occupancy_rate": _rate(occupied[i], capacity[i]),
+            }
+            for i, day in enumerate(self.dates)
+        ]
+
+    def weekday_hour_heatmap(self) -> np.ndarray:
+        """Occupancy percentage per weekday (0=Monday) x hour, shape (7, 24)."""
+        weekdays = np.array([day.weekday() for day in self.dates], dtype=np.int64)
+        capacity = np.zeros((7, HOURS), dtype=np.int64)
+        occupied = np.zeros((7, HOURS), dtype=np.int64)
+        np.add.at(capacity, weekdays, self.capacity.sum(axis=0))
+        np.add.at(occupied, weekdays, self.occupied.sum(axis=0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            heatmap = np.where(capacity > 0, occupied / capacity * 100, 0.0)
+        return heatmap
+
+
+class OccupancyEngine:
+    """Build occupancy matrices for the courts of one club."""
+
+    def __init__(
+        self,
+        club,
+        courts: Optional[Iterable] = None,
+        statuses: Iterable[str] = OCCUPIED_STATUSES,
+    ):
+        self.club = club
+        if courts is None:
+            # Uses prefetched courts when the caller has them
+            courts = [court for court in club.courts.all() if court.is_active]
+        self.court_ids = [court.id for court in courts]
+        self._court_index = {court_id: i for i, court_id in enumerate(self.court_ids)}
+        self.statuses = tuple(statuses)
+
+    def _open_masks(self) -> np.ndarray:
+        """Minute-level opening mask per weekday, shape (7, 1440)."""
+        club = self.club
+        masks = np.zeros((7, MINUTES_PER_DAY), dtype=bool)
+        scheduled = set()
+        for schedule in club.schedules.all():
+            scheduled.add(schedule.weekday)
+            if not schedule.is_closed:
+                masks[
+                    schedule.weekday,
+                    _minutes(schedule.opening_time) : _minutes(schedule.closing_time),
+                ] = True
+
+        days_open = set(club.days_open or range(7))
+        for weekday in set(range(7)) - scheduled:
+            if weekday in days_open:
+                masks[
+                    weekday,
+                    _minutes(club.opening_time) : _minutes(club.closing_time),
+                ] = True
+        return masks
+
+    def _exclusions(self, start: datetime, end: datetime):
+        """Blocked slots and maintenance windows overlapping [start, end), one query."""
+        from apps.reservations.models import BlockedSlot
+
+        from .models import MaintenanceRecord
+
+        no_duration = Value(None, output_field=DecimalField(max_digits=5, decimal_places=2))
+        blocked = (
+            BlockedSlot.objects.filter(
+                club_id=self.club.id, start_datetime__lt=end, end_datetime__gt=start
+            )
+            .annotate(duration=no_duration)
+            .order_by()
+            .values_list("court_id", "start_datetime", "end_datetime", "duration")
+        )
+        maintenance = (
+            MaintenanceRecord.objects.filter(
+                court_id__in=self.court_ids,
+                status__in=BLOCKING_MAINTENANCE_STATUSES,
+                scheduled_date__lt=end,
+            )
+            .filter(
+                Q(scheduled_end_date__gt=start)
+                | Q(
+                    scheduled_end_date__isnull=True,
+                    scheduled_date__gte=start - timedelta(days=1),
+                )
+            )
+            .order_by()
+            .values_list(
+                "court_id",
+                "scheduled_date",
+                "scheduled_end_date",
+                "maintenance_type__estimated_duration_hours",
+            )
+        )
+
+        for court_id, block_start, block_end, duration in blocked.union(
+            maintenance, all=True
+        ):
+            if block_end is None:
+                hours = duration or DEFAULT_MAINTENANCE_HOURS
+                block_end = block_start + timedelta(hours=float(hours))
+            yield court_id, block_start, block_end
+
+    def _apply_exclusions(self, capacity, masks, start_date, start, end):
+        num_days = capacity.shape[1]
+        blocked_minutes = defaultdict(list)
+        for court_id, block_start, block_end in self._exclusions(start, end):
+            if court_id is None:
+                courts = range(len(self.court_ids))
+            elif court_id in self._court_index:
+                courts = [self._court_index[court_id]]
+            else:
+                continue
+
+            local_start = timezone.localtime(max(block_start, start))
+            local_end = timezone.localtime(min(block_end, end))
+            day = local_start.date()
+            while day <= local_end.date():
+                day_index = (day - start_date).days
+                if 0 <= day_index < num_days:
+                    first = _minutes(local_start.time()) if day == local_start.date() else 0
+                    last = (
+                        _minutes(local_end.time())
+                        if day == local_end.date()
+                        else MINUTES_PER_DAY
+                    )
+                    for court_index in courts:
+                        blocked_minutes[(court_index, day_index)].append((first, last))
+                day += timedelta(days=1)
+
+        for (court_index, day_index), ranges in blocked_minutes.items():
+            day = start_date + timedelta(days=day_index)
+            mask = masks[day.weekday()].copy()
+            for first, last in ranges:
+                mask[first:last] = False
+            capacity[court_index, day_index] = mask.reshape(HOURS, 60).sum(axis=1)
+
+    def _occupied(self, occupied, reservations, start_date, end_date):
+        """Reservation minutes grouped by court, date and time range, one query."""
+        from apps.reservations.models import Reservation
+
+        rows = list(
+            Reservation.objects.filter(
+                club_id=self.club.id,
+                court_id__in=self.court_ids,
+                date__range=(start_date, end_date),
+                status__in=self.statuses,
+            )
+            .order_by()
+            .values_list("court_id", "date", "start_time", "end_time")
+            .annotate(count=Count("id"))
+        )
+        if not rows:
+            return
+
+        court_index = np.array([self._court_index[row[0]] for row in rows])
+        day_index = np.array([(row[1] - start_date).days for row in rows])
+        starts = np.array([_minutes(row[2]) for row in rows])
+        ends = np.array([_minutes(row[3]) for row in rows])
+        counts = np.array([row[4] for row in rows])
+
+        np.add.at(
+            occupied,
+            (court_index, day_index),
+            _hour_overlap(starts, ends) * counts[:, None],
+        )
+        np.add.at(reservations, (court_index, day_index), counts)
+
+    def compute(self, start_date: date, end_date: date) -> OccupancyMatrix:
+        """Matrix for every day from ``start_date`` to ``end_date`` inclusive."""
+        num_days = max((end_date - start_date).days + 1, 0)
+        dates = [start_date + timedelta(days=i) for i in range(num_days)]
+        shape = (len(self.court_ids), num_days)
+
+        masks = self._open_masks()
+        weekday_capacity = masks.reshape(7, HOURS, 60).sum(axis=2)
+        weekdays = np.array([day.weekday() for day in dates], dtype=np.int64)
+        capacity = np.broadcast_to(
+            weekday_capacity[weekdays], shape + (HOURS,)
+        ).astype(np.int64)
+        occupied = np.zeros(shape + (HOURS,), dtype=np.int64)
+        reservations = np.zeros(shape, dtype=np.int64)
+
+        if self.court_ids and num_days:
+            start = timezone.make_aware(datetime.combine(start_date, time.min))
+            end = timezone.make_aware(
+                datetime.combine(end_date + timedelta(days=1), time.min)
+            )
+            self._apply_exclusions(capacity, masks, start_date, start, end)
+            self._occupied(occupied, reservations, start_date, end_date)
+
+        return OccupancyMatrix(self.court_ids, dates, capacity, occupied, reservations)
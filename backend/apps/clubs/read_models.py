@@ -0,0 +1,273 @@
+"""
+Batched read model for court serializers.
+
+``CourtDetailSerializer`` reports maintenance state, 30-day occupancy and
+revenue per court, and ``CourtMobileSerializer`` the current effective
+price. Computed one court at a time those cost several queries per row;
+``CourtReadModel`` computes them for a whole page of courts with a handful
+of grouped queries (conditional aggregates per court, one fetch of the
+live maintenance records, one fetch of the special pricing periods) and the
+serializers read the results from their context.
+
+Each section is loaded on first use, so a serializer that only needs the
+price does not pay for the maintenance queries.
+
+Usage:
+    read_model = CourtReadModel(page)
+    CourtDetailSerializer(page, many=True, context={"court_read_model": read_model})
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.db import models
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import Court, CourtSpecialPricing, MaintenanceRecord
+
+# Same approximation as the per-court calculation: 14 hours a day for 30 days
+OCCUPANCY_WINDOW_DAYS = 30
+OCCUPANCY_DAILY_HOURS = 14
+HISTORY_WINDOW_DAYS = 180
+UPCOMING_WINDOW_DAYS = 30
+UPCOMING_LIMIT = 5
+TOP_CATEGORIES = 3
+
+CONTEXT_KEY = "court_read_model"
+
+
+class CourtReadModel:
+    """Per-court serializer values computed for a batch of courts."""
+
+    def __init__(self, courts: Iterable[Court], now: Optional[datetime] = None):
+        self.courts = list(courts)
+        self.court_ids = {court.id for court in self.courts}
+        self.now = now or timezone.now()
+
+    @classmethod
+    def from_context(cls, context: Dict, court: Court) -> "CourtReadModel":
+        """
+        Return the read model handed in through serializer ``context``, or a
+        single-court one when ``court`` is not part of it. The fallback is
+        kept in the context so the fields of one row share it.
+        """
+        read_model = context.get(CONTEXT_KEY)
+        if read_model is None or court.id not in read_model.court_ids:
+            read_model = context[CONTEXT_KEY] = cls([court])
+        return read_model
+
+    # Maintenance
+
+    @cached_property
+    def _maintenance_totals(self) -> Dict:
+        history_start = self.now - timedelta(days=HISTORY_WINDOW_DAYS)
+        completed = Q(status="completed")
+        recent = completed & Q(completed_at__gte=history_start)
+        rows = (
+            MaintenanceRecord.objects.filter(court_id__in=self.court_ids)
+            .order_by()
+            .values("court_id")
+            .annotate(
+                last_completed=Max("completed_at", filter=completed),
+                next_scheduled=Min(
+                    "scheduled_date",
+                    filter=Q(status="scheduled", scheduled_date__gte=self.now),
+                ),
+                completed_count=Count("id", filter=recent),
+                average_rating=Avg("quality_rating", filter=recent),
+            )
+        )
+        return {row["court_id"]: row for row in rows}
+
+    @cached_property
+    def _maintenance_categories(self) -> Dict:
+        rows = (
+            MaintenanceRecord.objects.filter(
+                court_id__in=self.court_ids,
+                status="completed",
+                completed_at__gte=self.now - timedelta(days=HISTORY_WINDOW_DAYS),
+            )
+            .order_by()
+            .values("court_id", "maintenance_type__category")
+            .annotate(count=Count("id"))
+            .order_by("court_id", "-count")
+        )
+        categories = defaultdict(list)
+        for row in rows:
+            court_categories = categories[row["court_id"]]
+            if len(court_categories) < TOP_CATEGORIES:
+                court_categories.append(
+                    {
+                        "category": row["maintenance_type__category"],
+                        "count": row["count"],
+                    }
+                )
+        return categories
+
+    @cached_property
+    def _live_maintenance(self) -> Dict[object, List[MaintenanceRecord]]:
+        """In-progress records plus those scheduled from today to the window end."""
+        today_start = timezone.make_aware(
+            datetime.combine(timezone.localdate(self.now), time.min)
+        )
+        records = (
+            MaintenanceRecord.objects.filter(court_id__in=self.court_ids)
+            .filter(
+                Q(status="in_progress")
+                | Q(
+                    status="scheduled",
+                    scheduled_date__gte=today_start,
+                    scheduled_date__lte=self.now + timedelta(days=UPCOMING_WINDOW_DAYS),
+                )
+            )
+            .select_related("maintenance_type", "assigned_to")
+            .order_by("scheduled_date")
+        )
+        by_court = defaultdict(list)
+        for record in records:
+            by_court[record.court_id].append(record)
+        return by_court
+
+    def last_maintenance_date(self, court: Court) -> Optional[str]:
+        completed_at = self._maintenance_totals.get(court.id, {}).get("last_completed")
+        return completed_at.date().isoformat() if completed_at else None
+
+    def next_maintenance_date(self, court: Court) -> Optional[str]:
+        scheduled = self._maintenance_totals.get(court.id, {}).get("next_scheduled")
+        return scheduled.date().isoformat() if scheduled else None
+
+    def maintenance_status(self, court: Court) -> Dict:
+        records = self._live_maintenance.get(court.id, [])
+
+        active = [record for record in records if record.status == "in_progress"]
+        if active:
+            # Model ordering (latest scheduled first) as the per-court lookup used
+            record = active[-1]
+            return {
+                "status": "in_progress",
+                "title": record.title,
+                "started_at": record.started_at.isoformat() if record.started_at else None,
+                "estimated_completion": (
+                    record.scheduled_end_date.isoformat()
+                    if record.scheduled_end_date
+                    else None
+                ),
+                "assigned_to": (
+                    record.assigned_to.get_full_name() if record.assigned_to else None
+                ),
+            }
+
+        today = timezone.localdate(self.now)
+        scheduled_today = [
+            record
+            for record in records
+            if record.status == "scheduled"
+            and timezone.localdate(record.scheduled_date) == today
+        ]
+        if scheduled_today:
+            record = scheduled_today[-1]
+            return {
+                "status": "scheduled_today",
+                "title": record.title,
+                "scheduled_time": record.scheduled_date.time().isoformat(),
+                "assigned_to": (
+                    record.assigned_to.get_full_name() if record.assigned_to else None
+                ),
+            }
+
+        if court.is_maintenance:
+            return {
+                "status": "general_maintenance",
+                "notes": court.maintenance_notes,
+            }
+
+        return {"status": "operational"}
+
+    def upcoming_maintenance(self, court: Court) -> List[Dict]:
+        upcoming = [
+            record
+            for record in self._live_maintenance.get(court.id, [])
+            if record.status == "scheduled" and record.scheduled_date >= self.now
+        ][:UPCOMING_LIMIT]
+        return [
+            {
+                "id": str(record.id),
+                "title": record.title,
+                "scheduled_date": record.scheduled_date.isoformat(),
+                "priority": record.priority,
+                "maintenance_type": (
+                    record.maintenance_type.name if record.maintenance_type else None
+                ),
+                "estimated_duration": record.get_duration_hours(),
+            }
+            for record in upcoming
+        ]
+
+    def maintenance_history_summary(self, court: Court) -> Dict:
+        totals = self._maintenance_totals.get(court.id, {})
+        return {
+            "total_completed": totals.get("completed_count") or 0,
+            "average_quality_rating": round(totals.get("average_rating") or 0, 2),
+            "most_common_categories": self._maintenance_categories.get(court.id, []),
+        }
+
+    # Reservations
+
+    @cached_property
+    def _reservation_totals(self) -> Dict:
+        from apps.reservations.models import Reservation
+
+        since = (self.now - timedelta(days=OCCUPANCY_WINDOW_DAYS)).date()
+        rows = (
+            Reservation.objects.filter(
+                court_id__in=self.court_ids, date__gte=since, status="confirmed"
+            )
+            .order_by()
+            .values("court_id")
+            .annotate(
+                reserved=Sum(
+                    models.F("end_time") - models.F("start_time"),
+                    output_field=models.DurationField(),
+                ),
+                revenue=Sum("total_price", filter=Q(payment_status="paid")),
+            )
+        )
+        return {row["court_id"]: row for row in rows}
+
+    def occupancy_rate_last_30_days(self, court: Court) -> float:
+        reserved = self._reservation_totals.get(court.id, {}).get("reserved")
+        if not reserved:
+            return 0.0
+        available_hours = OCCUPANCY_WINDOW_DAYS * OCCUPANCY_DAILY_HOURS
+        reserved_hours = reserved.total_seconds() / 3600
+        return round((reserved_hours / available_hours) * 100, 2)
+
+    def revenue_last_30_days(self, court: Court) -> float:
+        revenue = self._reservation_totals.get(court.id, {}).get("revenue")
+        return float(revenue or 0)
+
+    # Pricing
+
+    @cached_property
+    def _special_pricing(self) -> Dict[object, List[CourtSpecialPricing]]:
+        today = self.now.date()
+        periods = CourtSpecialPricing.objects.filter(
+            court_id__in=self.court_ids,
+            is_active=True,
+            start_date__lte=today,
+            end_date__gte=today,
+        ).order_by("-priority", "-created_at")
+        by_court = defaultdict(list)
+        for period in periods:
+            by_court[period.court_id].append(period)
+        return by_court
+
+    def current_price(self, court: Court) -> float:
+        return float(
+            court.get_effective_price(
+                self.now, special_pricing=self._special_pricing.get(court.id, [])
+            )
+        )
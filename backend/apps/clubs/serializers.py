@@ -10,6 +10,7 @@ from rest_framework import serializers
 from apps.shared.validators import InputValidators, phone_regex, rfc_regex
 
 from .models import Announcement, Club, Court, Schedule, CourtSpecialPricing
+from .read_models import CourtReadModel
 
 
 class ScheduleSerializer(serializers.ModelSerializer):
@@ -259,179 +260,36 @@ class CourtDetailSerializer(CourtSerializer):
             'maintenance_history_summary',
         ]
 
+    def _read_model(self, obj):
+        return CourtReadModel.from_context(self.context, obj)
+
     def get_last_maintenance_date(self, obj):
         """Get the date of the last completed maintenance."""
-        last_maintenance = obj.maintenance_records.filter(
-            status='completed'
-        ).order_by('-completed_at').first()
-        
-        if last_maintenance:
-            return last_maintenance.completed_at.date().isoformat()
-        return None
+        return self._read_model(obj).last_maintenance_date(obj)
     
     def get_next_maintenance_date(self, obj):
         """Get the date of the next scheduled maintenance."""
-        next_maintenance = obj.maintenance_records.filter(
-            status='scheduled',
-            scheduled_date__gte=timezone.now()
-        ).order_by('scheduled_date').first()
-        
-        if next_maintenance:
-            return next_maintenance.scheduled_date.date().isoformat()
-        return None
+        return self._read_model(obj).next_maintenance_date(obj)
     
     def get_maintenance_status(self, obj):
         """Get current maintenance status with details."""
-        from django.utils import timezone
-        
-        # Check for active (in-progress) maintenance
-        active_maintenance = obj.maintenance_records.filter(
-            status='in_progress'
-        ).first()
-        
-        if active_maintenance:
-            return {
-                'status': 'in_progress',
-                'title': active_maintenance.title,
-                'started_at': active_maintenance.started_at.isoformat() if active_maintenance.started_at else None,
-                'estimated_completion': (
-                    active_maintenance.scheduled_end_date.isoformat() 
-                    if active_maintenance.scheduled_end_date else None
-                ),
-                'assigned_to': (
-                    active_maintenance.assigned_to.get_full_name() 
-                    if active_maintenance.assigned_to else None
-                ),
-            }
-        
-        # Check for scheduled maintenance today
-        today = timezone.now().date()
-        today_maintenance = obj.maintenance_records.filter(
-            status='scheduled',
-            scheduled_date__date=today
-        ).first()
-        
-        if today_maintenance:
-            return {
-                'status': 'scheduled_today',
-                'title': today_maintenance.title,
-                'scheduled_time': today_maintenance.scheduled_date.time().isoformat(),
-                'assigned_to': (
-                    today_maintenance.assigned_to.get_full_name() 
-                    if today_maintenance.assigned_to else None
-                ),
-            }
-        
-        # Check general maintenance flag
-        if obj.is_maintenance:
-            return {
-                'status': 'general_maintenance',
-                'notes': obj.maintenance_notes,
-            }
-        
-        return {
-            'status': 'operational',
-        }
+        return self._read_model(obj).maintenance_status(obj)
     
     def get_upcoming_maintenance(self, obj):
         """Get upcoming maintenance in the next 30 days."""
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        upcoming = obj.maintenance_records.filter(
-            status='scheduled',
-            scheduled_date__gte=timezone.now(),
-            scheduled_date__lte=timezone.now() + timedelta(days=30)
-        ).order_by('scheduled_date')[:5]
-        
-        return [{
-            'id': str(record.id),
-            'title': record.title,
-            'scheduled_date': record.scheduled_date.isoformat(),
-            'priority': record.priority,
-            'maintenance_type': record.maintenance_type.name if record.maintenance_type else None,
-            'estimated_duration': record.get_duration_hours(),
-        } for record in upcoming]
+        return self._read_model(obj).upcoming_maintenance(obj)
     
     def get_maintenance_history_summary(self, obj):
         """Get maintenance history summary for the last 6 months."""
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Count, Avg
-        
-        six_months_ago = timezone.now() - timedelta(days=180)
-        
-        history = obj.maintenance_records.filter(
-            status='completed',
-            completed_at__gte=six_months_ago
-        )
-        
-        summary = history.aggregate(
-            total_count=Count('id'),
-            average_rating=Avg('quality_rating')
-        )
-        
-        # Count by category
-        categories = history.values(
-            'maintenance_type__category'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        return {
-            'total_completed': summary['total_count'] or 0,
-            'average_quality_rating': round(summary['average_rating'] or 0, 2),
-            'most_common_categories': [
-                {
-                    'category': cat['maintenance_type__category'],
-                    'count': cat['count']
-                }
-                for cat in categories[:3]
-            ]
-        }
+        return self._read_model(obj).maintenance_history_summary(obj)
 
     def get_occupancy_rate_last_30_days(self, obj):
         """Calculate occupancy rate for last 30 days."""
-        from django.utils import timezone
-        from datetime import timedelta, datetime
-        
-        # Get reservations from last 30 days
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        reservations = obj.reservations.filter(
-            date__gte=thirty_days_ago.date(),
-            status='confirmed'
-        )
-        
-        # Calculate total reserved hours
-        total_reserved_hours = sum([
-            (datetime.combine(r.date, r.end_time) - datetime.combine(r.date, r.start_time)).seconds / 3600
-            for r in reservations
-        ])
-        
-        # Calculate total available hours (approximate)
-        # Assuming 14 hours per day (7 AM to 9 PM) for 30 days
-        total_available_hours = 30 * 14  # Simplified calculation
-        
-        if total_available_hours > 0:
-            return round((total_reserved_hours / total_available_hours) * 100, 2)
-        return 0.0
+        return self._read_model(obj).occupancy_rate_last_30_days(obj)
 
     def get_revenue_last_30_days(self, obj):
         """Calculate revenue for last 30 days."""
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Sum
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        # Get total revenue from reservations
-        revenue = obj.reservations.filter(
-            date__gte=thirty_days_ago.date(),
-            status='confirmed',
-            payment_status='paid'
-        ).aggregate(total=Sum('total_price'))['total'] or 0
-        
-        return float(revenue)
+        return self._read_model(obj).revenue_last_30_days(obj)
 
     def to_representation(self, instance):
         """Custom representation for CourtDetail fields."""
@@ -987,8 +845,7 @@ class CourtMobileSerializer(serializers.ModelSerializer):
     
     def get_current_price(self, obj):
         """Get current effective price."""
-        from django.utils import timezone
-        return float(obj.get_effective_price(timezone.now()))
+        return CourtReadModel.from_context(self.context, obj).current_price(obj)
     
     def get_is_weather_suitable(self, obj):
         """Check if weather is suitable (would integrate with weather API)."""
@@ -2,10 +2,14 @@
 Signals for the clubs app to maintain data consistency.
 """
 
-from django.db.models.signals import post_save, post_delete
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
-from .models import Court
+from . import snapshots
+from .models import Announcement, Club, Court, CourtSpecialPricing, Schedule
+from .snapshots import ClubSnapshotService
+from .sync import SYNCED_CLUB_FIELDS, record_change
 
 
 @receiver(post_save, sender=Court)
@@ -19,7 +23,6 @@ def update_club_court_count_on_save(sender, instance, created, **kwargs):
         club.total_courts = club.courts.filter(is_active=True).count()
         club.save(update_fields=["total_courts"])
 
-
 @receiver(post_delete, sender=Court)
 def update_club_court_count_on_delete(sender, instance, **kwargs):
     """
@@ -29,4 +32,124 @@ def update_club_court_count_on_delete(sender, instance, **kwargs):
     if instance.club_id:  # Ensure the court had a club
         club = instance.club
         club.total_courts = club.courts.filter(is_active=True).count()
-        club.save(update_fields=["total_courts"])
\ No newline at end of file
+        club.save(update_fields=["total_courts"])
+
+# Offline sync change log (see apps.clubs.sync)
+
+
+def _reservation_owner_ids(reservation):
+    """Users whose offline data holds ``reservation``."""
+    owner_ids = {reservation.created_by_id}
+    if reservation.client_profile_id:
+        try:
+            owner_ids.add(reservation.client_profile.user_id)
+        except ObjectDoesNotExist:
+            # The profile is being deleted along with the reservation
+            pass
+    return owner_ids
+
+
+def _record_sync_change(club_id, entity, instance, deleted=False):
+    # Soft-deleted rows leave the offline data like deleted ones
+    # (Announcement.is_active is a method, not the BaseModel flag)
+    deleted = deleted or getattr(instance, "is_active", True) is False
+    user_ids = _reservation_owner_ids(instance) if entity == "reservation" else None
+    record_change(club_id, entity, instance.pk, deleted=deleted, user_ids=user_ids)
+
+
+@receiver(post_save, sender=Club)
+def sync_club_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not SYNCED_CLUB_FIELDS.intersection(update_fields):
+        return
+    _record_sync_change(instance.pk, "club", instance)
+
+
+@receiver(post_save, sender=Court)
+@receiver(post_save, sender=Schedule)
+@receiver(post_save, sender=Announcement)
+@receiver(post_save, sender="reservations.Reservation")
+def sync_club_object_saved(sender, instance, **kwargs):
+    _record_sync_change(instance.club_id, sender._meta.model_name, instance)
+
+
+@receiver(post_delete, sender=Court)
+@receiver(post_delete, sender=Schedule)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_delete, sender="reservations.Reservation")
+def sync_club_object_deleted(sender, instance, **kwargs):
+    _record_sync_change(instance.club_id, sender._meta.model_name, instance, deleted=True)
+
+
+def _pricing_club_id(instance):
+    try:
+        return instance.court.club_id
+    except Court.DoesNotExist:
+        return None
+
+
+@receiver(post_save, sender=CourtSpecialPricing)
+def sync_pricing_saved(sender, instance, **kwargs):
+    _record_sync_change(_pricing_club_id(instance), "pricing", instance)
+
+
+@receiver(post_delete, sender=CourtSpecialPricing)
+def sync_pricing_deleted(sender, instance, **kwargs):
+    _record_sync_change(_pricing_club_id(instance), "pricing", instance, deleted=True)
+
+
+# Dashboard snapshot counters (see apps.clubs.snapshots)
+
+SNAPSHOT_TRACKED = {
+    "reservation": (snapshots.reservation_state, snapshots.reservation_counters, "club_id"),
+    "payment": (snapshots.payment_state, snapshots.payment_counters, "club_id"),
+    "clientprofile": (
+        snapshots.member_state,
+        snapshots.member_counters,
+        "club__organization_id",
+    ),
+}
+
+
+@receiver(post_init, sender="reservations.Reservation")
+@receiver(post_init, sender="finance.Payment")
+@receiver(post_init, sender="clients.ClientProfile")
+def remember_snapshot_state(sender, instance, **kwargs):
+    state, _, _ = SNAPSHOT_TRACKED[sender._meta.model_name]
+    instance._snapshot_state = state(instance)
+
+
+def _track_snapshot_change(sender, instance, created=False, deleted=False):
+    state, counters, scope = SNAPSHOT_TRACKED[sender._meta.model_name]
+    before = None if created else getattr(instance, "_snapshot_state", None)
+    after = None if deleted else state(instance)
+    snapshots.track_change(counters, before, after, scope=scope)
+    instance._snapshot_state = after
+
+    club_ids = {instance.club_id}
+    if sender._meta.model_name == "reservation" and before:
+        club_ids.add(before[0])
+    for club_id in club_ids:
+        ClubSnapshotService.schedule_feed_refresh(club_id)
+
+
+@receiver(post_save, sender="reservations.Reservation")
+@receiver(post_save, sender="finance.Payment")
+@receiver(post_save, sender="clients.ClientProfile")
+def snapshot_row_saved(sender, instance, created, **kwargs):
+    _track_snapshot_change(sender, instance, created=created)
+
+
+@receiver(post_delete, sender="reservations.Reservation")
+@receiver(post_delete, sender="finance.Payment")
+@receiver(post_delete, sender="clients.ClientProfile")
+def snapshot_row_deleted(sender, instance, **kwargs):
+    _track_snapshot_change(sender, instance, deleted=True)
+
+
+@receiver(post_save, sender=Court)
+@receiver(post_delete, sender=Court)
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def invalidate_dashboard_snapshot(sender, instance, **kwargs):
+    """Court capacity changed: rebuild the snapshot on its next read."""
+    ClubSnapshotService.invalidate(instance.club_id)
@@ -0,0 +1,475 @@
+"""
+Denormalized daily dashboard snapshot per club.
+
+The manager dashboards (club dashboard stats, mobile dashboard, analytics,
+member and financial summaries) read one ``ClubDashboardSnapshot`` row
+instead of running a dozen counts and aggregates on every request.
+
+The row holds three kinds of figures:
+
+- live counters for ``day`` (today's reservations and booked minutes,
+  today's and this month's revenue, active members). Reservation, payment
+  and client saves adjust them in the saving transaction with a single
+  ``UPDATE ... SET x = x + delta``, so concurrent writers never lose a
+  count and a rolled back save leaves no trace.
+- trailing windows ending the day before ``day`` (yesterday, last 7 and 30
+  days, last month), which only change when old rows are edited and are
+  recomputed by ``rebuild``.
+- short feeds (upcoming reservations, recent activity), recomputed once the
+  transaction of each event commits.
+
+A snapshot whose ``day`` is not today is rebuilt on first read, and the
+periodic ``reconcile_dashboard_snapshots`` task rebuilds every club to
+repair whatever the increments missed (bulk writes, raw SQL, rows changed
+while a rebuild was running).
+
+Usage:
+    snapshot = ClubSnapshotService.get(club)
+    snapshot.today_reservations
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Club, ClubDashboardSnapshot
+from .occupancy import OccupancyEngine
+
+logger = logging.getLogger(__name__)
+
+# Reservation statuses shown on the dashboard (they hold a court)
+LIVE_STATUSES = ("confirmed", "pending")
+
+ZERO = Decimal("0")
+UPCOMING_SIZE = 3
+RECENT_RESERVATIONS_SIZE = 10
+ACTIVITY_SIZE = 5
+
+
+def percent_change(current, previous) -> float:
+    """Change of ``current`` over ``previous`` in percent, rounded to 0.1."""
+    if previous:
+        return round(float((current - previous) / previous) * 100, 1)
+    return 100.0 if current else 0.0
+
+
+def _month_bounds(day: date):
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def _minutes(hours: float) -> int:
+    return int(round(hours * 60))
+
+
+# Event counters: what one row contributes to the live counters of ``today``
+
+
+def reservation_state(reservation):
+    values = reservation.__dict__
+    return (
+        values.get("club_id"),
+        values.get("date"),
+        values.get("status"),
+        values.get("duration_minutes"),
+    )
+
+
+def reservation_counters(state, today: date) -> Dict[str, int]:
+    _, day, status, duration_minutes = state
+    if status not in LIVE_STATUSES or not isinstance(day, date):
+        return {}
+    counters = {}
+    if day == today:
+        counters["today_reservations"] = 1
+        counters["today_booked_minutes"] = duration_minutes or 0
+    if (day.year, day.month) == (today.year, today.month):
+        counters["month_reservations"] = 1
+    return counters
+
+
+def payment_state(payment):
+    values = payment.__dict__
+    return (
+        values.get("club_id"),
+        values.get("created_at"),
+        values.get("status"),
+        values.get("amount"),
+    )
+
+
+def payment_counters(state, today: date) -> Dict[str, Decimal]:
+    _, created_at, status, amount = state
+    if status != "completed" or created_at is None or amount is None:
+        return {}
+    day = timezone.localdate(created_at)
+    counters = {}
+    if day == today:
+        counters["today_revenue"] = Decimal(amount)
+        counters["today_payments"] = 1
+    if (day.year, day.month) == (today.year, today.month) and day <= today:
+        counters["month_revenue"] = Decimal(amount)
+    return counters
+
+
+def member_state(profile):
+    values = profile.__dict__
+    return values.get("organization_id"), values.get("is_active")
+
+
+def member_counters(state, today: date) -> Dict[str, int]:
+    return {"active_members": 1} if state[1] else {}
+
+
+def track_change(counters, before, after, scope: str = "club_id", today=None):
+    """
+    Apply the difference between what ``before`` and ``after`` (row states,
+    None for a missing row) contribute to the counters. ``scope`` is the
+    snapshot lookup the first element of a state is matched against.
+    """
+    today = today or timezone.localdate()
+    changes = defaultdict(lambda: defaultdict(int))
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None or not state[0]:
+            continue
+        for field, value in counters(state, today).items():
+            changes[state[0]][field] += sign * value
+    for key, deltas in changes.items():
+        # Member counts are not tied to a day
+        day = None if scope != "club_id" else today
+        ClubSnapshotService.increment(deltas, day=day, **{scope: key})
+
+
+class ClubSnapshotService:
+    """Build, read and update ``ClubDashboardSnapshot`` rows."""
+
+    @staticmethod
+    def increment(deltas: Dict, day: Optional[date] = None, **scope) -> int:
+        """Add ``deltas`` to the snapshots matching ``scope`` in one UPDATE."""
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return 0
+        snapshots = ClubDashboardSnapshot.objects.filter(**scope)
+        if day is not None:
+            # A snapshot of another day is rebuilt on its next read
+            snapshots = snapshots.filter(day=day)
+        return snapshots.update(
+            updated_at=timezone.now(),
+            **{field: F(field) + value for field, value in deltas.items()},
+        )
+
+    @classmethod
+    def get(cls, club: Club, today: Optional[date] = None) -> ClubDashboardSnapshot:
+        """The club's snapshot, rebuilt first when missing or from another day."""
+        today = today or timezone.localdate()
+        try:
+            snapshot = club.dashboard_snapshot
+        except ObjectDoesNotExist:
+            snapshot = None
+        if snapshot is None or snapshot.day != today:
+            snapshot = cls.rebuild(club, today)
+        return snapshot
+
+    @staticmethod
+    def invalidate(club_id) -> None:
+        """Drop the snapshot, e.g. when courts or schedules change capacity."""
+        if club_id:
+            ClubDashboardSnapshot.objects.filter(club_id=club_id).delete()
+
+    @classmethod
+    def rebuild(cls, club: Club, today: Optional[date] = None) -> ClubDashboardSnapshot:
+        """Recompute every figure of the club's snapshot from the raw tables."""
+        from apps.clients.models import ClientProfile
+        from apps.finance.models import Payment
+        from apps.reservations.models import Reservation
+
+        now = timezone.now()
+        today = today or timezone.localdate(now)
+        yesterday = today - timedelta(days=1)
+        month_start, month_end = _month_bounds(today)
+        last_month_end = month_start - timedelta(days=1)
+        last_month_start = last_month_end.replace(day=1)
+        last_30_days = Q(date__gte=today - timedelta(days=30), date__lte=yesterday)
+        window_start = min(last_month_start, today - timedelta(days=30))
+        live = Q(status__in=LIVE_STATUSES)
+
+        reservations = Reservation.objects.filter(club=club)
+        values = reservations.filter(
+            date__gte=window_start, date__lte=month_end
+        ).aggregate(
+            today_reservations=Count("id", filter=live & Q(date=today)),
+            today_booked_minutes=Sum("duration_minutes", filter=live & Q(date=today)),
+            month_reservations=Count("id", filter=live & Q(date__gte=month_start)),
+            yesterday_reservations=Count("id", filter=live & Q(date=yesterday)),
+            last_30_days_reservations=Count("id", filter=last_30_days),
+            last_30_days_confirmed=Count(
+                "id", filter=last_30_days & Q(status="confirmed")
+            ),
+            last_30_days_cancelled=Count(
+                "id", filter=last_30_days & Q(status="cancelled")
+            ),
+            last_month_reservations=Count(
+                "id", filter=live & Q(date__gte=last_month_start, date__lte=last_month_end)
+            ),
+        )
+
+        def paid(start, end=None):
+            end = end or start
+            return Q(created_at__date__gte=start, created_at__date__lte=end)
+
+        values.update(
+            Payment.objects.filter(club=club, status="completed")
+            .filter(paid(window_start, today))
+            .aggregate(
+                today_revenue=Sum("amount", filter=paid(today)),
+                today_payments=Count("id", filter=paid(today)),
+                month_revenue=Sum("amount", filter=paid(month_start, today)),
+                yesterday_revenue=Sum("amount", filter=paid(yesterday)),
+                last_7_days_revenue=Sum(
+                    "amount", filter=paid(today - timedelta(days=7), yesterday)
+                ),
+                last_30_days_revenue=Sum(
+                    "amount", filter=paid(today - timedelta(days=30), yesterday)
+                ),
+                last_30_days_payments=Count(
+                    "id", filter=paid(today - timedelta(days=30), yesterday)
+                ),
+                last_month_revenue=Sum(
+                    "amount", filter=paid(last_month_start, last_month_end)
+                ),
+            )
+        )
+
+        values.update(
+            ClientProfile.objects.filter(
+                organization_id=club.organization_id, is_active=True
+            ).aggregate(
+                active_members=Count("id"),
+                last_month_members=Count(
+                    "id", filter=Q(created_at__date__lte=last_month_end)
+                ),
+            )
+        )
+
+        values.update(
+            reservations.filter(
+                created_at__gte=now - timedelta(days=90), client_profile__isnull=False
+            ).aggregate(
+                recent_players=Count("client_profile", distinct=True),
+                new_recent_players=Count(
+                    "client_profile",
+                    distinct=True,
+                    filter=Q(client_profile__created_at__gte=now - timedelta(days=30)),
+                ),
+            )
+        )
+
+        # Pending reservations hold their court on the dashboard
+        engine = OccupancyEngine(club, statuses=LIVE_STATUSES)
+        days = engine.compute(last_month_start, today).by_day()
+        last_month = [row for row in days if row["date"] <= last_month_end]
+        values["active_courts"] = len(engine.court_ids)
+        values["today_capacity_minutes"] = _minutes(days[-1]["available_hours"])
+        values["last_month_capacity_minutes"] = _minutes(
+            sum(row["available_hours"] for row in last_month)
+        )
+        values["last_month_booked_minutes"] = _minutes(
+            sum(row["occupied_hours"] for row in last_month)
+        )
+
+        values["top_courts"] = list(
+            reservations.filter(last_30_days)
+            .values("court__name")
+            .annotate(booking_count=Count("id"))
+            .order_by("-booking_count", "court__name")[:3]
+        )
+        values["top_clients"] = list(
+            reservations.filter(
+                status="confirmed", date__gte=month_start, date__lte=month_end
+            )
+            .values("created_by__first_name", "created_by__last_name")
+            .annotate(total=Count("id"))
+            .order_by("-total")[:5]
+        )
+        values["court_usage"] = list(
+            reservations.filter(
+                status="confirmed", date__gte=today - timedelta(days=7), date__lte=yesterday
+            )
+            .values("court__name")
+            .annotate(usage_count=Count("id"))
+            .order_by("-usage_count", "court__name")
+        )
+
+        values.update(cls._feeds(club.id, now, today))
+        values = {
+            field: (ZERO if field.endswith("revenue") else 0) if value is None else value
+            for field, value in values.items()
+        }
+        values.update(day=today, rebuilt_at=now)
+
+        try:
+            with transaction.atomic():
+                snapshot, _ = ClubDashboardSnapshot.objects.update_or_create(
+                    club=club, defaults=values
+                )
+        except IntegrityError:
+            # Rebuilt concurrently by another request
+            snapshot = ClubDashboardSnapshot.objects.get(club=club)
+        club.dashboard_snapshot = snapshot
+        return snapshot
+
+    @classmethod
+    def reconcile(cls, club_ids: Optional[Iterable] = None) -> int:
+        """Rebuild the snapshots of all active clubs (or of ``club_ids``)."""
+        clubs = Club.objects.filter(is_active=True).prefetch_related("courts", "schedules")
+        if club_ids is not None:
+            clubs = clubs.filter(id__in=list(club_ids))
+        rebuilt = 0
+        today = timezone.localdate()
+        for club in clubs.iterator(chunk_size=100):
+            try:
+                cls.rebuild(club, today)
+                rebuilt += 1
+            except Exception as e:
+                logger.error(f"Error rebuilding dashboard snapshot for club {club.id}: {str(e)}")
+        return rebuilt
+
+    # Feeds
+
+    @staticmethod
+    def _feeds(club_id, now, today) -> Dict[str, List[Dict]]:
+        from apps.clients.models import ClientProfile
+        from apps.finance.models import Payment
+        from apps.reservations.models import Reservation
+
+        week_ago = now - timedelta(days=7)
+
+        upcoming = [
+            {
+                "id": str(reservation.id),
+                "player_name": reservation.player_name,
+                "court": reservation.court.name,
+                "date": reservation.date.isoformat(),
+                "start_time": reservation.start_time.strftime("%H:%M"),
+                "end_time": reservation.end_time.strftime("%H:%M"),
+                "status": reservation.status,
+                "player_count": reservation.player_count,
+            }
+            for reservation in Reservation.objects.filter(
+                club_id=club_id, date__gte=today, status__in=LIVE_STATUSES
+            )
+            .select_related("court")
+            .order_by("date", "start_time")[:UPCOMING_SIZE]
+        ]
+
+        recent = list(
+            Reservation.objects.filter(club_id=club_id, created_at__gte=week_ago)
+            .select_related("court", "created_by")
+            .order_by("-created_at")[:RECENT_RESERVATIONS_SIZE]
+        )
+        recent_reservations = [
+            {
+                "user__email": reservation.created_by.email if reservation.created_by else None,
+                "user__first_name": (
+                    reservation.created_by.first_name if reservation.created_by else None
+                ),
+                "user__last_name": (
+                    reservation.created_by.last_name if reservation.created_by else None
+                ),
+                "created_at": reservation.created_at.isoformat(),
+                "status": reservation.status,
+            }
+            for reservation in recent
+        ]
+
+        activity = [
+            {
+                "type": "reservation",
+                "description": f"Nueva reserva de {reservation.player_name} para {reservation.court.name}",
+                "timestamp": reservation.created_at.isoformat(),
+                "user": reservation.player_name,
+                "details": {
+                    "court": reservation.court.name,
+                    "date": reservation.date.isoformat(),
+                    "time": reservation.start_time.strftime("%H:%M"),
+                },
+            }
+            for reservation in recent[:3]
+        ]
+        for payment in (
+            Payment.objects.filter(
+                club_id=club_id, status="completed", created_at__gte=week_ago
+            )
+            .select_related("user")
+            .order_by("-created_at")[:2]
+        ):
+            activity.append(
+                {
+                    "type": "payment",
+                    "description": f"Pago recibido: ${float(payment.amount):.2f}",
+                    "timestamp": payment.created_at.isoformat(),
+                    "user": payment.user.get_full_name() if payment.user else "Cliente",
+                    "details": {
+                        "amount": float(payment.amount),
+                        "payment_method": payment.get_payment_method_display(),
+                        "category": payment.get_payment_type_display(),
+                    },
+                }
+            )
+        for client in (
+            ClientProfile.objects.filter(club_id=club_id, created_at__gte=week_ago)
+            .select_related("user", "level")
+            .order_by("-created_at")[:2]
+        ):
+            activity.append(
+                {
+                    "type": "client_registration",
+                    "description": f"Nuevo cliente registrado: {client.user.get_full_name()}",
+                    "timestamp": client.created_at.isoformat(),
+                    "user": client.user.get_full_name(),
+                    "details": {
+                        "level": client.level.display_name if client.level else "Sin nivel",
+                        "email": client.user.email,
+                    },
+                }
+            )
+        activity.sort(key=lambda entry: entry["timestamp"], reverse=True)
+
+        return {
+            "upcoming_reservations": upcoming,
+            "recent_activity": activity[:ACTIVITY_SIZE],
+            "recent_reservations": recent_reservations,
+        }
+
+    @classmethod
+    def refresh_feeds(cls, club_id) -> None:
+        """Recompute the feeds of an existing snapshot."""
+        if not ClubDashboardSnapshot.objects.filter(club_id=club_id).exists():
+            return
+        now = timezone.now()
+        ClubDashboardSnapshot.objects.filter(club_id=club_id).update(
+            updated_at=now, **cls._feeds(club_id, now, timezone.localdate(now))
+        )
+
+    @classmethod
+    def schedule_feed_refresh(cls, club_id) -> None:
+        """Refresh the club's feeds once the current transaction commits."""
+        if not club_id:
+            return
+
+        def refresh():
+            try:
+                cls.refresh_feeds(club_id)
+            except Exception as e:
+                # The next rebuild repairs a missed refresh
+                logger.error(f"Error refreshing dashboard feeds for club {club_id}: {str(e)}")
+
+        transaction.on_commit(refresh)
@@ -0,0 +1,372 @@
+"""
+Incremental offline sync for mobile clients.
+
+Every change to a club's offline data (the club itself, its courts,
+schedules, special pricing, announcements and reservations) appends a row to
+``SyncChange`` once its transaction commits. The row id is a monotonically
+increasing sequence number, so a client that remembers the last sequence it
+has seen only needs the changes after it: ``ClubSyncFeed`` collapses them to
+the latest change per object and loads the touched objects with one query per
+entity. Objects that were deleted, deactivated or otherwise left the club's
+offline scope come back as tombstones (ids under ``deletes``). Reservations
+are private to their owners, so their changes are logged once per owner and
+only reach that owner's feed, tombstones included.
+
+Cursors are opaque to clients (``"<sequence>.<issued epoch>"``). A missing,
+malformed or expired cursor (older than ``SYNC_CHANGE_RETENTION_DAYS``, after
+which its changes may have been pruned) or a backlog larger than
+``SYNC_MAX_CHANGES`` falls back to a full snapshot.
+
+Sequence numbers are handed out when a change is inserted, not when it
+commits, so a concurrent transaction can commit a lower id after a higher
+one was read. Cursors therefore only advance past changes older than
+``SYNC_SETTLE_SECONDS``; newer ones are sent again on the next sync, which is
+harmless because applying a change is idempotent.
+
+Usage:
+    payload = ClubSyncFeed(club, request.user).build(cursor)
+    payload["mode"]  # "snapshot" or "delta"
+"""
+
+import logging
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import SyncChange
+
+logger = logging.getLogger(__name__)
+
+# SyncChange.entity -> payload key
+ENTITY_KEYS = {
+    "court": "courts",
+    "schedule": "schedules",
+    "pricing": "pricing",
+    "reservation": "reservations",
+    "announcement": "announcements",
+}
+
+# Club fields in the offline payload; saves touching none of them are not synced
+SYNCED_CLUB_FIELDS = {
+    "name",
+    "slug",
+    "phone",
+    "email",
+    "address",
+    "opening_time",
+    "closing_time",
+    "days_open",
+    "is_active",
+}
+
+BUSINESS_RULES = {
+    "advance_booking_days": 30,
+    "cancellation_hours": 24,
+    "min_booking_duration": 60,
+    "max_booking_duration": 180,
+}
+
+
+def record_changes(
+    club_id,
+    entity: str,
+    object_ids: Iterable,
+    deleted: bool = False,
+    user_ids: Optional[Iterable] = None,
+):
+    """
+    Log changes to the sync feed once the current transaction commits.
+
+    ``user_ids`` restricts the changes to the feeds of those users; None
+    logs them for everyone.
+    """
+    object_ids = [object_id for object_id in object_ids if object_id]
+    user_ids = [None] if user_ids is None else [user_id for user_id in user_ids if user_id]
+    if not club_id or not object_ids or not user_ids:
+        return
+
+    def write():
+        try:
+            with transaction.atomic():
+                SyncChange.objects.bulk_create(
+                    SyncChange(
+                        club_id=club_id,
+                        entity=entity,
+                        object_id=object_id,
+                        deleted=deleted,
+                        user_id=user_id,
+                    )
+                    for object_id in object_ids
+                    for user_id in user_ids
+                )
+        except IntegrityError:
+            # The club itself was deleted in the same transaction
+            pass
+        except Exception as e:
+            # A missed change is repaired by the client's next snapshot
+            logger.error(f"Error recording sync changes for club {club_id}: {str(e)}")
+
+    transaction.on_commit(write)
+
+
+def record_change(club_id, entity: str, object_id, deleted: bool = False, user_ids=None):
+    record_changes(club_id, entity, [object_id], deleted, user_ids)
+
+
+def _format_time(value) -> Optional[str]:
+    if isinstance(value, str):
+        # Unsaved model defaults such as Club.opening_time="07:00"
+        value = time.fromisoformat(value)
+    return value.strftime("%H:%M") if value else None
+
+
+def encode_cursor(sequence: int, issued: datetime) -> str:
+    return f"{sequence}.{int(issued.timestamp())}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, datetime]]:
+    """``(sequence, issued)`` for a well-formed cursor, None otherwise."""
+    try:
+        sequence, issued = cursor.split(".")
+        return int(sequence), datetime.fromtimestamp(int(issued), tz=dt_timezone.utc)
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return None
+
+
+class ClubSyncFeed:
+    """Snapshot and delta payloads of one club's offline data for one user."""
+
+    def __init__(self, club, user=None, now: Optional[datetime] = None):
+        self.club = club
+        self.user = user
+        self.now = now or timezone.now()
+        self.today = timezone.localdate(self.now)
+
+    # Loaders: rows currently in the offline scope, all or among ``ids``
+
+    def _club_info(self) -> Dict:
+        club = self.club
+        return {
+            "id": str(club.id),
+            "name": club.name,
+            "slug": club.slug,
+            "phone": club.phone,
+            "email": club.email,
+            "address": club.address,
+            "opening_time": _format_time(club.opening_time),
+            "closing_time": _format_time(club.closing_time),
+            "days_open": club.days_open,
+        }
+
+    def _courts(self, ids=None):
+        courts = self.club.courts.filter(is_active=True)
+        if ids is not None:
+            courts = courts.filter(id__in=ids)
+        return courts.values(
+            "id",
+            "name",
+            "number",
+            "court_type",
+            "surface_type",
+            "has_lighting",
+            "has_heating",
+            "has_roof",
+            "is_maintenance",
+            "price_per_hour",
+        )
+
+    def _schedules(self, ids=None):
+        schedules = self.club.schedules.filter(is_active=True)
+        if ids is not None:
+            schedules = schedules.filter(id__in=ids)
+        return schedules.values(
+            "id", "weekday", "opening_time", "closing_time", "is_closed", "notes"
+        )
+
+    def _pricing(self, ids=None):
+        from .models import CourtSpecialPricing
+
+        pricing = CourtSpecialPricing.objects.filter(
+            court__club=self.club,
+            court__is_active=True,
+            is_active=True,
+            end_date__gte=self.today,
+        )
+        if ids is not None:
+            pricing = pricing.filter(id__in=ids)
+        return pricing.values(
+            "id",
+            "court_id",
+            "name",
+            "start_date",
+            "end_date",
+            "start_time",
+            "end_time",
+            "days_of_week",
+            "price_per_hour",
+            "priority",
+        )
+
+    def _reservations(self, ids=None):
+        from apps.reservations.models import Reservation
+
+        if not self.user or not self.user.is_authenticated:
+            return []
+        reservations = Reservation.objects.filter(
+            Q(created_by=self.user) | Q(client_profile__user=self.user),
+            club=self.club,
+            is_active=True,
+        )
+        if ids is None:
+            reservations = reservations.filter(date__gte=self.today)
+        else:
+            reservations = reservations.filter(id__in=ids)
+        return reservations.values(
+            "id",
+            "court_id",
+            "date",
+            "start_time",
+            "end_time",
+            "status",
+            "payment_status",
+            "player_count",
+            "total_price",
+        )
+
+    def _announcements(self, ids=None):
+        announcements = self.club.announcements.filter(
+            show_on_app=True, ends_at__gte=self.now
+        )
+        if ids is not None:
+            announcements = announcements.filter(id__in=ids)
+        return announcements.values(
+            "id",
+            "title",
+            "content",
+            "announcement_type",
+            "starts_at",
+            "ends_at",
+            "is_priority",
+        )
+
+    def _load(self, entity: str, ids=None) -> List[Dict]:
+        return list(getattr(self, f"_{ENTITY_KEYS[entity]}")(ids))
+
+    # Payloads
+
+    def _settled_sequence(self) -> int:
+        """Highest sequence no concurrent transaction can still commit below."""
+        settle = getattr(settings, "SYNC_SETTLE_SECONDS", 5)
+        return (
+            SyncChange.objects.filter(
+                created_at__lte=self.now - timedelta(seconds=settle)
+            ).aggregate(sequence=Max("id"))["sequence"]
+            or 0
+        )
+
+    def _payload(self, mode: str, sequence: int) -> Dict:
+        return {
+            "mode": mode,
+            "cursor": encode_cursor(sequence, self.now),
+            "data_version": sequence,
+            "last_sync": self.now.isoformat(),
+        }
+
+    def snapshot(self) -> Dict:
+        # Read the sequence first so changes racing the snapshot are re-sent
+        payload = self._payload("snapshot", self._settled_sequence())
+        payload["club"] = self._club_info()
+        for entity, key in ENTITY_KEYS.items():
+            payload[key] = self._load(entity)
+        payload["business_rules"] = BUSINESS_RULES
+        return payload
+
+    def delta(self, cursor: Optional[str]) -> Optional[Dict]:
+        """Changes since ``cursor``, or None when a snapshot is required."""
+        decoded = decode_cursor(cursor)
+        if decoded is None:
+            return None
+        sequence, issued = decoded
+        retention = getattr(settings, "SYNC_CHANGE_RETENTION_DAYS", 30)
+        if issued > self.now or issued < self.now - timedelta(days=retention):
+            return None
+
+        max_changes = getattr(settings, "SYNC_MAX_CHANGES", 1000)
+        audience = Q(user__isnull=True)
+        if self.user and self.user.is_authenticated:
+            audience |= Q(user=self.user)
+        rows = list(
+            SyncChange.objects.filter(audience, club=self.club, id__gt=sequence)
+            .order_by("id")
+            .values_list("id", "entity", "object_id", "deleted", "created_at")[
+                : max_changes + 1
+            ]
+        )
+        if len(rows) > max_changes:
+            return None
+
+        settle = getattr(settings, "SYNC_SETTLE_SECONDS", 5)
+        settled_before = self.now - timedelta(seconds=settle)
+        latest = {}
+        for change_id, entity, object_id, deleted, created_at in rows:
+            latest[(entity, object_id)] = deleted
+            if created_at <= settled_before:
+                sequence = change_id
+
+        payload = self._payload("delta", sequence)
+        changes = {}
+        if ("club", self.club.id) in latest:
+            changes["club"] = self._club_info()
+
+        for entity, key in ENTITY_KEYS.items():
+            touched = [
+                object_id
+                for (changed, object_id), deleted in latest.items()
+                if changed == entity and not deleted
+            ]
+            deleted = {
+                object_id
+                for (changed, object_id), was_deleted in latest.items()
+                if changed == entity and was_deleted
+            }
+            upserts = self._load(entity, touched) if touched else []
+            if entity != "reservation":
+                # Left the offline scope (deactivated, expired, moved club)
+                loaded = {row["id"] for row in upserts}
+                deleted.update(object_id for object_id in touched if object_id not in loaded)
+            if upserts or deleted:
+                changes[key] = {"upserts": upserts, "deletes": sorted(map(str, deleted))}
+
+        payload["changes"] = changes
+        return payload
+
+    def build(self, cursor: Optional[str] = None) -> Dict:
+        payload = self.delta(cursor) if cursor else None
+        return payload if payload is not None else self.snapshot()
+
+
+def prune_sync_changes(now: Optional[datetime] = None) -> int:
+    """
+    Delete sync changes older than SYNC_CHANGE_RETENTION_DAYS, in batches of
+    SYNC_PRUNE_BATCH_SIZE. Cursors that old fall back to a snapshot anyway.
+    """
+    now = now or timezone.now()
+    retention = getattr(settings, "SYNC_CHANGE_RETENTION_DAYS", 30)
+    batch_size = getattr(settings, "SYNC_PRUNE_BATCH_SIZE", 5000)
+    cutoff = now - timedelta(days=retention)
+
+    total = 0
+    while True:
+        ids = list(
+            SyncChange.objects.filter(created_at__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += SyncChange.objects.filter(id__in=ids).delete()[0]
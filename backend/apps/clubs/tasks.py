@@ -0,0 +1,64 @@
+"""
+Celery tasks for clubs module.
+"""
+
+import logging
+
+from celery import shared_task
+
+from . import sync
+from .maintenance import MaintenanceGenerator
+from .models import Club
+from .snapshots import ClubSnapshotService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def generate_maintenance_records():
+    """
+    Nightly task extending every auto-generating maintenance schedule to its
+    horizon, one batched pass per club.
+    """
+    clubs = Club.objects.filter(
+        is_active=True,
+        maintenance_schedules__is_active=True,
+        maintenance_schedules__auto_generate=True,
+    ).distinct()
+
+    summary = {"clubs": 0, "records": 0, "conflicts": 0}
+    for club in clubs.iterator():
+        try:
+            result = MaintenanceGenerator(club).run()
+        except Exception as e:
+            logger.error(f"Error generating maintenance for club {club.id}: {str(e)}")
+            continue
+        summary["clubs"] += 1
+        summary["records"] += len(result["records"])
+        summary["conflicts"] += len(result["conflicts"])
+
+    logger.info(
+        f"Generated {summary['records']} maintenance records for {summary['clubs']} clubs "
+        f"({summary['conflicts']} reservation overlaps)"
+    )
+    return summary
+
+
+@shared_task
+def prune_sync_changes():
+    """Delete offline sync changes older than SYNC_CHANGE_RETENTION_DAYS."""
+    deleted = sync.prune_sync_changes()
+    logger.info(f"Pruned {deleted} offline sync changes")
+    return deleted
+
+
+@shared_task
+def reconcile_dashboard_snapshots():
+    """
+    Periodic task rebuilding every club's dashboard snapshot from raw rows.
+    Repairs counters the event increments missed and rolls snapshots over
+    to the new day.
+    """
+    rebuilt = ClubSnapshotService.reconcile()
+    logger.info(f"Rebuilt {rebuilt} club dashboard snapshots")
+    return rebuilt
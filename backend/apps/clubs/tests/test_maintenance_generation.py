@@ -0,0 +1,179 @@
+"""
+Tests for bulk maintenance record generation.
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.clubs.maintenance import MaintenanceGenerator
+from apps.clubs.models import (
+    Club,
+    Court,
+    MaintenanceRecord,
+    MaintenanceSchedule,
+    MaintenanceType,
+)
+from apps.clubs.tasks import generate_maintenance_records
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+
+# A Monday
+TODAY = date(2026, 6, 1)
+
+
+class MaintenanceGeneratorTest(TestCase):
+    """Test expanding schedules across courts and horizon in one pass."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Maintenance Org", business_name="Maintenance Org LLC"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Maintenance Club",
+            slug="maintenance-club",
+            email="club@example.com",
+            phone="+5255000000",
+        )
+        cls.courts = [
+            Court.objects.create(
+                club=cls.club,
+                organization=cls.organization,
+                name=f"Cancha {number}",
+                number=number,
+                price_per_hour=Decimal("100.00"),
+            )
+            for number in (1, 2, 3)
+        ]
+        cls.maintenance_type = MaintenanceType.objects.create(
+            organization=cls.organization,
+            name="Limpieza",
+            category="cleaning",
+            estimated_cost=Decimal("250.00"),
+        )
+
+    def create_schedule(self, **kwargs):
+        values = {
+            "club": self.club,
+            "organization": self.organization,
+            "maintenance_type": self.maintenance_type,
+            "title": "Limpieza semanal",
+            "frequency": "weekly",
+            "preferred_weekday": 2,
+            "preferred_time": time(7),
+            "start_date": TODAY,
+            "generate_days_ahead": 90,
+        }
+        values.update(kwargs)
+        return MaintenanceSchedule.objects.create(**values)
+
+    def test_club_wide_schedule_generated_in_constant_queries(self):
+        self.create_schedule(generate_days_ahead=28)
+        self.create_schedule(
+            title="Revisión de red",
+            court=self.courts[0],
+            frequency="daily",
+            preferred_time=time(6),
+            generate_days_ahead=6,
+        )
+
+        # schedules, courts, existing, reservations, then insert, schedule
+        # update and court flags inside a savepoint
+        with self.assertNumQueries(9):
+            result = MaintenanceGenerator(self.club, today=TODAY).run()
+
+        # 4 Wednesdays x 3 courts + 7 daily checks on court 1
+        self.assertEqual(len(result["records"]), 4 * 3 + 7)
+        self.assertEqual(MaintenanceRecord.objects.count(), 19)
+        weekly = MaintenanceRecord.objects.filter(title="Limpieza semanal")
+        self.assertEqual({record.scheduled_date.weekday() for record in weekly}, {2})
+        self.assertEqual(weekly.first().estimated_cost, Decimal("250.00"))
+
+    def test_existing_records_are_not_duplicated(self):
+        schedule = self.create_schedule(generate_days_ahead=14)
+        MaintenanceGenerator(self.club, today=TODAY).run()
+        MaintenanceRecord.objects.filter(court=self.courts[2]).delete()
+        schedule.refresh_from_db()
+        schedule.last_generated_date = None
+        schedule.save(update_fields=["last_generated_date"])
+
+        result = MaintenanceGenerator(self.club, today=TODAY).run()
+
+        self.assertEqual(len(result["records"]), 2)
+        self.assertEqual({r.court_id for r in result["records"]}, {self.courts[2].id})
+        self.assertEqual(MaintenanceRecord.objects.count(), 6)
+
+    def test_incremental_run_only_adds_new_tail(self):
+        schedule = self.create_schedule(court=self.courts[0], generate_days_ahead=14)
+        MaintenanceGenerator(self.club, today=TODAY).run()
+        schedule.refresh_from_db()
+        # The last Wednesday generated, not the horizon
+        self.assertEqual(schedule.last_generated_date, date(2026, 6, 10))
+
+        result = MaintenanceGenerator(
+            self.club, today=TODAY + timedelta(days=7)
+        ).run()
+
+        self.assertEqual(len(result["records"]), 1)
+        self.assertEqual(
+            result["records"][0].scheduled_date.date(), date(2026, 6, 17)
+        )
+
+    def test_nightly_runs_keep_the_cadence(self):
+        schedule = self.create_schedule(
+            court=self.courts[0], frequency="monthly", generate_days_ahead=90
+        )
+
+        for night in range(5):
+            MaintenanceGenerator(
+                self.club, schedules=[schedule], today=TODAY + timedelta(days=night)
+            ).run()
+
+        self.assertEqual(
+            sorted(
+                MaintenanceRecord.objects.values_list("scheduled_date__date", flat=True)
+            ),
+            # The last night's horizon reaches September 3rd
+            [date(2026, 6, 1), date(2026, 7, 1), date(2026, 8, 1), date(2026, 9, 1)],
+        )
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.last_generated_date, date(2026, 9, 1))
+
+    def test_overlapping_reservations_are_flagged(self):
+        self.create_schedule(court=self.courts[1], generate_days_ahead=6)
+        Reservation.objects.bulk_create(
+            [
+                Reservation(
+                    organization=self.organization,
+                    club=self.club,
+                    court=self.courts[1],
+                    date=date(2026, 6, 3),
+                    start_time=time(7, 30),
+                    end_time=time(8, 30),
+                    duration_minutes=60,
+                    player_name="Jugador",
+                    player_email="jugador@example.com",
+                    price_per_hour=Decimal("100.00"),
+                    total_price=Decimal("100.00"),
+                    status="confirmed",
+                )
+            ]
+        )
+
+        result = MaintenanceGenerator(self.club, today=TODAY).run()
+
+        self.assertEqual(len(result["conflicts"]), 1)
+        record = MaintenanceRecord.objects.get()
+        self.assertIn("1 reserva", record.additional_notes)
+
+    def test_nightly_task_covers_every_club(self):
+        self.create_schedule(generate_days_ahead=7)
+
+        summary = generate_maintenance_records()
+
+        self.assertEqual(summary["clubs"], 1)
+        self.assertEqual(summary["records"], MaintenanceRecord.objects.count())
+        self.assertGreater(summary["records"], 0)
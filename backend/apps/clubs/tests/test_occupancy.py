@@ -0,0 +1,155 @@
+"""
+Tests for the schedule-aware occupancy engine.
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.clubs.models import Club, Court, MaintenanceRecord, Schedule
+from apps.clubs.occupancy import OccupancyEngine
+from apps.reservations.models import BlockedSlot, Reservation
+from apps.root.models import Organization
+
+# A Monday
+MONDAY = date(2026, 6, 1)
+
+
+class OccupancyEngineTest(TestCase):
+    """Test capacity, exclusions and occupied minutes per court x day x hour."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Occupancy Org", business_name="Occupancy Org LLC"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Occupancy Club",
+            slug="occupancy-club",
+            email="club@example.com",
+            phone="+5255000000",
+            opening_time=time(9),
+            closing_time=time(13),
+        )
+        cls.courts = [
+            Court.objects.create(
+                club=cls.club,
+                organization=cls.organization,
+                name=f"Cancha {number}",
+                number=number,
+                price_per_hour=Decimal("100.00"),
+            )
+            for number in (1, 2)
+        ]
+        # Monday 8:00-22:00, Sunday closed, other days fall back to 9:00-13:00
+        Schedule.objects.create(
+            club=cls.club,
+            organization=cls.organization,
+            weekday=0,
+            opening_time=time(8),
+            closing_time=time(22),
+        )
+        Schedule.objects.create(
+            club=cls.club,
+            organization=cls.organization,
+            weekday=6,
+            opening_time=time(8),
+            closing_time=time(22),
+            is_closed=True,
+        )
+
+    def reserve(self, court, day, start, end, status="confirmed"):
+        # bulk_create skips the booking-time validation in Reservation.save()
+        reservation = Reservation(
+            organization=self.organization,
+            club=self.club,
+            court=court,
+            date=day,
+            start_time=start,
+            end_time=end,
+            duration_minutes=0,
+            player_name="Jugador",
+            player_email="jugador@example.com",
+            price_per_hour=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+            status=status,
+        )
+        Reservation.objects.bulk_create([reservation])
+        return reservation
+
+    def compute(self, start_date, end_date):
+        club = Club.objects.prefetch_related("courts", "schedules").get(id=self.club.id)
+        return OccupancyEngine(club).compute(start_date, end_date)
+
+    def test_capacity_follows_schedule_and_fallback_hours(self):
+        sunday = MONDAY + timedelta(days=6)
+        matrix = self.compute(MONDAY, sunday)
+
+        self.assertEqual(matrix.capacity.shape, (2, 7, 24))
+        days = matrix.by_day(self.courts[0].id)
+        self.assertEqual(days[0]["available_hours"], 14)
+        self.assertEqual(days[1]["available_hours"], 4)
+        self.assertEqual(days[6]["available_hours"], 0)
+        self.assertEqual(matrix.capacity[0, 0, 7], 0)
+        self.assertEqual(matrix.capacity[0, 0, 8], 60)
+
+    def test_occupied_minutes_split_across_hours(self):
+        court = self.courts[0]
+        self.reserve(court, MONDAY, time(9, 30), time(11))
+        self.reserve(court, MONDAY, time(10), time(11), status="completed")
+        self.reserve(court, MONDAY, time(12), time(13), status="cancelled")
+
+        matrix = self.compute(MONDAY, MONDAY)
+
+        self.assertEqual(list(matrix.occupied[0, 0, 9:12]), [30, 120, 0])
+        self.assertEqual(matrix.reservation_count(court.id), 2)
+        self.assertEqual(matrix.occupied_hours(court.id), 2.5)
+        self.assertAlmostEqual(matrix.occupancy_rate(court.id), 2.5 / 14 * 100)
+        self.assertEqual(matrix.occupancy_rate(self.courts[1].id), 0)
+
+    def test_blocked_slots_and_maintenance_reduce_capacity(self):
+        tz = timezone.get_current_timezone()
+        BlockedSlot.objects.create(
+            organization=self.organization,
+            club=self.club,
+            start_datetime=datetime.combine(MONDAY, time(8), tzinfo=tz),
+            end_datetime=datetime.combine(MONDAY, time(10), tzinfo=tz),
+            reason="tournament",
+        )
+        MaintenanceRecord.objects.bulk_create(
+            [
+                MaintenanceRecord(
+                    club=self.club,
+                    court=self.courts[1],
+                    organization=self.organization,
+                    title="Cambio de red",
+                    description="",
+                    status="scheduled",
+                    scheduled_date=datetime.combine(MONDAY, time(14, 30), tzinfo=tz),
+                )
+            ]
+        )
+
+        matrix = self.compute(MONDAY, MONDAY)
+
+        # Club-wide block on both courts, one default-length maintenance hour on court 2
+        self.assertEqual(matrix.available_hours(self.courts[0].id), 12)
+        self.assertEqual(matrix.available_hours(self.courts[1].id), 11)
+        self.assertEqual(list(matrix.capacity[1, 0, 14:16]), [30, 30])
+
+    def test_ninety_day_heatmap_costs_two_queries(self):
+        for offset in range(0, 90, 7):
+            day = MONDAY + timedelta(days=offset)
+            self.reserve(self.courts[offset % 2], day, time(18), time(20))
+        club = Club.objects.prefetch_related("courts", "schedules").get(id=self.club.id)
+
+        with self.assertNumQueries(2):
+            matrix = OccupancyEngine(club).compute(MONDAY, MONDAY + timedelta(days=89))
+
+        heatmap = matrix.weekday_hour_heatmap()
+        self.assertEqual(heatmap.shape, (7, 24))
+        self.assertEqual(heatmap[0, 18], 50.0)
+        self.assertEqual(heatmap[1, 18], 0.0)
@@ -0,0 +1,178 @@
+"""
+Tests for the batched court read model.
+"""
+
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.clubs.models import (
+    Club,
+    Court,
+    CourtSpecialPricing,
+    MaintenanceRecord,
+    MaintenanceType,
+)
+from apps.clubs.read_models import CourtReadModel
+from apps.clubs.serializers import CourtDetailSerializer, CourtMobileSerializer
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+
+
+class CourtReadModelTest(TestCase):
+    """Test court serializer fields computed for a batch of courts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Read Model Org", business_name="Read Model Org LLC"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Read Model Club",
+            slug="read-model-club",
+            email="club@example.com",
+            phone="+5255000000",
+        )
+        cls.maintenance_type = MaintenanceType.objects.create(
+            organization=cls.organization, name="Limpieza", category="cleaning"
+        )
+        cls.courts = [
+            Court.objects.create(
+                club=cls.club,
+                organization=cls.organization,
+                name=f"Cancha {number}",
+                number=number,
+                price_per_hour=Decimal("100.00"),
+                dimensions={"length": 20.0, "width": 10.0, "height": 6.0},
+            )
+            for number in range(1, 5)
+        ]
+        now = timezone.now()
+        for court in cls.courts:
+            cls.add_activity(court, now)
+
+    @classmethod
+    def add_activity(cls, court, now):
+        common = {
+            "club": cls.club,
+            "court": court,
+            "organization": cls.organization,
+            "maintenance_type": cls.maintenance_type,
+            "description": "",
+        }
+        MaintenanceRecord.objects.bulk_create(
+            [
+                MaintenanceRecord(
+                    title="Limpieza mensual",
+                    status="completed",
+                    scheduled_date=now - timedelta(days=12),
+                    completed_at=now - timedelta(days=10),
+                    quality_rating=4,
+                    **common,
+                ),
+                MaintenanceRecord(
+                    title="Limpieza semanal",
+                    status="completed",
+                    scheduled_date=now - timedelta(days=3),
+                    completed_at=now - timedelta(days=2),
+                    quality_rating=5,
+                    **common,
+                ),
+                MaintenanceRecord(
+                    title="Cambio de red",
+                    status="scheduled",
+                    scheduled_date=now + timedelta(days=5),
+                    **common,
+                ),
+            ]
+        )
+        date = (now - timedelta(days=1)).date()
+        Reservation.objects.bulk_create(
+            Reservation(
+                organization=cls.organization,
+                club=cls.club,
+                court=court,
+                date=date,
+                start_time=time(start),
+                end_time=time(start + 2),
+                duration_minutes=120,
+                player_name="Jugador",
+                player_email="jugador@example.com",
+                price_per_hour=Decimal("100.00"),
+                total_price=Decimal("200.00"),
+                status="confirmed",
+                payment_status=payment_status,
+            )
+            for start, payment_status in ((9, "paid"), (18, "pending"))
+        )
+
+    def serialize(self, courts):
+        context = {"court_read_model": CourtReadModel(courts)}
+        return CourtDetailSerializer(courts, many=True, context=context).data
+
+    def test_detail_fields(self):
+        now = timezone.now()
+        data = self.serialize(self.courts[:1])[0]
+
+        self.assertEqual(
+            data["last_maintenance_date"], (now - timedelta(days=2)).date().isoformat()
+        )
+        self.assertEqual(
+            data["next_maintenance_date"], (now + timedelta(days=5)).date().isoformat()
+        )
+        self.assertEqual(data["maintenance_status"], {"status": "operational"})
+        self.assertEqual(len(data["upcoming_maintenance"]), 1)
+        self.assertEqual(data["upcoming_maintenance"][0]["title"], "Cambio de red")
+        self.assertEqual(
+            data["maintenance_history_summary"],
+            {
+                "total_completed": 2,
+                "average_quality_rating": 4.5,
+                "most_common_categories": [{"category": "cleaning", "count": 2}],
+            },
+        )
+        # 4 confirmed hours out of 30 days * 14 hours
+        self.assertEqual(data["occupancy_rate_last_30_days"], 0.95)
+        self.assertEqual(data["revenue_last_30_days"], 200.0)
+
+    def test_query_count_does_not_grow_with_courts(self):
+        with CaptureQueriesContext(connection) as two_courts:
+            self.serialize(self.courts[:2])
+        with CaptureQueriesContext(connection) as four_courts:
+            self.serialize(self.courts)
+
+        self.assertEqual(len(two_courts), len(four_courts))
+        self.assertLessEqual(len(four_courts), 4)
+
+    def test_in_progress_maintenance_status(self):
+        court = self.courts[0]
+        MaintenanceRecord.objects.filter(court=court, status="scheduled").update(
+            status="in_progress"
+        )
+
+        data = self.serialize([court])[0]
+
+        self.assertEqual(data["maintenance_status"]["status"], "in_progress")
+        self.assertEqual(data["maintenance_status"]["title"], "Cambio de red")
+
+    def test_current_price_uses_preloaded_special_pricing(self):
+        today = timezone.now().date()
+        CourtSpecialPricing.objects.create(
+            court=self.courts[1],
+            organization=self.organization,
+            name="Temporada alta",
+            start_date=today - timedelta(days=1),
+            end_date=today + timedelta(days=1),
+            price_per_hour=Decimal("150.00"),
+        )
+        context = {"court_read_model": CourtReadModel(self.courts)}
+
+        with self.assertNumQueries(1):
+            data = CourtMobileSerializer(self.courts, many=True, context=context).data
+
+        self.assertEqual(data[1]["current_price"], 150.0)
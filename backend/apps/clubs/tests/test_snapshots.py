@@ -0,0 +1,269 @@
+"""
+Tests for the denormalized club dashboard snapshot.
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.clients.models import ClientProfile
+from apps.clubs.models import Club, ClubDashboardSnapshot, Court
+from apps.clubs.snapshots import ClubSnapshotService
+from apps.clubs.views import ClubViewSet
+from apps.finance.models import Payment
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+
+User = get_user_model()
+
+# A Wednesday
+TODAY = date(2026, 6, 10)
+
+
+def aware(day, hour=12):
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+# Reservation.clean() compares dates in UTC, the snapshot in local time
+@override_settings(TIME_ZONE="UTC")
+class ClubSnapshotTest(TestCase):
+    """Test snapshot rebuilds, event increments and the dashboard reads."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Snapshot Org", business_name="Snapshot Org LLC"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Snapshot Club",
+            slug="snapshot-club",
+            email="club@example.com",
+            phone="+5255000000",
+            opening_time=time(9),
+            closing_time=time(23),
+        )
+        cls.courts = [
+            Court.objects.create(
+                club=cls.club,
+                organization=cls.organization,
+                name=f"Cancha {number}",
+                number=number,
+                price_per_hour=Decimal("100.00"),
+            )
+            for number in (1, 2)
+        ]
+        cls.admin = User.objects.create_superuser(
+            username="snapshot-admin", email="admin@example.com", password="TEST_PASSWORD"
+        )
+
+    def reserve(self, day, start, end, status="confirmed", court=None, bulk=False):
+        reservation = Reservation(
+            organization=self.organization,
+            club=self.club,
+            court=court or self.courts[0],
+            date=day,
+            start_time=start,
+            end_time=end,
+            duration_minutes=(end.hour - start.hour) * 60 + end.minute - start.minute,
+            player_name="Jugador",
+            player_email="jugador@example.com",
+            price_per_hour=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+            status=status,
+            created_by=self.admin,
+        )
+        if bulk:
+            # bulk_create skips signals and the booking-date validation
+            Reservation.objects.bulk_create([reservation])
+        else:
+            reservation.save()
+        return reservation
+
+    def pay(self, amount, status="completed", created_at=None, bulk=False):
+        payment = Payment(
+            organization=self.organization,
+            club=self.club,
+            amount=Decimal(amount),
+            payment_type="reservation",
+            payment_method="card",
+            status=status,
+            reference_number=f"PAY-{Payment.objects.count()}",
+        )
+        if bulk:
+            Payment.objects.bulk_create([payment])
+            Payment.objects.filter(pk=payment.pk).update(created_at=created_at)
+        else:
+            payment.save()
+        return payment
+
+    def member(self, username, club=None, is_active=True):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com", password="TEST_PASSWORD"
+        )
+        return ClientProfile.objects.create(
+            organization=self.organization, club=club, user=user, is_active=is_active
+        )
+
+    def snapshot(self):
+        return ClubDashboardSnapshot.objects.get(club=self.club)
+
+    def test_rebuild_computes_live_counters_and_trailing_windows(self):
+        yesterday = TODAY - timedelta(days=1)
+        self.reserve(TODAY, time(10), time(11), bulk=True)
+        self.reserve(TODAY, time(12), time(13, 30), court=self.courts[1], bulk=True)
+        self.reserve(TODAY, time(15), time(16), status="cancelled", bulk=True)
+        self.reserve(yesterday, time(10), time(11), bulk=True)
+        self.reserve(date(2026, 5, 20), time(10), time(11), status="pending", bulk=True)
+        self.reserve(date(2026, 5, 20), time(11), time(12), status="pending", bulk=True)
+        # Last month, outside the trailing 30 days
+        self.reserve(date(2026, 5, 1), time(10), time(11), bulk=True)
+        self.pay("100.00", created_at=aware(TODAY), bulk=True)
+        self.pay("50.00", status="pending", created_at=aware(TODAY), bulk=True)
+        self.pay("40.00", created_at=aware(yesterday), bulk=True)
+        self.pay("60.00", created_at=aware(date(2026, 5, 20)), bulk=True)
+        self.member("member-1")
+        self.member("member-2", club=self.club)
+        self.member("member-3", is_active=False)
+
+        snapshot = ClubSnapshotService.rebuild(self.club, TODAY)
+
+        self.assertEqual(snapshot.day, TODAY)
+        self.assertEqual(snapshot.today_reservations, 2)
+        self.assertEqual(snapshot.today_booked_minutes, 150)
+        self.assertEqual(snapshot.month_reservations, 3)
+        self.assertEqual(snapshot.yesterday_reservations, 1)
+        self.assertEqual(snapshot.last_30_days_reservations, 3)
+        self.assertEqual(snapshot.last_30_days_confirmed, 1)
+        self.assertEqual(snapshot.last_month_reservations, 3)
+        self.assertEqual(snapshot.today_revenue, Decimal("100.00"))
+        self.assertEqual(snapshot.today_payments, 1)
+        self.assertEqual(snapshot.month_revenue, Decimal("140.00"))
+        self.assertEqual(snapshot.yesterday_revenue, Decimal("40.00"))
+        self.assertEqual(snapshot.last_7_days_revenue, Decimal("40.00"))
+        self.assertEqual(snapshot.last_30_days_revenue, Decimal("100.00"))
+        self.assertEqual(snapshot.last_30_days_payments, 2)
+        self.assertEqual(snapshot.last_month_revenue, Decimal("60.00"))
+        self.assertEqual(snapshot.active_members, 2)
+        # 2 courts x 14 opening hours
+        self.assertEqual(snapshot.active_courts, 2)
+        self.assertEqual(snapshot.today_capacity_minutes, 2 * 14 * 60)
+        self.assertEqual(snapshot.last_month_capacity_minutes, 31 * 2 * 14 * 60)
+        self.assertEqual(snapshot.last_month_booked_minutes, 180)
+        self.assertEqual(
+            [row["start_time"] for row in snapshot.upcoming_reservations], ["10:00", "12:00"]
+        )
+        self.assertEqual(
+            [entry["type"] for entry in snapshot.recent_activity].count("client_registration"),
+            1,
+        )
+
+    def test_reservation_saves_adjust_todays_counters(self):
+        today = timezone.localdate()
+        ClubSnapshotService.get(self.club)
+
+        reservation = self.reserve(today, time(20), time(21, 30))
+        snapshot = self.snapshot()
+        self.assertEqual(
+            (snapshot.today_reservations, snapshot.today_booked_minutes, snapshot.month_reservations),
+            (1, 90, 1),
+        )
+
+        reservation.status = "cancelled"
+        reservation.save()
+        self.assertEqual(self.snapshot().today_reservations, 0)
+
+        pending = self.reserve(today, time(21, 30), time(22), status="pending")
+        self.assertEqual(self.snapshot().today_booked_minutes, 30)
+        pending.delete()
+        snapshot = self.snapshot()
+        self.assertEqual((snapshot.today_reservations, snapshot.today_booked_minutes), (0, 0))
+
+        # A rolled back save leaves no trace
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.reserve(today, time(20), time(21))
+                raise RuntimeError()
+        self.assertEqual(self.snapshot().today_reservations, 0)
+
+    def test_payment_and_member_saves_adjust_counters(self):
+        other_club = Club.objects.create(
+            organization=self.organization,
+            name="Other Club",
+            slug="other-club",
+            email="other@example.com",
+            phone="+5255000001",
+        )
+        ClubSnapshotService.get(self.club)
+        ClubSnapshotService.get(other_club)
+
+        payment = self.pay("250.00")
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot.today_revenue, Decimal("250.00"))
+        self.assertEqual(snapshot.today_payments, 1)
+        self.assertEqual(snapshot.month_revenue, Decimal("250.00"))
+
+        payment.status = "refunded"
+        payment.save()
+        self.assertEqual(self.snapshot().today_revenue, Decimal("0"))
+
+        # Members count for every club of the organization
+        profile = self.member("new-member")
+        self.assertEqual(
+            list(
+                ClubDashboardSnapshot.objects.order_by("club__slug").values_list(
+                    "active_members", flat=True
+                )
+            ),
+            [1, 1],
+        )
+        profile.is_active = False
+        profile.save()
+        self.assertEqual(self.snapshot().active_members, 0)
+
+    def test_feeds_refresh_once_the_transaction_commits(self):
+        ClubSnapshotService.get(self.club)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reserve(timezone.localdate() + timedelta(days=1), time(18), time(19))
+
+        self.assertEqual(len(self.snapshot().upcoming_reservations), 1)
+        self.assertEqual(self.snapshot().recent_activity[0]["type"], "reservation")
+
+    def test_stale_or_invalidated_snapshots_are_rebuilt(self):
+        ClubSnapshotService.get(self.club)
+        ClubDashboardSnapshot.objects.filter(club=self.club).update(
+            day=timezone.localdate() - timedelta(days=1), today_reservations=7
+        )
+
+        club = Club.objects.select_related("dashboard_snapshot").get(pk=self.club.pk)
+        snapshot = ClubSnapshotService.get(club)
+        self.assertEqual(snapshot.day, timezone.localdate())
+        self.assertEqual(snapshot.today_reservations, 0)
+
+        # Capacity changes drop the snapshot until the next read
+        self.courts[1].is_active = False
+        self.courts[1].save()
+        self.assertFalse(ClubDashboardSnapshot.objects.exists())
+        club = Club.objects.select_related("dashboard_snapshot").get(pk=self.club.pk)
+        self.assertEqual(ClubSnapshotService.get(club).active_courts, 1)
+
+    def test_dashboard_actions_read_one_row(self):
+        ClubSnapshotService.get(self.club)
+        factory = APIRequestFactory()
+
+        for action in ["dashboard_stats", "mobile_dashboard", "financial_summary"]:
+            request = factory.get(f"/clubs/{self.club.slug}/{action}/")
+            force_authenticate(request, user=self.admin)
+            view = ClubViewSet.as_view({"get": action})
+            with self.assertNumQueries(1):
+                response = view(request, slug=self.club.slug)
+            self.assertEqual(response.status_code, 200, action)
+
+        self.assertEqual(response.data["revenue"]["transactions"], 0)
@@ -0,0 +1,228 @@
+"""
+Tests for the incremental offline sync feed.
+"""
+
+import gzip
+import json
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clubs.models import Club, Court, Schedule, SyncChange
+from apps.clubs.sync import ClubSyncFeed, decode_cursor, encode_cursor, prune_sync_changes
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+
+User = get_user_model()
+
+
+class ClubSyncFeedTest(TestCase):
+    """Test snapshots, deltas and snapshot fallback of the offline feed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Sync Org", business_name="Sync Org LLC"
+        )
+        cls.user = User.objects.create_user(
+            username="player", email="player@example.com", password="TEST_PASSWORD"
+        )
+        cls.other_user = User.objects.create_user(
+            username="other", email="other@example.com", password="TEST_PASSWORD"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Sync Club",
+            slug="sync-club",
+            email="club@example.com",
+            phone="+5255000000",
+        )
+        cls.courts = [
+            Court.objects.create(
+                club=cls.club,
+                organization=cls.organization,
+                name=f"Cancha {number}",
+                number=number,
+                price_per_hour=Decimal("100.00"),
+            )
+            for number in (1, 2)
+        ]
+
+    def reserve(self, created_by, start):
+        reservation = Reservation(
+            organization=self.organization,
+            club=self.club,
+            court=self.courts[0],
+            created_by=created_by,
+            date=timezone.localdate() + timedelta(days=1),
+            start_time=time(start),
+            end_time=time(start + 1),
+            duration_minutes=60,
+            player_name="Jugador",
+            player_email="jugador@example.com",
+            price_per_hour=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+            status="confirmed",
+        )
+        Reservation.objects.bulk_create([reservation])
+        return reservation
+
+    def feed(self, now=None):
+        return ClubSyncFeed(self.club, self.user, now=now)
+
+    def later(self, seconds=60):
+        return timezone.now() + timedelta(seconds=seconds)
+
+    def test_snapshot_holds_club_data_and_own_reservations(self):
+        own = self.reserve(self.user, 9)
+        self.reserve(self.other_user, 10)
+
+        payload = self.feed().build()
+
+        self.assertEqual(payload["mode"], "snapshot")
+        self.assertEqual(payload["club"]["slug"], "sync-club")
+        self.assertEqual(len(payload["courts"]), 2)
+        self.assertEqual([row["id"] for row in payload["reservations"]], [own.id])
+        self.assertIsNotNone(decode_cursor(payload["cursor"]))
+
+    def test_delta_sends_changed_objects_and_tombstones(self):
+        cursor = self.feed().build()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            court = self.courts[0]
+            court.price_per_hour = Decimal("120.00")
+            court.save()
+            retired = self.courts[1]
+            retired.is_active = False
+            retired.save()
+            schedule = Schedule.objects.create(
+                club=self.club,
+                organization=self.organization,
+                weekday=5,
+                opening_time=time(8),
+                closing_time=time(14),
+            )
+
+        payload = self.feed(now=self.later()).build(cursor)
+
+        self.assertEqual(payload["mode"], "delta")
+        changes = payload["changes"]
+        self.assertEqual(
+            [row["price_per_hour"] for row in changes["courts"]["upserts"]],
+            [Decimal("120.00")],
+        )
+        self.assertEqual(changes["courts"]["deletes"], [str(retired.id)])
+        self.assertEqual(changes["schedules"]["upserts"][0]["id"], schedule.id)
+        # Court saves refresh total_courts only, which is not synced
+        self.assertNotIn("club", changes)
+        self.assertNotIn("reservations", changes)
+
+        # Nothing new since the returned cursor
+        payload = self.feed(now=self.later(120)).build(payload["cursor"])
+        self.assertEqual(payload["changes"], {})
+
+    def test_reservations_of_other_users_are_not_synced(self):
+        cursor = self.feed().build()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            own = self.reserve(self.user, 9)
+            other = self.reserve(self.other_user, 10)
+            for reservation in (own, other):
+                reservation.status = "cancelled"
+                reservation.save(update_fields=["status"])
+
+        changes = self.feed(now=self.later()).build(cursor)["changes"]
+
+        self.assertEqual(
+            [(row["id"], row["status"]) for row in changes["reservations"]["upserts"]],
+            [(own.id, "cancelled")],
+        )
+        self.assertEqual(changes["reservations"]["deletes"], [])
+
+    def test_reservation_tombstones_only_reach_their_owner(self):
+        own = self.reserve(self.user, 9)
+        other = self.reserve(self.other_user, 10)
+        own_id, other_id = str(own.id), str(other.id)
+        cursor = self.feed().build()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            own.delete()
+            other.delete()
+
+        changes = self.feed(now=self.later()).build(cursor)["changes"]
+        other_changes = ClubSyncFeed(self.club, self.other_user, now=self.later()).build(
+            cursor
+        )["changes"]
+
+        self.assertEqual(changes["reservations"]["deletes"], [own_id])
+        self.assertEqual(other_changes["reservations"]["deletes"], [other_id])
+
+    def test_cursor_waits_for_unsettled_changes(self):
+        cursor = self.feed().build()["cursor"]
+        sequence = decode_cursor(cursor)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.courts[0].save()
+
+        payload = self.feed().build(cursor)
+
+        # Sent now, and again on the next sync
+        self.assertEqual(len(payload["changes"]["courts"]["upserts"]), 1)
+        self.assertEqual(decode_cursor(payload["cursor"])[0], sequence)
+
+    def test_old_invalid_or_oversized_cursors_fall_back_to_snapshot(self):
+        expired = encode_cursor(0, timezone.now() - timedelta(days=31))
+        self.assertEqual(self.feed().build(expired)["mode"], "snapshot")
+        self.assertEqual(self.feed().build("not-a-cursor")["mode"], "snapshot")
+
+        cursor = self.feed().build()["cursor"]
+        with self.captureOnCommitCallbacks(execute=True):
+            for court in self.courts:
+                court.save()
+        with override_settings(SYNC_MAX_CHANGES=1):
+            self.assertEqual(
+                self.feed(now=self.later()).build(cursor)["mode"], "snapshot"
+            )
+
+    def test_prune_drops_changes_past_retention(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.courts[0].save()
+
+        self.assertEqual(prune_sync_changes(now=self.later()), 0)
+        self.assertEqual(prune_sync_changes(now=timezone.now() + timedelta(days=31)), 1)
+        self.assertFalse(SyncChange.objects.exists())
+
+
+class OfflineDataEndpointTest(TestCase):
+    """Test the offline_data action serving the sync feed."""
+
+    def setUp(self):
+        organization = Organization.objects.create(
+            trade_name="Sync Org", business_name="Sync Org LLC"
+        )
+        self.club = Club.objects.create(
+            organization=organization,
+            name="Sync Club",
+            slug="sync-club",
+            email="club@example.com",
+            phone="+5255000000",
+        )
+        user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="TEST_PASSWORD"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        self.url = reverse("clubs:club-offline-data", kwargs={"slug": self.club.slug})
+
+    def test_response_is_gzipped_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        payload = json.loads(gzip.decompress(response.content))
+        self.assertEqual(payload["mode"], "snapshot")
+
+        response = self.client.get(self.url, {"cursor": payload["cursor"]})
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response.json()["mode"], "delta")
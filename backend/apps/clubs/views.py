@@ -4,23 +4,27 @@ Views for clubs module - EMERGENCY RECOVERY VERSION.
 
 import datetime
 from datetime import timedelta
-from decimal import Decimal
 
-from django.db import models
 from django.db.models import Count, Q, Sum, F, DurationField
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
 
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.conditional import ConditionalGetMixin
 from core.permissions import IsOrganizationMember, IsOwnerOrReadOnly, HasClubAccessBySlug
 from core.pagination import StandardResultsSetPagination
 
 from .court_actions import CourtActionsMixin
 from .models import Announcement, Club, Court, Schedule, CourtSpecialPricing
+from .read_models import CONTEXT_KEY as READ_MODEL_CONTEXT_KEY, CourtReadModel
+from .snapshots import ClubSnapshotService, percent_change
+from .sync import ClubSyncFeed
 from .optimizations import (
     CourtAvailabilityOptimizer, 
     ClubRevenueOptimizer, 
@@ -38,11 +42,25 @@ from .serializers import (
     SpecialPricingPeriodSummarySerializer,
 )
 
+# Actions served from the club's dashboard snapshot
+SNAPSHOT_ACTIONS = {
+    "dashboard_stats",
+    "mobile_dashboard",
+    "analytics_summary",
+    "member_management",
+    "financial_summary",
+}
 
-class ClubViewSet(viewsets.ModelViewSet):
+
+def _occupancy(booked_minutes, capacity_minutes):
+    return booked_minutes / capacity_minutes * 100 if capacity_minutes else 0.0
+
+
+class ClubViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing clubs - EMERGENCY RECOVERY VERSION."""
 
     serializer_class = ClubSerializer
+    conditional_dependencies = ["clubs.Court"]
     permission_classes = [IsAuthenticated, IsOrganizationMember]
     lookup_field = "slug"
     pagination_class = StandardResultsSetPagination
@@ -52,9 +70,13 @@ class ClubViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         # Base queryset
-        queryset = Club.objects.select_related("organization").prefetch_related(
-            "courts", "schedules"
-        )
+        if self.action in SNAPSHOT_ACTIONS:
+            # One row: the club joined to its dashboard snapshot
+            queryset = Club.objects.select_related("organization", "dashboard_snapshot")
+        else:
+            queryset = Club.objects.select_related("organization").prefetch_related(
+                "courts", "schedules"
+            )
 
         # Filter by user's club membership
         if user.is_superuser:
@@ -119,254 +141,48 @@ class ClubViewSet(viewsets.ModelViewSet):
     def dashboard_stats(self, request, slug=None):
         """Get dashboard statistics for a specific club."""
         club = self.get_object()
-        today = timezone.now().date()
-        
-        # Import here to avoid circular imports
-        from apps.reservations.models import Reservation
-        from apps.finance.models import Transaction
-        from apps.clients.models import ClientProfile
         
         try:
-            # Today's reservations count
-            today_reservations = Reservation.objects.filter(
-                club=club,
-                date=today,
-                status__in=['confirmed', 'pending']
-            ).count()
+            snapshot = ClubSnapshotService.get(club)
+            today = snapshot.day
             
-            # Calculate percentage change vs last month
-            last_month_start = today.replace(day=1) - timedelta(days=1)
-            last_month_start = last_month_start.replace(day=1)
+            # Today's figures against last month's daily average
             last_month_end = today.replace(day=1) - timedelta(days=1)
+            days_in_last_month = last_month_end.day
+            reservations_change = percent_change(
+                snapshot.today_reservations,
+                snapshot.last_month_reservations / days_in_last_month,
+            )
             
-            last_month_reservations = Reservation.objects.filter(
-                club=club,
-                date__gte=last_month_start,
-                date__lte=last_month_end,
-                status__in=['confirmed', 'pending']
-            ).count()
-            
-            # Calculate daily average for last month
-            days_in_last_month = (last_month_end - last_month_start).days + 1
-            last_month_daily_avg = last_month_reservations / days_in_last_month if days_in_last_month > 0 else 0
-            
-            # Calculate percentage change
-            if last_month_daily_avg > 0:
-                reservations_change = ((today_reservations - last_month_daily_avg) / last_month_daily_avg) * 100
-            else:
-                reservations_change = 100 if today_reservations > 0 else 0
-            
-            # Upcoming reservations (next 2-3 reservations)
-            upcoming_reservations = Reservation.objects.filter(
-                club=club,
-                date__gte=today,
-                status__in=['confirmed', 'pending']
-            ).select_related('court').order_by('date', 'start_time')[:3]
-            
-            upcoming_data = []
-            for reservation in upcoming_reservations:
-                upcoming_data.append({
-                    'id': reservation.id,
-                    'player_name': reservation.player_name,
-                    'court': reservation.court.name,
-                    'date': reservation.date.isoformat(),
-                    'start_time': reservation.start_time.strftime('%H:%M'),
-                    'end_time': reservation.end_time.strftime('%H:%M'),
-                    'status': reservation.status,
-                    'player_count': reservation.player_count
-                })
-            
-            # Recent activity (last 5 activities)
-            recent_activities = []
-            
-            # Recent reservations
-            recent_reservations = Reservation.objects.filter(
-                club=club,
-                created_at__gte=today - timedelta(days=7)
-            ).select_related('court').order_by('-created_at')[:3]
-            
-            for reservation in recent_reservations:
-                recent_activities.append({
-                    'type': 'reservation',
-                    'description': f'Nueva reserva de {reservation.player_name} para {reservation.court.name}',
-                    'timestamp': reservation.created_at.isoformat(),
-                    'user': reservation.player_name,
-                    'details': {
-                        'court': reservation.court.name,
-                        'date': reservation.date.isoformat(),
-                        'time': reservation.start_time.strftime('%H:%M')
-                    }
-                })
-            
-            # Recent payments
-            recent_payments = Transaction.objects.filter(
-                club=club,
-                transaction_type='income',
-                status='completed',
-                transaction_date__gte=timezone.now() - timedelta(days=7)
-            ).order_by('-transaction_date')[:2]
-            
-            for payment in recent_payments:
-                recent_activities.append({
-                    'type': 'payment',
-                    'description': f'Pago recibido: ${float(payment.amount):.2f}',
-                    'timestamp': payment.transaction_date.isoformat(),
-                    'user': payment.user.get_full_name() if payment.user else 'Cliente',
-                    'details': {
-                        'amount': float(payment.amount),
-                        'payment_method': payment.payment_method.name if payment.payment_method else 'N/A',
-                        'category': payment.get_category_display()
-                    }
-                })
-            
-            # Recent client registrations (if any)
-            recent_clients = ClientProfile.objects.filter(
-                club=club,
-                created_at__gte=today - timedelta(days=7)
-            ).select_related('user').order_by('-created_at')[:2]
-            
-            for client in recent_clients:
-                recent_activities.append({
-                    'type': 'client_registration',
-                    'description': f'Nuevo cliente registrado: {client.user.get_full_name()}',
-                    'timestamp': client.created_at.isoformat(),
-                    'user': client.user.get_full_name(),
-                    'details': {
-                        'level': client.level.display_name if client.level else 'Sin nivel',
-                        'email': client.user.email
-                    }
-                })
-            
-            # Sort recent activities by timestamp (most recent first)
-            recent_activities.sort(key=lambda x: x['timestamp'], reverse=True)
-            recent_activities = recent_activities[:5]  # Limit to 5 most recent
-            
-            # Get active courts count
-            total_courts = club.get_active_courts_count()
-            
-            # Get active members count and calculate change
-            from apps.clients.models import ClientProfile
-            current_members = ClientProfile.objects.filter(
-                organization=club.organization,
-                is_active=True
-            ).distinct().count()
-            
-            # Calculate active members change vs last month
-            previous_month_start = last_month_start
-            previous_month_end = last_month_end
-            
-            # Get members who were active last month
-            last_month_members = ClientProfile.objects.filter(
-                organization=club.organization,
-                is_active=True,
-                created_at__lte=previous_month_end
-            ).distinct().count()
-            
-            # Calculate percentage change in active members
-            if last_month_members > 0:
-                active_members_change = ((current_members - last_month_members) / last_month_members) * 100
-            else:
-                active_members_change = 100 if current_members > 0 else 0
-            
-            # Calculate occupancy for today and last month comparison
-            total_court_hours = total_courts * 12  # Assuming 12 hours of operation
-            
-            # Today's occupancy
-            reserved_hours_today = Reservation.objects.filter(
-                club=club,
-                date=today,
-                status__in=['confirmed', 'pending']
-            ).aggregate(
-                total_hours=models.Sum(
-                    models.F('end_time') - models.F('start_time'),
-                    output_field=models.DurationField()
-                )
-            )['total_hours']
-            
-            if reserved_hours_today and total_court_hours > 0:
-                # Convert duration to hours
-                reserved_hours_float = reserved_hours_today.total_seconds() / 3600
-                average_occupancy = (reserved_hours_float / total_court_hours) * 100
-            else:
-                average_occupancy = 0
-            
-            # Last month's average occupancy
-            last_month_reservations = Reservation.objects.filter(
-                club=club,
-                date__gte=last_month_start,
-                date__lte=last_month_end,
-                status__in=['confirmed', 'pending']
-            ).aggregate(
-                total_hours=models.Sum(
-                    models.F('end_time') - models.F('start_time'),
-                    output_field=models.DurationField()
-                )
-            )['total_hours']
-            
-            if last_month_reservations:
-                last_month_hours_float = last_month_reservations.total_seconds() / 3600
-                last_month_daily_occupancy = (last_month_hours_float / (days_in_last_month * total_court_hours)) * 100 if (days_in_last_month * total_court_hours) > 0 else 0
-                
-                # Calculate occupancy change
-                if last_month_daily_occupancy > 0:
-                    occupancy_change = ((average_occupancy - last_month_daily_occupancy) / last_month_daily_occupancy) * 100
-                else:
-                    occupancy_change = 100 if average_occupancy > 0 else 0
-            else:
-                occupancy_change = 100 if average_occupancy > 0 else 0
-            
-            # Calculate revenue metrics
-            current_month_start = today.replace(day=1)
-            current_month_revenue = Transaction.objects.filter(
-                club=club,
-                transaction_type='income',
-                status='completed',
-                transaction_date__gte=current_month_start,
-                transaction_date__lte=today
-            ).aggregate(
-                total=models.Sum('amount')
-            )['total'] or Decimal('0')
-            
-            last_month_revenue = Transaction.objects.filter(
-                club=club,
-                transaction_type='income',
-                status='completed',
-                transaction_date__gte=last_month_start,
-                transaction_date__lte=last_month_end
-            ).aggregate(
-                total=models.Sum('amount')
-            )['total'] or Decimal('0')
+            average_occupancy = _occupancy(
+                snapshot.today_booked_minutes, snapshot.today_capacity_minutes
+            )
+            last_month_occupancy = _occupancy(
+                snapshot.last_month_booked_minutes, snapshot.last_month_capacity_minutes
+            )
             
-            # Calculate revenue change
-            if last_month_revenue > 0:
-                # Normalize to daily average for comparison
-                current_days = (today - current_month_start).days + 1
-                last_month_days = (last_month_end - last_month_start).days + 1
-                
-                current_daily_avg = current_month_revenue / current_days if current_days > 0 else Decimal('0')
-                last_month_daily_avg = last_month_revenue / last_month_days if last_month_days > 0 else Decimal('0')
-                
-                if last_month_daily_avg > 0:
-                    revenue_change = float(((current_daily_avg - last_month_daily_avg) / last_month_daily_avg) * 100)
-                else:
-                    revenue_change = 100 if current_daily_avg > 0 else 0
-            else:
-                revenue_change = 100 if current_month_revenue > 0 else 0
+            # Revenue normalized to daily averages
+            revenue_change = percent_change(
+                snapshot.month_revenue / today.day,
+                snapshot.last_month_revenue / days_in_last_month,
+            )
             
             return Response({
-                'today_reservations': today_reservations,
-                'today_reservations_change': round(reservations_change, 1),
-                'total_courts': total_courts,
-                'active_members': current_members,
-                'active_members_change': round(active_members_change, 1),
+                'today_reservations': snapshot.today_reservations,
+                'today_reservations_change': reservations_change,
+                'total_courts': snapshot.active_courts,
+                'active_members': snapshot.active_members,
+                'active_members_change': percent_change(
+                    snapshot.active_members, snapshot.last_month_members
+                ),
                 'average_occupancy': round(average_occupancy, 1),
-                'occupancy_change': round(occupancy_change, 1),
-                'current_month_revenue': float(current_month_revenue),
-                'revenue_change': round(revenue_change, 1),
-                'last_month_revenue': float(last_month_revenue),
-                'upcoming_reservations': upcoming_data,
-                'recent_activity': recent_activities,
-                'generated_at': timezone.now().isoformat()
+                'occupancy_change': percent_change(average_occupancy, last_month_occupancy),
+                'current_month_revenue': float(snapshot.month_revenue),
+                'revenue_change': revenue_change,
+                'last_month_revenue': float(snapshot.last_month_revenue),
+                'upcoming_reservations': snapshot.upcoming_reservations,
+                'recent_activity': snapshot.recent_activity,
+                'generated_at': snapshot.updated_at.isoformat()
             })
             
         except Exception as e:
@@ -376,7 +192,7 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"], url_path="mobile-dashboard")
-    def mobile_dashboard(self, request, pk=None):
+    def mobile_dashboard(self, request, slug=None):
         """
         Mobile-optimized club dashboard with essential data only.
         
@@ -384,13 +200,9 @@ class ClubViewSet(viewsets.ModelViewSet):
         format optimized for mobile consumption.
         """
         club = self.get_object()
-        today = timezone.now().date()
-        now = timezone.now()
         
         try:
-            # Import models
-            from apps.reservations.models import Reservation
-            from apps.finance.models import Transaction
+            snapshot = ClubSnapshotService.get(club)
             
             # Essential mobile data only
             mobile_data = {
@@ -403,13 +215,14 @@ class ClubViewSet(viewsets.ModelViewSet):
                     'closing_time': club.closing_time.strftime('%H:%M') if club.closing_time else None,
                 },
                 'today_stats': {
-                    'reservations_count': Reservation.objects.filter(
-                        club=club,
-                        date=today,
-                        status__in=['confirmed', 'pending']
-                    ).count(),
-                    'active_courts': club.courts.filter(is_active=True).count(),
-                    'occupancy_rate': 0,  # Will be calculated
+                    'reservations_count': snapshot.today_reservations,
+                    'active_courts': snapshot.active_courts,
+                    'occupancy_rate': round(
+                        _occupancy(
+                            snapshot.today_booked_minutes, snapshot.today_capacity_minutes
+                        ),
+                        1,
+                    ),
                 },
                 'notifications': [],  # Placeholder for push notifications
                 'quick_actions': [
@@ -417,7 +230,7 @@ class ClubViewSet(viewsets.ModelViewSet):
                     {'action': 'court_status', 'label': 'Court Status'},
                     {'action': 'member_checkin', 'label': 'Member Check-in'},
                 ],
-                'last_updated': now.isoformat()
+                'last_updated': snapshot.updated_at.isoformat()
             }
             
             return Response(mobile_data)
@@ -485,61 +298,40 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"])
-    def analytics_summary(self, request, pk=None):
+    def analytics_summary(self, request, slug=None):
         """
         Club analytics summary optimized for mobile display.
         
-        Returns key performance indicators and trends.
+        Returns key performance indicators and trends over the last 30
+        complete days.
         """
         club = self.get_object()
         
-        # Date range (default: last 30 days)
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
         try:
-            from apps.reservations.models import Reservation
-            from apps.finance.models import Transaction
-            
-            # Key metrics
-            reservations = Reservation.objects.filter(
-                club=club,
-                created_at__gte=start_date,
-                created_at__lte=end_date
-            )
-            
-            revenue = Transaction.objects.filter(
-                club=club,
-                transaction_type='income',
-                status='completed',
-                transaction_date__gte=start_date.date(),
-                transaction_date__lte=end_date.date()
-            ).aggregate(total=models.Sum('amount'))['total'] or 0
+            snapshot = ClubSnapshotService.get(club)
+            bookings = snapshot.last_30_days_reservations
+            revenue = snapshot.last_30_days_revenue
             
             analytics_data = {
                 'period': {
-                    'start_date': start_date.date().isoformat(),
-                    'end_date': end_date.date().isoformat(),
+                    'start_date': (snapshot.day - timedelta(days=30)).isoformat(),
+                    'end_date': (snapshot.day - timedelta(days=1)).isoformat(),
                     'days': 30
                 },
                 'kpis': {
-                    'total_bookings': reservations.count(),
-                    'confirmed_bookings': reservations.filter(status='confirmed').count(),
-                    'cancelled_bookings': reservations.filter(status='cancelled').count(),
+                    'total_bookings': bookings,
+                    'confirmed_bookings': snapshot.last_30_days_confirmed,
+                    'cancelled_bookings': snapshot.last_30_days_cancelled,
                     'total_revenue': float(revenue),
-                    'avg_booking_value': float(revenue / reservations.count() if reservations.count() > 0 else 0),
+                    'avg_booking_value': float(revenue / bookings if bookings > 0 else 0),
                 },
                 'trends': {
                     'booking_trend': 'up',  # Simplified - would calculate actual trend
                     'revenue_trend': 'up',
                     'occupancy_trend': 'stable'
                 },
-                'top_courts': list(
-                    reservations.values('court__name')
-                    .annotate(booking_count=models.Count('id'))
-                    .order_by('-booking_count')[:3]
-                ),
-                'generated_at': timezone.now().isoformat()
+                'top_courts': snapshot.top_courts,
+                'generated_at': snapshot.updated_at.isoformat()
             }
             
             return Response(analytics_data)
@@ -551,7 +343,7 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"])
-    def member_management(self, request, pk=None):
+    def member_management(self, request, slug=None):
         """
         Member management interface data for club staff.
         
@@ -560,38 +352,16 @@ class ClubViewSet(viewsets.ModelViewSet):
         club = self.get_object()
         
         try:
-            from apps.clients.models import ClientProfile
-            from apps.reservations.models import Reservation
-            
-            # Get club members (users with recent reservations)
-            recent_date = timezone.now() - timedelta(days=90)  # 3 months
-            
-            active_members = ClientProfile.objects.filter(
-                user__reservations__club=club,
-                user__reservations__created_at__gte=recent_date
-            ).distinct()
+            snapshot = ClubSnapshotService.get(club)
             
             member_data = {
                 'stats': {
-                    'total_active_members': active_members.count(),
-                    'new_members_this_month': active_members.filter(
-                        created_at__gte=timezone.now() - timedelta(days=30)
-                    ).count(),
+                    # Clients with a reservation in the last 3 months
+                    'total_active_members': snapshot.recent_players,
+                    'new_members_this_month': snapshot.new_recent_players,
                     'member_retention_rate': 85,  # Placeholder - would calculate actual
                 },
-                'recent_activity': list(
-                    Reservation.objects.filter(
-                        club=club,
-                        created_at__gte=timezone.now() - timedelta(days=7)
-                    ).select_related('user')
-                    .values(
-                        'user__email',
-                        'user__first_name',
-                        'user__last_name',
-                        'created_at',
-                        'status'
-                    ).order_by('-created_at')[:10]
-                ),
+                'recent_activity': snapshot.recent_reservations,
                 'member_tools': [
                     {'action': 'member_search', 'label': 'Search Members'},
                     {'action': 'send_announcement', 'label': 'Send Announcement'},
@@ -609,46 +379,32 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"])
-    def financial_summary(self, request, pk=None):
+    def financial_summary(self, request, slug=None):
         """
         Financial summary for club management.
         
-        Returns revenue, costs, and profitability metrics.
+        Returns revenue, costs, and profitability metrics over the last 30
+        complete days.
         """
         club = self.get_object()
         
-        # Date range
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
         try:
-            from apps.finance.models import Transaction
-            
-            # Revenue calculation
-            revenue_data = Transaction.objects.filter(
-                club=club,
-                transaction_type='income',
-                status='completed',
-                transaction_date__gte=start_date.date(),
-                transaction_date__lte=end_date.date()
-            ).aggregate(
-                total_revenue=models.Sum('amount'),
-                transaction_count=models.Count('id'),
-                avg_transaction=models.Avg('amount')
-            )
+            snapshot = ClubSnapshotService.get(club)
+            total_revenue = float(snapshot.last_30_days_revenue)
+            transactions = snapshot.last_30_days_payments
             
             # Cost calculation (placeholder - would integrate with expense tracking)
-            estimated_costs = float(revenue_data['total_revenue'] or 0) * 0.3  # 30% of revenue
+            estimated_costs = total_revenue * 0.3  # 30% of revenue
             
             financial_data = {
                 'period': {
-                    'start_date': start_date.date().isoformat(),
-                    'end_date': end_date.date().isoformat()
+                    'start_date': (snapshot.day - timedelta(days=30)).isoformat(),
+                    'end_date': (snapshot.day - timedelta(days=1)).isoformat()
                 },
                 'revenue': {
-                    'total': float(revenue_data['total_revenue'] or 0),
-                    'transactions': revenue_data['transaction_count'] or 0,
-                    'average_transaction': float(revenue_data['avg_transaction'] or 0),
+                    'total': total_revenue,
+                    'transactions': transactions,
+                    'average_transaction': total_revenue / transactions if transactions else 0,
                 },
                 'costs': {
                     'estimated_total': estimated_costs,
@@ -660,11 +416,11 @@ class ClubViewSet(viewsets.ModelViewSet):
                     }
                 },
                 'profitability': {
-                    'gross_profit': float(revenue_data['total_revenue'] or 0) - estimated_costs,
-                    'margin_percentage': ((float(revenue_data['total_revenue'] or 0) - estimated_costs) / 
-                                        float(revenue_data['total_revenue'] or 1)) * 100,
+                    'gross_profit': total_revenue - estimated_costs,
+                    'margin_percentage': ((total_revenue - estimated_costs) / 
+                                        (total_revenue or 1)) * 100,
                 },
-                'generated_at': timezone.now().isoformat()
+                'generated_at': snapshot.updated_at.isoformat()
             }
             
             return Response(financial_data)
@@ -727,50 +483,22 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"])
-    def offline_data(self, request, pk=None):
+    @method_decorator(gzip_page)
+    def offline_data(self, request, pk=None, slug=None):
         """
-        Essential data for offline mobile app functionality.
-        
-        Returns minimal data set that mobile apps can cache for offline use.
+        Offline data for the mobile app, synced incrementally.
+
+        Query params:
+        - cursor: Cursor returned by the previous sync. Without it, or when it
+          is too old, a full snapshot is returned; otherwise only the changes
+          since then (see apps.clubs.sync).
         """
         club = self.get_object()
-        
+
         try:
-            # Essential offline data
-            offline_data = {
-                'club_info': {
-                    'id': str(club.id),
-                    'name': club.name,
-                    'slug': club.slug,
-                    'phone': club.phone,
-                    'email': club.email,
-                    'address': club.address,
-                    'opening_time': club.opening_time.strftime('%H:%M') if club.opening_time else None,
-                    'closing_time': club.closing_time.strftime('%H:%M') if club.closing_time else None,
-                    'days_open': club.days_open,
-                },
-                'courts': list(
-                    club.courts.filter(is_active=True).values(
-                        'id', 'name', 'court_type', 'hourly_rate', 'features'
-                    )
-                ),
-                'pricing_rules': {
-                    'base_rates': {},  # Would populate with actual pricing
-                    'special_rates': {},
-                    'member_discounts': {},
-                },
-                'business_rules': {
-                    'advance_booking_days': 30,
-                    'cancellation_hours': 24,
-                    'min_booking_duration': 60,
-                    'max_booking_duration': 180,
-                },
-                'last_sync': timezone.now().isoformat(),
-                'data_version': 1  # For cache invalidation
-            }
-            
-            return Response(offline_data)
-            
+            feed = ClubSyncFeed(club, request.user)
+            return Response(feed.build(request.query_params.get("cursor")))
+
         except Exception as e:
             return Response(
                 {'error': f'Error generating offline data: {str(e)}'},
@@ -976,18 +704,46 @@ class ClubViewSet(viewsets.ModelViewSet):
             )
 
 
-class CourtViewSet(CourtActionsMixin, viewsets.ModelViewSet):
+class CourtViewSet(ConditionalGetMixin, CourtActionsMixin, viewsets.ModelViewSet):
     """ViewSet for managing courts - EMERGENCY RECOVERY VERSION."""
 
     serializer_class = CourtSerializer
+    # Detail fields embed maintenance, reservation figures and current prices
+    conditional_dependencies = [
+        "clubs.Club",
+        "clubs.CourtSpecialPricing",
+        "clubs.MaintenanceRecord",
+        "reservations.Reservation",
+    ]
+    conditional_time_bucket = 900
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
+    def get_conditional_dependencies(self):
+        # Only detail responses carry reservation figures; plain court lists
+        # must not be invalidated by every booking
+        if self.get_serializer_class() is CourtDetailSerializer:
+            return self.conditional_dependencies
+        return [
+            label for label in self.conditional_dependencies
+            if label != "reservations.Reservation"
+        ]
+
     def get_serializer_class(self):
-        """Use detailed serializer for retrieve action."""
+        """Use detailed serializer for retrieve action, or list with ?detail=true."""
         if self.action == 'retrieve':
             return CourtDetailSerializer
+        if self.action == 'list' and self.request.query_params.get("detail") == "true":
+            return CourtDetailSerializer
         return CourtSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        """Hand detail serializers one read model for the whole page."""
+        if args and args[0] is not None and self.get_serializer_class() is CourtDetailSerializer:
+            courts = args[0] if kwargs.get("many") else [args[0]]
+            context = kwargs.setdefault("context", self.get_serializer_context())
+            context[READ_MODEL_CONTEXT_KEY] = CourtReadModel(courts)
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         """Filter courts by organization and club."""
         user = self.request.user
@@ -1065,7 +821,7 @@ class CourtViewSet(CourtActionsMixin, viewsets.ModelViewSet):
         return Response(CourtSerializer(court).data)
 
 
-class ScheduleViewSet(viewsets.ModelViewSet):
+class ScheduleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing schedules - EMERGENCY RECOVERY VERSION."""
 
     serializer_class = ScheduleSerializer
@@ -1224,10 +980,11 @@ class UserClubsView(viewsets.ReadOnlyModelViewSet):
         })
 
 
-class CourtSpecialPricingViewSet(viewsets.ModelViewSet):
+class CourtSpecialPricingViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for managing court special pricing periods."""
 
     serializer_class = CourtSpecialPricingSerializer
+    conditional_dependencies = ["clubs.Court", "clubs.Club"]
     permission_classes = [IsAuthenticated, IsOrganizationMember]
 
     def get_queryset(self):
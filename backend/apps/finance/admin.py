@@ -11,7 +11,8 @@ from .models import (
     Payment,
     PaymentRefund,
     PaymentMethod,
-    PaymentIntent
+    PaymentIntent,
+    WebhookEvent
 )
 
 
@@ -208,8 +209,12 @@ class PaymentAdmin(admin.ModelAdmin):
     
     def export_to_csv(self, request, queryset):
         """Export selected payments to CSV."""
-        # TODO: Implement CSV export
-        pass
+        from apps.finance.exports import PAYMENT_COLUMNS
+        from apps.shared.exports import CSV, Export
+
+        return Export(
+            "pagos", queryset.order_by("created_at", "id"), PAYMENT_COLUMNS
+        ).response(CSV)
     export_to_csv.short_description = "Export to CSV"
 
 
@@ -312,4 +317,48 @@ class PaymentIntentAdmin(admin.ModelAdmin):
         'updated_at',
         'confirmed_at',
         'cancelled_at'
-    ]
\ No newline at end of file
+    ]
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Admin configuration for the webhook inbox."""
+    
+    list_display = [
+        'event_id',
+        'provider',
+        'event_type',
+        'status',
+        'attempts',
+        'event_created_at',
+        'processed_at'
+    ]
+    
+    list_filter = [
+        'provider',
+        'status',
+        'event_type'
+    ]
+    
+    search_fields = [
+        'event_id',
+        'object_key'
+    ]
+    
+    readonly_fields = [
+        'created_at',
+        'updated_at',
+        'processed_at'
+    ]
+    
+    actions = ['retry_events']
+    
+    def retry_events(self, request, queryset):
+        """Send failed or dead events back to the inbox."""
+        updated = queryset.exclude(status='processed').update(
+            status='pending',
+            attempts=0,
+            next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} events queued for retry.')
+    retry_events.short_description = "Retry selected events"
@@ -9,26 +9,28 @@ This module ensures continuous payment processing capability.
 import logging
 import time
 from datetime import datetime, timedelta
-from enum import Enum
+from datetime import timezone as dt_timezone
 from typing import Dict, List, Optional, Callable, Any
 from decimal import Decimal
-from contextlib import contextmanager
 
 from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from apps.shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    circuit_breaker_registry,
+)
+
 logger = logging.getLogger('finance.circuit_breakers')
 
-# Circuit breaker states
-class CircuitBreakerState(Enum):
-    CLOSED = "closed"      # Normal operation
-    OPEN = "open"          # Failing, rejecting requests
-    HALF_OPEN = "half_open"  # Testing if service recovered
+# Kept for backwards compatibility with code importing the finance enum.
+CircuitBreakerState = CircuitState
 
 
-class PaymentGatewayCircuitBreaker:
+class PaymentGatewayCircuitBreaker(CircuitBreaker):
     """
     CRITICAL: Circuit breaker for payment gateway reliability.
     
@@ -36,145 +38,36 @@ class PaymentGatewayCircuitBreaker:
     when primary gateway fails. Prevents cascade failures and ensures
     continuous payment processing.
     """
-    
+
+    error_class = ValidationError
+
     def __init__(self, 
-                 gateway_name: str,
+                 name: str,
                  failure_threshold: int = 5,
                  recovery_timeout: int = 300,  # 5 minutes
-                 success_threshold: int = 3):
-        self.gateway_name = gateway_name
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout  
-        self.success_threshold = success_threshold
-        self.state = CircuitBreakerState.CLOSED
-        self.failure_count = 0
-        self.success_count = 0
-        self.last_failure_time = None
-        self.next_attempt_time = None
-        
-        # Cache keys for persistence across requests
-        self.state_cache_key = f"circuit_breaker_state_{gateway_name}"
-        self.failure_cache_key = f"circuit_breaker_failures_{gateway_name}"
-        self.last_failure_cache_key = f"circuit_breaker_last_failure_{gateway_name}"
-        
-        self._load_state_from_cache()
-    
-    def _load_state_from_cache(self):
-        """Load circuit breaker state from cache."""
-        try:
-            cached_state = cache.get(self.state_cache_key)
-            if cached_state:
-                self.state = CircuitBreakerState(cached_state)
-            
-            self.failure_count = cache.get(self.failure_cache_key, 0)
-            
-            last_failure = cache.get(self.last_failure_cache_key)
-            if last_failure:
-                self.last_failure_time = datetime.fromisoformat(last_failure)
-                self.next_attempt_time = self.last_failure_time + timedelta(seconds=self.recovery_timeout)
-            
-        except Exception as e:
-            logger.warning(f"Failed to load circuit breaker state: {e}")
-            # Reset to safe defaults
-            self.state = CircuitBreakerState.CLOSED
-            self.failure_count = 0
-            self.last_failure_time = None
-    
-    def _save_state_to_cache(self):
-        """Save circuit breaker state to cache."""
-        try:
-            cache.set(self.state_cache_key, self.state.value, 3600)  # 1 hour
-            cache.set(self.failure_cache_key, self.failure_count, 3600)
-            
-            if self.last_failure_time:
-                cache.set(
-                    self.last_failure_cache_key, 
-                    self.last_failure_time.isoformat(), 
-                    3600
-                )
-                
-        except Exception as e:
-            logger.error(f"Failed to save circuit breaker state: {e}")
-    
+                 success_threshold: int = 3,
+                 namespace: str = 'finance'):
+        super().__init__(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            success_threshold=success_threshold,
+            namespace=namespace,
+        )
+        self.gateway_name = name
+
+    def open_error(self) -> Exception:
+        return ValidationError(
+            f"Payment gateway {self.gateway_name} unavailable (circuit breaker OPEN)"
+        )
+
     def can_execute(self) -> bool:
         """Check if request can be executed through this gateway."""
-        current_time = timezone.now()
-        
-        if self.state == CircuitBreakerState.CLOSED:
-            return True
-        elif self.state == CircuitBreakerState.OPEN:
-            if self.next_attempt_time and current_time >= self.next_attempt_time:
-                self.state = CircuitBreakerState.HALF_OPEN
-                self.success_count = 0
-                logger.info(f"Circuit breaker {self.gateway_name} moving to HALF_OPEN")
-                self._save_state_to_cache()
-                return True
-            return False
-        elif self.state == CircuitBreakerState.HALF_OPEN:
-            return True
-        
-        return False
-    
-    def record_success(self):
-        """Record successful gateway operation."""
-        if self.state == CircuitBreakerState.HALF_OPEN:
-            self.success_count += 1
-            if self.success_count >= self.success_threshold:
-                self._reset()
-                logger.info(f"Circuit breaker {self.gateway_name} recovered - moving to CLOSED")
-        elif self.state == CircuitBreakerState.CLOSED:
-            # Reset failure count on success
-            if self.failure_count > 0:
-                self.failure_count = max(0, self.failure_count - 1)
-        
-        self._save_state_to_cache()
-    
-    def record_failure(self):
-        """Record gateway failure."""
-        self.failure_count += 1
-        self.last_failure_time = timezone.now()
-        
-        if self.state == CircuitBreakerState.HALF_OPEN:
-            self._trip()
-            logger.warning(f"Circuit breaker {self.gateway_name} failed during recovery - back to OPEN")
-        elif self.failure_count >= self.failure_threshold:
-            self._trip()
-            logger.critical(f"Circuit breaker {self.gateway_name} TRIPPED - too many failures")
-        
-        self._save_state_to_cache()
-    
-    def _trip(self):
-        """Trip the circuit breaker to OPEN state."""
-        self.state = CircuitBreakerState.OPEN
-        self.next_attempt_time = timezone.now() + timedelta(seconds=self.recovery_timeout)
-        
-        # Alert monitoring systems
-        logger.critical(
-            f"PAYMENT_GATEWAY_CIRCUIT_BREAKER_OPEN: {self.gateway_name} "
-            f"failures={self.failure_count} next_attempt={self.next_attempt_time}"
-        )
-    
-    def _reset(self):
-        """Reset circuit breaker to CLOSED state."""
-        self.state = CircuitBreakerState.CLOSED
-        self.failure_count = 0
-        self.success_count = 0
-        self.last_failure_time = None
-        self.next_attempt_time = None
-    
-    @contextmanager
+        return self.allow_request()
+
     def protected_call(self):
         """Context manager for protected gateway calls."""
-        if not self.can_execute():
-            raise ValidationError(f"Payment gateway {self.gateway_name} unavailable (circuit breaker OPEN)")
-        
-        try:
-            yield
-            self.record_success()
-        except Exception as e:
-            self.record_failure()
-            logger.error(f"Payment gateway {self.gateway_name} call failed: {e}")
-            raise
+        return self.protect()
 
 
 class FinanceRateLimiter:
@@ -410,10 +303,15 @@ class PaymentGatewayManager:
     def __init__(self):
         # Initialize circuit breakers for each gateway
         self.circuit_breakers = {
-            'stripe': PaymentGatewayCircuitBreaker('stripe', failure_threshold=3),
-            'paypal': PaymentGatewayCircuitBreaker('paypal', failure_threshold=5),
-            'oxxo': PaymentGatewayCircuitBreaker('oxxo', failure_threshold=10),
-            'spei': PaymentGatewayCircuitBreaker('spei', failure_threshold=5)
+            gateway: circuit_breaker_registry.get_or_create(
+                gateway,
+                namespace='finance',
+                breaker_class=PaymentGatewayCircuitBreaker,
+                failure_threshold=threshold,
+            )
+            for gateway, threshold in [
+                ('stripe', 3), ('paypal', 5), ('oxxo', 10), ('spei', 5)
+            ]
         }
         
         # Gateway priority order (primary to fallback)
@@ -603,7 +501,11 @@ class PaymentGatewayManager:
                 'state': circuit_breaker.state.value,
                 'can_execute': circuit_breaker.can_execute(),
                 'failure_count': circuit_breaker.failure_count,
-                'last_failure': circuit_breaker.last_failure_time.isoformat() if circuit_breaker.last_failure_time else None
+                'last_failure': (
+                    datetime.fromtimestamp(circuit_breaker.last_failure_time, tz=dt_timezone.utc).isoformat()
+                    if circuit_breaker.last_failure_time else None
+                ),
+                'latency': circuit_breaker.latency.snapshot()
             }
             
             status['gateways'][gateway_name] = gateway_status
@@ -0,0 +1,73 @@
+"""
+Row-level finance exports (see apps.shared.exports).
+"""
+
+from django.utils.dateparse import parse_date
+
+from apps.finance.models import Payment, Revenue
+from apps.shared.exports import Export, register_export
+
+
+PAYMENT_COLUMNS = [
+    ("Fecha", "created_at"),
+    ("Club", "club__name"),
+    ("Referencia", "reference_number"),
+    ("Tipo", "payment_type"),
+    ("Método", "payment_method"),
+    ("Estado", "status"),
+    ("Moneda", "currency"),
+    ("Monto", "amount"),
+    ("Comisión", "processing_fee"),
+    ("Neto", "net_amount"),
+    ("Procesado", "processed_at"),
+    ("Cliente", "billing_name"),
+    ("Email", "billing_email"),
+]
+
+
+@register_export("finance.revenues")
+def revenues_export(
+    organization_id, club_id=None, start_date=None, end_date=None, include_metadata=False
+):
+    """Revenue entries by date, optionally for one club."""
+    queryset = Revenue.objects.filter(organization_id=organization_id, is_active=True)
+    if club_id:
+        queryset = queryset.filter(club_id=club_id)
+    if start_date:
+        queryset = queryset.filter(date__gte=parse_date(start_date))
+    if end_date:
+        queryset = queryset.filter(date__lte=parse_date(end_date))
+
+    columns = [
+        ("Fecha", "date"),
+        ("Club", "club__name"),
+        ("Concepto", "concept"),
+        ("Descripción", "description"),
+        ("Método de pago", "payment_method"),
+        ("Monto", "amount"),
+        ("Referencia", "reference"),
+    ]
+    if include_metadata:
+        columns += [("ID", "id"), ("Pago", "payment_id"), ("Creado", "created_at")]
+
+    return Export("ingresos", queryset.order_by("date", "created_at", "id"), columns)
+
+
+@register_export("finance.payments")
+def payments_export(
+    organization_id, club_id=None, start_date=None, end_date=None, include_metadata=False
+):
+    """Payments by creation date, optionally for one club."""
+    queryset = Payment.objects.filter(organization_id=organization_id)
+    if club_id:
+        queryset = queryset.filter(club_id=club_id)
+    if start_date:
+        queryset = queryset.filter(created_at__date__gte=parse_date(start_date))
+    if end_date:
+        queryset = queryset.filter(created_at__date__lte=parse_date(end_date))
+
+    columns = list(PAYMENT_COLUMNS)
+    if include_metadata:
+        columns += [("ID", "id"), ("Reserva", "reservation_id"), ("Gateway", "gateway")]
+
+    return Export("pagos", queryset.order_by("created_at", "id"), columns)
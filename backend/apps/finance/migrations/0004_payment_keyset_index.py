@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_webhookevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['organization', 'created_at', 'id'], name='finance_pay_organiz_8e482e_idx'),
+        ),
+    ]
@@ -230,6 +230,7 @@ class Payment(BaseModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['organization', 'status', 'created_at']),
+            models.Index(fields=['organization', 'created_at', 'id']),
             models.Index(fields=['club', 'payment_type', 'created_at']),
             models.Index(fields=['reference_number']),
             models.Index(fields=['external_transaction_id']),
@@ -915,3 +916,62 @@ class Invoice(BaseModel):
         self.amount_paid = self.amount
         self.amount_remaining = Decimal('0.00')
         self.save()
+
+
+class WebhookEvent(BaseModel):
+    """
+    Inbox of payment gateway webhook events.
+
+    The webhook views only verify and store the raw event here; a worker
+    applies it later. The unique (provider, event_id) pair deduplicates
+    gateway retries, and object_key lets events for the same charge,
+    subscription or payment be applied in the order they happened.
+    """
+
+    PROVIDER_CHOICES = [
+        ('stripe', 'Stripe'),
+        ('mercadopago', 'MercadoPago'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('processed', 'Procesado'),
+        ('failed', 'Fallido'),
+        ('dead', 'Descartado'),
+    ]
+
+    provider = models.CharField(max_length=20, choices=PROVIDER_CHOICES)
+    event_id = models.CharField(max_length=255)
+    event_type = models.CharField(max_length=100)
+    object_key = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Gateway object the event belongs to, used for ordering"
+    )
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    # Dates
+    event_created_at = models.DateTimeField(
+        help_text="When the gateway created the event"
+    )
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['event_created_at', 'created_at']
+        unique_together = ['provider', 'event_id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['provider', 'object_key', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.provider} {self.event_type} ({self.event_id}) - {self.status}"
@@ -7,6 +7,7 @@ from decimal import Decimal
 from django.db.models import Sum, Count, Q, F
 from django.utils import timezone
 
+from apps.clubs.occupancy import OccupancyEngine
 from apps.finance.models import Revenue, Payment
 from apps.reservations.models import Reservation
 
@@ -190,32 +191,37 @@ class RevenueReportService:
             payment_status='paid'
         ).select_related('court')
         
-        # By court
-        courts_data = {}
-        for court in club.courts.filter(is_active=True):
-            court_reservations = reservations.filter(court=court)
-            court_revenues = Revenue.objects.filter(
-                payment__reservation__court=court,
+        # By court, utilization from the schedule-aware occupancy matrix
+        courts = list(club.courts.filter(is_active=True))
+        occupancy = OccupancyEngine(club, courts=courts).compute(
+            start_date, end_date
+        ).by_court()
+        reservation_counts = dict(
+            reservations.order_by().values_list('court_id').annotate(count=Count('id'))
+        )
+        court_revenues = dict(
+            Revenue.objects.filter(
+                payment__reservation__court__in=courts,
                 date__gte=start_date,
                 date__lte=end_date
+            ).order_by().values_list('payment__reservation__court_id').annotate(
+                total=Sum('amount')
             )
-            
-            # Calculate utilization
-            total_hours = (end_date - start_date).days * 16  # 6 AM to 10 PM
-            reserved_hours = sum([
-                (r.end_time.hour + r.end_time.minute/60) - 
-                (r.start_time.hour + r.start_time.minute/60)
-                for r in court_reservations
-            ])
-            
+        )
+
+        courts_data = {}
+        for court in courts:
+            stats = occupancy[court.id]
+            total_revenue = court_revenues.get(court.id) or 0
+            reserved_hours = stats['occupied_hours']
             courts_data[court.name] = {
                 'court_id': court.id,
-                'total_reservations': court_reservations.count(),
-                'total_revenue': court_revenues.aggregate(total=Sum('amount'))['total'] or 0,
-                'utilization_rate': (reserved_hours / total_hours * 100) if total_hours > 0 else 0,
+                'total_reservations': reservation_counts.get(court.id, 0),
+                'total_revenue': total_revenue,
+                'utilization_rate': stats['occupancy_rate'],
                 'reserved_hours': reserved_hours,
                 'average_price_per_hour': (
-                    courts_data[court.name]['total_revenue'] / reserved_hours
+                    float(total_revenue) / reserved_hours
                 ) if reserved_hours > 0 else 0
             }
         
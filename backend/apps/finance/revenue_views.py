@@ -10,6 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.finance.reports import RevenueReportService
+from apps.shared.exports import WRITERS, export_response
 from apps.clubs.models import Club
 from rest_framework.permissions import IsAuthenticated
 
@@ -196,3 +197,83 @@ def payment_method_analysis(request):
     )
     
     return Response(report, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def revenue_export(request):
+    """
+    Export revenue or payment rows for a date range as CSV/Excel/JSON.
+
+    Query params: dataset (revenues|payments), file_format (csv|excel|json),
+    start_date, end_date, club_id, background. Small exports are streamed;
+    large ones (or background=true) are generated asynchronously and the
+    user is notified with the download link.
+    """
+    dataset = request.query_params.get('dataset', 'revenues')
+    file_format = request.query_params.get('file_format', 'csv')
+    start_date = request.query_params.get('start_date')
+    end_date = request.query_params.get('end_date')
+    club_id = request.query_params.get('club_id')
+    background = request.query_params.get('background', 'false').lower() == 'true'
+
+    if dataset not in ('revenues', 'payments'):
+        return Response(
+            {'error': 'dataset must be revenues or payments'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if file_format not in WRITERS:
+        return Response(
+            {'error': f"file_format must be one of {', '.join(WRITERS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not all([start_date, end_date]):
+        return Response(
+            {'error': 'start_date and end_date are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Parse dates
+    try:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except ValueError:
+        return Response(
+            {'error': 'Invalid date format. Use YYYY-MM-DD'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Get club
+    if club_id:
+        try:
+            club = Club.objects.get(id=club_id)
+            # Check permissions
+            if not request.user.is_staff and request.user.club_id != club.id:
+                return Response(
+                    {'error': 'No permission to view this club data'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        except Club.DoesNotExist:
+            return Response(
+                {'error': 'Club not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        organization_id = club.organization_id
+    else:
+        organization = request.user.organization
+        if organization is None:
+            return Response(
+                {'error': 'User has no organization'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        organization_id = organization.id
+
+    params = {
+        'organization_id': str(organization_id),
+        'club_id': club_id,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+    }
+    return export_response(
+        request, f'finance.{dataset}', params, file_format, background=background
+    )
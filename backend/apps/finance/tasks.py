@@ -0,0 +1,34 @@
+"""
+Async tasks for finance module.
+"""
+
+import logging
+
+from celery import shared_task
+
+from .webhook_inbox import WebhookInbox
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_webhook_object(provider, object_key):
+    """Apply the pending webhook events of one gateway object."""
+    return WebhookInbox.process_object(provider, object_key)
+
+
+@shared_task
+def process_webhook_inbox(limit=200):
+    """
+    Periodic sweep of the webhook inbox: applies retries that are due and
+    anything whose per-object task was lost. Should be run every minute.
+    """
+    processed = WebhookInbox.process_pending(limit=limit)
+    metrics = WebhookInbox.get_metrics()
+
+    log = logger.warning if metrics['dead'] or metrics['backlog'] > limit else logger.info
+    log(
+        f"Webhook inbox: applied {processed} events, backlog {metrics['backlog']}, "
+        f"dead {metrics['dead']}, oldest pending {metrics['oldest_pending_age_seconds']}s"
+    )
+    return processed
@@ -0,0 +1,171 @@
+"""
+Tests for the payment webhook inbox.
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.finance.models import WebhookEvent
+from apps.finance.webhook_inbox import DISPATCHERS, WebhookInbox
+from apps.finance.webhooks import mercadopago_webhook, stripe_webhook
+
+applied = []
+
+
+def record_event(payload):
+    """Test dispatcher: records payloads, fails when asked to."""
+    if payload.get("fail"):
+        raise RuntimeError("gateway object not found")
+    applied.append(payload["n"])
+
+
+def stripe_signature(payload, secret):
+    timestamp = int(time.time())
+    signed = f"{timestamp}.{payload}".encode()
+    signature = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+class WebhookViewsTest(TestCase):
+    """Test that the webhook views only verify and store events."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(STRIPE_WEBHOOK_SECRET="whsec_test")
+    def test_stripe_event_stored_once(self):
+        payload = json.dumps(
+            {
+                "id": "evt_123",
+                "object": "event",
+                "type": "charge.succeeded",
+                "created": 1700000000,
+                "data": {
+                    "object": {"id": "ch_1", "object": "charge", "payment_intent": "pi_1"}
+                },
+            }
+        )
+
+        for _ in range(2):
+            request = self.factory.post(
+                "/api/v1/finance/webhooks/stripe/",
+                data=payload,
+                content_type="application/json",
+                HTTP_STRIPE_SIGNATURE=stripe_signature(payload, "whsec_test"),
+            )
+            self.assertEqual(stripe_webhook(request).status_code, 200)
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual(event.event_id, "evt_123")
+        self.assertEqual(event.object_key, "payment_intent:pi_1")
+        self.assertEqual(event.status, "pending")
+
+    @override_settings(STRIPE_WEBHOOK_SECRET="whsec_test")
+    def test_stripe_bad_signature_rejected(self):
+        request = self.factory.post(
+            "/api/v1/finance/webhooks/stripe/",
+            data="{}",
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE="t=1,v1=bad",
+        )
+        self.assertEqual(stripe_webhook(request).status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    @override_settings(MERCADOPAGO_WEBHOOK_SECRET="mp_secret")
+    def test_mercadopago_signature(self):
+        payload = json.dumps(
+            {"id": 42, "type": "payment", "action": "payment.updated", "data": {"id": "999"}}
+        )
+        manifest = "id:999;request-id:req-1;ts:1700000000;"
+        signature = hmac.new(b"mp_secret", manifest.encode(), hashlib.sha256).hexdigest()
+
+        request = self.factory.post(
+            "/api/v1/finance/webhooks/mercadopago/",
+            data=payload,
+            content_type="application/json",
+            HTTP_X_SIGNATURE=f"ts=1700000000,v1={signature}",
+            HTTP_X_REQUEST_ID="req-1",
+        )
+        self.assertEqual(mercadopago_webhook(request).status_code, 200)
+
+        forged = self.factory.post(
+            "/api/v1/finance/webhooks/mercadopago/",
+            data=payload,
+            content_type="application/json",
+            HTTP_X_SIGNATURE="ts=1700000000,v1=deadbeef",
+            HTTP_X_REQUEST_ID="req-1",
+        )
+        self.assertEqual(mercadopago_webhook(forged).status_code, 400)
+
+        event = WebhookEvent.objects.get(provider="mercadopago")
+        self.assertEqual(event.event_id, "42")
+        self.assertEqual(event.object_key, "payment:999")
+
+
+@patch.dict(DISPATCHERS, {"stripe": "apps.finance.tests.test_webhook_inbox.record_event"})
+class WebhookInboxProcessingTest(TestCase):
+    """Test ordered, idempotent processing with retries."""
+
+    def setUp(self):
+        applied.clear()
+        self.now = timezone.now()
+
+    def ingest(self, event_id, n, object_key="charge:1", seconds=0, **payload):
+        return WebhookInbox.ingest(
+            provider="stripe",
+            event_id=event_id,
+            event_type="charge.succeeded",
+            payload={"n": n, **payload},
+            object_key=object_key,
+            event_created_at=self.now + timedelta(seconds=seconds),
+        )[0]
+
+    def test_events_applied_in_gateway_order(self):
+        self.ingest("evt_b", 2, seconds=10)
+        self.ingest("evt_a", 1, seconds=0)
+        self.ingest("evt_other", 3, object_key="charge:2")
+
+        self.assertEqual(WebhookInbox.process_pending(), 3)
+        self.assertEqual(applied[:2], [1, 2])
+        self.assertEqual(WebhookInbox.process_pending(), 0)
+        self.assertEqual(len(applied), 3)
+
+    def test_failure_blocks_later_events_and_backs_off(self):
+        failing = self.ingest("evt_a", 1, fail=True)
+        self.ingest("evt_b", 2, seconds=10)
+
+        self.assertEqual(WebhookInbox.process_object("stripe", "charge:1"), 0)
+
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, "failed")
+        self.assertEqual(failing.attempts, 1)
+        self.assertGreater(failing.next_attempt_at, timezone.now())
+        self.assertEqual(applied, [])
+
+        # Still backing off: the sweep does not touch it
+        self.assertEqual(WebhookInbox.process_pending(), 0)
+
+    def test_dead_letter_after_max_attempts(self):
+        event = self.ingest("evt_a", 1, fail=True)
+        self.ingest("evt_b", 2, seconds=10)
+
+        with patch.object(WebhookInbox, "max_attempts", 2):
+            for _ in range(2):
+                WebhookEvent.objects.filter(pk=event.pk).update(next_attempt_at=self.now)
+                WebhookInbox.process_object("stripe", "charge:1")
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, "dead")
+        self.assertEqual(applied, [2])
+
+        metrics = WebhookInbox.get_metrics()
+        self.assertEqual(metrics["dead"], 1)
+        self.assertEqual(metrics["backlog"], 0)
+        self.assertEqual(metrics["by_provider"]["stripe"]["processed"], 1)
@@ -12,12 +12,13 @@ from .views import (
     RevenueViewSet,
     MembershipViewSet
 )
-from .webhooks import stripe_webhook
+from .webhooks import mercadopago_webhook, stripe_webhook
 from .revenue_views import (
     daily_revenue_report,
     monthly_revenue_report,
     court_utilization_report,
-    payment_method_analysis
+    payment_method_analysis,
+    revenue_export
 )
 
 app_name = "finance"
@@ -32,8 +33,10 @@ router.register(r"memberships", MembershipViewSet, basename="membership")
 urlpatterns = [
     path("", include(router.urls)),
     path("webhooks/stripe/", stripe_webhook, name="stripe-webhook"),
+    path("webhooks/mercadopago/", mercadopago_webhook, name="mercadopago-webhook"),
     path("reports/daily/", daily_revenue_report, name="daily-revenue-report"),
     path("reports/monthly/", monthly_revenue_report, name="monthly-revenue-report"),
     path("reports/court-utilization/", court_utilization_report, name="court-utilization-report"),
     path("reports/payment-analysis/", payment_method_analysis, name="payment-method-analysis"),
+    path("reports/export/", revenue_export, name="revenue-export"),
 ]
\ No newline at end of file
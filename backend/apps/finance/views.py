@@ -25,6 +25,7 @@ from apps.finance.serializers import (
     PaymentIntentCreateSerializer
 )
 from apps.finance.services import PaymentService, ReconciliationService
+from apps.shared.pagination import KeysetPagination
 from core.permissions import IsOwnerOrStaff
 
 
@@ -34,6 +35,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
     
     def get_queryset(self):
         """Filter by user's organization."""
@@ -196,6 +199,8 @@ class PaymentIntentViewSet(viewsets.ModelViewSet):
     queryset = PaymentIntent.objects.all()
     serializer_class = PaymentIntentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
     
     def create(self, request):
         """Create a new payment intent."""
@@ -304,6 +309,8 @@ class RevenueViewSet(viewsets.ReadOnlyModelViewSet):
     
     serializer_class = RevenueSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-date", "-created_at", "-id")
     
     def get_queryset(self):
         """Get revenues based on user permissions."""
@@ -0,0 +1,211 @@
+"""
+Inbox for payment gateway webhooks.
+
+The webhook views only verify the signature and store the raw event
+(``WebhookInbox.ingest``); duplicates of an already stored event id are
+acknowledged without doing anything. Events are applied by Celery workers,
+one gateway object at a time and in the order the gateway created them,
+with exponential backoff on failure and a dead-letter state after
+``FINANCE_WEBHOOK_MAX_ATTEMPTS`` tries.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import WebhookEvent
+
+logger = logging.getLogger('finance.webhooks')
+
+RETRYABLE_STATUSES = ('pending', 'failed')
+
+# Functions that apply a stored payload, per provider.
+DISPATCHERS = {
+    'stripe': 'apps.finance.webhooks.dispatch_stripe_event',
+    'mercadopago': 'apps.finance.webhooks.dispatch_mercadopago_event',
+}
+
+
+class WebhookInbox:
+    """Store and apply webhook events."""
+
+    max_attempts = getattr(settings, 'FINANCE_WEBHOOK_MAX_ATTEMPTS', 8)
+    retry_base_seconds = getattr(settings, 'FINANCE_WEBHOOK_RETRY_BASE_SECONDS', 30)
+    retry_max_seconds = getattr(settings, 'FINANCE_WEBHOOK_RETRY_MAX_SECONDS', 3600)
+
+    @classmethod
+    def ingest(
+        cls,
+        provider: str,
+        event_id: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        object_key: str = '',
+        event_created_at=None,
+    ) -> Tuple[WebhookEvent, bool]:
+        """
+        Store a verified event. Returns ``(event, created)``; ``created`` is
+        False when the gateway re-delivered an event we already have.
+        """
+        event, created = WebhookEvent.objects.get_or_create(
+            provider=provider,
+            event_id=event_id,
+            defaults={
+                'event_type': event_type,
+                'object_key': object_key,
+                'payload': payload,
+                'event_created_at': event_created_at or timezone.now(),
+            },
+        )
+
+        if created:
+            transaction.on_commit(lambda: cls.schedule(provider, object_key))
+        else:
+            logger.info(f"Duplicate {provider} webhook {event_id} ignored")
+
+        return event, created
+
+    @staticmethod
+    def schedule(provider: str, object_key: str):
+        """Queue processing for one object; the periodic sweep is the fallback."""
+        from .tasks import process_webhook_object
+
+        try:
+            process_webhook_object.delay(provider, object_key)
+        except Exception as e:
+            logger.warning(f"Could not queue webhook processing, sweep will retry: {e}")
+
+    @classmethod
+    def process_object(cls, provider: str, object_key: str) -> int:
+        """
+        Apply the pending events of one gateway object in order.
+
+        The object's events are row-locked (``NOWAIT``) for the duration, so
+        a second worker picking the same object backs off instead of
+        applying events out of order. Processing stops at the first event
+        that fails or is still backing off; a dead-lettered event no longer
+        blocks the ones after it.
+
+        Returns:
+            Number of events applied
+        """
+        dispatcher = import_string(DISPATCHERS[provider])
+        now = timezone.now()
+        processed = 0
+
+        try:
+            with transaction.atomic():
+                events = list(
+                    WebhookEvent.objects.select_for_update(nowait=True)
+                    .filter(
+                        provider=provider,
+                        object_key=object_key,
+                        status__in=RETRYABLE_STATUSES,
+                    )
+                    .order_by('event_created_at', 'created_at')
+                )
+
+                for event in events:
+                    if event.next_attempt_at > now:
+                        break
+
+                    event.attempts += 1
+                    try:
+                        with transaction.atomic():
+                            dispatcher(event.payload)
+                    except Exception as e:
+                        if cls._record_failure(event, e, now) != 'dead':
+                            break
+                        continue
+
+                    event.status = 'processed'
+                    event.processed_at = timezone.now()
+                    event.last_error = ''
+                    event.save(
+                        update_fields=[
+                            'status', 'attempts', 'processed_at', 'last_error', 'updated_at'
+                        ]
+                    )
+                    processed += 1
+
+        except OperationalError as e:
+            logger.debug(f"Webhook object {provider}:{object_key} busy, skipping: {e}")
+
+        return processed
+
+    @classmethod
+    def _record_failure(cls, event: WebhookEvent, error: Exception, now) -> str:
+        """Schedule a retry or dead-letter the event; returns the new status."""
+        event.last_error = str(error)
+        if event.attempts >= cls.max_attempts:
+            event.status = 'dead'
+            logger.error(
+                f"Webhook {event.provider} {event.event_id} dead after "
+                f"{event.attempts} attempts: {error}"
+            )
+        else:
+            event.status = 'failed'
+            delay = min(
+                cls.retry_base_seconds * 2 ** (event.attempts - 1),
+                cls.retry_max_seconds,
+            )
+            event.next_attempt_at = now + timedelta(seconds=delay)
+            logger.warning(
+                f"Webhook {event.provider} {event.event_id} failed "
+                f"(attempt {event.attempts}), retrying in {delay}s: {error}"
+            )
+        event.save(
+            update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'updated_at']
+        )
+        return event.status
+
+    @classmethod
+    def process_pending(cls, limit: int = 200) -> int:
+        """Apply due events for up to ``limit`` objects, oldest first."""
+        objects = (
+            WebhookEvent.objects.filter(
+                status__in=RETRYABLE_STATUSES,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .values('provider', 'object_key')
+            .annotate(first_event=Min('event_created_at'))
+            .order_by('first_event')[:limit]
+        )
+
+        return sum(
+            cls.process_object(row['provider'], row['object_key']) for row in objects
+        )
+
+    @staticmethod
+    def get_metrics() -> Dict[str, Any]:
+        """Backlog metrics per provider and status."""
+        metrics = {
+            provider: {status: 0 for status, _ in WebhookEvent.STATUS_CHOICES}
+            for provider, _ in WebhookEvent.PROVIDER_CHOICES
+        }
+        for row in WebhookEvent.objects.values('provider', 'status').annotate(
+            count=Count('id')
+        ):
+            metrics.setdefault(row['provider'], {})[row['status']] = row['count']
+
+        oldest: Optional[Any] = WebhookEvent.objects.filter(
+            status__in=RETRYABLE_STATUSES
+        ).aggregate(oldest=Min('created_at'))['oldest']
+
+        return {
+            'by_provider': metrics,
+            'backlog': sum(
+                counts.get('pending', 0) + counts.get('failed', 0)
+                for counts in metrics.values()
+            ),
+            'dead': sum(counts.get('dead', 0) for counts in metrics.values()),
+            'oldest_pending_age_seconds': (
+                int((timezone.now() - oldest).total_seconds()) if oldest else 0
+            ),
+        }
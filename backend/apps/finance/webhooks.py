@@ -1,9 +1,12 @@
 """
-Stripe webhook handler for payment events.
+Stripe and MercadoPago webhook handlers for payment events.
 """
 
+import hashlib
+import hmac
 import json
 import logging
+import uuid
 import stripe
 from decimal import Decimal
 
@@ -13,12 +16,15 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 from django.db import transaction
-from datetime import datetime
+from django.utils.dateparse import parse_datetime
+from datetime import datetime, timezone as dt_timezone
 
 from apps.finance.models import Payment, PaymentRefund, Subscription, Invoice
 from apps.finance.services import PaymentService
 from apps.notifications.services import EmailService
 
+from .webhook_inbox import WebhookInbox
+
 logger = logging.getLogger(__name__)
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
@@ -27,7 +33,52 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 @require_POST
 def stripe_webhook(request):
     """
-    Handle Stripe webhook events.
+    Receive Stripe webhook events.
+
+    Only verifies the signature and stores the event in the webhook inbox;
+    ``dispatch_stripe_event`` applies it from a worker. Stripe retries of
+    an event we already stored are acknowledged and dropped.
+    """
+    payload = request.body
+    sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
+    
+    try:
+        event = stripe.Webhook.construct_event(
+            payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
+        )
+    except ValueError:
+        logger.error("Invalid payload in Stripe webhook")
+        return HttpResponse(status=400)
+    except stripe.error.SignatureVerificationError:
+        logger.error("Invalid signature in Stripe webhook")
+        return HttpResponse(status=400)
+    
+    WebhookInbox.ingest(
+        provider='stripe',
+        event_id=event['id'],
+        event_type=event['type'],
+        payload=json.loads(payload),
+        object_key=stripe_object_key(event),
+        event_created_at=datetime.fromtimestamp(event['created'], tz=dt_timezone.utc),
+    )
+    
+    return HttpResponse(status=200)
+
+
+def stripe_object_key(event):
+    """
+    Key used to order events of the same gateway object. Charges are keyed
+    by their payment intent so charge and intent events serialize together.
+    """
+    data_object = event['data']['object']
+    if data_object.get('object') == 'charge' and data_object.get('payment_intent'):
+        return f"payment_intent:{data_object['payment_intent']}"
+    return f"{data_object.get('object', 'unknown')}:{data_object.get('id', '')}"
+
+
+def dispatch_stripe_event(event):
+    """
+    Apply a stored Stripe event.
     
     Events handled:
     - charge.succeeded
@@ -40,68 +91,89 @@ def stripe_webhook(request):
     - customer.subscription.created
     - customer.subscription.updated
     - customer.subscription.deleted
+    
+    Handlers raise on failure so the inbox can retry the event.
     """
-    payload = request.body
-    sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
+    handler = STRIPE_EVENT_HANDLERS.get(event['type'])
+    if handler is None:
+        logger.info(f"Unhandled Stripe event type: {event['type']}")
+        return
     
+    handler(event['data']['object'])
+
+
+@csrf_exempt
+@require_POST
+def mercadopago_webhook(request):
+    """
+    Receive MercadoPago notifications.
+
+    Verifies the ``x-signature`` header and stores the notification in the
+    webhook inbox; ``dispatch_mercadopago_event`` applies it from a worker.
+    """
     try:
-        event = stripe.Webhook.construct_event(
-            payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
-        )
+        notification = json.loads(request.body)
     except ValueError:
-        logger.error("Invalid payload in Stripe webhook")
+        logger.error("Invalid payload in MercadoPago webhook")
         return HttpResponse(status=400)
-    except stripe.error.SignatureVerificationError:
-        logger.error("Invalid signature in Stripe webhook")
+    
+    data_id = str(
+        (notification.get('data') or {}).get('id') or request.GET.get('data.id', '')
+    )
+    if not verify_mercadopago_signature(request, data_id):
+        logger.error("Invalid signature in MercadoPago webhook")
         return HttpResponse(status=400)
     
-    # Handle the event
-    if event['type'] == 'charge.succeeded':
-        charge = event['data']['object']
-        handle_successful_charge(charge)
-        
-    elif event['type'] == 'charge.failed':
-        charge = event['data']['object']
-        handle_failed_charge(charge)
-        
-    elif event['type'] == 'charge.refunded':
-        charge = event['data']['object']
-        handle_refunded_charge(charge)
-        
-    elif event['type'] == 'payment_intent.succeeded':
-        intent = event['data']['object']
-        handle_successful_intent(intent)
-        
-    elif event['type'] == 'payment_intent.payment_failed':
-        intent = event['data']['object']
-        handle_failed_intent(intent)
-        
-    elif event['type'] == 'invoice.payment_succeeded':
-        invoice = event['data']['object']
-        handle_invoice_payment_succeeded(invoice)
-        
-    elif event['type'] == 'invoice.payment_failed':
-        invoice = event['data']['object']
-        handle_invoice_payment_failed(invoice)
-        
-    elif event['type'] == 'customer.subscription.created':
-        subscription = event['data']['object']
-        handle_subscription_created(subscription)
-        
-    elif event['type'] == 'customer.subscription.updated':
-        subscription = event['data']['object']
-        handle_subscription_updated(subscription)
-        
-    elif event['type'] == 'customer.subscription.deleted':
-        subscription = event['data']['object']
-        handle_subscription_deleted(subscription)
+    event_type = notification.get('type') or notification.get('topic', '')
+    event_id = notification.get('id') or f"{event_type}:{data_id}:{notification.get('action', '')}"
     
-    else:
-        logger.info(f"Unhandled Stripe event type: {event['type']}")
+    WebhookInbox.ingest(
+        provider='mercadopago',
+        event_id=str(event_id),
+        event_type=notification.get('action') or event_type,
+        payload=notification,
+        object_key=f"{event_type}:{data_id}",
+        event_created_at=parse_datetime(notification.get('date_created') or ''),
+    )
     
     return HttpResponse(status=200)
 
 
+def verify_mercadopago_signature(request, data_id):
+    """
+    Check the MercadoPago ``x-signature`` header (``ts=...,v1=...``), an
+    HMAC-SHA256 of ``id:<data.id>;request-id:<x-request-id>;ts:<ts>;``.
+    """
+    secret = getattr(settings, 'MERCADOPAGO_WEBHOOK_SECRET', '')
+    if not secret:
+        logger.error("MERCADOPAGO_WEBHOOK_SECRET is not configured")
+        return False
+    
+    parts = dict(
+        part.strip().split('=', 1)
+        for part in request.META.get('HTTP_X_SIGNATURE', '').split(',')
+        if '=' in part
+    )
+    ts, signature = parts.get('ts'), parts.get('v1')
+    if not ts or not signature:
+        return False
+    
+    manifest = f"id:{data_id.lower()};request-id:{request.META.get('HTTP_X_REQUEST_ID', '')};ts:{ts};"
+    expected = hmac.new(secret.encode(), manifest.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def dispatch_mercadopago_event(notification):
+    """Apply a stored MercadoPago notification."""
+    event_type = notification.get('type') or notification.get('topic', '')
+    data_id = (notification.get('data') or {}).get('id')
+    
+    if event_type == 'payment' and data_id:
+        handle_mercadopago_payment(data_id)
+    else:
+        logger.info(f"Unhandled MercadoPago notification type: {event_type}")
+
+
 def handle_successful_charge(charge):
     """Handle successful charge from Stripe."""
     try:
@@ -138,6 +210,7 @@ def handle_successful_charge(charge):
             
     except Exception as e:
         logger.error(f"Error handling successful charge: {e}")
+        raise
 
 
 def handle_failed_charge(charge):
@@ -158,6 +231,7 @@ def handle_failed_charge(charge):
             
     except Exception as e:
         logger.error(f"Error handling failed charge: {e}")
+        raise
 
 
 def handle_refunded_charge(charge):
@@ -194,6 +268,7 @@ def handle_refunded_charge(charge):
                 
     except Exception as e:
         logger.error(f"Error handling refunded charge: {e}")
+        raise
 
 
 def handle_successful_intent(intent):
@@ -261,6 +336,7 @@ def handle_invoice_payment_succeeded(invoice):
             
     except Exception as e:
         logger.error(f"Error handling invoice payment succeeded: {e}")
+        raise
 
 
 @transaction.atomic
@@ -313,6 +389,7 @@ def handle_invoice_payment_failed(invoice):
             
     except Exception as e:
         logger.error(f"Error handling invoice payment failed: {e}")
+        raise
 
 
 @transaction.atomic
@@ -372,6 +449,7 @@ def handle_subscription_created(subscription):
             
     except Exception as e:
         logger.error(f"Error handling subscription created: {e}")
+        raise
 
 
 @transaction.atomic
@@ -414,6 +492,7 @@ def handle_subscription_updated(subscription):
             
     except Exception as e:
         logger.error(f"Error handling subscription updated: {e}")
+        raise
 
 
 @transaction.atomic
@@ -449,3 +528,86 @@ def handle_subscription_deleted(subscription):
             
     except Exception as e:
         logger.error(f"Error handling subscription deleted: {e}")
+        raise
+
+
+# MercadoPago payment status -> Payment status
+MERCADOPAGO_STATUS_MAP = {
+    'approved': 'completed',
+    'rejected': 'failed',
+    'cancelled': 'cancelled',
+    'refunded': 'refunded',
+    'charged_back': 'disputed',
+}
+
+
+def handle_mercadopago_payment(mp_payment_id):
+    """Sync a payment from MercadoPago after a payment notification."""
+    import mercadopago
+    
+    sdk = mercadopago.SDK(settings.MERCADOPAGO_ACCESS_TOKEN)
+    response = sdk.payment().get(mp_payment_id)
+    if response.get('status') != 200:
+        raise RuntimeError(
+            f"MercadoPago payment {mp_payment_id} lookup failed with status {response.get('status')}"
+        )
+    mp_payment = response['response']
+    
+    payment = Payment.objects.filter(
+        external_transaction_id=str(mp_payment['id'])
+    ).first()
+    
+    if not payment:
+        # Our payment ID travels as the external reference
+        try:
+            payment_id = uuid.UUID(str(mp_payment.get('external_reference')))
+        except ValueError:
+            payment_id = None
+        if payment_id:
+            payment = Payment.objects.filter(id=payment_id).first()
+    
+    new_status = MERCADOPAGO_STATUS_MAP.get(mp_payment.get('status'))
+    if not payment or not new_status or payment.status == new_status:
+        return
+    
+    if new_status == 'completed':
+        payment.status = 'completed'
+        payment.processed_at = timezone.now()
+        payment.external_transaction_id = str(mp_payment['id'])
+        payment.gateway_response = mp_payment
+        payment.save()
+        
+        payment._update_related_object()
+        payment._create_revenue_record()
+        
+    elif new_status in ['failed', 'cancelled']:
+        if payment.status == 'completed':
+            return
+        payment.status = new_status
+        payment.failed_at = timezone.now()
+        payment.failure_reason = mp_payment.get('status_detail', 'Payment failed')
+        payment.gateway_response = mp_payment
+        payment.save()
+        
+    else:
+        payment.status = new_status
+        if new_status == 'refunded':
+            payment.refund_amount = Decimal(str(mp_payment.get('transaction_amount_refunded') or payment.amount))
+        payment.gateway_response = mp_payment
+        payment.save()
+    
+    logger.info(f"Updated payment {payment.reference_number} from MercadoPago as {new_status}")
+
+
+STRIPE_EVENT_HANDLERS = {
+    'charge.succeeded': handle_successful_charge,
+    'charge.failed': handle_failed_charge,
+    'charge.refunded': handle_refunded_charge,
+    'payment_intent.succeeded': handle_successful_intent,
+    'payment_intent.payment_failed': handle_failed_intent,
+    'invoice.payment_succeeded': handle_invoice_payment_succeeded,
+    'invoice.payment_failed': handle_invoice_payment_failed,
+    'customer.subscription.created': handle_subscription_created,
+    'customer.subscription.updated': handle_subscription_updated,
+    'customer.subscription.deleted': handle_subscription_deleted,
+}
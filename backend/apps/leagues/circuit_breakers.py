@@ -9,16 +9,20 @@ Every threshold and timeout has been carefully calibrated for league operations.
 import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Callable
+from typing import Dict, Any, Callable
 from functools import wraps
 from threading import Lock
-from dataclasses import dataclass
-from enum import Enum
 
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from apps.shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    circuit_breaker_registry,
+)
+
 # Configure circuit breaker logger
 logger = logging.getLogger('leagues.circuit_breaker')
 
@@ -63,158 +67,65 @@ LEAGUE_OPERATION_THRESHOLDS = {
 }
 
 
-class CircuitBreakerState(Enum):
-    """Circuit breaker states."""
-    CLOSED = "closed"      # Normal operation
-    OPEN = "open"          # Blocking requests
-    HALF_OPEN = "half_open"  # Testing recovery
-
-
-@dataclass
-class CircuitBreakerStats:
-    """Circuit breaker statistics."""
-    failure_count: int = 0
-    success_count: int = 0
-    last_failure_time: Optional[datetime] = None
-    last_success_time: Optional[datetime] = None
-    state: CircuitBreakerState = CircuitBreakerState.CLOSED
-    total_requests: int = 0
+# Kept for backwards compatibility with code importing the league enum.
+CircuitBreakerState = CircuitState
 
 
-class LeagueCircuitBreaker:
+class LeagueCircuitBreaker(CircuitBreaker):
     """
     CRITICAL: Circuit breaker for league operations.
     Prevents cascading failures and protects system stability.
+    Calls slower than ``timeout`` count as failures.
     """
-    
+
+    error_class = ValidationError
+
     def __init__(
         self,
         failure_threshold: int = LEAGUE_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
         recovery_timeout: int = LEAGUE_CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
         timeout: int = LEAGUE_CIRCUIT_BREAKER_TIMEOUT,
-        name: str = "league_default"
+        name: str = "league_default",
+        namespace: str = "leagues",
     ):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
+        super().__init__(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            slow_call_threshold=timeout,
+            namespace=namespace,
+        )
         self.timeout = timeout
-        self.name = name
-        self._lock = Lock()
-        self._stats = CircuitBreakerStats()
-        
+
         logger.info(
             f"League circuit breaker initialized: {name} "
             f"threshold={failure_threshold} recovery={recovery_timeout}s"
         )
-    
-    def __call__(self, func: Callable) -> Callable:
-        """Decorator to protect functions with circuit breaker."""
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return self._call_with_circuit_breaker(func, *args, **kwargs)
-        return wrapper
-    
+
+    def open_error(self) -> Exception:
+        logger.warning(
+            f"Circuit breaker OPEN for {self.name}: "
+            f"failures={self.failure_count} last_failure={self.last_failure_time}"
+        )
+        return ValidationError(
+            f"League operation temporarily unavailable: {self.name} circuit breaker open"
+        )
+
+    def _handle_slow_call(self, result: Any, elapsed_ms: float) -> Any:
+        raise ValidationError(
+            f"League operation timeout: {elapsed_ms / 1000:.2f}s > {self.timeout}s"
+        )
+
     def _call_with_circuit_breaker(self, func: Callable, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        with self._lock:
-            self._stats.total_requests += 1
-            
-            # Check current state
-            current_state = self._get_state()
-            
-            if current_state == CircuitBreakerState.OPEN:
-                logger.warning(
-                    f"Circuit breaker OPEN for {self.name}: "
-                    f"failures={self._stats.failure_count} "
-                    f"last_failure={self._stats.last_failure_time}"
-                )
-                raise ValidationError(
-                    f"League operation temporarily unavailable: {self.name} circuit breaker open"
-                )
-            
-            if current_state == CircuitBreakerState.HALF_OPEN:
-                logger.info(f"Circuit breaker HALF_OPEN for {self.name}: testing recovery")
-        
-        # Execute the function
-        start_time = time.time()
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Check for timeout
-            if execution_time > self.timeout:
-                self._record_failure("timeout")
-                raise ValidationError(f"League operation timeout: {execution_time:.2f}s > {self.timeout}s")
-            
-            self._record_success()
-            return result
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            self._record_failure(str(e))
-            logger.error(
-                f"Circuit breaker failure in {self.name}: "
-                f"error={str(e)} execution_time={execution_time:.2f}s"
-            )
-            raise
-    
-    def _get_state(self) -> CircuitBreakerState:
-        """Get current circuit breaker state."""
-        now = timezone.now()
-        
-        # If we're in OPEN state, check if we should transition to HALF_OPEN
-        if self._stats.state == CircuitBreakerState.OPEN:
-            if (self._stats.last_failure_time and 
-                (now - self._stats.last_failure_time).total_seconds() >= self.recovery_timeout):
-                self._stats.state = CircuitBreakerState.HALF_OPEN
-                logger.info(f"Circuit breaker {self.name} transitioning to HALF_OPEN")
-        
-        return self._stats.state
-    
-    def _record_success(self):
-        """Record successful operation."""
-        with self._lock:
-            self._stats.success_count += 1
-            self._stats.last_success_time = timezone.now()
-            
-            # Reset failure count on success and close circuit if needed
-            if self._stats.state == CircuitBreakerState.HALF_OPEN:
-                self._stats.state = CircuitBreakerState.CLOSED
-                self._stats.failure_count = 0
-                logger.info(f"Circuit breaker {self.name} CLOSED: recovery successful")
-    
-    def _record_failure(self, error: str):
-        """Record failed operation."""
-        with self._lock:
-            self._stats.failure_count += 1
-            self._stats.last_failure_time = timezone.now()
-            
-            # Open circuit if failure threshold exceeded
-            if self._stats.failure_count >= self.failure_threshold:
-                self._stats.state = CircuitBreakerState.OPEN
-                logger.critical(
-                    f"Circuit breaker {self.name} OPENED: "
-                    f"failures={self._stats.failure_count} threshold={self.failure_threshold}"
-                )
-    
+        return self.call(func, *args, **kwargs)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get circuit breaker statistics."""
-        with self._lock:
-            return {
-                'name': self.name,
-                'state': self._stats.state.value,
-                'failure_count': self._stats.failure_count,
-                'success_count': self._stats.success_count,
-                'total_requests': self._stats.total_requests,
-                'last_failure_time': self._stats.last_failure_time.isoformat() if self._stats.last_failure_time else None,
-                'last_success_time': self._stats.last_success_time.isoformat() if self._stats.last_success_time else None,
-                'failure_rate': self._stats.failure_count / max(self._stats.total_requests, 1)
-            }
-    
-    def reset(self):
-        """Reset circuit breaker to initial state."""
-        with self._lock:
-            self._stats = CircuitBreakerStats()
-            logger.info(f"Circuit breaker {self.name} reset")
+        stats = super().get_stats()
+        stats['success_count'] = stats['total_calls'] - stats['total_failures']
+        stats['total_requests'] = stats['total_calls'] + stats['rejected_calls']
+        return stats
 
 
 class LeagueRateLimiter:
@@ -359,25 +270,31 @@ class LeagueRateLimiter:
 
 
 # Pre-configured circuit breakers and rate limiters for league operations
-league_standings_circuit_breaker = LeagueCircuitBreaker(
+league_standings_circuit_breaker = circuit_breaker_registry.get_or_create(
+    "league_standings",
+    namespace="leagues",
+    breaker_class=LeagueCircuitBreaker,
     failure_threshold=3,
     recovery_timeout=30,
     timeout=15,
-    name="league_standings"
 )
 
-league_season_transition_circuit_breaker = LeagueCircuitBreaker(
+league_season_transition_circuit_breaker = circuit_breaker_registry.get_or_create(
+    "season_transition",
+    namespace="leagues",
+    breaker_class=LeagueCircuitBreaker,
     failure_threshold=2,
     recovery_timeout=120,
     timeout=60,
-    name="season_transition"
 )
 
-league_match_result_circuit_breaker = LeagueCircuitBreaker(
+league_match_result_circuit_breaker = circuit_breaker_registry.get_or_create(
+    "match_results",
+    namespace="leagues",
+    breaker_class=LeagueCircuitBreaker,
     failure_threshold=5,
     recovery_timeout=30,
     timeout=10,
-    name="match_results"
 )
 
 # Rate limiters for different operations
@@ -411,7 +328,11 @@ def get_league_circuit_breaker(operation_type: str) -> LeagueCircuitBreaker:
         'match_result': league_match_result_circuit_breaker
     }
     
-    return circuit_breakers.get(operation_type, LeagueCircuitBreaker(name=f"league_{operation_type}"))
+    if operation_type in circuit_breakers:
+        return circuit_breakers[operation_type]
+    return circuit_breaker_registry.get_or_create(
+        f"league_{operation_type}", namespace="leagues", breaker_class=LeagueCircuitBreaker
+    )
 
 
 def get_league_rate_limiter(operation_type: str) -> LeagueRateLimiter:
@@ -467,14 +388,8 @@ def protected_league_operation(operation_type: str = 'default'):
 
 def get_all_circuit_breaker_stats() -> Dict[str, Any]:
     """Get statistics for all league circuit breakers."""
-    circuit_breakers = [
-        league_standings_circuit_breaker,
-        league_season_transition_circuit_breaker,
-        league_match_result_circuit_breaker
-    ]
-    
     stats = {}
-    for cb in circuit_breakers:
+    for cb in circuit_breaker_registry.all(namespace="leagues"):
         stats[cb.name] = cb.get_stats()
     
     return {
@@ -486,14 +401,7 @@ def get_all_circuit_breaker_stats() -> Dict[str, Any]:
 
 def reset_all_circuit_breakers():
     """Reset all league circuit breakers to initial state."""
-    circuit_breakers = [
-        league_standings_circuit_breaker,
-        league_season_transition_circuit_breaker,
-        league_match_result_circuit_breaker
-    ]
-    
-    for cb in circuit_breakers:
-        cb.reset()
+    circuit_breaker_registry.reset_all(namespace="leagues")
     
     logger.info("All league circuit breakers reset")
 
@@ -263,17 +263,20 @@ class LeagueSeason(BaseModel):
             self.matches_per_team = (teams_count - 1) * 2
             self.total_matches = teams_count * (teams_count - 1)
 
-        self.save()
+        # Generate fixtures; byes and groups make the real totals differ
+        matches = self.generate_fixtures()
+        if matches:
+            self.total_matchdays = max(match.matchday for match in matches)
+            self.total_matches = len(matches)
 
-        # Generate fixtures
-        self.generate_fixtures()
+        self.save()
 
-    def generate_fixtures(self):
+    def generate_fixtures(self, dry_run=False):
         """Generate league fixtures."""
         from .services import LeagueFixtureGenerator
 
         generator = LeagueFixtureGenerator(self)
-        generator.generate()
+        return generator.generate(dry_run=dry_run)
 
 
 class LeagueTeam(BaseModel):
@@ -4,11 +4,13 @@ Business logic services for leagues module.
 
 import itertools
 import random
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Tuple
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 
 from .models import (
@@ -24,171 +26,244 @@ from .models import (
 class LeagueFixtureGenerator:
     """
     Service for generating league fixtures automatically.
+
+    The whole season is computed in memory (circle-method rounds with
+    home/away balancing, dates from the preloaded schedule) and persisted
+    with a single ``bulk_create``.
     """
 
-    def __init__(self, season: LeagueSeason):
+    def __init__(
+        self,
+        season: LeagueSeason,
+        teams: Optional[List[LeagueTeam]] = None,
+        schedules: Optional[List[LeagueSchedule]] = None,
+        group_size: Optional[int] = None,
+    ):
         self.season = season
         self.league = season.league
-        self.teams = list(season.teams.filter(status="active"))
+        if teams is None:
+            teams = season.teams.filter(status="active")
+        self.teams = list(teams)
         self.teams_count = len(self.teams)
+        self.group_size = group_size or getattr(settings, "LEAGUE_GROUP_SIZE", 4)
+
+        if schedules is None:
+            schedules = season.schedules.filter(auto_schedule=True)
+        self.schedule = next((s for s in schedules if s.auto_schedule), None)
+        self._matchday_dates: Dict[int, datetime] = {}
+
+    @classmethod
+    def generate_for_seasons(
+        cls, seasons, dry_run: bool = False
+    ) -> Dict[Any, List[LeagueMatch]]:
+        """
+        Generate fixtures for many seasons (e.g. every division of a
+        federation) with two queries to load teams and schedules and one
+        insert per season.
+
+        Returns:
+            ``{season_id: matches}``
+        """
+        seasons = (
+            LeagueSeason.objects.filter(pk__in=[getattr(s, "pk", s) for s in seasons])
+            .select_related("league")
+            .prefetch_related(
+                Prefetch(
+                    "teams",
+                    queryset=LeagueTeam.objects.filter(status="active"),
+                    to_attr="active_teams",
+                ),
+                Prefetch(
+                    "schedules",
+                    queryset=LeagueSchedule.objects.filter(auto_schedule=True),
+                    to_attr="auto_schedules",
+                ),
+            )
+        )
+
+        return {
+            season.id: cls(
+                season, teams=season.active_teams, schedules=season.auto_schedules
+            ).generate(dry_run=dry_run)
+            for season in seasons
+        }
+
+    def generate(self, dry_run: bool = False) -> List[LeagueMatch]:
+        """
+        Generate fixtures for the league season.
 
-    def generate(self) -> List[LeagueMatch]:
-        """Generate fixtures for the league season."""
+        With ``dry_run`` the matches are returned unsaved.
+        """
         if self.teams_count < 2:
             raise ValidationError("At least 2 teams are required to generate fixtures")
 
         if self.league.format == "round_robin":
-            return self._generate_round_robin()
+            matches = self._generate_round_robin()
         elif self.league.format == "round_robin_double":
-            return self._generate_round_robin_double()
+            matches = self._generate_round_robin_double()
         elif self.league.format == "group_stage":
-            return self._generate_group_stage()
+            matches = self._generate_group_stage()
         else:
             raise ValidationError(f"Unsupported league format: {self.league.format}")
 
-    def _generate_round_robin(self) -> List[LeagueMatch]:
-        """Generate single round-robin fixtures."""
-        matches = []
-        matchday = 1
-
-        # Use round-robin algorithm
-        if self.teams_count % 2 == 0:
-            # Even number of teams
-            rounds = self.teams_count - 1
-            matches_per_round = self.teams_count // 2
-        else:
-            # Odd number of teams (add bye)
-            rounds = self.teams_count
-            matches_per_round = self.teams_count // 2
+        if not dry_run:
+            self._save(matches)
 
-        teams = self.teams.copy()
-
-        for round_num in range(rounds):
-            round_matches = []
-
-            # Pair teams for this round
-            for i in range(matches_per_round):
-                if self.teams_count % 2 == 0:
-                    home_team = teams[i]
-                    away_team = teams[self.teams_count - 1 - i]
-                else:
-                    if i < len(teams) // 2:
-                        home_team = teams[i]
-                        away_team = teams[len(teams) - 1 - i]
-                    else:
-                        continue  # Bye week
-
-                if home_team and away_team:
-                    match = self._create_match(
-                        matchday=matchday,
-                        match_number=len(round_matches) + 1,
-                        home_team=home_team,
-                        away_team=away_team,
-                    )
-                    round_matches.append(match)
+        return matches
 
-            matches.extend(round_matches)
-            matchday += 1
+    def preview(self) -> List[Dict[str, Any]]:
+        """Fixture list as plain data, without touching the database."""
+        groups = {
+            team.id: label
+            for label, members in self._split_groups().items()
+            for team in members
+        }
+        preview = []
+        for match in self.generate(dry_run=True):
+            entry = {
+                "matchday": match.matchday,
+                "match_number": match.match_number,
+                "home_team": {"id": str(match.home_team.id), "name": match.home_team.team_name},
+                "away_team": {"id": str(match.away_team.id), "name": match.away_team.team_name},
+                "scheduled_date": match.scheduled_date.isoformat(),
+            }
+            if self.league.format == "group_stage":
+                entry["group"] = groups.get(match.home_team.id)
+            preview.append(entry)
+        return preview
 
-            # Rotate teams (keep first team fixed for even, rotate all for odd)
-            if self.teams_count % 2 == 0:
-                teams = [teams[0]] + [teams[-1]] + teams[1:-1]
-            else:
-                teams = teams[1:] + [teams[0]]
+    def _save(self, matches: List[LeagueMatch]):
+        """Persist the season's fixtures in one insert."""
+        with transaction.atomic():
+            if LeagueMatch.objects.filter(season=self.season).exists():
+                raise ValidationError("Fixtures have already been generated for this season")
+            LeagueMatch.objects.bulk_create(matches)
 
-        return matches
+    def _generate_round_robin(self) -> List[LeagueMatch]:
+        """Generate single round-robin fixtures."""
+        return self._build_matches(self._circle_rounds(self.teams))
 
     def _generate_round_robin_double(self) -> List[LeagueMatch]:
         """Generate double round-robin fixtures."""
-        # Generate first round
-        first_round = self._generate_round_robin()
-
-        # Generate second round (reverse home/away)
-        second_round = []
-        max_matchday = max(match.matchday for match in first_round)
-
-        for match in first_round:
-            reverse_match = self._create_match(
-                matchday=match.matchday + max_matchday,
-                match_number=match.match_number,
-                home_team=match.away_team,
-                away_team=match.home_team,
-            )
-            second_round.append(reverse_match)
-
-        return first_round + second_round
+        first_leg = self._circle_rounds(self.teams)
+        # Second leg mirrors the first with home and away swapped
+        second_leg = [[(away, home) for home, away in pairs] for pairs in first_leg]
+        return self._build_matches(first_leg + second_leg)
 
     def _generate_group_stage(self) -> List[LeagueMatch]:
-        """Generate group stage fixtures (same as round-robin for now)."""
-        return self._generate_round_robin()
-
-    def _create_match(
-        self,
-        matchday: int,
-        match_number: int,
-        home_team: LeagueTeam,
-        away_team: LeagueTeam,
-    ) -> LeagueMatch:
-        """Create a league match."""
-        # Calculate scheduled date based on league schedule
-        scheduled_date = self._calculate_match_date(matchday, match_number)
-
-        match = LeagueMatch.objects.create(
-            season=self.season,
-            matchday=matchday,
-            match_number=match_number,
-            home_team=home_team,
-            away_team=away_team,
-            scheduled_date=scheduled_date,
-            status="scheduled",
-        )
-
-        return match
+        """
+        Generate group stage fixtures.
+
+        Each group is a round robin; groups play their rounds on the same
+        matchdays.
+        """
+        group_rounds = [self._circle_rounds(teams) for teams in self._split_groups().values()]
+        rounds = [
+            [pair for rounds in group_rounds if day < len(rounds) for pair in rounds[day]]
+            for day in range(max(len(rounds) for rounds in group_rounds))
+        ]
+        return self._build_matches(rounds)
+
+    def _split_groups(self) -> Dict[str, List[LeagueTeam]]:
+        """
+        Snake-seed teams, in registration order, into groups of at most
+        ``group_size``.
+        """
+        if self.league.format != "group_stage":
+            return {}
+
+        group_count = max(1, -(-self.teams_count // self.group_size))
+        groups: List[List[LeagueTeam]] = [[] for _ in range(group_count)]
+        for index, team in enumerate(self.teams):
+            row, col = divmod(index, group_count)
+            groups[col if row % 2 == 0 else group_count - 1 - col].append(team)
+
+        return {chr(ord("A") + i): teams for i, teams in enumerate(groups) if teams}
+
+    @staticmethod
+    def _circle_rounds(teams: List[LeagueTeam]) -> List[List[Tuple[LeagueTeam, LeagueTeam]]]:
+        """
+        Round-robin pairings by the circle method.
+
+        One team stays fixed while the rest rotate; with an odd number of
+        teams a bye takes the fixed place. The fixed team alternates home
+        and away; any other pair is oriented by the distance between the two
+        teams around the circle, which gives every team as many home as away
+        games (give or take one).
+        """
+        slots: List[Optional[LeagueTeam]] = list(teams)
+        if len(slots) % 2:
+            slots.insert(0, None)
+        n = len(slots)
+        ring = n - 1
+
+        order = list(range(n))
+        rounds = []
+        for round_num in range(n - 1):
+            pairs = []
+            for i in range(n // 2):
+                first, second = order[i], order[n - 1 - i]
+                if slots[first] is None or slots[second] is None:
+                    continue  # Bye
+                if first == 0:
+                    home_first = round_num % 2 == 0
+                else:
+                    home_first = (second - first) % ring % 2 == 1
+                pair = (slots[first], slots[second])
+                pairs.append(pair if home_first else pair[::-1])
+            rounds.append(pairs)
+            order = [order[0], order[-1]] + order[1:-1]
+
+        return rounds
+
+    def _build_matches(
+        self, rounds: List[List[Tuple[LeagueTeam, LeagueTeam]]]
+    ) -> List[LeagueMatch]:
+        """Unsaved matches, one matchday per round."""
+        return [
+            LeagueMatch(
+                season=self.season,
+                matchday=matchday,
+                match_number=match_number,
+                home_team=home_team,
+                away_team=away_team,
+                scheduled_date=self._calculate_match_date(matchday, match_number),
+                status="scheduled",
+            )
+            for matchday, pairs in enumerate(rounds, start=1)
+            for match_number, (home_team, away_team) in enumerate(pairs, start=1)
+        ]
 
     def _calculate_match_date(self, matchday: int, match_number: int) -> datetime:
         """Calculate the scheduled date for a match."""
-        schedule = self.season.schedules.filter(auto_schedule=True).first()
+        if matchday not in self._matchday_dates:
+            self._matchday_dates[matchday] = self._matchday_date(matchday)
+        return self._matchday_dates[matchday]
+
+    def _matchday_date(self, matchday: int) -> datetime:
+        schedule = self.schedule
+        base_date = self.season.start_date
 
         if not schedule:
             # Default: weekly schedule starting from season start date
-            base_date = self.season.start_date
-            days_offset = (matchday - 1) * 7  # Weekly
-            match_date = base_date + timedelta(days=days_offset)
-            match_datetime = timezone.make_aware(
-                datetime.combine(
-                    match_date, timezone.datetime.strptime("18:00", "%H:%M").time()
-                )
-            )
-            return match_datetime
+            match_date = base_date + timedelta(days=(matchday - 1) * 7)
+            return timezone.make_aware(datetime.combine(match_date, time(18, 0)))
 
         # Use schedule configuration
-        base_date = self.season.start_date
-
-        if schedule.schedule_type == "weekly":
-            days_offset = (matchday - 1) * 7
-        elif schedule.schedule_type == "biweekly":
+        if schedule.schedule_type == "biweekly":
             days_offset = (matchday - 1) * 14
         else:
-            days_offset = (matchday - 1) * 7  # Default to weekly
+            days_offset = (matchday - 1) * 7  # Weekly, and the default
 
         match_date = base_date + timedelta(days=days_offset)
 
-        # Adjust to preferred days
-        if schedule.preferred_days:
-            # Find next available preferred day
-            while match_date.weekday() not in schedule.preferred_days:
-                match_date += timedelta(days=1)
-
-        # Check if date is available
-        while not schedule.is_day_available(match_date):
+        # Move to the next preferred, non-excluded day (within a year)
+        for _ in range(366):
+            if schedule.is_day_available(match_date):
+                break
             match_date += timedelta(days=1)
 
-        # Create datetime with start time
-        match_datetime = timezone.make_aware(
-            datetime.combine(match_date, schedule.start_time)
-        )
-
-        return match_datetime
+        return timezone.make_aware(datetime.combine(match_date, schedule.start_time))
 
 
 class LeagueStandingsService:
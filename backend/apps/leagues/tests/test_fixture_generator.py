@@ -0,0 +1,172 @@
+"""
+Tests for in-memory fixture generation.
+"""
+
+from collections import Counter
+from datetime import date, time
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.leagues.models import League, LeagueMatch, LeagueSchedule, LeagueSeason, LeagueTeam
+from apps.leagues.services import LeagueFixtureGenerator
+from apps.clients.models import ClientProfile
+from tests.factories import ClubFactory, PlayerLevelFactory, UserFactory
+
+
+class LeagueFixtureGeneratorTest(TestCase):
+    """Test circle-method rounds, balancing and bulk persistence."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.club = ClubFactory()
+        level = PlayerLevelFactory()
+        cls.players = [
+            ClientProfile.objects.create(
+                user=UserFactory(),
+                organization=cls.club.organization,
+                club=cls.club,
+                level=level,
+            )
+            for _ in range(6)
+        ]
+
+    def make_season(self, teams, format="round_robin", name="Liga"):
+        league = League.objects.create(
+            organization=self.club.organization,
+            club=self.club,
+            name=name,
+            description=name,
+            slug=f"{name.lower().replace(' ', '-')}",
+            format=format,
+            organizer=self.user,
+            contact_email="organizer@example.com",
+        )
+        season = LeagueSeason.objects.create(
+            league=league,
+            name=f"{name} 2030",
+            start_date=date(2030, 3, 4),
+            end_date=date(2030, 12, 20),
+            registration_start=timezone.now(),
+            registration_end=timezone.now(),
+        )
+        pairs = [(a, b) for a in self.players for b in self.players if a != b]
+        LeagueTeam.objects.bulk_create(
+            LeagueTeam(
+                season=season,
+                team_name=f"Team {i:02d}",
+                player1=pairs[i][0],
+                player2=pairs[i][1],
+                contact_phone="5550000",
+                contact_email=f"team{i}@example.com",
+            )
+            for i in range(teams)
+        )
+        return season
+
+    def test_round_robin_pairs_everyone_once_with_balanced_venues(self):
+        season = self.make_season(7)
+
+        matches = LeagueFixtureGenerator(season).generate()
+
+        self.assertEqual(len(matches), 21)
+        self.assertEqual(max(m.matchday for m in matches), 7)
+        pairs = {frozenset((m.home_team_id, m.away_team_id)) for m in matches}
+        self.assertEqual(len(pairs), 21)
+        for matchday in range(1, 8):
+            playing = [
+                team
+                for m in matches
+                if m.matchday == matchday
+                for team in (m.home_team_id, m.away_team_id)
+            ]
+            self.assertEqual(len(playing), len(set(playing)))
+
+        home = Counter(m.home_team_id for m in matches)
+        away = Counter(m.away_team_id for m in matches)
+        for team in season.teams.all():
+            self.assertLessEqual(abs(home[team.id] - away[team.id]), 1)
+
+        self.assertEqual(LeagueMatch.objects.filter(season=season).count(), 21)
+
+    def test_double_round_robin_mirrors_first_leg(self):
+        season = self.make_season(4, format="round_robin_double")
+
+        matches = LeagueFixtureGenerator(season).generate(dry_run=True)
+
+        first = {(m.home_team_id, m.away_team_id) for m in matches if m.matchday <= 3}
+        second = {(m.away_team_id, m.home_team_id) for m in matches if m.matchday > 3}
+        self.assertEqual(len(matches), 12)
+        self.assertEqual(first, second)
+
+    def test_group_stage_plays_groups_on_shared_matchdays(self):
+        season = self.make_season(8, format="group_stage")
+
+        preview = LeagueFixtureGenerator(season, group_size=4).preview()
+
+        self.assertEqual(len(preview), 12)
+        self.assertEqual(Counter(f["group"] for f in preview), {"A": 6, "B": 6})
+        self.assertEqual(max(f["matchday"] for f in preview), 3)
+        numbers = [(f["matchday"], f["match_number"]) for f in preview]
+        self.assertEqual(len(numbers), len(set(numbers)))
+
+    def test_dry_run_does_not_write(self):
+        season = self.make_season(6)
+        generator = LeagueFixtureGenerator(season)
+
+        with CaptureQueriesContext(connection) as queries:
+            matches = generator.generate(dry_run=True)
+
+        self.assertEqual(len(matches), 15)
+        self.assertEqual(len(queries), 0)
+        self.assertFalse(LeagueMatch.objects.exists())
+
+    def test_dates_follow_preloaded_schedule(self):
+        season = self.make_season(4)
+        LeagueSchedule.objects.create(
+            season=season,
+            schedule_type="weekly",
+            preferred_days=[5],
+            start_time=time(10, 0),
+            end_time=time(14, 0),
+            custom_excluded_dates=["2030-03-16"],
+        )
+        generator = LeagueFixtureGenerator(season)
+
+        with self.assertNumQueries(0):
+            matches = generator.generate(dry_run=True)
+
+        dates = {m.matchday: timezone.localtime(m.scheduled_date) for m in matches}
+        # Saturdays only, skipping the excluded 16th
+        self.assertEqual(
+            [dates[day].date() for day in (1, 2, 3)],
+            [date(2030, 3, 9), date(2030, 3, 23), date(2030, 3, 23)],
+        )
+        self.assertTrue(all(d.time() == time(10, 0) for d in dates.values()))
+
+    def test_second_generation_is_rejected(self):
+        season = self.make_season(4)
+        LeagueFixtureGenerator(season).generate()
+
+        with self.assertRaises(ValidationError):
+            LeagueFixtureGenerator(season).generate()
+        self.assertEqual(LeagueMatch.objects.filter(season=season).count(), 6)
+
+    def test_many_divisions_one_insert_each(self):
+        seasons = [self.make_season(12, name=f"Division {i}") for i in range(30)]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = LeagueFixtureGenerator.generate_for_seasons(seasons)
+
+        self.assertEqual(len(result), 30)
+        self.assertEqual(LeagueMatch.objects.count(), 30 * 66)
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        # One bulk insert per season (SQLite splits it into parameter-limited batches)
+        self.assertTrue(all("leaguematch" in q["sql"] for q in inserts))
+        self.assertLessEqual(len(inserts), 30 * 2)
+        # Per season: existing-fixtures check, insert batches and the savepoint
+        self.assertLess(len(queries), 30 * 5 + 10)
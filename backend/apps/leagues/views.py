@@ -2,6 +2,7 @@
 Views for leagues module.
 """
 
+from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
@@ -246,6 +247,27 @@ class LeagueSeasonViewSet(viewsets.ModelViewSet):
             }
         )
 
+    @action(detail=True, methods=["get"])
+    def preview_fixtures(self, request, pk=None):
+        """Preview the fixtures a season would get, without saving them."""
+        season = self.get_object()
+
+        try:
+            fixtures = LeagueFixtureGenerator(season).preview()
+        except ValidationError as e:
+            return Response(
+                {"error": " ".join(e.messages)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                "season": season.name,
+                "total_matchdays": max((f["matchday"] for f in fixtures), default=0),
+                "total_matches": len(fixtures),
+                "matches": fixtures,
+            }
+        )
+
     @action(detail=True, methods=["post"])
     def register_team(self, request, pk=None):
         """Register a team for the season."""
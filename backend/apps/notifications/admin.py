@@ -10,6 +10,7 @@ from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from .delivery import dispatch_deliveries
 from .models import (
     Notification,
     NotificationBatch,
@@ -20,7 +21,7 @@ from .models import (
     NotificationType,
     UserNotificationPreference,
 )
-from .tasks import process_notification_batch, send_notification_delivery
+from .tasks import process_notification_batch
 
 
 @admin.register(NotificationType)
@@ -323,13 +324,15 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def resend_failed_deliveries(self, request, queryset):
         """Resend failed deliveries for selected notifications."""
-        count = 0
-        for notification in queryset:
-            failed_deliveries = notification.deliveries.filter(status="failed")
-            for delivery in failed_deliveries:
-                if delivery.can_retry():
-                    send_notification_delivery.apply_async(args=[delivery.id])
-                    count += 1
+        retryable = [
+            delivery
+            for delivery in NotificationDelivery.objects.filter(
+                notification__in=queryset, status="failed"
+            )
+            if delivery.can_retry()
+        ]
+        dispatch_deliveries(retryable)
+        count = len(retryable)
 
         self.message_user(request, f"{count} failed deliveries scheduled for retry.")
 
@@ -635,11 +638,9 @@ class NotificationDeliveryAdmin(admin.ModelAdmin):
 
     def retry_delivery(self, request, queryset):
         """Retry selected deliveries."""
-        count = 0
-        for delivery in queryset:
-            if delivery.can_retry():
-                send_notification_delivery.apply_async(args=[delivery.id])
-                count += 1
+        retryable = [delivery for delivery in queryset if delivery.can_retry()]
+        dispatch_deliveries(retryable)
+        count = len(retryable)
 
         self.message_user(request, f"{count} deliveries scheduled for retry.")
 
@@ -0,0 +1,228 @@
+"""
+Channel-batched notification delivery.
+
+Pending deliveries are dispatched in chunks per channel instead of one
+Celery task each. A worker loads its chunk with one query, renders every
+message and hands them to the channel's pooled service, whose
+``send_batch`` uses the provider's bulk API where there is one (Resend
+batch emails, FCM multicast) and otherwise reuses one client for the whole
+chunk. Outcomes are written back with one ``bulk_update`` of the
+deliveries and one ``bulk_create`` of their events.
+
+A chunk's rows stay locked (``SKIP LOCKED``) from loading to write-back, so
+a redelivered or retried task cannot pick up deliveries still in flight. If
+the write-back fails after the provider accepted messages, the worker
+records those deliveries as sent on their own and the task only retries
+the ones that did not go out.
+
+Usage:
+    dispatch_deliveries(NotificationDelivery.objects.filter(notification__batch=batch))
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .models import NotificationChannel, NotificationDelivery, NotificationEvent
+from .services import NotificationServiceFactory
+
+logger = logging.getLogger(__name__)
+
+# Fields a send can change, written back with bulk_update
+STATUS_FIELDS = [
+    "status",
+    "attempt_count",
+    "sent_at",
+    "failed_at",
+    "next_retry_at",
+    "provider_id",
+    "provider_response",
+    "error_code",
+    "error_message",
+    "updated_at",
+]
+
+# Channels whose provider reports delivery status later
+STATUS_CHECK_CHANNELS = ("email", "sms", "whatsapp")
+
+
+def get_batch_size() -> int:
+    return getattr(settings, "NOTIFICATION_DELIVERY_BATCH_SIZE", 500)
+
+
+def dispatch_deliveries(deliveries) -> int:
+    """
+    Enqueue ``send_delivery_batch`` tasks for ``deliveries`` (a queryset or
+    an iterable of instances), one per channel and chunk of
+    NOTIFICATION_DELIVERY_BATCH_SIZE. Tasks are sent once the current
+    transaction commits; returns how many were enqueued.
+    """
+    from .tasks import send_delivery_batch
+
+    if isinstance(deliveries, QuerySet):
+        rows = deliveries.values_list("id", "channel_id").iterator()
+    else:
+        rows = ((delivery.id, delivery.channel_id) for delivery in deliveries)
+
+    by_channel: Dict[str, List[str]] = defaultdict(list)
+    for delivery_id, channel_id in rows:
+        by_channel[str(channel_id)].append(str(delivery_id))
+
+    batch_size = get_batch_size()
+    chunks = [
+        (channel_id, delivery_ids[start : start + batch_size])
+        for channel_id, delivery_ids in by_channel.items()
+        for start in range(0, len(delivery_ids), batch_size)
+    ]
+
+    def enqueue():
+        for channel_id, delivery_ids in chunks:
+            send_delivery_batch.delay(channel_id, delivery_ids)
+
+    if chunks:
+        transaction.on_commit(enqueue)
+    return len(chunks)
+
+
+class DeliveryWorker:
+    """Send chunks of deliveries of one channel through its pooled service."""
+
+    def __init__(self, channel: NotificationChannel):
+        self.channel = channel
+        self.service = NotificationServiceFactory.get_pooled_service(
+            channel.channel_type
+        )
+        # Deliveries the provider accepted in the current run
+        self.sent_ids: List[str] = []
+
+    def _load(self, delivery_ids: Iterable) -> List[NotificationDelivery]:
+        """Lock the sendable deliveries; rows locked by another worker are skipped."""
+        deliveries = (
+            NotificationDelivery.objects.select_related(
+                "notification__recipient",
+                "notification__template",
+                "notification__club",
+                "notification__organization",
+            )
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(id__in=list(delivery_ids), channel=self.channel)
+        )
+        return [delivery for delivery in deliveries if delivery.can_retry()]
+
+    def run(self, delivery_ids: Iterable) -> Dict[str, int]:
+        self.sent_ids = []
+        try:
+            with transaction.atomic():
+                return self._run(delivery_ids)
+        except Exception:
+            self._record_sent()
+            raise
+
+    def _record_sent(self):
+        """After a failed write-back, keep what went out from being sent again."""
+        if not self.sent_ids:
+            return
+        try:
+            now = timezone.now()
+            NotificationDelivery.objects.filter(id__in=self.sent_ids).update(
+                status="sent",
+                sent_at=now,
+                attempt_count=F("attempt_count") + 1,
+                updated_at=now,
+            )
+        except Exception as e:
+            logger.error(
+                f"Could not record {len(self.sent_ids)} sent "
+                f"{self.channel.channel_type} deliveries: {str(e)}"
+            )
+
+    def _run(self, delivery_ids: Iterable) -> Dict[str, int]:
+        from .tasks import (
+            _get_recipient_for_channel,
+            _prepare_notification_content,
+            check_delivery_statuses,
+        )
+
+        deliveries = self._load(delivery_ids)
+        channel = self.channel
+
+        to_send, messages = [], []
+        for delivery in deliveries:
+            notification = delivery.notification
+            recipient = _get_recipient_for_channel(notification.recipient, channel)
+            if not recipient:
+                delivery.mark_as_failed(
+                    error_code="NO_RECIPIENT",
+                    error_message=f"No {channel.channel_type} address for user",
+                    schedule_retry=False,
+                    save=False,
+                )
+                continue
+
+            content = _prepare_notification_content(notification, channel)
+            to_send.append(delivery)
+            messages.append(
+                {
+                    "recipient": recipient,
+                    "subject": content["subject"],
+                    "message": content["body"],
+                    "extra": content.get("extra", {}),
+                }
+            )
+
+        results = self.service.send_batch(messages) if messages else []
+
+        sent_ids = self.sent_ids
+        events = []
+        for delivery, result in zip(to_send, results):
+            if result["success"]:
+                delivery.mark_as_sent(
+                    provider_id=result["provider_id"],
+                    provider_response=result.get("provider_response"),
+                    save=False,
+                )
+                sent_ids.append(str(delivery.id))
+                event_type = "sent"
+            else:
+                delivery.mark_as_failed(
+                    error_code=result.get("error_code", "SEND_FAILED"),
+                    error_message=result.get("error", "Unknown error"),
+                    schedule_retry=True,
+                    save=False,
+                )
+                event_type = "failed"
+            events.append(
+                NotificationEvent(
+                    notification=delivery.notification,
+                    delivery=delivery,
+                    event_type=event_type,
+                    event_data=result,
+                )
+            )
+
+        now = timezone.now()
+        for delivery in deliveries:
+            delivery.updated_at = now
+
+        NotificationDelivery.objects.bulk_update(deliveries, STATUS_FIELDS)
+        NotificationEvent.objects.bulk_create(events)
+
+        if sent_ids and channel.channel_type in STATUS_CHECK_CHANNELS:
+            # Check after 1 minute, one task for the whole chunk
+            check_delivery_statuses.apply_async(args=[list(sent_ids)], countdown=60)
+
+        summary = {
+            "deliveries": len(deliveries),
+            "sent": len(sent_ids),
+            "failed": len(deliveries) - len(sent_ids),
+        }
+        logger.info(
+            f"Delivered {summary['sent']}/{summary['deliveries']} "
+            f"{channel.channel_type} notifications in one batch"
+        )
+        return summary
@@ -0,0 +1,242 @@
+"""
+Set-based notification digests.
+
+One windowed query selects every unread notification whose (recipient,
+type) has a digest preference of the frequencies being built, ordered by
+recipient so it is grouped in a single streaming pass. Each finished
+recipient yields one digest per frequency; digests are rendered and
+enqueued in chunks, and the per-user ``DigestWatermark`` rows are advanced
+in bulk with them so a notification never lands in two digests. The work
+grows with the number of pending notifications, not with users x queries.
+
+Usage:
+    DigestBuilder(["hourly"]).run()
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import DigestWatermark, Notification, UserNotificationPreference
+from .preferences import CHANNEL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PERIODS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+# Runs fire on a schedule, so allow a little drift when checking if due
+DUE_TOLERANCE = timedelta(minutes=5)
+
+# Digests per enqueued send task
+SEND_BATCH_SIZE = 200
+
+# Notifications listed in a digest body; the rest are only counted
+MAX_ITEMS = 20
+
+QUERY_CHUNK_SIZE = 2000
+
+
+def render_digest(count: int, items: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Subject and body for ``count`` notifications, listing ``items``."""
+    subject = f"Tienes {count} notificaciones nuevas"
+
+    body_parts = [f"Resumen de tus últimas {count} notificaciones:\n"]
+    for title, action_url in items:
+        body_parts.append(f"• {title}")
+        if action_url:
+            body_parts.append(f"  Ver más: {action_url}")
+        body_parts.append("")
+    if count > len(items):
+        body_parts.append(f"... y {count - len(items)} más.")
+
+    return {"subject": subject, "body": "\n".join(body_parts)}
+
+
+class _Digest:
+    """Pending digest of one user for one frequency."""
+
+    __slots__ = ("user_id", "frequency", "count", "items", "channels", "last")
+
+    def __init__(self, user_id, frequency):
+        self.user_id = user_id
+        self.frequency = frequency
+        self.count = 0
+        self.items: List[Tuple[str, str]] = []
+        self.channels = set()
+        self.last = None
+
+    def add(self, notification_id, title, action_url, created_at, channels):
+        self.count += 1
+        if len(self.items) < MAX_ITEMS:
+            self.items.append((title, action_url))
+        self.channels.update(channels)
+        self.last = (created_at, notification_id)
+
+    def payload(self) -> Dict:
+        return {
+            "user_id": self.user_id,
+            "frequency": self.frequency,
+            "count": self.count,
+            "channels": sorted(self.channels),
+            **render_digest(self.count, self.items),
+        }
+
+
+class DigestBuilder:
+    """Build and enqueue the digests of the given frequencies."""
+
+    def __init__(self, frequencies: Optional[Iterable[str]] = None, now=None):
+        self.frequencies = list(frequencies or DIGEST_PERIODS)
+        self.cutoff = now or timezone.now()
+        self.window_start = {
+            frequency: self.cutoff - DIGEST_PERIODS[frequency]
+            for frequency in self.frequencies
+        }
+
+    def _preferences(self) -> Dict[Tuple, Tuple[str, List[str]]]:
+        """``{(user_id, type_id): (frequency, [channel slugs])}`` in one query."""
+        rows = UserNotificationPreference.objects.filter(
+            digest_enabled=True,
+            is_active=True,
+            digest_frequency__in=self.frequencies,
+        ).values_list(
+            "user_id", "notification_type_id", "digest_frequency", *CHANNEL_FIELDS.values()
+        )
+        slugs = list(CHANNEL_FIELDS)
+        return {
+            (user_id, type_id): (
+                frequency,
+                [slug for slug, enabled in zip(slugs, flags) if enabled],
+            )
+            for user_id, type_id, frequency, *flags in rows.iterator(
+                chunk_size=QUERY_CHUNK_SIZE
+            )
+        }
+
+    def _watermarks(self) -> Dict[Tuple, DigestWatermark]:
+        return {
+            (watermark.user_id, watermark.frequency): watermark
+            for watermark in DigestWatermark.objects.filter(
+                frequency__in=self.frequencies
+            ).iterator(chunk_size=QUERY_CHUNK_SIZE)
+        }
+
+    def _is_due(self, watermark: Optional[DigestWatermark], frequency: str) -> bool:
+        if watermark is None:
+            return True
+        return watermark.last_sent_at <= self.window_start[frequency] + DUE_TOLERANCE
+
+    def _pending(self):
+        """Unread notifications of digest-enabled (user, type) pairs in the window."""
+        digest_preference = UserNotificationPreference.objects.filter(
+            user_id=OuterRef("recipient_id"),
+            notification_type_id=OuterRef("notification_type_id"),
+            digest_enabled=True,
+            is_active=True,
+            digest_frequency__in=self.frequencies,
+        )
+        return (
+            Notification.objects.filter(
+                Exists(digest_preference),
+                is_read=False,
+                is_active=True,
+                created_at__gte=min(self.window_start.values()),
+                created_at__lte=self.cutoff,
+            )
+            .order_by("recipient_id", "created_at", "id")
+            .values_list(
+                "id", "recipient_id", "notification_type_id", "title", "action_url", "created_at"
+            )
+            .iterator(chunk_size=QUERY_CHUNK_SIZE)
+        )
+
+    def build(self):
+        """Yield finished ``_Digest``s, one recipient at a time."""
+        preferences = self._preferences()
+        if not preferences:
+            return
+        watermarks = self._watermarks()
+
+        current_user = None
+        digests: Dict[str, _Digest] = {}
+        for notification_id, user_id, type_id, title, action_url, created_at in self._pending():
+            if user_id != current_user:
+                yield from digests.values()
+                current_user, digests = user_id, {}
+
+            preference = preferences.get((user_id, type_id))
+            if preference is None:
+                # Turned on after the preferences were read, left for the next run
+                continue
+            frequency, channels = preference
+            if created_at < self.window_start[frequency]:
+                continue
+            watermark = watermarks.get((user_id, frequency))
+            if not self._is_due(watermark, frequency):
+                continue
+            if watermark is not None and (created_at, notification_id) <= (
+                watermark.watermark_at,
+                watermark.watermark_id,
+            ):
+                continue
+
+            digest = digests.get(frequency)
+            if digest is None:
+                digest = digests[frequency] = _Digest(user_id, frequency)
+            digest.add(notification_id, title, action_url, created_at, channels)
+
+        yield from digests.values()
+
+    def run(self) -> Dict[str, int]:
+        """Enqueue every due digest in chunks; returns digest and notification totals."""
+        totals = {"digests": 0, "notifications": 0, "batches": 0}
+        batch: List[_Digest] = []
+        for digest in self.build():
+            batch.append(digest)
+            if len(batch) >= SEND_BATCH_SIZE:
+                self._enqueue(batch, totals)
+                batch = []
+        if batch:
+            self._enqueue(batch, totals)
+
+        logger.info(
+            f"Enqueued {totals['digests']} {'/'.join(self.frequencies)} digests "
+            f"covering {totals['notifications']} notifications"
+        )
+        return totals
+
+    def _enqueue(self, batch: List[_Digest], totals: Dict[str, int]):
+        from .tasks import send_digest_batch
+
+        watermarks = [
+            DigestWatermark(
+                user_id=digest.user_id,
+                frequency=digest.frequency,
+                watermark_at=digest.last[0],
+                watermark_id=digest.last[1],
+                last_sent_at=self.cutoff,
+            )
+            for digest in batch
+        ]
+        payloads = [digest.payload() for digest in batch]
+
+        with transaction.atomic():
+            DigestWatermark.objects.bulk_create(
+                watermarks,
+                update_conflicts=True,
+                unique_fields=["user", "frequency"],
+                update_fields=["watermark_at", "watermark_id", "last_sent_at", "updated_at"],
+            )
+            transaction.on_commit(lambda: send_digest_batch.delay(payloads))
+
+        totals["digests"] += len(batch)
+        totals["notifications"] += sum(digest.count for digest in batch)
+        totals["batches"] += 1
@@ -0,0 +1,40 @@
+# Preferences are now stored sparsely: drop rows that only repeat the
+# notification type defaults (see apps.notifications.preferences).
+
+from django.db import migrations
+
+
+def prune_default_preferences(apps, schema_editor):
+    NotificationType = apps.get_model("notifications", "NotificationType")
+    UserNotificationPreference = apps.get_model(
+        "notifications", "UserNotificationPreference"
+    )
+
+    for notification_type in NotificationType.objects.all():
+        enabled = notification_type.default_enabled
+        UserNotificationPreference.objects.filter(
+            notification_type=notification_type,
+            is_active=True,
+            email_enabled=enabled,
+            sms_enabled=enabled,
+            whatsapp_enabled=enabled,
+            push_web_enabled=enabled,
+            push_mobile_enabled=enabled,
+            in_app_enabled=True,
+            quiet_hours_start__isnull=True,
+            quiet_hours_end__isnull=True,
+            digest_enabled=False,
+            digest_frequency="daily",
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_notification_keyset_index"),
+    ]
+
+    operations = [
+        # Resolution falls back to the same defaults, so nothing to restore
+        migrations.RunPython(prune_default_preferences, migrations.RunPython.noop),
+    ]
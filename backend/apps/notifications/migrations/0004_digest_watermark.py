@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0003_prune_default_preferences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='digest_watermarks', to=settings.AUTH_USER_MODEL)),
+                ('frequency', models.CharField(choices=[('hourly', 'Cada hora'), ('daily', 'Diario'), ('weekly', 'Semanal')], max_length=20)),
+                ('watermark_at', models.DateTimeField()),
+                ('watermark_id', models.UUIDField()),
+                ('last_sent_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Marca de Resumen',
+                'verbose_name_plural': 'Marcas de Resúmenes',
+                'unique_together': {('user', 'frequency')},
+            },
+        ),
+    ]
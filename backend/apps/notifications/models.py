@@ -168,6 +168,13 @@ class NotificationTemplate(MultiTenantModel):
         return {"subject": subject, "body": body}
 
 
+DIGEST_FREQUENCY_CHOICES = [
+    ("hourly", "Cada hora"),
+    ("daily", "Diario"),
+    ("weekly", "Semanal"),
+]
+
+
 class UserNotificationPreference(BaseModel):
     """
     User preferences for notification types and channels.
@@ -200,11 +207,7 @@ class UserNotificationPreference(BaseModel):
     )
     digest_frequency = models.CharField(
         max_length=20,
-        choices=[
-            ("hourly", "Cada hora"),
-            ("daily", "Diario"),
-            ("weekly", "Semanal"),
-        ],
+        choices=DIGEST_FREQUENCY_CHOICES,
         default="daily",
     )
 
@@ -232,6 +235,31 @@ class UserNotificationPreference(BaseModel):
         return channel_map.get(channel_slug, False)
 
 
+class DigestWatermark(BaseModel):
+    """
+    Newest notification already included in a user's digest of a given
+    frequency, so each notification is digested at most once.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="digest_watermarks"
+    )
+    frequency = models.CharField(max_length=20, choices=DIGEST_FREQUENCY_CHOICES)
+
+    # (created_at, id) of the last digested notification
+    watermark_at = models.DateTimeField()
+    watermark_id = models.UUIDField()
+    last_sent_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Marca de Resumen"
+        verbose_name_plural = "Marcas de Resúmenes"
+        unique_together = ["user", "frequency"]
+
+    def __str__(self):
+        return f"{self.user} - {self.frequency} - {self.watermark_at}"
+
+
 class NotificationBatch(MultiTenantModel):
     """
     Batch notifications for mass sending.
@@ -382,6 +410,7 @@ class Notification(MultiTenantModel):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["recipient", "is_read", "created_at"]),
+            models.Index(fields=["recipient", "created_at", "id"]),
             models.Index(fields=["notification_type", "created_at"]),
             models.Index(fields=["priority", "created_at"]),
         ]
@@ -468,8 +497,8 @@ class NotificationDelivery(BaseModel):
             and (self.next_retry_at is None or self.next_retry_at <= timezone.now())
         )
 
-    def mark_as_sent(self, provider_id=None, provider_response=None):
-        """Mark delivery as sent."""
+    def mark_as_sent(self, provider_id=None, provider_response=None, save=True):
+        """Mark delivery as sent; ``save=False`` leaves it for a bulk_update."""
         self.status = "sent"
         self.sent_at = timezone.now()
         self.attempt_count += 1
@@ -479,7 +508,8 @@ class NotificationDelivery(BaseModel):
         if provider_response:
             self.provider_response = provider_response
 
-        self.save()
+        if save:
+            self.save()
 
     def mark_as_delivered(self, provider_response=None):
         """Mark delivery as delivered."""
@@ -491,7 +521,9 @@ class NotificationDelivery(BaseModel):
 
         self.save()
 
-    def mark_as_failed(self, error_code=None, error_message=None, schedule_retry=True):
+    def mark_as_failed(
+        self, error_code=None, error_message=None, schedule_retry=True, save=True
+    ):
         """Mark delivery as failed and optionally schedule retry."""
         self.status = "failed"
         self.failed_at = timezone.now()
@@ -510,7 +542,8 @@ class NotificationDelivery(BaseModel):
             self.next_retry_at = timezone.now() + timedelta(minutes=delay_minutes)
             self.status = "pending"  # Reset to pending for retry
 
-        self.save()
+        if save:
+            self.save()
 
     def mark_as_read(self):
         """Mark delivery as read."""
@@ -0,0 +1,130 @@
+"""
+Sparse notification preference resolution.
+
+``UserNotificationPreference`` rows are only stored for users who changed
+something for a notification type; everyone else follows the type's
+defaults. ``PreferenceResolver`` answers "what applies to these users for
+this type" with one query for the overrides plus in-memory defaults, so
+adding a notification type writes nothing per user and batch sends
+resolve every recipient at once.
+
+Usage:
+    resolver = PreferenceResolver(notification_type)
+    preferences = resolver.resolve(recipients)
+    preferences[user.id].is_channel_enabled("email")
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from .models import NotificationChannel, NotificationType, UserNotificationPreference
+
+# Channel slug -> preference field
+CHANNEL_FIELDS = {
+    "email": "email_enabled",
+    "sms": "sms_enabled",
+    "whatsapp": "whatsapp_enabled",
+    "push_web": "push_web_enabled",
+    "push_mobile": "push_mobile_enabled",
+    "in_app": "in_app_enabled",
+}
+
+SETTING_FIELDS = (
+    "quiet_hours_start",
+    "quiet_hours_end",
+    "digest_enabled",
+    "digest_frequency",
+)
+
+
+def default_preference_values(notification_type: NotificationType) -> Dict:
+    """
+    Field values a user without an override gets for ``notification_type``:
+    every channel follows ``default_enabled`` except in-app, which is always
+    on. A type that lists ``available_channels`` is limited to those.
+    """
+    enabled = notification_type.default_enabled
+    values = {field: enabled for field in CHANNEL_FIELDS.values()}
+    values["in_app_enabled"] = True
+    available = notification_type.available_channels
+    if available:
+        for slug, field in CHANNEL_FIELDS.items():
+            if slug not in available:
+                values[field] = False
+    values.update(
+        quiet_hours_start=None,
+        quiet_hours_end=None,
+        digest_enabled=False,
+        digest_frequency="daily",
+    )
+    return values
+
+
+class ResolvedPreference:
+    """Effective preference of one user for one notification type."""
+
+    __slots__ = ("values", "is_default")
+
+    def __init__(self, values: Dict, is_default: bool):
+        self.values = values
+        self.is_default = is_default
+
+    def __getattr__(self, name):
+        try:
+            return self.values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def is_channel_enabled(self, channel_slug: str) -> bool:
+        field = CHANNEL_FIELDS.get(channel_slug)
+        return bool(field and self.values[field])
+
+
+class PreferenceResolver:
+    """Resolve preferences of many users for one notification type."""
+
+    def __init__(self, notification_type: NotificationType):
+        self.notification_type = notification_type
+        self.defaults = default_preference_values(notification_type)
+
+    def resolve(self, users: Iterable) -> Dict:
+        """
+        ``{user_id: ResolvedPreference}`` for ``users`` (instances or ids),
+        with one query for the stored overrides.
+        """
+        user_ids = [getattr(user, "pk", user) for user in users]
+        overrides = UserNotificationPreference.objects.filter(
+            notification_type=self.notification_type,
+            user_id__in=user_ids,
+            is_active=True,
+        ).values("user_id", *CHANNEL_FIELDS.values(), *SETTING_FIELDS)
+
+        resolved = {}
+        for row in overrides:
+            user_id = row.pop("user_id")
+            resolved[user_id] = ResolvedPreference(row, is_default=False)
+
+        default = ResolvedPreference(self.defaults, is_default=True)
+        for user_id in user_ids:
+            resolved.setdefault(user_id, default)
+        return resolved
+
+    def resolve_one(self, user) -> ResolvedPreference:
+        user_id = getattr(user, "pk", user)
+        return self.resolve([user_id])[user_id]
+
+    def channels_for(
+        self,
+        users: Iterable,
+        channels: Optional[Iterable[NotificationChannel]] = None,
+    ) -> Dict[object, List[NotificationChannel]]:
+        """
+        ``{user_id: [channel, ...]}``: the channels (enabled ones by default)
+        each user accepts for this type.
+        """
+        if channels is None:
+            channels = NotificationChannel.objects.filter(is_enabled=True)
+        channels = list(channels)
+        return {
+            user_id: [c for c in channels if preference.is_channel_enabled(c.slug)]
+            for user_id, preference in self.resolve(users).items()
+        }
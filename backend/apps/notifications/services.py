@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -16,6 +16,10 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+# Provider limits for bulk sends
+RESEND_BATCH_SIZE = 100
+FCM_MULTICAST_SIZE = 500
+
 
 class BaseNotificationService:
     """
@@ -46,6 +50,24 @@ class BaseNotificationService:
         """
         return {"status": "unknown", "provider_id": provider_id}
 
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several messages (dicts with ``recipient``, ``subject``,
+        ``message`` and optional ``extra`` kwargs), returning one result per
+        message in the same order. Subclasses override this to use the
+        provider's bulk API; by default messages go one by one through the
+        same service instance, so any client it holds is reused.
+        """
+        return [
+            self.send(
+                message["recipient"],
+                message["subject"],
+                message["message"],
+                **message.get("extra", {}),
+            )
+            for message in messages
+        ]
+
 
 class EmailService(BaseNotificationService):
     """
@@ -59,6 +81,7 @@ class EmailService(BaseNotificationService):
         self.api_key = settings.RESEND_API_KEY
         self.from_email = settings.RESEND_FROM_EMAIL
         self.base_url = "https://api.resend.com"
+        self._session = None
 
     def validate_recipient(self, recipient: str) -> bool:
         """Validate email format."""
@@ -87,33 +110,13 @@ class EmailService(BaseNotificationService):
             return self._send_with_django(recipient, subject, message, **kwargs)
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            # Prepare email data
-            email_data = {
-                "from": kwargs.get("from_email", self.from_email),
-                "to": [recipient],
-                "subject": subject,
-                "html": message,
-            }
-
-            # Add reply-to if provided
-            if kwargs.get("reply_to"):
-                email_data["reply_to"] = [kwargs["reply_to"]]
-
-            # Add attachments if provided
-            if kwargs.get("attachments"):
-                email_data["attachments"] = kwargs["attachments"]
-
-            # Add tags for tracking
-            if kwargs.get("tags"):
-                email_data["tags"] = kwargs["tags"]
+            email_data = self._resend_payload(recipient, subject, message, **kwargs)
 
             response = requests.post(
-                f"{self.base_url}/emails", headers=headers, json=email_data, timeout=30
+                f"{self.base_url}/emails",
+                headers=self._resend_headers(),
+                json=email_data,
+                timeout=30,
             )
 
             if response.status_code == 200:
@@ -151,6 +154,142 @@ class EmailService(BaseNotificationService):
                 "provider_id": None,
             }
 
+    def _resend_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _resend_payload(
+        self, recipient: str, subject: str, message: str, **kwargs
+    ) -> Dict[str, Any]:
+        """Resend API body for one email."""
+        email_data = {
+            "from": kwargs.get("from_email", self.from_email),
+            "to": [recipient],
+            "subject": subject,
+            "html": message,
+        }
+
+        # Add reply-to if provided
+        if kwargs.get("reply_to"):
+            email_data["reply_to"] = [kwargs["reply_to"]]
+
+        # Add attachments if provided
+        if kwargs.get("attachments"):
+            email_data["attachments"] = kwargs["attachments"]
+
+        # Add tags for tracking
+        if kwargs.get("tags"):
+            email_data["tags"] = kwargs["tags"]
+
+        return email_data
+
+    def _http(self) -> requests.Session:
+        """Keep-alive session reused by every batch this instance sends."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send emails through Resend's batch endpoint (RESEND_BATCH_SIZE per
+        request) or, without an API key, over one open SMTP connection.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        batchable = []
+        for index, item in enumerate(messages):
+            extra = item.get("extra", {})
+            if not self.validate_recipient(item["recipient"]):
+                results[index] = {
+                    "success": False,
+                    "error": "Invalid email format",
+                    "provider_id": None,
+                }
+            elif self.api_key and extra.get("attachments"):
+                # The batch endpoint does not take attachments
+                results[index] = self.send(
+                    item["recipient"], item["subject"], item["message"], **extra
+                )
+            else:
+                batchable.append(index)
+
+        if self.api_key:
+            chunks = [
+                batchable[start : start + RESEND_BATCH_SIZE]
+                for start in range(0, len(batchable), RESEND_BATCH_SIZE)
+            ]
+            send_chunk = self._send_resend_batch
+        else:
+            chunks = [batchable] if batchable else []
+            send_chunk = self._send_many_with_django
+
+        for chunk in chunks:
+            for index, result in zip(chunk, send_chunk([messages[i] for i in chunk])):
+                results[index] = result
+        return results
+
+    def _send_resend_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        payload = [
+            self._resend_payload(
+                item["recipient"], item["subject"], item["message"], **item.get("extra", {})
+            )
+            for item in messages
+        ]
+        try:
+            response = self._http().post(
+                f"{self.base_url}/emails/batch",
+                headers=self._resend_headers(),
+                json=payload,
+                timeout=30,
+            )
+            if response.status_code == 200:
+                ids = [entry.get("id") for entry in response.json().get("data", [])]
+                ids += [None] * (len(messages) - len(ids))
+                return [
+                    {
+                        "success": True,
+                        "provider_id": provider_id,
+                        "provider_response": {"id": provider_id, "batch": True},
+                    }
+                    for provider_id in ids
+                ]
+            error = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Resend batch API error: {str(e)}")
+            error = f"Network error: {str(e)}"
+
+        return [
+            {"success": False, "error": error, "provider_id": None} for _ in messages
+        ]
+
+    def _send_many_with_django(
+        self, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Send every message over a single backend connection."""
+        try:
+            with get_connection() as connection:
+                return [
+                    self._send_with_django(
+                        item["recipient"],
+                        item["subject"],
+                        item["message"],
+                        connection=connection,
+                        **item.get("extra", {}),
+                    )
+                    for item in messages
+                ]
+        except Exception as e:
+            logger.error(f"Django email connection error: {str(e)}")
+            return [
+                {
+                    "success": False,
+                    "error": f"Django email error: {str(e)}",
+                    "provider_id": None,
+                }
+                for _ in messages
+            ]
+
     def _send_with_django(
         self, recipient: str, subject: str, message: str, **kwargs
     ) -> Dict[str, Any]:
@@ -164,6 +303,7 @@ class EmailService(BaseNotificationService):
                 from_email=kwargs.get("from_email", self.from_email),
                 to=[recipient],
                 reply_to=[kwargs["reply_to"]] if kwargs.get("reply_to") else None,
+                connection=kwargs.get("connection"),
             )
             email.content_subtype = "html"
 
@@ -231,7 +371,23 @@ class EmailService(BaseNotificationService):
             return {"status": "unknown", "provider_id": provider_id}
 
 
-class SMSService(BaseNotificationService):
+class TwilioClientMixin:
+    """
+    Keep one Twilio REST client (and its HTTP session) per service
+    instance instead of building a new one for every message.
+    """
+
+    _twilio_client = None
+
+    def _get_client(self):
+        if self._twilio_client is None:
+            from twilio.rest import Client
+
+            self._twilio_client = Client(self.account_sid, self.auth_token)
+        return self._twilio_client
+
+
+class SMSService(TwilioClientMixin, BaseNotificationService):
     """
     SMS notification service using Twilio.
     """
@@ -274,9 +430,7 @@ class SMSService(BaseNotificationService):
             }
 
         try:
-            from twilio.rest import Client
-
-            client = Client(self.account_sid, self.auth_token)
+            client = self._get_client()
 
             # For SMS, we usually don't use the subject, just the message
             sms_body = f"{subject}\n\n{message}" if subject else message
@@ -316,9 +470,7 @@ class SMSService(BaseNotificationService):
             return {"status": "unknown", "provider_id": provider_id}
 
         try:
-            from twilio.rest import Client
-
-            client = Client(self.account_sid, self.auth_token)
+            client = self._get_client()
             message = client.messages(provider_id).fetch()
 
             # Map Twilio status to our status
@@ -346,7 +498,7 @@ class SMSService(BaseNotificationService):
             return {"status": "unknown", "provider_id": provider_id}
 
 
-class WhatsAppService(BaseNotificationService):
+class WhatsAppService(TwilioClientMixin, BaseNotificationService):
     """
     WhatsApp notification service using Twilio WhatsApp API.
     """
@@ -389,9 +541,7 @@ class WhatsAppService(BaseNotificationService):
             }
 
         try:
-            from twilio.rest import Client
-
-            client = Client(self.account_sid, self.auth_token)
+            client = self._get_client()
 
             # Format message for WhatsApp
             whatsapp_body = f"*{subject}*\n\n{message}" if subject else message
@@ -427,9 +577,8 @@ class WhatsAppService(BaseNotificationService):
         """
         Get WhatsApp delivery status from Twilio.
         """
-        # Same as SMS service since both use Twilio
-        sms_service = SMSService()
-        return sms_service.get_delivery_status(provider_id)
+        # Same as SMS service since both use Twilio (and the same client)
+        return SMSService.get_delivery_status(self, provider_id)
 
 
 class PushNotificationService(BaseNotificationService):
@@ -446,18 +595,22 @@ class PushNotificationService(BaseNotificationService):
         self._firebase_app = None
 
     def _get_firebase_app(self):
-        """Get or initialize Firebase app."""
+        """Get the process-wide Firebase app, initializing it once."""
         if self._firebase_app is None:
             try:
                 import firebase_admin
                 from firebase_admin import credentials
 
-                if self.credentials_path:
-                    cred = credentials.Certificate(self.credentials_path)
-                    self._firebase_app = firebase_admin.initialize_app(cred)
-                else:
-                    # Use default credentials (e.g., in Google Cloud environment)
-                    self._firebase_app = firebase_admin.initialize_app()
+                try:
+                    # Already initialized by an earlier service instance
+                    self._firebase_app = firebase_admin.get_app()
+                except ValueError:
+                    if self.credentials_path:
+                        cred = credentials.Certificate(self.credentials_path)
+                        self._firebase_app = firebase_admin.initialize_app(cred)
+                    else:
+                        # Use default credentials (e.g., in Google Cloud environment)
+                        self._firebase_app = firebase_admin.initialize_app()
 
             except Exception as e:
                 logger.error(f"Failed to initialize Firebase: {str(e)}")
@@ -470,6 +623,74 @@ class PushNotificationService(BaseNotificationService):
         # Basic FCM token validation (tokens are usually 152 characters)
         return len(recipient) > 100 and ":" in recipient
 
+    def _build_message_parts(self, subject: str, message: str, **kwargs) -> Dict[str, Any]:
+        """Notification, data and platform configs shared by single and multicast sends."""
+        from firebase_admin import messaging
+
+        # Build notification
+        notification = messaging.Notification(
+            title=subject, body=message, image=kwargs.get("image_url")
+        )
+
+        # Build data payload
+        data = kwargs.get("data", {})
+        # Convert all values to strings (FCM requirement)
+        data = {str(k): str(v) for k, v in data.items()}
+
+        # Build Android config
+        android_config = messaging.AndroidConfig(
+            priority="high",
+            notification=messaging.AndroidNotification(
+                click_action=kwargs.get("click_action"),
+                color=kwargs.get("color", "#1976D2"),
+                sound="default",
+                channel_id=kwargs.get("channel_id", "default"),
+            ),
+        )
+
+        # Build iOS config
+        apns_config = messaging.APNSConfig(
+            payload=messaging.APNSPayload(
+                aps=messaging.Aps(
+                    alert=messaging.ApsAlert(
+                        title=subject,
+                        body=message,
+                    ),
+                    sound="default",
+                    badge=kwargs.get("badge"),
+                    category=kwargs.get("category"),
+                )
+            )
+        )
+
+        # Build web config
+        web_config = messaging.WebpushConfig(
+            notification=messaging.WebpushNotification(
+                title=subject,
+                body=message,
+                icon=kwargs.get("icon_url"),
+                badge=kwargs.get("badge_url"),
+                image=kwargs.get("image_url"),
+                actions=[
+                    messaging.WebpushNotificationAction(
+                        action=action.get("action"),
+                        title=action.get("title"),
+                        icon=action.get("icon"),
+                    )
+                    for action in kwargs.get("actions", [])
+                ],
+            ),
+            fcm_options=messaging.WebpushFCMOptions(link=kwargs.get("click_action")),
+        )
+
+        return {
+            "notification": notification,
+            "data": data,
+            "android": android_config,
+            "apns": apns_config,
+            "webpush": web_config,
+        }
+
     def send(
         self, recipient: str, subject: str, message: str, **kwargs
     ) -> Dict[str, Any]:
@@ -493,72 +714,9 @@ class PushNotificationService(BaseNotificationService):
         try:
             from firebase_admin import messaging
 
-            # Build notification
-            notification = messaging.Notification(
-                title=subject, body=message, image=kwargs.get("image_url")
-            )
-
-            # Build data payload
-            data = kwargs.get("data", {})
-            # Convert all values to strings (FCM requirement)
-            data = {str(k): str(v) for k, v in data.items()}
-
-            # Build Android config
-            android_config = messaging.AndroidConfig(
-                priority="high",
-                notification=messaging.AndroidNotification(
-                    click_action=kwargs.get("click_action"),
-                    color=kwargs.get("color", "#1976D2"),
-                    sound="default",
-                    channel_id=kwargs.get("channel_id", "default"),
-                ),
-            )
-
-            # Build iOS config
-            apns_config = messaging.APNSConfig(
-                payload=messaging.APNSPayload(
-                    aps=messaging.Aps(
-                        alert=messaging.ApsAlert(
-                            title=subject,
-                            body=message,
-                        ),
-                        sound="default",
-                        badge=kwargs.get("badge"),
-                        category=kwargs.get("category"),
-                    )
-                )
-            )
-
-            # Build web config
-            web_config = messaging.WebpushConfig(
-                notification=messaging.WebpushNotification(
-                    title=subject,
-                    body=message,
-                    icon=kwargs.get("icon_url"),
-                    badge=kwargs.get("badge_url"),
-                    image=kwargs.get("image_url"),
-                    actions=[
-                        messaging.WebpushNotificationAction(
-                            action=action.get("action"),
-                            title=action.get("title"),
-                            icon=action.get("icon"),
-                        )
-                        for action in kwargs.get("actions", [])
-                    ],
-                ),
-                fcm_options=messaging.WebpushFCMOptions(
-                    link=kwargs.get("click_action")
-                ),
-            )
-
             # Create message
             fcm_message = messaging.Message(
-                notification=notification,
-                data=data,
-                token=recipient,
-                android=android_config,
-                apns=apns_config,
-                webpush=web_config,
+                token=recipient, **self._build_message_parts(subject, message, **kwargs)
             )
 
             # Send message
@@ -578,6 +736,91 @@ class PushNotificationService(BaseNotificationService):
                 "provider_id": None,
             }
 
+    def send_multicast(
+        self, tokens: List[str], subject: str, message: str, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Send the same push to many tokens with FCM multicast
+        (FCM_MULTICAST_SIZE tokens per call), one result per token.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tokens)
+        valid = []
+        for index, token in enumerate(tokens):
+            if self.validate_recipient(token):
+                valid.append(index)
+            else:
+                results[index] = {
+                    "success": False,
+                    "error": "Invalid FCM token format",
+                    "provider_id": None,
+                }
+        if not valid:
+            return results
+
+        if not self._get_firebase_app():
+            error = {"success": False, "error": "Firebase not configured", "provider_id": None}
+            return [result or dict(error) for result in results]
+
+        try:
+            from firebase_admin import messaging
+
+            parts = self._build_message_parts(subject, message, **kwargs)
+            for start in range(0, len(valid), FCM_MULTICAST_SIZE):
+                chunk = valid[start : start + FCM_MULTICAST_SIZE]
+                batch_response = messaging.send_each_for_multicast(
+                    messaging.MulticastMessage(
+                        tokens=[tokens[index] for index in chunk], **parts
+                    )
+                )
+                for index, response in zip(chunk, batch_response.responses):
+                    if response.success:
+                        results[index] = {
+                            "success": True,
+                            "provider_id": response.message_id,
+                            "provider_response": {"message_id": response.message_id},
+                        }
+                    else:
+                        results[index] = {
+                            "success": False,
+                            "error": f"Push notification error: {response.exception}",
+                            "provider_id": None,
+                        }
+
+        except Exception as e:
+            logger.error(f"Firebase multicast error: {str(e)}")
+            error = {
+                "success": False,
+                "error": f"Push notification error: {str(e)}",
+                "provider_id": None,
+            }
+            results = [result or dict(error) for result in results]
+
+        return results
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group messages with identical content and send each group as a multicast."""
+        groups: Dict[str, List[int]] = {}
+        for index, item in enumerate(messages):
+            key = json.dumps(
+                [item["subject"], item["message"], item.get("extra", {})],
+                sort_keys=True,
+                default=str,
+            )
+            groups.setdefault(key, []).append(index)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        for indexes in groups.values():
+            first = messages[indexes[0]]
+            group_results = self.send_multicast(
+                [messages[index]["recipient"] for index in indexes],
+                first["subject"],
+                first["message"],
+                **first.get("extra", {}),
+            )
+            for index, result in zip(indexes, group_results):
+                results[index] = result
+        return results
+
     def send_to_topic(
         self, topic: str, subject: str, message: str, **kwargs
     ) -> Dict[str, Any]:
@@ -793,6 +1036,9 @@ class NotificationServiceFactory:
         "in_app": InAppNotificationService,
     }
 
+    # Per-process service instances used by the batched delivery workers
+    _pool: Dict[str, BaseNotificationService] = {}
+
     @classmethod
     def get_service(cls, channel_type: str) -> BaseNotificationService:
         """
@@ -804,6 +1050,23 @@ class NotificationServiceFactory:
 
         return service_class()
 
+    @classmethod
+    def get_pooled_service(cls, channel_type: str) -> BaseNotificationService:
+        """
+        Service instance shared by every batch a worker process sends for
+        ``channel_type``, so its provider client (HTTP session, Twilio
+        client, Firebase app) is built once and its connections reused.
+        """
+        service = cls._pool.get(channel_type)
+        if service is None:
+            service = cls._pool[channel_type] = cls.get_service(channel_type)
+        return service
+
+    @classmethod
+    def clear_pool(cls):
+        """Drop pooled services, e.g. after provider settings change."""
+        cls._pool.clear()
+
     @classmethod
     def get_available_channels(cls) -> List[str]:
         """
@@ -7,81 +7,13 @@ from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import (
-    Notification,
-    NotificationDelivery,
-    NotificationType,
-    UserNotificationPreference,
-)
+from .models import Notification, NotificationDelivery, NotificationType
+from .preferences import PreferenceResolver
 from .tasks import send_notification_delivery
 
 User = get_user_model()
 
 
-@receiver(post_save, sender=User)
-def create_user_notification_preferences(sender, instance, created, **kwargs):
-    """
-    Create default notification preferences for new users.
-    """
-    if created:
-        try:
-            # Get all active notification types
-            notification_types = NotificationType.objects.filter(is_active=True)
-
-            for notification_type in notification_types:
-                # Create preference with default settings
-                UserNotificationPreference.objects.get_or_create(
-                    user=instance,
-                    notification_type=notification_type,
-                    defaults={
-                        "email_enabled": notification_type.default_enabled,
-                        "sms_enabled": notification_type.default_enabled,
-                        "whatsapp_enabled": notification_type.default_enabled,
-                        "push_web_enabled": notification_type.default_enabled,
-                        "push_mobile_enabled": notification_type.default_enabled,
-                        "in_app_enabled": True,  # Always enable in-app notifications
-                    },
-                )
-        except Exception as e:
-            # Log error but don't fail user creation
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to create notification preferences for user {instance.id}: {e}")
-            pass
-
-
-@receiver(post_save, sender=NotificationType)
-def create_preferences_for_existing_users(sender, instance, created, **kwargs):
-    """
-    Create preferences for existing users when a new notification type is created.
-    """
-    if created:
-        # Get all active users
-        users = User.objects.filter(is_active=True)
-
-        preferences_to_create = []
-        for user in users:
-            if not UserNotificationPreference.objects.filter(
-                user=user, notification_type=instance
-            ).exists():
-                preferences_to_create.append(
-                    UserNotificationPreference(
-                        user=user,
-                        notification_type=instance,
-                        email_enabled=instance.default_enabled,
-                        sms_enabled=instance.default_enabled,
-                        whatsapp_enabled=instance.default_enabled,
-                        push_web_enabled=instance.default_enabled,
-                        push_mobile_enabled=instance.default_enabled,
-                        in_app_enabled=True,
-                    )
-                )
-
-        # Bulk create preferences
-        if preferences_to_create:
-            UserNotificationPreference.objects.bulk_create(preferences_to_create)
-
-
 @receiver(post_save, sender=NotificationDelivery)
 def schedule_notification_delivery(sender, instance, created, **kwargs):
     """
@@ -113,36 +45,14 @@ def create_notification_for_event(
             **kwargs,
         )
 
-        # Get user's preferred channels for this notification type
-        try:
-            preference = UserNotificationPreference.objects.get(
-                user=recipient, notification_type=notification_type
+        # Create deliveries for the user's preferred channels
+        for channel in PreferenceResolver(notification_type).channels_for(
+            [recipient.pk]
+        )[recipient.pk]:
+            NotificationDelivery.objects.create(
+                notification=notification, channel=channel
             )
 
-            # Create deliveries for enabled channels
-            from .models import NotificationChannel
-
-            channels = NotificationChannel.objects.filter(is_enabled=True)
-
-            for channel in channels:
-                if preference.is_channel_enabled(channel.slug):
-                    NotificationDelivery.objects.create(
-                        notification=notification, channel=channel
-                    )
-
-        except UserNotificationPreference.DoesNotExist:
-            # Use default channels if no preference exists
-            from .models import NotificationChannel
-
-            default_channels = NotificationChannel.objects.filter(
-                is_enabled=True, slug__in=notification_type.available_channels
-            )
-
-            for channel in default_channels:
-                NotificationDelivery.objects.create(
-                    notification=notification, channel=channel
-                )
-
         return notification
 
     except NotificationType.DoesNotExist:
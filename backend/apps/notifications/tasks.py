@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 from celery import shared_task
@@ -20,8 +21,10 @@ from .models import (
     NotificationEvent,
     NotificationTemplate,
     NotificationType,
-    UserNotificationPreference,
 )
+from .delivery import DeliveryWorker, dispatch_deliveries
+from .digest import DigestBuilder
+from .preferences import PreferenceResolver
 from .services import NotificationServiceFactory, send_notification_via_channel
 
 User = get_user_model()
@@ -178,6 +181,44 @@ def check_delivery_status(delivery_id: int):
         return {"success": False, "reason": "error", "error": str(exc)}
 
 
+@shared_task
+def check_delivery_statuses(delivery_ids):
+    """
+    Check provider status of a chunk of deliveries sent together.
+    """
+    return [check_delivery_status(delivery_id) for delivery_id in delivery_ids]
+
+
+@shared_task(bind=True, max_retries=3)
+def send_delivery_batch(self, channel_id, delivery_ids):
+    """
+    Send a chunk of deliveries of one channel (see apps.notifications.delivery).
+    """
+    try:
+        channel = NotificationChannel.objects.get(id=channel_id)
+    except NotificationChannel.DoesNotExist:
+        logger.error(f"Channel {channel_id} not found for delivery batch")
+        return {"success": False, "reason": "not_found"}
+
+    worker = None
+    try:
+        worker = DeliveryWorker(channel)
+        return worker.run(delivery_ids)
+
+    except Exception as exc:
+        logger.error(
+            f"Error sending {len(delivery_ids)} {channel.channel_type} deliveries: {str(exc)}"
+        )
+        # Deliveries that already went out are not sent again
+        sent = set(worker.sent_ids) if worker else set()
+        unsent = [delivery_id for delivery_id in delivery_ids if str(delivery_id) not in sent]
+        if unsent and self.request.retries < self.max_retries:
+            raise self.retry(
+                args=[channel_id, unsent], countdown=60 * (2**self.request.retries)
+            )
+        return {"success": False, "reason": "task_failed", "error": str(exc)}
+
+
 @shared_task
 def process_notification_batch(batch_id: int):
     """
@@ -210,68 +251,69 @@ def process_notification_batch(batch_id: int):
             batch.save()
             return {"success": True, "recipients": 0, "notifications": 0}
 
-        # Create notifications for each recipient
-        notifications_created = 0
+        # Build notifications, deliveries and events in memory; bulk_create
+        # skips the per-delivery post_save task, deliveries go out per channel
+        channels = list(batch.channels.all())
+        preferences = PreferenceResolver(batch.notification_type).resolve(recipients)
+        notifications, deliveries, events = [], [], []
+
+        for recipient in recipients:
+            # Check user preferences
+            if not _should_send_to_user(
+                recipient, batch.notification_type, channels, preferences
+            ):
+                continue
+
+            # Prepare notification content
+            content = _prepare_batch_content(batch, recipient)
+
+            notification = Notification(
+                notification_type=batch.notification_type,
+                recipient=recipient,
+                title=content["subject"],
+                message=content["body"],
+                organization=batch.organization,
+                club=batch.club,
+                batch=batch,
+                template=batch.template,
+                data=content.get("data", {}),
+            )
+            notifications.append(notification)
 
-        with transaction.atomic():
-            for recipient in recipients:
-                # Check user preferences
-                if not _should_send_to_user(
-                    recipient, batch.notification_type, batch.channels.all()
+            # Create deliveries for each channel
+            for channel in channels:
+                if _user_accepts_channel(
+                    recipient, batch.notification_type, channel, preferences
                 ):
-                    continue
-
-                # Prepare notification content
-                content = _prepare_batch_content(batch, recipient)
-
-                # Create notification
-                notification = Notification.objects.create(
-                    notification_type=batch.notification_type,
-                    recipient=recipient,
-                    title=content["subject"],
-                    message=content["body"],
-                    organization=batch.organization,
-                    club=batch.club,
-                    batch=batch,
-                    template=batch.template,
-                    data=content.get("data", {}),
-                )
-
-                # Create deliveries for each channel
-                for channel in batch.channels.all():
-                    if _user_accepts_channel(
-                        recipient, batch.notification_type, channel
-                    ):
-                        NotificationDelivery.objects.create(
-                            notification=notification, channel=channel
-                        )
-
-                notifications_created += 1
+                    deliveries.append(
+                        NotificationDelivery(notification=notification, channel=channel)
+                    )
 
-                # Create event
-                NotificationEvent.objects.create(
+            events.append(
+                NotificationEvent(
                     notification=notification,
                     event_type="created",
-                    event_data={"batch_id": batch_id},
+                    event_data={"batch_id": str(batch_id)},
                 )
+            )
 
-        # Schedule delivery of all notifications
-        deliveries = NotificationDelivery.objects.filter(
-            notification__batch=batch, status="pending"
-        )
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, batch_size=1000)
+            NotificationDelivery.objects.bulk_create(deliveries, batch_size=1000)
+            NotificationEvent.objects.bulk_create(events, batch_size=1000)
 
-        for delivery in deliveries:
-            send_notification_delivery.apply_async(args=[delivery.id])
+            # Schedule delivery of all notifications, batched per channel
+            dispatch_deliveries(deliveries)
 
         # Update batch
-        batch.total_sent = notifications_created
+        batch.total_sent = len(notifications)
         batch.save()
 
         return {
             "success": True,
             "recipients": len(recipients),
-            "notifications": notifications_created,
-            "deliveries": deliveries.count(),
+            "notifications": len(notifications),
+            "deliveries": len(deliveries),
         }
 
     except NotificationBatch.DoesNotExist:
@@ -305,16 +347,13 @@ def retry_failed_deliveries():
     failed_deliveries = NotificationDelivery.objects.filter(
         status="pending",
         next_retry_at__lte=now,
-        attempt_count__lt=models.F("max_attempts"),
+        attempt_count__lt=F("max_attempts"),
     )
 
-    retry_count = 0
-    for delivery in failed_deliveries:
-        if delivery.can_retry():
-            send_notification_delivery.apply_async(args=[delivery.id])
-            retry_count += 1
+    retry_count = failed_deliveries.count()
+    batches = dispatch_deliveries(failed_deliveries)
 
-    return {"retries_scheduled": retry_count}
+    return {"retries_scheduled": retry_count, "batches": batches}
 
 
 @shared_task
@@ -343,47 +382,46 @@ def cleanup_old_notifications():
 
 
 @shared_task
-def send_digest_notifications():
+def send_digest_notifications(frequency=None):
     """
-    Send digest notifications for users who have enabled them.
+    Build digests for users who have enabled them and enqueue their
+    delivery in chunks. Without ``frequency`` every due frequency is built.
     """
-    from django.db.models import Q
+    frequencies = [frequency] if frequency else None
+    return DigestBuilder(frequencies).run()
 
-    # Get users with digest preferences
-    digest_preferences = UserNotificationPreference.objects.filter(
-        digest_enabled=True, is_active=True
-    ).select_related("user", "notification_type")
 
-    digests_sent = 0
+@shared_task
+def send_digest_batch(digests):
+    """
+    Send a chunk of rendered digests (see apps.notifications.digest) over
+    each user's digest channels.
+    """
+    users = User.objects.in_bulk([digest["user_id"] for digest in digests])
+    channels = {
+        channel.slug: channel
+        for channel in NotificationChannel.objects.filter(is_enabled=True)
+    }
 
-    for preference in digest_preferences:
-        # Get unread notifications for this user and type
-        notifications = Notification.objects.filter(
-            recipient=preference.user,
-            notification_type=preference.notification_type,
-            is_read=False,
-            created_at__gte=_get_digest_period_start(preference.digest_frequency),
-        ).order_by("-created_at")
-
-        if notifications.exists():
-            # Create digest notification
-            digest_content = _create_digest_content(notifications, preference)
-
-            # Send via preferred channels
-            channels = _get_user_preferred_channels(
-                preference.user, preference.notification_type
+    digests_sent = 0
+    for digest in digests:
+        user = users.get(digest["user_id"])
+        if user is None:
+            continue
+
+        for slug in digest["channels"]:
+            channel = channels.get(slug)
+            if channel is None:
+                continue
+            recipient = _get_recipient_for_channel(user, channel)
+            if not recipient:
+                continue
+
+            result = send_notification_via_channel(
+                channel.channel_type, recipient, digest["subject"], digest["body"]
             )
-
-            for channel in channels:
-                result = send_notification_via_channel(
-                    channel.channel_type,
-                    _get_recipient_for_channel(preference.user, channel),
-                    digest_content["subject"],
-                    digest_content["body"],
-                )
-
-                if result["success"]:
-                    digests_sent += 1
+            if result["success"]:
+                digests_sent += 1
 
     return {"digests_sent": digests_sent}
 
@@ -436,15 +474,20 @@ def _prepare_batch_content(batch, recipient):
         **batch.template_context,
     }
 
+    # Only the JSON-serializable part of the context is stored as data
     if batch.template:
         rendered = batch.template.render(context)
         return {
             "subject": rendered["subject"] or batch.subject,
             "body": rendered["body"] or batch.message,
-            "data": context,
+            "data": batch.template_context,
         }
     else:
-        return {"subject": batch.subject, "body": batch.message, "data": context}
+        return {
+            "subject": batch.subject,
+            "body": batch.message,
+            "data": batch.template_context,
+        }
 
 
 def _get_batch_recipients(batch):
@@ -476,79 +519,23 @@ def _get_batch_recipients(batch):
     return list(queryset.distinct())
 
 
-def _should_send_to_user(user, notification_type, channels):
-    """Check if notification should be sent to user."""
-    try:
-        preference = UserNotificationPreference.objects.get(
-            user=user, notification_type=notification_type
-        )
-
-        # Check if any channel is enabled
-        return any(preference.is_channel_enabled(channel.slug) for channel in channels)
-
-    except UserNotificationPreference.DoesNotExist:
-        # Use default preference
-        return notification_type.default_enabled
-
-
-def _user_accepts_channel(user, notification_type, channel):
-    """Check if user accepts notifications via specific channel."""
-    try:
-        preference = UserNotificationPreference.objects.get(
-            user=user, notification_type=notification_type
-        )
-        return preference.is_channel_enabled(channel.slug)
-
-    except UserNotificationPreference.DoesNotExist:
-        return notification_type.default_enabled
-
-
-def _get_digest_period_start(frequency):
-    """Get start time for digest period."""
-    now = timezone.now()
-
-    if frequency == "hourly":
-        return now - timedelta(hours=1)
-    elif frequency == "daily":
-        return now - timedelta(days=1)
-    elif frequency == "weekly":
-        return now - timedelta(weeks=1)
-    else:
-        return now - timedelta(days=1)
-
-
-def _create_digest_content(notifications, preference):
-    """Create digest content from notifications."""
-    count = notifications.count()
-    subject = f"Tienes {count} notificaciones nuevas"
-
-    body_parts = [f"Resumen de tus últimas {count} notificaciones:\n"]
+def _resolve_preference(user, notification_type, preferences=None):
+    """Preference from a bulk-resolved map, or resolved for this user alone."""
+    if preferences is not None and user.pk in preferences:
+        return preferences[user.pk]
+    return PreferenceResolver(notification_type).resolve_one(user)
 
-    for notification in notifications:
-        body_parts.append(f"• {notification.title}")
-        if notification.action_url:
-            body_parts.append(f"  Ver más: {notification.action_url}")
-        body_parts.append("")
-
-    return {"subject": subject, "body": "\n".join(body_parts)}
 
+def _should_send_to_user(user, notification_type, channels, preferences=None):
+    """Check if notification should be sent to user."""
+    preference = _resolve_preference(user, notification_type, preferences)
 
-def _get_user_preferred_channels(user, notification_type):
-    """Get user's preferred channels for notification type."""
-    try:
-        preference = UserNotificationPreference.objects.get(
-            user=user, notification_type=notification_type
-        )
+    # Check if any channel is enabled
+    return any(preference.is_channel_enabled(channel.slug) for channel in channels)
 
-        enabled_channels = []
-        for channel in NotificationChannel.objects.filter(is_enabled=True):
-            if preference.is_channel_enabled(channel.slug):
-                enabled_channels.append(channel)
 
-        return enabled_channels
+def _user_accepts_channel(user, notification_type, channel, preferences=None):
+    """Check if user accepts notifications via specific channel."""
+    preference = _resolve_preference(user, notification_type, preferences)
+    return preference.is_channel_enabled(channel.slug)
 
-    except UserNotificationPreference.DoesNotExist:
-        # Return default channels
-        return NotificationChannel.objects.filter(
-            is_enabled=True, slug__in=notification_type.available_channels
-        )
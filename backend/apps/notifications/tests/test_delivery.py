@@ -0,0 +1,257 @@
+"""
+Tests for channel-batched notification delivery.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from apps.root.models import Organization
+
+from ..delivery import DeliveryWorker, dispatch_deliveries
+from ..models import (
+    Notification,
+    NotificationBatch,
+    NotificationChannel,
+    NotificationDelivery,
+    NotificationEvent,
+    NotificationType,
+)
+from ..services import BaseNotificationService, NotificationServiceFactory
+from ..tasks import process_notification_batch, send_delivery_batch
+
+User = get_user_model()
+
+
+class StubSMSService(BaseNotificationService):
+    """Local SMS provider recording every bulk call."""
+
+    instances = 0
+
+    def __init__(self):
+        super().__init__()
+        self.channel_type = "sms"
+        self.batches = []
+        StubSMSService.instances += 1
+
+    def validate_recipient(self, recipient):
+        return True
+
+    def send_batch(self, messages):
+        self.batches.append(messages)
+        return [
+            {"success": False, "error": "Provider down", "provider_id": None}
+            for _ in messages
+        ]
+
+
+class FirstOnlySMSService(StubSMSService):
+    """Provider that only accepts the first message of a batch."""
+
+    def send_batch(self, messages):
+        return [
+            {"success": True, "provider_id": "sms_0"}
+            if index == 0
+            else {"success": False, "error": "Provider down", "provider_id": None}
+            for index in range(len(messages))
+        ]
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return {"data": [{"id": f"re_{i}"} for i in range(len(self.payload))]}
+
+
+class StubResendSession:
+    """Local Resend HTTP endpoint recording every request."""
+
+    posts = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        StubResendSession.posts.append((url, json))
+        return StubResponse(json)
+
+
+class DeliveryBatchTest(TestCase):
+    """Test dispatching and sending deliveries in per-channel batches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Delivery Org", business_name="Delivery Org LLC"
+        )
+        cls.email = NotificationChannel.objects.create(
+            name="Email", slug="email", channel_type="email"
+        )
+        cls.sms = NotificationChannel.objects.create(
+            name="SMS", slug="sms", channel_type="sms"
+        )
+        cls.notification_type = NotificationType.objects.create(
+            name="Anuncios", slug="announcements"
+        )
+        cls.users = [
+            User.objects.create_user(
+                username=f"delivery{i}",
+                email=f"delivery{i}@example.com",
+                phone=f"+5255000000{i}",
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        NotificationServiceFactory.clear_pool()
+        self.addCleanup(NotificationServiceFactory.clear_pool)
+
+    def create_deliveries(self, channel):
+        notifications = [
+            Notification(
+                organization=self.organization,
+                notification_type=self.notification_type,
+                recipient=user,
+                title="Torneo de verano",
+                message="Inscripciones abiertas",
+            )
+            for user in self.users
+        ]
+        Notification.objects.bulk_create(notifications)
+        # bulk_create skips the per-delivery post_save task
+        return NotificationDelivery.objects.bulk_create(
+            NotificationDelivery(notification=notification, channel=channel)
+            for notification in notifications
+        )
+
+    @override_settings(NOTIFICATION_DELIVERY_BATCH_SIZE=2)
+    def test_dispatch_groups_by_channel_and_chunk(self):
+        deliveries = self.create_deliveries(self.email) + self.create_deliveries(
+            self.sms
+        )
+
+        with patch("apps.notifications.tasks.send_delivery_batch.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                batches = dispatch_deliveries(
+                    NotificationDelivery.objects.filter(
+                        id__in=[delivery.id for delivery in deliveries]
+                    )
+                )
+
+        self.assertEqual(batches, 4)
+        sizes = sorted(
+            (channel_id, len(ids)) for (channel_id, ids), _ in delay.call_args_list
+        )
+        self.assertEqual(
+            sizes,
+            sorted(
+                [
+                    (str(self.email.id), 2),
+                    (str(self.email.id), 1),
+                    (str(self.sms.id), 2),
+                    (str(self.sms.id), 1),
+                ]
+            ),
+        )
+
+    @patch("apps.notifications.tasks.check_delivery_statuses.apply_async")
+    def test_email_batch_shares_one_connection(self, check_statuses):
+        deliveries = self.create_deliveries(self.email)
+
+        with patch("django.core.mail.backends.locmem.EmailBackend.open") as open_:
+            summary = DeliveryWorker(self.email).run([d.id for d in deliveries])
+
+        self.assertEqual(summary, {"deliveries": 3, "sent": 3, "failed": 0})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(open_.call_count, 1)
+        self.assertEqual(
+            NotificationDelivery.objects.filter(
+                channel=self.email, status="sent", attempt_count=1
+            ).count(),
+            3,
+        )
+        self.assertEqual(NotificationEvent.objects.filter(event_type="sent").count(), 3)
+        check_statuses.assert_called_once()
+
+    @override_settings(RESEND_API_KEY="re_test")
+    @patch("apps.notifications.tasks.check_delivery_statuses.apply_async")
+    @patch("apps.notifications.services.requests.Session", StubResendSession)
+    def test_resend_batch_endpoint(self, check_statuses):
+        StubResendSession.posts = []
+        deliveries = self.create_deliveries(self.email)
+
+        DeliveryWorker(self.email).run([d.id for d in deliveries])
+
+        self.assertEqual(len(StubResendSession.posts), 1)
+        url, payload = StubResendSession.posts[0]
+        self.assertTrue(url.endswith("/emails/batch"))
+        self.assertEqual(len(payload), 3)
+        self.assertEqual(
+            set(
+                NotificationDelivery.objects.filter(channel=self.email).values_list(
+                    "provider_id", flat=True
+                )
+            ),
+            {"re_0", "re_1", "re_2"},
+        )
+
+    def test_failed_batch_is_bulk_updated_for_retry(self):
+        deliveries = self.create_deliveries(self.sms)
+        StubSMSService.instances = 0
+
+        with patch.dict(NotificationServiceFactory._services, {"sms": StubSMSService}):
+            with self.assertNumQueries(5):
+                DeliveryWorker(self.sms).run([d.id for d in deliveries])
+            DeliveryWorker(self.sms).run([])
+
+        # One pooled client for both batches, one provider call for the chunk
+        self.assertEqual(StubSMSService.instances, 1)
+        service = NotificationServiceFactory.get_pooled_service("sms")
+        self.assertEqual(len(service.batches), 1)
+        for delivery in NotificationDelivery.objects.filter(channel=self.sms):
+            self.assertEqual(delivery.status, "pending")
+            self.assertEqual(delivery.attempt_count, 1)
+            self.assertEqual(delivery.error_message, "Provider down")
+            self.assertIsNotNone(delivery.next_retry_at)
+
+    def test_failed_write_back_only_retries_unsent_deliveries(self):
+        deliveries = self.create_deliveries(self.sms)
+        delivery_ids = [str(d.id) for d in deliveries]
+
+        with patch.dict(NotificationServiceFactory._services, {"sms": FirstOnlySMSService}), \
+                patch.object(NotificationEvent.objects, "bulk_create", side_effect=RuntimeError), \
+                patch("apps.notifications.tasks.check_delivery_statuses.apply_async"), \
+                patch.object(send_delivery_batch, "retry", side_effect=RuntimeError) as retry:
+            with self.assertRaises(RuntimeError):
+                send_delivery_batch(str(self.sms.id), delivery_ids)
+
+        # The accepted message is recorded although the chunk rolled back
+        sent = NotificationDelivery.objects.get(status="sent")
+        self.assertEqual(sent.attempt_count, 1)
+        self.assertEqual(NotificationDelivery.objects.filter(status="pending").count(), 2)
+        delivery_ids.remove(str(sent.id))
+        self.assertEqual(retry.call_args.kwargs["args"], [str(self.sms.id), delivery_ids])
+
+    def test_batch_announcement_enqueues_per_channel(self):
+        batch = NotificationBatch.objects.create(
+            organization=self.organization,
+            name="Verano",
+            notification_type=self.notification_type,
+            batch_type="manual",
+            status="scheduled",
+            subject="Torneo de verano",
+            message="Inscripciones abiertas",
+        )
+        batch.recipients.set(self.users)
+        batch.channels.set([self.email, self.sms])
+
+        with patch("apps.notifications.tasks.send_delivery_batch.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = process_notification_batch(batch.id)
+
+        self.assertEqual(result["notifications"], 3)
+        self.assertEqual(result["deliveries"], 6)
+        self.assertEqual(delay.call_count, 2)
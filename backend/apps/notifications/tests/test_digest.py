@@ -0,0 +1,151 @@
+"""
+Tests for the set-based digest builder.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.root.models import Organization
+
+from ..digest import DigestBuilder
+from ..models import (
+    DigestWatermark,
+    Notification,
+    NotificationChannel,
+    NotificationType,
+    UserNotificationPreference,
+)
+from ..tasks import send_digest_batch
+
+User = get_user_model()
+
+
+class DigestBuilderTest(TestCase):
+    """Test windowed selection, grouping and watermarks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Digest Org", business_name="Digest Org LLC"
+        )
+        cls.in_app = NotificationChannel.objects.create(
+            name="In-App", slug="in_app", channel_type="in_app"
+        )
+        cls.notification_type = NotificationType.objects.create(
+            name="Reservas", slug="reservations"
+        )
+        cls.users = [
+            User.objects.create_user(username=f"digest{i}", email=f"digest{i}@example.com")
+            for i in range(4)
+        ]
+        # The last user gets individual notifications only
+        for user in cls.users[:3]:
+            UserNotificationPreference.objects.create(
+                user=user,
+                notification_type=cls.notification_type,
+                digest_enabled=True,
+                digest_frequency="hourly",
+            )
+
+    def notify(self, user, title):
+        return Notification.objects.create(
+            organization=self.organization,
+            notification_type=self.notification_type,
+            recipient=user,
+            title=title,
+            message=title,
+        )
+
+    def run_builder(self, now=None):
+        with patch("apps.notifications.tasks.send_digest_batch.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                totals = DigestBuilder(["hourly"], now=now).run()
+        payloads = [digest for call in delay.call_args_list for digest in call.args[0]]
+        return totals, payloads
+
+    def test_groups_all_users_with_constant_queries(self):
+        for user in self.users:
+            for i in range(3):
+                self.notify(user, f"Reserva {i}")
+
+        # Preferences, watermarks, pending notifications and one upsert
+        # (inside a savepoint), however many users are digested
+        with self.assertNumQueries(6):
+            totals, payloads = self.run_builder(timezone.now())
+
+        self.assertEqual(totals["digests"], 3)
+        self.assertEqual(totals["notifications"], 9)
+        self.assertEqual(
+            {payload["user_id"] for payload in payloads},
+            {user.pk for user in self.users[:3]},
+        )
+        payload = payloads[0]
+        self.assertEqual(payload["count"], 3)
+        self.assertEqual(
+            payload["channels"],
+            ["email", "in_app", "push_mobile", "push_web", "sms", "whatsapp"],
+        )
+        self.assertIn("Tienes 3 notificaciones nuevas", payload["subject"])
+
+    def test_watermark_prevents_repeats(self):
+        user = self.users[0]
+        self.notify(user, "Primera")
+        first_run = timezone.now()
+        self.run_builder(first_run)
+
+        newer = self.notify(user, "Segunda")
+        _, payloads = self.run_builder(first_run + timedelta(hours=1))
+
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(payloads[0]["count"], 1)
+        self.assertIn("Segunda", payloads[0]["body"])
+        self.assertNotIn("Primera", payloads[0]["body"])
+        watermark = DigestWatermark.objects.get(user=user, frequency="hourly")
+        self.assertEqual(watermark.watermark_id, newer.id)
+
+    def test_not_due_again_within_period(self):
+        self.notify(self.users[0], "Primera")
+        now = timezone.now()
+        self.run_builder(now)
+        self.notify(self.users[0], "Segunda")
+
+        totals, _ = self.run_builder(now + timedelta(minutes=10))
+
+        self.assertEqual(totals["digests"], 0)
+
+    def test_preference_enabled_between_queries_is_skipped(self):
+        for user in self.users[:2]:
+            self.notify(user, "Reserva")
+        read = DigestBuilder._preferences
+
+        def stale(builder):
+            # As if users[0] enabled digests after the preferences were read
+            preferences = read(builder)
+            del preferences[(self.users[0].pk, self.notification_type.pk)]
+            return preferences
+
+        with patch.object(DigestBuilder, "_preferences", stale):
+            totals, payloads = self.run_builder(timezone.now())
+
+        self.assertEqual(totals["digests"], 1)
+        self.assertEqual(payloads[0]["user_id"], self.users[1].pk)
+
+    def test_send_batch_uses_digest_channels(self):
+        result = send_digest_batch(
+            [
+                {
+                    "user_id": self.users[0].pk,
+                    "frequency": "hourly",
+                    "count": 1,
+                    "channels": ["in_app", "sms"],
+                    "subject": "Tienes 1 notificaciones nuevas",
+                    "body": "...",
+                }
+            ]
+        )
+
+        self.assertEqual(result["digests_sent"], 1)
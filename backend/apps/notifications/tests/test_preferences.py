@@ -0,0 +1,116 @@
+"""
+Tests for sparse notification preference resolution.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..models import NotificationChannel, NotificationType, UserNotificationPreference
+from ..preferences import PreferenceResolver
+from ..tasks import _should_send_to_user, _user_accepts_channel
+from ..utils import get_user_preferred_channels
+
+User = get_user_model()
+
+
+class PreferenceResolverTest(TestCase):
+    """Test that overrides are sparse and resolved in bulk."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=f"pref{i}", email=f"pref{i}@example.com")
+            for i in range(5)
+        ]
+        cls.email = NotificationChannel.objects.create(
+            name="Email", slug="email", channel_type="email"
+        )
+        cls.sms = NotificationChannel.objects.create(
+            name="SMS", slug="sms", channel_type="sms"
+        )
+        cls.in_app = NotificationChannel.objects.create(
+            name="In-App", slug="in_app", channel_type="in_app"
+        )
+        cls.notification_type = NotificationType.objects.create(
+            name="Reserva confirmada", slug="reservation_confirmed"
+        )
+        UserNotificationPreference.objects.create(
+            user=cls.users[0],
+            notification_type=cls.notification_type,
+            email_enabled=False,
+            sms_enabled=True,
+        )
+
+    def test_new_type_writes_no_rows_per_user(self):
+        with self.assertNumQueries(1):
+            notification_type = NotificationType.objects.create(
+                name="Promociones", slug="promotions", default_enabled=False
+            )
+
+        self.assertFalse(
+            UserNotificationPreference.objects.filter(
+                notification_type=notification_type
+            ).exists()
+        )
+
+    def test_resolves_overrides_and_defaults_in_one_query(self):
+        resolver = PreferenceResolver(self.notification_type)
+
+        with self.assertNumQueries(1):
+            preferences = resolver.resolve(self.users)
+
+        self.assertEqual(len(preferences), 5)
+        override = preferences[self.users[0].pk]
+        self.assertFalse(override.is_default)
+        self.assertFalse(override.is_channel_enabled("email"))
+        self.assertTrue(override.is_channel_enabled("sms"))
+        for user in self.users[1:]:
+            self.assertTrue(preferences[user.pk].is_default)
+            self.assertTrue(preferences[user.pk].is_channel_enabled("email"))
+
+    def test_disabled_by_default_type_keeps_in_app(self):
+        notification_type = NotificationType.objects.create(
+            name="Marketing", slug="marketing", default_enabled=False
+        )
+
+        channels = PreferenceResolver(notification_type).channels_for(
+            self.users[:2], [self.email, self.in_app]
+        )
+
+        self.assertEqual(channels[self.users[0].pk], [self.in_app])
+        self.assertEqual(channels[self.users[1].pk], [self.in_app])
+
+    def test_defaults_respect_available_channels(self):
+        notification_type = NotificationType.objects.create(
+            name="Recibo", slug="receipt", available_channels=["email", "in_app"]
+        )
+
+        channels = get_user_preferred_channels(self.users[1], notification_type)
+
+        self.assertEqual({c.slug for c in channels}, {"email", "in_app"})
+
+    def test_batch_helpers_use_resolved_map(self):
+        preferences = PreferenceResolver(self.notification_type).resolve(self.users)
+        overridden, default = self.users[0], self.users[1]
+
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                _should_send_to_user(
+                    overridden, self.notification_type, [self.email, self.sms], preferences
+                )
+            )
+            self.assertFalse(
+                _user_accepts_channel(
+                    overridden, self.notification_type, self.email, preferences
+                )
+            )
+            self.assertTrue(
+                _user_accepts_channel(
+                    default, self.notification_type, self.email, preferences
+                )
+            )
+
+    def test_preferred_channels_follow_override(self):
+        channels = get_user_preferred_channels(self.users[0], self.notification_type)
+
+        self.assertEqual({c.slug for c in channels}, {"sms", "in_app"})
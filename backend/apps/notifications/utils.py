@@ -19,6 +19,7 @@ from .models import (
     NotificationType,
     UserNotificationPreference,
 )
+from .preferences import PreferenceResolver
 from .services import NotificationServiceFactory
 
 User = get_user_model()
@@ -167,23 +168,7 @@ def get_user_preferred_channels(
     Returns:
         List of preferred NotificationChannel instances
     """
-    try:
-        preference = UserNotificationPreference.objects.get(
-            user=user, notification_type=notification_type, is_active=True
-        )
-
-        enabled_channels = []
-        for channel in NotificationChannel.objects.filter(is_enabled=True):
-            if preference.is_channel_enabled(channel.slug):
-                enabled_channels.append(channel)
-
-        return enabled_channels
-
-    except UserNotificationPreference.DoesNotExist:
-        # Return default channels
-        return NotificationChannel.objects.filter(
-            is_enabled=True, slug__in=notification_type.available_channels
-        )
+    return PreferenceResolver(notification_type).channels_for([user.pk])[user.pk]
 
 
 def get_notification_stats(user: User) -> Dict[str, Any]:
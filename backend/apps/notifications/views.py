@@ -14,9 +14,11 @@ from rest_framework.response import Response
 
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.shared.pagination import KeysetPagination
 from core.mixins import MultiTenantMixin
 from core.permissions import IsClubMemberOrStaff, IsOwnerOrStaff
 
+from .delivery import dispatch_deliveries
 from .models import (
     Notification,
     NotificationBatch,
@@ -27,6 +29,7 @@ from .models import (
     NotificationType,
     UserNotificationPreference,
 )
+from .preferences import default_preference_values
 from .serializers import (
     BulkPreferenceUpdateSerializer,
     MarkNotificationReadSerializer,
@@ -176,6 +179,8 @@ class NotificationViewSet(MultiTenantMixin, viewsets.ModelViewSet):
     search_fields = ["title", "message"]
     ordering_fields = ["created_at", "priority"]
     ordering = ["-created_at"]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         """Filter notifications by recipient and tenant."""
@@ -309,6 +314,7 @@ class NotificationViewSet(MultiTenantMixin, viewsets.ModelViewSet):
 
         data = serializer.validated_data
         notifications_created = []
+        deliveries = []
 
         # Create notifications for each recipient
         for recipient in data["recipients"]:
@@ -328,16 +334,17 @@ class NotificationViewSet(MultiTenantMixin, viewsets.ModelViewSet):
             )
 
             # Create deliveries for each channel
-            for channel in data["channels"]:
-                delivery = NotificationDelivery.objects.create(
-                    notification=notification, channel=channel
-                )
-
-                # Schedule delivery
-                send_notification_delivery.apply_async(args=[delivery.id])
+            deliveries.extend(
+                NotificationDelivery(notification=notification, channel=channel)
+                for channel in data["channels"]
+            )
 
             notifications_created.append(notification)
 
+        # Schedule delivery in per-channel batches rather than a task each
+        NotificationDelivery.objects.bulk_create(deliveries)
+        dispatch_deliveries(deliveries)
+
         # Serialize created notifications
         response_serializer = NotificationListSerializer(
             notifications_created, many=True
@@ -518,8 +525,13 @@ class UserNotificationPreferenceViewSet(viewsets.ModelViewSet):
         ).select_related("notification_type")
 
     def perform_create(self, serializer):
-        """Set user to current user."""
-        serializer.save(user=self.request.user)
+        """Set user to current user; unset fields follow the type defaults."""
+        defaults = default_preference_values(
+            serializer.validated_data["notification_type"]
+        )
+        for field in serializer.validated_data:
+            defaults.pop(field, None)
+        serializer.save(user=self.request.user, **defaults)
 
     @action(detail=False, methods=["post"])
     def bulk_update(self, request):
@@ -535,8 +547,11 @@ class UserNotificationPreferenceViewSet(viewsets.ModelViewSet):
         updated_count = 0
 
         for notification_type in notification_types:
+            # Only overrides are stored; a new row starts from the type defaults
             preference, created = UserNotificationPreference.objects.get_or_create(
-                user=request.user, notification_type=notification_type, defaults=data
+                user=request.user,
+                notification_type=notification_type,
+                defaults={**default_preference_values(notification_type), **data},
             )
 
             if not created:
@@ -549,6 +564,33 @@ class UserNotificationPreferenceViewSet(viewsets.ModelViewSet):
 
         return Response({"status": "success", "updated_count": updated_count})
 
+    @action(detail=False, methods=["get"])
+    def effective(self, request):
+        """
+        Effective preferences for every active notification type, whether
+        stored as an override or inherited from the type defaults.
+        """
+        overrides = {
+            preference.notification_type_id: preference
+            for preference in self.get_queryset()
+        }
+
+        results = []
+        for notification_type in NotificationType.objects.filter(is_active=True):
+            values = default_preference_values(notification_type)
+            override = overrides.get(notification_type.id)
+            if override is not None:
+                values = {field: getattr(override, field) for field in values}
+            results.append(
+                {
+                    "notification_type": notification_type.id,
+                    "notification_type_name": notification_type.name,
+                    "is_default": override is None,
+                    **values,
+                }
+            )
+        return Response(results)
+
     @action(detail=False, methods=["post"])
     def reset_defaults(self, request):
         """
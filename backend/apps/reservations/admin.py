@@ -6,6 +6,8 @@ from django.contrib import admin
 from django.utils import timezone
 from django.utils.html import format_html
 
+from core.conditional import tracked_update
+
 from .models import BlockedSlot, Reservation, ReservationPayment
 
 
@@ -199,7 +201,7 @@ class ReservationAdmin(admin.ModelAdmin):
 
     def mark_as_confirmed(self, request, queryset):
         """Mark selected reservations as confirmed."""
-        updated = queryset.filter(status="pending").update(status="confirmed")
+        updated = tracked_update(queryset.filter(status="pending"), status="confirmed")
         self.message_user(request, f"{updated} reservations marked as confirmed.")
 
     mark_as_confirmed.short_description = "Mark as confirmed"
@@ -5,188 +5,60 @@ Based on the successful clubs module circuit breaker pattern.
 """
 
 import logging
-import threading
-import time
-from datetime import datetime, timedelta
-from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from datetime import datetime
+from typing import Any, Dict
 
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError, OperationalError
 from django.utils import timezone
 
-logger = logging.getLogger('reservations.circuit_breakers')
-
+from apps.shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerError,
+    CircuitState,
+    circuit_breaker_registry,
+)
 
-class CircuitState(Enum):
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+logger = logging.getLogger('reservations.circuit_breakers')
 
 
-class ReservationCircuitBreakerError(Exception):
+class ReservationCircuitBreakerError(CircuitBreakerError):
     """Custom exception for reservation circuit breaker failures."""
     pass
 
 
-class ReservationCircuitBreaker:
+class ReservationCircuitBreaker(CircuitBreaker):
     """
     Circuit breaker implementation specifically designed for reservation operations.
     More tolerant than clubs circuit breaker due to higher critical nature of reservations.
+    Expected failures fall back when a fallback function is configured.
     """
-    
+
+    error_class = ReservationCircuitBreakerError
+    fallback_on_failure = True
+
     def __init__(
         self,
         name: str,
         failure_threshold: int = 5,  # More tolerant than clubs
         recovery_timeout: int = 30,  # Faster recovery for reservations
-        expected_exception: Union[Exception, tuple] = Exception,
-        fallback_function: Optional[Callable] = None
+        namespace: str = 'reservations',
+        **options
     ):
-        self.name = name
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.fallback_function = fallback_function
-        
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = CircuitState.CLOSED
-        self.lock = threading.RLock()
-        
-        # Cache keys
-        self.failure_count_key = f"reservation_circuit_breaker_{name}_failures"
-        self.state_key = f"reservation_circuit_breaker_{name}_state"
-        self.last_failure_key = f"reservation_circuit_breaker_{name}_last_failure"
-        
-        # Load state from cache
-        self._load_state_from_cache()
-    
-    def _load_state_from_cache(self):
-        """Load circuit breaker state from cache."""
-        try:
-            self.failure_count = cache.get(self.failure_count_key, 0)
-            self.state = CircuitState(cache.get(self.state_key, CircuitState.CLOSED.value))
-            self.last_failure_time = cache.get(self.last_failure_key)
-        except Exception as e:
-            logger.warning(f"Failed to load reservation circuit breaker state from cache: {e}")
-    
-    def _save_state_to_cache(self):
-        """Save circuit breaker state to cache."""
-        try:
-            cache.set(self.failure_count_key, self.failure_count, 3600)  # 1 hour
-            cache.set(self.state_key, self.state.value, 3600)
-            cache.set(self.last_failure_key, self.last_failure_time, 3600)
-        except Exception as e:
-            logger.warning(f"Failed to save reservation circuit breaker state to cache: {e}")
-    
-    def _should_attempt_reset(self) -> bool:
-        """Check if we should attempt to reset the circuit breaker."""
-        if self.last_failure_time is None:
-            return True
-        
-        time_since_failure = time.time() - self.last_failure_time
-        return time_since_failure >= self.recovery_timeout
-    
-    def _record_success(self):
-        """Record a successful operation."""
-        with self.lock:
-            self.failure_count = 0
-            self.state = CircuitState.CLOSED
-            self.last_failure_time = None
-            self._save_state_to_cache()
-            logger.info(f"Reservation circuit breaker '{self.name}' reset to CLOSED state")
-    
-    def _record_failure(self, exception: Exception):
-        """Record a failed operation."""
-        with self.lock:
-            self.failure_count += 1
-            self.last_failure_time = time.time()
-            
-            if self.failure_count >= self.failure_threshold:
-                self.state = CircuitState.OPEN
-                logger.error(
-                    f"Reservation circuit breaker '{self.name}' opened after {self.failure_count} failures. "
-                    f"Last error: {exception}"
-                )
-            else:
-                logger.warning(
-                    f"Reservation circuit breaker '{self.name}' failure {self.failure_count}/{self.failure_threshold}. "
-                    f"Error: {exception}"
-                )
-            
-            self._save_state_to_cache()
-    
-    def call_with_breaker(self, func: Callable, *args, **kwargs) -> Any:
-        """
-        Call a function with circuit breaker protection.
-        
-        Args:
-            func: Function to call
-            *args: Function arguments
-            **kwargs: Function keyword arguments
-            
-        Returns:
-            Function result or fallback result
-            
-        Raises:
-            ReservationCircuitBreakerError: When circuit is open and no fallback
-        """
-        with self.lock:
-            # Check if circuit is open
-            if self.state == CircuitState.OPEN:
-                if not self._should_attempt_reset():
-                    logger.warning(f"Reservation circuit breaker '{self.name}' is OPEN, using fallback")
-                    if self.fallback_function:
-                        return self.fallback_function(*args, **kwargs)
-                    raise ReservationCircuitBreakerError(
-                        f"Reservation circuit breaker '{self.name}' is open"
-                    )
-                else:
-                    # Attempt reset
-                    self.state = CircuitState.HALF_OPEN
-                    logger.info(f"Reservation circuit breaker '{self.name}' attempting reset (HALF_OPEN)")
-        
-        # Attempt to call the function
-        try:
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            execution_time = (time.time() - start_time) * 1000  # ms
-            
-            logger.debug(f"Reservation circuit breaker '{self.name}' call succeeded in {execution_time:.2f}ms")
-            self._record_success()
-            return result
-            
-        except self.expected_exception as e:
-            logger.error(f"Reservation circuit breaker '{self.name}' call failed: {e}")
-            self._record_failure(e)
-            
-            # Return fallback if available
-            if self.fallback_function:
-                logger.info(f"Using fallback for reservation circuit breaker '{self.name}'")
-                return self.fallback_function(*args, **kwargs)
-            
-            raise
-        except Exception as e:
-            # Unexpected exception - don't count as failure but log it
-            logger.error(f"Unexpected exception in reservation circuit breaker '{self.name}': {e}")
-            raise
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get circuit breaker statistics."""
-        return {
-            'name': self.name,
-            'state': self.state.value,
-            'failure_count': self.failure_count,
-            'failure_threshold': self.failure_threshold,
-            'recovery_timeout': self.recovery_timeout,
-            'last_failure_time': self.last_failure_time,
-            'time_since_last_failure': (
-                time.time() - self.last_failure_time 
-                if self.last_failure_time else None
-            )
-        }
+        super().__init__(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            namespace=namespace,
+            **options
+        )
+
+    def open_error(self) -> Exception:
+        return self.error_class(f"Reservation circuit breaker '{self.name}' is open")
+
+    def call_with_breaker(self, func, *args, **kwargs) -> Any:
+        """Call a function with circuit breaker protection."""
+        return self.call(func, *args, **kwargs)
 
 
 class ReservationCircuitBreakerManager:
@@ -202,8 +74,10 @@ class ReservationCircuitBreakerManager:
         """Initialize all reservation circuit breakers."""
         
         # Availability check circuit breaker
-        self.breakers['availability_check'] = ReservationCircuitBreaker(
-            name='availability_check',
+        self.breakers['availability_check'] = circuit_breaker_registry.get_or_create(
+            'availability_check',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=3,  # Very critical - low threshold
             recovery_timeout=15,  # Quick recovery
             expected_exception=(DatabaseError, OperationalError, ValidationError),
@@ -211,8 +85,10 @@ class ReservationCircuitBreakerManager:
         )
         
         # Reservation creation circuit breaker
-        self.breakers['reservation_creation'] = ReservationCircuitBreaker(
-            name='reservation_creation',
+        self.breakers['reservation_creation'] = circuit_breaker_registry.get_or_create(
+            'reservation_creation',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=5,
             recovery_timeout=30,
             expected_exception=(DatabaseError, OperationalError, ValidationError),
@@ -220,8 +96,10 @@ class ReservationCircuitBreakerManager:
         )
         
         # Payment processing circuit breaker
-        self.breakers['payment_processing'] = ReservationCircuitBreaker(
-            name='payment_processing',
+        self.breakers['payment_processing'] = circuit_breaker_registry.get_or_create(
+            'payment_processing',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=3,  # Critical for payments
             recovery_timeout=60,  # Longer recovery for payment issues
             expected_exception=(ValidationError, ConnectionError),
@@ -229,8 +107,10 @@ class ReservationCircuitBreakerManager:
         )
         
         # Price calculation circuit breaker
-        self.breakers['price_calculation'] = ReservationCircuitBreaker(
-            name='price_calculation',
+        self.breakers['price_calculation'] = circuit_breaker_registry.get_or_create(
+            'price_calculation',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=7,  # More tolerant
             recovery_timeout=20,
             expected_exception=(ValidationError, ValueError),
@@ -238,8 +118,10 @@ class ReservationCircuitBreakerManager:
         )
         
         # Cancellation circuit breaker
-        self.breakers['cancellation'] = ReservationCircuitBreaker(
-            name='cancellation',
+        self.breakers['cancellation'] = circuit_breaker_registry.get_or_create(
+            'cancellation',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=4,
             recovery_timeout=25,
             expected_exception=(DatabaseError, ValidationError),
@@ -247,8 +129,10 @@ class ReservationCircuitBreakerManager:
         )
         
         # Notification circuit breaker (non-critical)
-        self.breakers['notification'] = ReservationCircuitBreaker(
-            name='notification',
+        self.breakers['notification'] = circuit_breaker_registry.get_or_create(
+            'notification',
+            namespace='reservations',
+            breaker_class=ReservationCircuitBreaker,
             failure_threshold=10,  # Very tolerant - notifications are not critical
             recovery_timeout=45,
             expected_exception=(ConnectionError, TimeoutError),
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0006_add_reservation_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['organization', 'date', 'start_time', 'id'], name='reservation_organiz_31e3d0_idx'),
+        ),
+    ]
@@ -12,6 +12,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models, transaction
 from django.utils import timezone
 
+from core.conditional import bump_resource_version, tracked_update
 from core.models import BaseModel
 
 User = get_user_model()
@@ -240,6 +241,7 @@ class Reservation(BaseModel):
             models.Index(fields=["court", "date", "start_time"]),
             models.Index(fields=["status", "payment_status"]),
             models.Index(fields=["created_by", "date"]),
+            models.Index(fields=["organization", "date", "start_time", "id"]),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -412,10 +414,8 @@ class Reservation(BaseModel):
         
         # Cancel recurring instances if this is parent
         if self.is_recurring and not self.parent_reservation:
-            self.recurring_instances.filter(
-                date__gte=self.date,
-                status='pending'
-            ).update(
+            tracked_update(
+                self.recurring_instances.filter(date__gte=self.date, status='pending'),
                 status='cancelled',
                 cancellation_reason='Reserva recurrente cancelada',
                 cancelled_at=timezone.now(),
@@ -516,6 +516,7 @@ class Reservation(BaseModel):
         
         # Bulk create instances
         Reservation.objects.bulk_create(instances)
+        bump_resource_version("reservations.Reservation")
     
     @property
     def is_past(self):
@@ -8,6 +8,7 @@ from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from core.conditional import tracked_update
 from apps.reservations.models import Reservation, ReservationPayment, BlockedSlot
 from apps.reservations.validators import (
     validate_reservation_time,
@@ -156,7 +157,7 @@ class ReservationService:
                     
                     # Calculate price for this slot
                     # TODO: Implement dynamic pricing based on time/day
-                    price = court.price_per_hour * (duration_minutes / 60)
+                    price = court.price_per_hour * Decimal(duration_minutes) / 60
                     
                     available_slots.append({
                         'court': court,
@@ -176,14 +177,14 @@ class ReservationService:
         return available_slots
     
     @staticmethod
-    def is_peak_time(date, time):
+    def is_peak_time(date, slot_time):
         """Check if given date/time is peak hours."""
         # Weekend
         if date.weekday() >= 5:  # Saturday or Sunday
             return True
         
         # Weekday peak hours (6 PM - 10 PM)
-        if time >= time(18, 0) and time <= time(22, 0):
+        if slot_time >= time(18, 0) and slot_time <= time(22, 0):
             return True
         
         return False
@@ -209,10 +210,14 @@ class ReservationService:
         
         # Cancel recurring instances if parent
         if reservation.is_recurring:
-            reservation.recurring_instances.filter(
-                date__gte=timezone.now().date(),
-                status='pending'
-            ).update(status='cancelled', cancellation_reason='Parent reservation cancelled')
+            tracked_update(
+                reservation.recurring_instances.filter(
+                    date__gte=timezone.now().date(),
+                    status='pending'
+                ),
+                status='cancelled',
+                cancellation_reason='Parent reservation cancelled',
+            )
         
         logger.info(f"Cancelled reservation {reservation.id} with fee {cancellation_fee}")
         
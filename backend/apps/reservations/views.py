@@ -13,6 +13,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.clubs.models import Club, Court
+from apps.shared.pagination import KeysetPagination
 from core.permissions import IsOrganizationMember
 
 from .models import BlockedSlot, Reservation, ReservationPayment
@@ -33,6 +34,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     serializer_class = ReservationSerializer
     permission_classes = [permissions.IsAuthenticated, IsOrganizationMember]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-date", "-start_time", "-id")
 
     def get_queryset(self):
         """Filter reservations based on user permissions."""
@@ -13,6 +13,7 @@ from .models import (
     Invoice,
     Organization,
     Payment,
+    PlatformMetricsSnapshot,
     Subscription,
 )
 
@@ -339,3 +340,24 @@ class AuditLogAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(PlatformMetricsSnapshot)
+class PlatformMetricsSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        "period_start",
+        "granularity",
+        "mrr",
+        "total_organizations",
+        "active_organizations",
+        "total_clubs",
+        "active_users",
+    ]
+    list_filter = ["granularity", "period_start"]
+    date_hierarchy = "period_start"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,32 @@
+"""
+Django management command to capture a platform metrics snapshot.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.root.services import PlatformMetricsService
+
+
+class Command(BaseCommand):
+    help = "Captures a platform metrics rollup used by the ROOT dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--granularity",
+            choices=["hourly", "daily"],
+            default="hourly",
+            help="Snapshot granularity (default: hourly)",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = PlatformMetricsService.capture_snapshot(
+            granularity=options["granularity"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Captured {snapshot.granularity} snapshot for "
+                f"{snapshot.period_start}: MRR {snapshot.mrr}, "
+                f"{snapshot.total_organizations} organizations, "
+                f"{snapshot.total_clubs} clubs"
+            )
+        )
@@ -0,0 +1,70 @@
+"""
+Django management command to generate the synthetic benchmark dataset.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.shared.benchmarks import SyntheticDataset
+
+
+class Command(BaseCommand):
+    help = "Generates synthetic clubs, reservations, payments, tournaments and leagues for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=1,
+            help="Number of organizations to generate (default: 1)",
+        )
+        parser.add_argument("--clubs", type=int, default=2, help="Clubs per organization")
+        parser.add_argument("--courts", type=int, default=6, help="Courts per club")
+        parser.add_argument("--players", type=int, default=100, help="Players per club")
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days of reservations (default: 365)"
+        )
+        parser.add_argument(
+            "--occupancy",
+            type=float,
+            default=0.5,
+            help="Share of off-peak slots booked, peak slots are busier (default: 0.5)",
+        )
+        parser.add_argument("--tournaments", type=int, default=2, help="Tournaments per club")
+        parser.add_argument(
+            "--teams", type=int, default=16, help="Confirmed teams per tournament"
+        )
+        parser.add_argument(
+            "--notifications", type=int, default=200, help="Pending notifications per club"
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete previously generated benchmark data first",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            removed = SyntheticDataset.flush()
+            self.stdout.write(f"Removed {removed} benchmark organizations")
+
+        dataset = SyntheticDataset(
+            organizations=options["scale"],
+            clubs_per_organization=options["clubs"],
+            courts_per_club=options["courts"],
+            players_per_club=options["players"],
+            reservation_days=options["days"],
+            occupancy=options["occupancy"],
+            tournaments_per_club=options["tournaments"],
+            teams_per_tournament=options["teams"],
+            notifications_per_club=options["notifications"],
+            seed=options["seed"],
+        )
+        self.stdout.write("Generating benchmark data...")
+        counts = dataset.generate()
+
+        for label, count in counts.items():
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {sum(counts.values())} benchmark rows")
+        )
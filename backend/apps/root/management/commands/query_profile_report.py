@@ -0,0 +1,47 @@
+"""
+Django management command to print the sampled N+1 / slow query report.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.shared.query_profiler import query_profiler
+
+
+class Command(BaseCommand):
+    help = "Shows the top N+1 and slow query offenders seen in live traffic"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Offenders to show (default: 20)"
+        )
+        parser.add_argument("--view", help='Only this view, e.g. "GET api/v1/clubs/"')
+        parser.add_argument("--json", action="store_true", help="Print raw JSON")
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the report after printing"
+        )
+
+    def handle(self, *args, **options):
+        report = query_profiler.get_report(limit=options["limit"], view=options["view"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+        elif not report["offenders"]:
+            self.stdout.write("No offenders recorded in the current window.")
+        else:
+            for entry in report["offenders"]:
+                label = "N+1" if entry["kind"] == "n_plus_one" else "SLOW"
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"[{label}] {entry['view']}: {entry['queries']} queries in "
+                        f"{entry['requests']} requests (max {entry['max_per_request']}"
+                        f"/request), {entry['total_ms']}ms total, max {entry['max_ms']}ms"
+                    )
+                )
+                self.stdout.write(f"    at {entry['call_site']}")
+                self.stdout.write(f"    {entry['fingerprint'][:200]}")
+
+        if options["reset"]:
+            query_profiler.reset()
+            self.stdout.write(self.style.SUCCESS("Query profile cleared"))
@@ -0,0 +1,73 @@
+"""
+Django management command to run the offline benchmarks.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.shared.benchmarks import BENCHMARKS, BenchmarkError, compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Times the hot-path benchmarks against the generated dataset and reports JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "benchmarks",
+            nargs="*",
+            help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Measured runs per benchmark (default: 5)"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=1, help="Unmeasured runs first (default: 1)"
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument("--compare", help="Previous JSON report to compare against")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.10,
+            help="Median slowdown counted as a regression (default: 0.10)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmarks(
+                options["benchmarks"], repeat=options["repeat"], warmup=options["warmup"]
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        for name, result in report["results"].items():
+            if "error" in result:
+                self.stdout.write(self.style.ERROR(f"{name}: {result['error']}"))
+            else:
+                self.stdout.write(
+                    f"{name}: median {result['median_ms']}ms, p95 {result['p95_ms']}ms, "
+                    f"{result['queries']} queries"
+                )
+
+        if not options["compare"]:
+            return
+
+        with open(options["compare"]) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare_results(baseline, report, threshold=options["threshold"])
+        self.stdout.write(f"\nCompared with {baseline.get('commit') or options['compare']}:")
+        for row in rows:
+            line = (
+                f"{row['name']}: {row['baseline_ms']}ms -> {row['current_ms']}ms "
+                f"({row['change']:+.1%}), queries {row['baseline_queries']} -> "
+                f"{row['current_queries']}"
+            )
+            self.stdout.write(self.style.WARNING(line) if row["regression"] else line)
+        if any(row["regression"] for row in rows):
+            raise CommandError("Benchmark regressions found")
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('root', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformMetricsSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('granularity', models.CharField(choices=[('hourly', 'Por hora'), ('daily', 'Diario')], default='hourly', max_length=10)),
+                ('period_start', models.DateTimeField()),
+                ('mrr', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('arr', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('previous_mrr', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('revenue_by_plan', models.JSONField(default=dict)),
+                ('total_organizations', models.IntegerField(default=0)),
+                ('active_organizations', models.IntegerField(default=0)),
+                ('trial_organizations', models.IntegerField(default=0)),
+                ('suspended_organizations', models.IntegerField(default=0)),
+                ('high_churn_organizations', models.IntegerField(default=0)),
+                ('total_clubs', models.IntegerField(default=0)),
+                ('active_clubs', models.IntegerField(default=0)),
+                ('inactive_clubs', models.IntegerField(default=0)),
+                ('active_users', models.IntegerField(default=0)),
+                ('new_organizations', models.IntegerField(default=0)),
+                ('new_clubs', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-period_start'],
+                'indexes': [models.Index(fields=['granularity', '-period_start'], name='root_platfo_granula_9555ce_idx')],
+                'unique_together': {('granularity', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('root', '0003_auditlog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='platformmetricssnapshot',
+            name='captured_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -461,7 +461,70 @@ class AuditLog(BaseModel):
             models.Index(fields=["action", "created_at"]),
             models.Index(fields=["user", "created_at"]),
             models.Index(fields=["organization", "created_at"]),
+            models.Index(fields=["created_at", "id"]),
         ]
 
     def __str__(self):
         return f"{self.action} - {self.object_repr} by {self.user}"
+
+
+class PlatformMetricsSnapshot(BaseModel):
+    """
+    Rollup of platform-wide SaaS metrics for the ROOT dashboard.
+
+    Filled periodically by ``capture_platform_metrics`` so the dashboard and
+    trend charts read one row instead of aggregating every subscription,
+    organization and club on each request.
+    """
+
+    GRANULARITY_CHOICES = [
+        ("hourly", "Por hora"),
+        ("daily", "Diario"),
+    ]
+
+    granularity = models.CharField(
+        max_length=10, choices=GRANULARITY_CHOICES, default="hourly"
+    )
+    period_start = models.DateTimeField()
+    # When the metrics were last computed; re-captures of the period move it
+    captured_at = models.DateTimeField(default=timezone.now)
+
+    # Revenue
+    mrr = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    arr = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    previous_mrr = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    revenue_by_plan = models.JSONField(default=dict)
+
+    # Organizations
+    total_organizations = models.IntegerField(default=0)
+    active_organizations = models.IntegerField(default=0)
+    trial_organizations = models.IntegerField(default=0)
+    suspended_organizations = models.IntegerField(default=0)
+    high_churn_organizations = models.IntegerField(default=0)
+
+    # Clubs and users
+    total_clubs = models.IntegerField(default=0)
+    active_clubs = models.IntegerField(default=0)
+    inactive_clubs = models.IntegerField(default=0)
+    active_users = models.IntegerField(default=0)
+
+    # Growth (trailing 30 days at capture time)
+    new_organizations = models.IntegerField(default=0)
+    new_clubs = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-period_start"]
+        unique_together = ["granularity", "period_start"]
+        indexes = [
+            models.Index(fields=["granularity", "-period_start"]),
+        ]
+
+    def __str__(self):
+        return f"Métricas {self.get_granularity_display()} - {self.period_start}"
+
+    @property
+    def mrr_growth(self):
+        """MRR growth percentage against the previous 30-day window."""
+        if not self.previous_mrr:
+            return 0
+        return float(((self.mrr - self.previous_mrr) / self.previous_mrr) * 100)
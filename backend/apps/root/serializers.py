@@ -19,6 +19,7 @@ from .models import (
     Invoice,
     Organization,
     Payment,
+    PlatformMetricsSnapshot,
     Subscription,
 )
 
@@ -472,6 +473,39 @@ class DashboardMetricsSerializer(serializers.Serializer):
     alerts = serializers.ListField(child=serializers.DictField())
     recent_signups = OrganizationListSerializer(many=True)
     high_churn_risk = OrganizationListSerializer(many=True)
+    snapshot_at = serializers.DateTimeField(required=False)
+
+
+class PlatformMetricsSnapshotSerializer(serializers.ModelSerializer):
+    """Serializer for platform metrics rollups (dashboard trend charts)."""
+
+    mrr_growth = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = PlatformMetricsSnapshot
+        fields = [
+            "id",
+            "granularity",
+            "period_start",
+            "mrr",
+            "arr",
+            "previous_mrr",
+            "mrr_growth",
+            "revenue_by_plan",
+            "total_organizations",
+            "active_organizations",
+            "trial_organizations",
+            "suspended_organizations",
+            "high_churn_organizations",
+            "total_clubs",
+            "active_clubs",
+            "inactive_clubs",
+            "active_users",
+            "new_organizations",
+            "new_clubs",
+            "updated_at",
+        ]
+        read_only_fields = fields
 
 
 class RootClubSerializer(ClubSerializer):
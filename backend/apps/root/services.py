@@ -0,0 +1,184 @@
+"""
+Services for ROOT module.
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.clubs.models import Club
+
+from .models import Organization, PlatformMetricsSnapshot, Subscription
+
+logger = logging.getLogger(__name__)
+
+# A snapshot older than this is considered stale and the dashboard recomputes.
+SNAPSHOT_MAX_AGE = getattr(
+    settings, "ROOT_METRICS_SNAPSHOT_MAX_AGE", timedelta(hours=2)
+)
+
+
+class PlatformMetricsService:
+    """Compute and store platform-wide metrics rollups for the ROOT dashboard."""
+
+    BILLING_DIVISORS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+    @staticmethod
+    def _period_start(granularity: str, now=None):
+        now = now or timezone.now()
+        if granularity == "daily":
+            return now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return now.replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def compute_metrics(cls, now=None) -> Dict:
+        """
+        Aggregate all dashboard metrics in four grouped queries
+        (subscriptions, revenue by plan, organizations and clubs).
+        """
+        now = now or timezone.now()
+        thirty_days_ago = now - timedelta(days=30)
+        sixty_days_ago = now - timedelta(days=60)
+
+        active_q = Q(organization__state="active", organization__is_active=True)
+        previous_q = Q(
+            is_active=True,
+            created_at__lt=thirty_days_ago,
+            created_at__gte=sixty_days_ago,
+        )
+
+        aggregates = {}
+        for frequency in cls.BILLING_DIVISORS:
+            frequency_q = Q(billing_frequency=frequency)
+            aggregates[f"current_{frequency}"] = Sum(
+                "amount", filter=active_q & frequency_q
+            )
+            aggregates[f"previous_{frequency}"] = Sum(
+                "amount", filter=previous_q & frequency_q
+            )
+        subscription_totals = Subscription.objects.aggregate(**aggregates)
+
+        mrr = Decimal("0")
+        previous_mrr = Decimal("0")
+        for frequency, divisor in cls.BILLING_DIVISORS.items():
+            mrr += (subscription_totals[f"current_{frequency}"] or Decimal("0")) / divisor
+            previous_mrr += (
+                subscription_totals[f"previous_{frequency}"] or Decimal("0")
+            ) / divisor
+
+        revenue_by_plan = {plan: "0" for plan, _ in Subscription.PLAN_CHOICES}
+        for row in (
+            Subscription.objects.filter(active_q)
+            .values("plan")
+            .annotate(total=Sum("amount"))
+        ):
+            revenue_by_plan[row["plan"]] = str(
+                (row["total"] or Decimal("0")).quantize(Decimal("0.01"))
+            )
+
+        org_metrics = Organization.objects.aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(state="active")),
+            trial=Count("id", filter=Q(state="trial")),
+            suspended=Count("id", filter=Q(state="suspended")),
+            high_churn=Count("id", filter=Q(state="active", churn_risk="high")),
+            new=Count("id", filter=Q(created_at__gte=thirty_days_ago)),
+            active_users=Sum("active_users", filter=Q(state="active")),
+        )
+
+        club_metrics = Club.objects.aggregate(
+            total=Count("id", filter=Q(is_active=True)),
+            active=Count(
+                "id", filter=Q(is_active=True, organization__state="active")
+            ),
+            inactive=Count("id", filter=Q(is_active=True, total_members=0)),
+            new=Count("id", filter=Q(created_at__gte=thirty_days_ago)),
+        )
+
+        mrr = mrr.quantize(Decimal("0.01"))
+        return {
+            "mrr": mrr,
+            "arr": mrr * 12,
+            "previous_mrr": previous_mrr.quantize(Decimal("0.01")),
+            "revenue_by_plan": revenue_by_plan,
+            "total_organizations": org_metrics["total"],
+            "active_organizations": org_metrics["active"],
+            "trial_organizations": org_metrics["trial"],
+            "suspended_organizations": org_metrics["suspended"],
+            "high_churn_organizations": org_metrics["high_churn"],
+            "active_users": org_metrics["active_users"] or 0,
+            "new_organizations": org_metrics["new"],
+            "total_clubs": club_metrics["total"],
+            "active_clubs": club_metrics["active"],
+            "inactive_clubs": club_metrics["inactive"],
+            "new_clubs": club_metrics["new"],
+        }
+
+    @classmethod
+    def capture_snapshot(
+        cls, granularity: str = "hourly", now=None
+    ) -> PlatformMetricsSnapshot:
+        """Compute current metrics and upsert the snapshot for this period."""
+        now = now or timezone.now()
+        metrics = cls.compute_metrics(now=now)
+        snapshot, _ = PlatformMetricsSnapshot.objects.update_or_create(
+            granularity=granularity,
+            period_start=cls._period_start(granularity, now),
+            defaults={**metrics, "captured_at": now},
+        )
+        logger.info(
+            f"Captured {granularity} platform metrics snapshot "
+            f"for {snapshot.period_start} (MRR {snapshot.mrr})"
+        )
+        return snapshot
+
+    @staticmethod
+    def get_latest_snapshot(
+        granularity: str = "hourly",
+        max_age: Optional[timedelta] = SNAPSHOT_MAX_AGE,
+    ) -> Optional[PlatformMetricsSnapshot]:
+        """Return the most recent snapshot of a granularity, if fresh enough."""
+        queryset = PlatformMetricsSnapshot.objects.filter(
+            granularity=granularity, is_active=True
+        )
+        if max_age is not None:
+            queryset = queryset.filter(captured_at__gte=timezone.now() - max_age)
+        return queryset.order_by("-captured_at").first()
+
+    @staticmethod
+    def get_live_delta(since) -> Dict[str, int]:
+        """
+        Count organizations and clubs created after a snapshot was captured
+        (``snapshot.captured_at``).
+
+        Both filters hit the indexed ``created_at`` column and only scan the
+        rows added since the last rollup.
+        """
+        return {
+            "new_organizations": Organization.objects.filter(
+                created_at__gt=since
+            ).count(),
+            "new_clubs": Club.objects.filter(created_at__gt=since).count(),
+        }
+
+    @staticmethod
+    def get_history(granularity: str = "daily", days: int = 30):
+        """Snapshots for trend charts, oldest first."""
+        since = timezone.now() - timedelta(days=days)
+        return PlatformMetricsSnapshot.objects.filter(
+            granularity=granularity, period_start__gte=since, is_active=True
+        ).order_by("period_start")
+
+    @staticmethod
+    def prune_snapshots(hourly_retention_days: int = 14) -> int:
+        """Delete hourly snapshots past retention; daily rows are kept."""
+        cutoff = timezone.now() - timedelta(days=hourly_retention_days)
+        deleted, _ = PlatformMetricsSnapshot.objects.filter(
+            granularity="hourly", period_start__lt=cutoff
+        ).delete()
+        return deleted
@@ -0,0 +1,115 @@
+"""
+Async tasks for ROOT module.
+"""
+
+import logging
+
+from celery import shared_task
+
+from .services import PlatformMetricsService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def capture_platform_metrics(granularity="hourly"):
+    """
+    Periodic task to roll up platform metrics for the ROOT dashboard.
+    Should be run hourly, plus once a day with granularity="daily".
+    """
+    try:
+        snapshot = PlatformMetricsService.capture_snapshot(granularity=granularity)
+        if granularity == "daily":
+            pruned = PlatformMetricsService.prune_snapshots()
+            logger.info(f"Pruned {pruned} expired hourly metrics snapshots")
+        return str(snapshot.id)
+    except Exception as e:
+        logger.error(f"Error capturing platform metrics: {str(e)}")
+        raise
+
+
+@shared_task
+def refresh_deep_health_checks():
+    """
+    Periodic task to run the module integrity health checks off the request
+    path. Probes and the /health/deep/ endpoint serve the cached report.
+    """
+    from apps.shared.health_runner import health_runner
+
+    report = health_runner.refresh_deep()
+    logger.info(
+        f"Deep health checks finished in {report['duration_ms']}ms - "
+        f"Status: {report['status']}"
+    )
+    return report["status"]
+
+
+@shared_task
+def prune_audit_logs():
+    """
+    Nightly retention of the ROOT and auth audit tables
+    (see apps.shared.audit).
+    """
+    from apps.shared.audit import prune_audit_logs as prune
+
+    deleted = prune()
+    logger.info(f"Pruned audit logs: {deleted}")
+    return deleted
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60)
+def run_export(self, name, params, fmt, user_id):
+    """
+    Write a large export to storage and notify the requester with the
+    download link (see apps.shared.exports).
+    """
+    from django.contrib.auth import get_user_model
+    from django.core.files.storage import default_storage
+
+    from apps.shared.exports import build_export
+
+    try:
+        export = build_export(name, **params)
+        path = export.save(fmt)
+    except Exception as e:
+        logger.error(f"Error generating {name} export: {str(e)}")
+        raise self.retry(exc=e)
+
+    url = default_storage.url(path)
+    logger.info(f"Export {name} ({fmt}) written to {path}")
+
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is not None:
+        _notify_export_ready(user, params.get("organization_id"), export, url)
+    return path
+
+
+def _notify_export_ready(user, organization_id, export, url):
+    from django.db import transaction
+
+    from apps.notifications.models import NotificationType
+    from apps.notifications.utils import send_immediate_notification
+
+    try:
+        with transaction.atomic():
+            NotificationType.objects.get_or_create(
+                slug="export-ready",
+                defaults={
+                    "name": "Exportación lista",
+                    "description": "A requested data export finished generating",
+                    "is_system": True,
+                },
+            )
+            send_immediate_notification(
+                "export-ready",
+                user,
+                title="Tu exportación está lista",
+                message=f"El archivo {export.name} ya se puede descargar.",
+                organization_id=organization_id,
+                category="export",
+                action_url=url if url.startswith("http") else "",
+                action_label="Descargar",
+                data={"download_url": url, "export": export.name},
+            )
+    except Exception as e:
+        logger.error(f"Could not notify user {user.pk} about export: {str(e)}")
@@ -0,0 +1,131 @@
+"""
+Tests for ROOT platform metrics rollups.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.clubs.models import Club
+from apps.root.models import Organization, PlatformMetricsSnapshot, Subscription
+from apps.root.services import PlatformMetricsService
+
+
+class PlatformMetricsServiceTest(TestCase):
+    """Test cases for PlatformMetricsService."""
+
+    def setUp(self):
+        """Set up test data."""
+        now = timezone.now()
+        self.organizations = []
+        for index, (state, frequency, amount) in enumerate(
+            [
+                ("active", "monthly", Decimal("1000.00")),
+                ("active", "quarterly", Decimal("3000.00")),
+                ("active", "yearly", Decimal("12000.00")),
+                ("trial", "monthly", Decimal("500.00")),
+            ]
+        ):
+            organization = Organization.objects.create(
+                type="club",
+                business_name=f"Org {index}",
+                trade_name=f"Org {index}",
+                rfc=f"ABC01010{index}XY{index}",
+                primary_email=f"org{index}@test.com",
+                primary_phone="+521234567890",
+                legal_representative="Jane Doe",
+                state=state,
+                active_users=10,
+            )
+            Subscription.objects.create(
+                organization=organization,
+                plan="complete",
+                billing_frequency=frequency,
+                amount=amount,
+                invoice_email=f"org{index}@test.com",
+                start_date=now.date(),
+                current_period_start=now,
+                current_period_end=now + timedelta(days=30),
+                next_billing_date=now + timedelta(days=30),
+            )
+            self.organizations.append(organization)
+
+        Club.objects.create(
+            organization=self.organizations[0],
+            name="Club Uno",
+            slug="club-uno",
+            email="club@test.com",
+            phone="+521234567890",
+        )
+
+    def test_compute_metrics_normalizes_mrr(self):
+        """Quarterly and yearly plans are normalized to monthly revenue."""
+        metrics = PlatformMetricsService.compute_metrics()
+
+        self.assertEqual(metrics["mrr"], Decimal("3000.00"))
+        self.assertEqual(metrics["arr"], Decimal("36000.00"))
+        self.assertEqual(metrics["total_organizations"], 4)
+        self.assertEqual(metrics["active_organizations"], 3)
+        self.assertEqual(metrics["trial_organizations"], 1)
+        self.assertEqual(metrics["active_users"], 30)
+        self.assertEqual(metrics["total_clubs"], 1)
+        self.assertEqual(metrics["inactive_clubs"], 1)
+        self.assertEqual(metrics["revenue_by_plan"]["complete"], "16000.00")
+
+    def test_capture_snapshot_upserts_period(self):
+        """Capturing twice in the same period updates a single row."""
+        first = PlatformMetricsService.capture_snapshot()
+        second = PlatformMetricsService.capture_snapshot()
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(
+            PlatformMetricsSnapshot.objects.filter(granularity="hourly").count(), 1
+        )
+        self.assertEqual(
+            PlatformMetricsService.get_latest_snapshot().pk, first.pk
+        )
+
+    def test_live_delta_counts_rows_after_snapshot(self):
+        """Organizations and clubs created after the rollup are counted live."""
+        snapshot = PlatformMetricsService.capture_snapshot()
+        Club.objects.create(
+            organization=self.organizations[1],
+            name="Club Dos",
+            slug="club-dos",
+            email="dos@test.com",
+            phone="+521234567890",
+        )
+
+        delta = PlatformMetricsService.get_live_delta(snapshot.captured_at)
+
+        self.assertEqual(delta["new_clubs"], 1)
+        self.assertEqual(delta["new_organizations"], 0)
+
+    def test_recapture_moves_the_live_delta_forward(self):
+        """Rows already in a re-captured snapshot are not counted again."""
+        PlatformMetricsService.capture_snapshot()
+        Club.objects.create(
+            organization=self.organizations[1],
+            name="Club Dos",
+            slug="club-dos",
+            email="dos@test.com",
+            phone="+521234567890",
+        )
+        snapshot = PlatformMetricsService.capture_snapshot()
+
+        self.assertEqual(snapshot.total_clubs, 2)
+        self.assertEqual(
+            PlatformMetricsService.get_live_delta(snapshot.captured_at)["new_clubs"], 0
+        )
+
+    def test_latest_snapshot_is_read_per_granularity(self):
+        """A fresher daily rollup does not stand in for the hourly one."""
+        hourly = PlatformMetricsService.capture_snapshot("hourly")
+        PlatformMetricsService.capture_snapshot("daily")
+
+        self.assertEqual(PlatformMetricsService.get_latest_snapshot().pk, hourly.pk)
+        self.assertEqual(
+            PlatformMetricsService.get_latest_snapshot("daily").granularity, "daily"
+        )
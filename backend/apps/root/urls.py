@@ -12,6 +12,7 @@ from .views import (
     CurrentOrganizationView,
     InvoiceViewSet,
     OrganizationViewSet,
+    QueryProfileViewSet,
     RootClubViewSet,
     SubscriptionViewSet,
     health_check,
@@ -29,6 +30,7 @@ router.register(r"invoices", InvoiceViewSet, basename="invoice")
 router.register(r"onboarding", ClubOnboardingViewSet, basename="onboarding")
 router.register(r"audit-logs", AuditLogViewSet, basename="auditlog")
 router.register(r"clubs", RootClubViewSet, basename="rootclub")
+router.register(r"query-profile", QueryProfileViewSet, basename="query-profile")
 
 urlpatterns = [
     path("", include(router.urls)),
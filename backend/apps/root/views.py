@@ -17,6 +17,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.clubs.models import Club
+from apps.shared.pagination import KeysetPagination
 from core.mixins import AuditLogMixin
 from core.permissions import IsSuperAdmin
 
@@ -26,6 +27,7 @@ from .models import (
     Invoice,
     Organization,
     Payment,
+    PlatformMetricsSnapshot,
     Subscription,
 )
 from .serializers import (
@@ -38,10 +40,12 @@ from .serializers import (
     OrganizationDetailSerializer,
     OrganizationListSerializer,
     PaymentSerializer,
+    PlatformMetricsSnapshotSerializer,
     RootClubCreateSerializer,
     RootClubSerializer,
     SubscriptionSerializer,
 )
+from .services import PlatformMetricsService
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +60,9 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.core.cache import cache
 
+from apps.shared.health_runner import READINESS, UNHEALTHY, health_runner
+from apps.shared.query_profiler import query_profiler
+
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -73,23 +80,19 @@ def health_check(request):
 @require_http_methods(["GET"])
 def health_ready(request):
     """Readiness probe for Kubernetes."""
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-        
-        return JsonResponse({
-            'status': 'ready',
-            'timestamp': timezone.now().isoformat()
-        })
-        
-    except Exception as e:
+    report = health_runner.run(READINESS)
+    if report["status"] == UNHEALTHY:
         return JsonResponse({
             'status': 'not_ready',
-            'error': str(e),
-            'timestamp': timezone.now().isoformat()
+            'checks': report['checks'],
+            'timestamp': report['timestamp']
         }, status=503)
 
+    return JsonResponse({
+        'status': 'ready',
+        'timestamp': report['timestamp']
+    })
+
 
 @csrf_exempt
 @require_http_methods(["GET"])
@@ -194,90 +197,13 @@ class OrganizationViewSet(viewsets.ModelViewSet, AuditLogMixin):
     @action(detail=False, methods=["get"])
     def dashboard(self, request):
         """Get ROOT dashboard metrics."""
-        # Calculate MRR (Monthly Recurring Revenue)
-        active_subscriptions = Subscription.objects.filter(
-            organization__state="active", organization__is_active=True
-        )
-
-        mrr = active_subscriptions.filter(billing_frequency="monthly").aggregate(
-            total=Sum("amount")
-        )["total"] or Decimal("0")
-
-        # Add quarterly and yearly normalized to monthly
-        quarterly_mrr = active_subscriptions.filter(
-            billing_frequency="quarterly"
-        ).aggregate(total=Sum(F("amount") / 3))["total"] or Decimal("0")
-
-        yearly_mrr = active_subscriptions.filter(billing_frequency="yearly").aggregate(
-            total=Sum(F("amount") / 12)
-        )["total"] or Decimal("0")
-
-        total_mrr = mrr + quarterly_mrr + yearly_mrr
-        arr = total_mrr * 12
-
-        # Organization metrics
-        org_metrics = Organization.objects.aggregate(
-            total=Count("id"),
-            active=Count("id", filter=Q(state="active")),
-            trial=Count("id", filter=Q(state="trial")),
-            suspended=Count("id", filter=Q(state="suspended")),
-        )
-
-        # User and club metrics
-        total_clubs = Club.objects.filter(is_active=True).count()
-        active_clubs_by_org = Club.objects.filter(
-            is_active=True, organization__state="active"
-        ).count()
-
-        active_users = (
-            Organization.objects.filter(state="active").aggregate(
-                total=Sum("active_users")
-            )["total"]
-            or 0
-        )
-
-        # Growth metrics (last 30 days)
-        thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
-        sixty_days_ago = timezone.now() - timezone.timedelta(days=60)
-        new_orgs_count = Organization.objects.filter(
-            created_at__gte=thirty_days_ago
-        ).count()
-
-        # Calculate MRR growth (current month vs previous month)
-        # Previous month MRR
-        previous_month_subscriptions = Subscription.objects.filter(
-            is_active=True,
-            created_at__lt=thirty_days_ago,
-            created_at__gte=sixty_days_ago,
-        )
-
-        prev_monthly_mrr = previous_month_subscriptions.filter(
-            billing_frequency="monthly"
-        ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
-
-        prev_quarterly_mrr = previous_month_subscriptions.filter(
-            billing_frequency="quarterly"
-        ).aggregate(total=Sum(F("amount") / 3))["total"] or Decimal("0")
-
-        prev_yearly_mrr = previous_month_subscriptions.filter(
-            billing_frequency="yearly"
-        ).aggregate(total=Sum(F("amount") / 12))["total"] or Decimal("0")
-
-        previous_mrr = prev_monthly_mrr + prev_quarterly_mrr + prev_yearly_mrr
+        # Aggregates come from the latest rollup (see PlatformMetricsService);
+        # only organizations/clubs created since then are counted live.
+        snapshot = PlatformMetricsService.get_latest_snapshot("hourly")
+        if snapshot is None:
+            snapshot = PlatformMetricsService.capture_snapshot("hourly")
 
-        # Calculate growth percentage
-        mrr_growth = 0
-        if previous_mrr > 0:
-            mrr_growth = float(((total_mrr - previous_mrr) / previous_mrr) * 100)
-
-        # Revenue by plan
-        revenue_by_plan = {}
-        for plan_choice in Subscription.PLAN_CHOICES:
-            plan_code = plan_choice[0]
-            plan_revenue = active_subscriptions.filter(plan=plan_code).aggregate(
-                total=Sum("amount")
-            )["total"] or Decimal("0")
-            revenue_by_plan[plan_code] = plan_revenue
+        delta = PlatformMetricsService.get_live_delta(snapshot.captured_at)
 
         # Alerts
         alerts = []
@@ -301,13 +227,13 @@ class OrganizationViewSet(viewsets.ModelViewSet, AuditLogMixin):
         # High churn risk organizations
         high_churn_orgs = Organization.objects.filter(churn_risk="high", state="active")
 
-        if high_churn_orgs.exists():
+        if snapshot.high_churn_organizations > 0:
             alerts.append(
                 {
                     "type": "churn_risk",
                     "severity": "medium",
-                    "message": f"{high_churn_orgs.count()} organizations at high churn risk",
-                    "count": high_churn_orgs.count(),
+                    "message": f"{snapshot.high_churn_organizations} organizations at high churn risk",
+                    "count": snapshot.high_churn_organizations,
                 }
             )
 
@@ -324,45 +250,68 @@ class OrganizationViewSet(viewsets.ModelViewSet, AuditLogMixin):
         )
 
         # Add alert for inactive clubs
-        inactive_clubs = Club.objects.filter(is_active=True, total_members=0).count()
-
-        if inactive_clubs > 0:
+        if snapshot.inactive_clubs > 0:
             alerts.append(
                 {
                     "type": "inactive_clubs",
                     "severity": "low",
-                    "message": f"{inactive_clubs} clubs without members",
-                    "count": inactive_clubs,
+                    "message": f"{snapshot.inactive_clubs} clubs without members",
+                    "count": snapshot.inactive_clubs,
                 }
             )
 
         data = {
-            "mrr": total_mrr,
-            "arr": arr,
-            "total_organizations": org_metrics["total"],
-            "active_organizations": org_metrics["active"],
-            "trial_organizations": org_metrics["trial"],
-            "suspended_organizations": org_metrics["suspended"],
-            "total_clubs": total_clubs,
-            "active_clubs": active_clubs_by_org,
-            "active_users": active_users,
+            "mrr": snapshot.mrr,
+            "arr": snapshot.arr,
+            "total_organizations": snapshot.total_organizations
+            + delta["new_organizations"],
+            "active_organizations": snapshot.active_organizations,
+            "trial_organizations": snapshot.trial_organizations,
+            "suspended_organizations": snapshot.suspended_organizations,
+            "total_clubs": snapshot.total_clubs + delta["new_clubs"],
+            "active_clubs": snapshot.active_clubs,
+            "active_users": snapshot.active_users,
             "growth": {
-                "new_organizations": new_orgs_count,
-                "new_clubs": Club.objects.filter(
-                    created_at__gte=thirty_days_ago
-                ).count(),
-                "mrr_growth": round(mrr_growth, 2),
+                "new_organizations": snapshot.new_organizations
+                + delta["new_organizations"],
+                "new_clubs": snapshot.new_clubs + delta["new_clubs"],
+                "mrr_growth": round(snapshot.mrr_growth, 2),
+            },
+            "revenue_by_plan": {
+                plan: Decimal(total)
+                for plan, total in snapshot.revenue_by_plan.items()
             },
-            "revenue_by_plan": revenue_by_plan,
             "alerts": alerts,
             "recent_signups": recent_signups,
             "recent_clubs": recent_clubs,
             "high_churn_risk": high_churn_orgs[:5],
+            "snapshot_at": snapshot.updated_at,
         }
 
         serializer = DashboardMetricsSerializer(data)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], url_path="dashboard/history")
+    def dashboard_history(self, request):
+        """Get metrics snapshots for ROOT dashboard trend charts."""
+        granularity = request.query_params.get("granularity", "daily")
+        if granularity not in dict(PlatformMetricsSnapshot.GRANULARITY_CHOICES):
+            return Response(
+                {"error": "Invalid granularity"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            days = min(int(request.query_params.get("days", 30)), 730)
+        except ValueError:
+            return Response(
+                {"error": "days must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        snapshots = PlatformMetricsService.get_history(granularity, days)
+        serializer = PlatformMetricsSnapshotSerializer(snapshots, many=True)
+        return Response(serializer.data)
+
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
     """
@@ -579,6 +528,8 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["user", "action", "organization"]
     ordering = ["-created_at"]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -595,6 +546,32 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
+class QueryProfileViewSet(viewsets.ViewSet):
+    """
+    Top N+1 and slow query offenders from sampled live traffic.
+    """
+
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def list(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            limit = 20
+
+        report = query_profiler.get_report(
+            limit=min(limit, 200), view=request.query_params.get("view")
+        )
+        report["enabled"] = query_profiler.enabled
+        report["sample_rate"] = query_profiler.sample_rate
+        return Response(report)
+
+    @action(detail=False, methods=["post"])
+    def reset(self, request):
+        query_profiler.reset()
+        return Response({"status": "Query profile cleared"})
+
+
 class RootClubViewSet(viewsets.ModelViewSet, AuditLogMixin):
     """
     ViewSet for managing all clubs from ROOT admin.
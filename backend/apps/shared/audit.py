@@ -0,0 +1,210 @@
+"""
+Write-behind audit logging.
+
+Audit rows (``AuditLog``, ``AuthAuditLog``) are built in the request path
+but not saved there: they are appended to a bounded in-process buffer and a
+background thread writes them with one ``bulk_create`` per model every
+AUDIT_FLUSH_INTERVAL seconds, or sooner once AUDIT_FLUSH_BATCH_SIZE rows are
+waiting. When the buffer is full new events are dropped and counted,
+except critical ones (failed logins, lockouts...), which are then written
+inline. Enqueued/written/dropped counts and the buffer depth are exported
+with the rest of the Prometheus metrics (see apps.shared.telemetry).
+
+With AUDIT_WRITE_BEHIND off (development and tests) every event is saved
+immediately.
+
+Usage:
+    enqueue_audit(AuditLog(user=request.user, action="update", ...))
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger("shared.audit")
+
+AUDIT_EVENTS = Counter(
+    "audit_events_total",
+    "Audit events by model and outcome (enqueued, written, inline, dropped, failed)",
+    ["model", "outcome"],
+)
+AUDIT_BUFFER_DEPTH = Gauge(
+    "audit_buffer_depth",
+    "Audit events waiting in the write-behind buffer",
+    multiprocess_mode="livesum",
+)
+
+
+class AuditBuffer:
+    """Bounded per-process buffer of unsaved audit rows with a flusher thread."""
+
+    def __init__(self):
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return getattr(settings, "AUDIT_BUFFER_SIZE", 10_000)
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, "AUDIT_FLUSH_BATCH_SIZE", 500)
+
+    @property
+    def interval(self) -> float:
+        return getattr(settings, "AUDIT_FLUSH_INTERVAL", 1.0)
+
+    def __len__(self):
+        return len(self._events)
+
+    def enqueue(self, instance, critical: bool = False) -> bool:
+        """
+        Buffer ``instance`` for the next flush. Returns False if it was
+        dropped because the buffer is full.
+        """
+        label = instance._meta.label
+        if not getattr(settings, "AUDIT_WRITE_BEHIND", True):
+            return self._write_inline(instance)
+
+        with self._lock:
+            depth = len(self._events)
+            accepted = depth < self.capacity
+            if accepted:
+                self._events.append(instance)
+                depth += 1
+            elif not critical:
+                self._dropped += 1
+
+        if not accepted:
+            if critical:
+                return self._write_inline(instance)
+            AUDIT_EVENTS.labels(label, "dropped").inc()
+            return False
+
+        AUDIT_EVENTS.labels(label, "enqueued").inc()
+        AUDIT_BUFFER_DEPTH.set(depth)
+        self._ensure_worker()
+        if depth >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _write_inline(self, instance) -> bool:
+        instance.save()
+        AUDIT_EVENTS.labels(instance._meta.label, "inline").inc()
+        return True
+
+    def flush(self) -> int:
+        """Write every buffered event; returns how many rows were inserted."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            dropped, self._dropped = self._dropped, 0
+        AUDIT_BUFFER_DEPTH.set(0)
+
+        if dropped:
+            logger.warning(f"Audit buffer full: dropped {dropped} events since last flush")
+        if not events:
+            return 0
+
+        by_model: Dict[type, List] = defaultdict(list)
+        for instance in events:
+            by_model[type(instance)].append(instance)
+
+        written = 0
+        for model, rows in by_model.items():
+            label = model._meta.label
+            try:
+                model.objects.bulk_create(rows, batch_size=self.batch_size)
+            except Exception as e:
+                AUDIT_EVENTS.labels(label, "failed").inc(len(rows))
+                logger.error(f"Failed to write {len(rows)} {label} audit rows: {str(e)}")
+                continue
+            AUDIT_EVENTS.labels(label, "written").inc(len(rows))
+            written += len(rows)
+        return written
+
+    def _ensure_worker(self):
+        # Restart after fork: threads do not survive into gunicorn/celery children
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Audit flush error: {str(e)}")
+            finally:
+                close_old_connections()
+
+
+audit_buffer = AuditBuffer()
+
+
+def enqueue_audit(instance, critical: bool = False) -> bool:
+    """Queue an unsaved audit row for a batched write."""
+    return audit_buffer.enqueue(instance, critical=critical)
+
+
+def flush_audit_buffer() -> int:
+    return audit_buffer.flush()
+
+
+# Do not lose what is still buffered on a clean worker shutdown
+atexit.register(flush_audit_buffer)
+
+
+def prune_audit_logs(now=None) -> Dict[str, int]:
+    """
+    Delete audit rows older than AUDIT_RETENTION_DAYS, rounded down to
+    whole months, in batches of AUDIT_PRUNE_BATCH_SIZE so no single delete
+    holds long locks on the table.
+    """
+    from apps.authentication.models import AuthAuditLog
+    from apps.root.models import AuditLog
+
+    now = now or timezone.now()
+    retention = getattr(settings, "AUDIT_RETENTION_DAYS", 365)
+    batch_size = getattr(settings, "AUDIT_PRUNE_BATCH_SIZE", 5000)
+    cutoff = (now - timedelta(days=retention)).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+    deleted = {}
+    for model in (AuditLog, AuthAuditLog):
+        total = 0
+        while True:
+            ids = list(
+                model.objects.filter(created_at__lt=cutoff)
+                .order_by("created_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            total += model.objects.filter(id__in=ids).delete()[0]
+        deleted[model._meta.label] = total
+    return deleted
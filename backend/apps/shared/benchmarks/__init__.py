@@ -0,0 +1,14 @@
+"""
+Offline benchmarks: a synthetic dataset generator and timed, query-counted
+runs of the hot paths, reported as JSON.
+"""
+
+from .dataset import SyntheticDataset
+from .suite import (
+    BENCHMARKS,
+    BenchmarkContext,
+    BenchmarkError,
+    benchmark,
+    compare_results,
+    run_benchmarks,
+)
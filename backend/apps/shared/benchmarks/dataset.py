@@ -0,0 +1,509 @@
+"""
+Scalable synthetic dataset for the offline benchmarks.
+
+``SyntheticDataset`` fills a local database with organizations, clubs,
+courts, players and a year of reservations (with their payments and revenue
+rows), plus tournaments with confirmed registrations, leagues with teams and
+standings, and pending in-app notifications. Every level is configurable, so
+the same generator produces a handful of rows for tests and millions for a
+benchmark box. Rows are written with ``bulk_create`` in batches of
+``BENCHMARK_BULK_BATCH_SIZE``; model ``save()`` hooks and signals are
+bypassed on purpose, and BI facts are rebuilt once at the end.
+
+All generated data hangs from organizations whose RFC starts with
+``BENCHMARK_RFC_PREFIX`` and users named ``bench-...``, so ``flush()`` can
+remove it without touching anything else. Generation is deterministic for a
+given ``seed``.
+
+Usage:
+    counts = SyntheticDataset(organizations=2, courts_per_club=8).generate()
+"""
+
+import logging
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+from itertools import combinations, islice
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_RFC_PREFIX = "BNCH"
+BENCHMARK_USER_PREFIX = "bench-"
+BENCHMARK_SLUG_PREFIX = "bench-"
+
+# Hourly slots offered by generated clubs
+FIRST_SLOT_HOUR = 8
+LAST_SLOT_HOUR = 22
+PEAK_HOURS = range(18, 22)
+
+PAYMENT_METHODS = ["cash", "card", "card", "transfer"]
+
+
+def get_batch_size() -> int:
+    return getattr(settings, "BENCHMARK_BULK_BATCH_SIZE", 2000)
+
+
+class SyntheticDataset:
+    """Generate (and flush) benchmark data at a configurable scale."""
+
+    def __init__(
+        self,
+        organizations: int = 1,
+        clubs_per_organization: int = 2,
+        courts_per_club: int = 6,
+        players_per_club: int = 100,
+        reservation_days: int = 365,
+        occupancy: float = 0.5,
+        tournaments_per_club: int = 2,
+        teams_per_tournament: int = 16,
+        leagues_per_club: int = 1,
+        teams_per_league: int = 8,
+        notifications_per_club: int = 200,
+        seed: int = 42,
+        today: Optional[date] = None,
+    ):
+        self.organizations = organizations
+        self.clubs_per_organization = clubs_per_organization
+        self.courts_per_club = courts_per_club
+        self.players_per_club = players_per_club
+        self.reservation_days = reservation_days
+        self.occupancy = occupancy
+        self.tournaments_per_club = tournaments_per_club
+        self.teams_per_tournament = teams_per_tournament
+        self.leagues_per_club = leagues_per_club
+        self.teams_per_league = teams_per_league
+        self.notifications_per_club = notifications_per_club
+        self.seed = seed
+        self.today = today or timezone.localdate()
+        self.random = random.Random(seed)
+        self.batch_size = get_batch_size()
+        self.counts: Dict[str, int] = {}
+
+    def _bulk_create(self, model, objects: List) -> List:
+        objects = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        key = model._meta.label
+        self.counts[key] = self.counts.get(key, 0) + len(objects)
+        return objects
+
+    def _tag(self, *parts) -> str:
+        return "-".join(str(part) for part in (self.seed, *parts))
+
+    # Stages
+
+    def _create_organizations(self):
+        from apps.root.models import Organization
+
+        return self._bulk_create(
+            Organization,
+            [
+                Organization(
+                    business_name=f"Benchmark Org {index} SA de CV",
+                    trade_name=f"Benchmark Org {index}",
+                    rfc=f"{BENCHMARK_RFC_PREFIX}{self.seed % 10000:04d}{index:05d}",
+                    legal_representative="Benchmark",
+                    primary_email=f"org{index}@benchmark.local",
+                    primary_phone="+525500000000",
+                )
+                for index in range(self.organizations)
+            ],
+        )
+
+    def _create_clubs(self, organizations):
+        from apps.clubs.models import Club
+
+        return self._bulk_create(
+            Club,
+            [
+                Club(
+                    organization=organization,
+                    name=f"Benchmark Club {org_index}-{index}",
+                    slug=f"{BENCHMARK_SLUG_PREFIX}{self._tag(org_index, index)}",
+                    email=f"club{org_index}-{index}@benchmark.local",
+                    phone="+525500000000",
+                    opening_time=time(FIRST_SLOT_HOUR),
+                    closing_time=time(LAST_SLOT_HOUR),
+                    total_courts=self.courts_per_club,
+                )
+                for org_index, organization in enumerate(organizations)
+                for index in range(self.clubs_per_organization)
+            ],
+        )
+
+    def _create_courts(self, clubs):
+        from apps.clubs.models import Court
+
+        return self._bulk_create(
+            Court,
+            [
+                Court(
+                    club=club,
+                    organization_id=club.organization_id,
+                    name=f"Cancha {number}",
+                    number=number,
+                    price_per_hour=Decimal(self.random.choice([300, 350, 400, 450])),
+                )
+                for club in clubs
+                for number in range(1, self.courts_per_club + 1)
+            ],
+        )
+
+    def _create_players(self, clubs):
+        from apps.clients.models import ClientProfile
+
+        User = get_user_model()
+        password = make_password(None)
+        users = self._bulk_create(
+            User,
+            [
+                User(
+                    username=f"{BENCHMARK_USER_PREFIX}{self._tag(club_index, index)}",
+                    email=f"player{self._tag(club_index, index)}@benchmark.local",
+                    password=password,
+                    first_name="Jugador",
+                    last_name=f"{club_index}-{index}",
+                )
+                for club_index in range(len(clubs))
+                for index in range(self.players_per_club)
+            ],
+        )
+        profiles = self._bulk_create(
+            ClientProfile,
+            [
+                ClientProfile(
+                    organization_id=club.organization_id,
+                    club=club,
+                    user=user,
+                )
+                for club_index, club in enumerate(clubs)
+                for user in users[
+                    club_index * self.players_per_club : (club_index + 1)
+                    * self.players_per_club
+                ]
+            ],
+        )
+        players = {}
+        for profile in profiles:
+            players.setdefault(profile.club_id, []).append(profile)
+        return players
+
+    def _reservation_rows(self, court, players):
+        """Reservations of one court for every day of the window."""
+        from apps.reservations.models import Reservation
+
+        start = self.today - timedelta(days=self.reservation_days - 30)
+        for offset in range(self.reservation_days):
+            day = start + timedelta(days=offset)
+            weekend = day.weekday() >= 5
+            for hour in range(FIRST_SLOT_HOUR, LAST_SLOT_HOUR):
+                busy = self.occupancy * (1.4 if weekend or hour in PEAK_HOURS else 0.8)
+                if self.random.random() >= busy:
+                    continue
+                player = self.random.choice(players)
+                past = day < self.today
+                cancelled = self.random.random() < 0.08
+                if cancelled:
+                    status = "cancelled"
+                else:
+                    status = "completed" if past else "confirmed"
+                yield Reservation(
+                    organization_id=court.organization_id,
+                    club_id=court.club_id,
+                    court=court,
+                    client_profile=player,
+                    date=day,
+                    start_time=time(hour),
+                    end_time=time(hour + 1),
+                    duration_minutes=60,
+                    player_name=f"{player.user.first_name} {player.user.last_name}",
+                    player_email=player.user.email,
+                    price_per_hour=court.price_per_hour,
+                    total_price=court.price_per_hour,
+                    status=status,
+                    payment_status="paid" if past and not cancelled else "pending",
+                )
+
+    def _create_reservations(self, courts, players):
+        from apps.reservations.models import Reservation
+
+        reservations = []
+        for court in courts:
+            reservations.extend(
+                self._reservation_rows(court, players[court.club_id])
+            )
+        return self._bulk_create(Reservation, reservations)
+
+    def _create_payments(self, reservations):
+        from apps.finance.models import Payment, Revenue
+
+        paid = [r for r in reservations if r.payment_status == "paid"]
+        payments = self._bulk_create(
+            Payment,
+            [
+                Payment(
+                    organization_id=reservation.organization_id,
+                    club_id=reservation.club_id,
+                    client=reservation.client_profile,
+                    reservation=reservation,
+                    amount=reservation.total_price,
+                    payment_type="reservation",
+                    payment_method=self.random.choice(PAYMENT_METHODS),
+                    status="completed",
+                )
+                for reservation in paid
+            ],
+        )
+        self._bulk_create(
+            Revenue,
+            [
+                Revenue(
+                    organization_id=payment.organization_id,
+                    club_id=payment.club_id,
+                    date=reservation.date,
+                    concept="reservation",
+                    description=f"Reserva {reservation.date}",
+                    amount=payment.amount,
+                    payment_method=payment.payment_method,
+                    payment=payment,
+                    reference=str(payment.id),
+                )
+                for payment, reservation in zip(payments, paid)
+            ],
+        )
+        return payments
+
+    def _teams(self, players, count):
+        """``count`` distinct pairs of players, disjoint while players last."""
+        pool = list(players)
+        self.random.shuffle(pool)
+        pairs = list(zip(pool[0::2], pool[1::2]))
+        if count > len(pairs):
+            used = set(pairs)
+            extra = (pair for pair in combinations(pool, 2) if pair not in used)
+            pairs.extend(islice(extra, count - len(pairs)))
+        return pairs[:count]
+
+    def _create_tournaments(self, clubs, players, organizer):
+        from apps.tournaments.models import (
+            Tournament,
+            TournamentCategory,
+            TournamentRegistration,
+        )
+
+        category, _ = TournamentCategory.objects.get_or_create(
+            name="Benchmark Open", defaults={"category_type": "open"}
+        )
+        starts = self.today + timedelta(days=14)
+        tournaments = self._bulk_create(
+            Tournament,
+            [
+                Tournament(
+                    organization_id=club.organization_id,
+                    club=club,
+                    name=f"Torneo {club.name} {index}",
+                    description="Torneo generado para benchmarks",
+                    slug=f"{club.slug}-torneo-{index}",
+                    format="elimination",
+                    category=category,
+                    start_date=starts,
+                    end_date=starts + timedelta(days=2),
+                    registration_start=timezone.now() - timedelta(days=30),
+                    registration_end=timezone.now() + timedelta(days=7),
+                    max_teams=self.teams_per_tournament,
+                    confirmed_teams=self.teams_per_tournament,
+                    organizer=organizer,
+                    contact_email=club.email,
+                )
+                for club in clubs
+                for index in range(self.tournaments_per_club)
+            ],
+        )
+        by_club = {club.id: players[club.id] for club in clubs}
+        self._bulk_create(
+            TournamentRegistration,
+            [
+                TournamentRegistration(
+                    tournament=tournament,
+                    team_name=f"Equipo {index + 1}",
+                    player1=player1,
+                    player2=player2,
+                    contact_phone="+525500000000",
+                    contact_email=player1.user.email,
+                    status="confirmed",
+                )
+                for tournament in tournaments
+                for index, (player1, player2) in enumerate(
+                    self._teams(by_club[tournament.club_id], self.teams_per_tournament)
+                )
+            ],
+        )
+        return tournaments
+
+    def _create_leagues(self, clubs, players, organizer):
+        from apps.leagues.models import League, LeagueSeason, LeagueStanding, LeagueTeam
+
+        leagues = self._bulk_create(
+            League,
+            [
+                League(
+                    organization_id=club.organization_id,
+                    club=club,
+                    name=f"Liga {club.name} {index}",
+                    description="Liga generada para benchmarks",
+                    slug=f"{club.slug}-liga-{index}",
+                    organizer=organizer,
+                    contact_email=club.email,
+                )
+                for club in clubs
+                for index in range(self.leagues_per_club)
+            ],
+        )
+        seasons = self._bulk_create(
+            LeagueSeason,
+            [
+                LeagueSeason(
+                    league=league,
+                    name=f"Temporada {self.today.year}",
+                    start_date=self.today - timedelta(days=60),
+                    end_date=self.today + timedelta(days=120),
+                    registration_start=timezone.now() - timedelta(days=90),
+                    registration_end=timezone.now() - timedelta(days=61),
+                )
+                for league in leagues
+            ],
+        )
+        club_of = {league.id: league.club_id for league in leagues}
+        teams = self._bulk_create(
+            LeagueTeam,
+            [
+                LeagueTeam(
+                    season=season,
+                    team_name=f"Equipo {index + 1}",
+                    player1=player1,
+                    player2=player2,
+                    contact_phone="+525500000000",
+                    contact_email=player1.user.email,
+                )
+                for season in seasons
+                for index, (player1, player2) in enumerate(
+                    self._teams(players[club_of[season.league_id]], self.teams_per_league)
+                )
+            ],
+        )
+        standings = []
+        for team in teams:
+            won = self.random.randint(0, 10)
+            lost = self.random.randint(0, 10)
+            sets_won = won * 2 + self.random.randint(0, lost)
+            sets_lost = lost * 2 + self.random.randint(0, won)
+            standings.append(
+                LeagueStanding(
+                    season=team.season,
+                    team=team,
+                    matches_played=won + lost,
+                    matches_won=won,
+                    matches_lost=lost,
+                    sets_won=sets_won,
+                    sets_lost=sets_lost,
+                    sets_difference=sets_won - sets_lost,
+                    points=won * 3,
+                )
+            )
+        self._bulk_create(LeagueStanding, standings)
+        return seasons
+
+    def _create_notifications(self, clubs, players):
+        from apps.notifications.models import (
+            Notification,
+            NotificationChannel,
+            NotificationDelivery,
+            NotificationType,
+        )
+
+        notification_type, _ = NotificationType.objects.get_or_create(
+            slug="benchmark", defaults={"name": "Benchmark"}
+        )
+        channel, _ = NotificationChannel.objects.get_or_create(
+            slug="benchmark-in-app",
+            defaults={"name": "Benchmark in-app", "channel_type": "in_app"},
+        )
+        notifications = self._bulk_create(
+            Notification,
+            [
+                Notification(
+                    organization_id=club.organization_id,
+                    club=club,
+                    notification_type=notification_type,
+                    recipient=player.user,
+                    title="Recordatorio de reserva",
+                    message=f"Tu reserva en {club.name} es mañana.",
+                )
+                for club in clubs
+                for player in (
+                    players[club.id][index % len(players[club.id])]
+                    for index in range(self.notifications_per_club)
+                )
+            ],
+        )
+        self._bulk_create(
+            NotificationDelivery,
+            [
+                NotificationDelivery(notification=notification, channel=channel)
+                for notification in notifications
+            ],
+        )
+
+    @transaction.atomic
+    def generate(self) -> Dict[str, int]:
+        """Write the whole dataset; returns rows created per model label."""
+        from apps.bi.facts import FactBuilder
+
+        User = get_user_model()
+        organizations = self._create_organizations()
+        clubs = self._create_clubs(organizations)
+        courts = self._create_courts(clubs)
+        players = self._create_players(clubs)
+        logger.info(f"Generating reservations for {len(courts)} courts")
+        reservations = self._create_reservations(courts, players)
+        self._create_payments(reservations)
+
+        organizer = self._bulk_create(
+            User,
+            [
+                User(
+                    username=f"{BENCHMARK_USER_PREFIX}{self._tag('organizer')}",
+                    email=f"organizer{self.seed}@benchmark.local",
+                    password=make_password(None),
+                    is_staff=True,
+                )
+            ],
+        )[0]
+        self._create_tournaments(clubs, players, organizer)
+        self._create_leagues(clubs, players, organizer)
+        self._create_notifications(clubs, players)
+
+        written = FactBuilder.reconcile(
+            days=self.reservation_days, club_ids=[club.id for club in clubs]
+        )
+        self.counts["bi.facts"] = written["daily"] + written["hourly"]
+        return self.counts
+
+    @staticmethod
+    @transaction.atomic
+    def flush() -> int:
+        """Delete every generated organization and user; returns organizations removed."""
+        from apps.root.models import Organization
+
+        organizations = Organization.objects.filter(rfc__startswith=BENCHMARK_RFC_PREFIX)
+        count = organizations.count()
+        organizations.delete()
+        get_user_model().objects.filter(
+            username__startswith=BENCHMARK_USER_PREFIX
+        ).delete()
+        return count
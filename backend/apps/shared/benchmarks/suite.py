@@ -0,0 +1,341 @@
+"""
+In-process micro-benchmarks for the hot paths.
+
+Each benchmark is a function registered with ``@benchmark`` that takes a
+``BenchmarkContext`` (the generated club, its courts, a tournament, a league
+season, pending notification deliveries...) and exercises one service the
+way a request or task would. ``run_benchmarks`` times every benchmark over a
+number of repeats after a warm-up run and records the wall time (median,
+p95, min, max) and the number of queries of the first measured run.
+
+The whole run happens inside one transaction that is rolled back at the
+end, and every repeat inside a savepoint that is rolled back too, so
+benchmarks that write (bracket generation, notification delivery) start
+from the same data each time and leave the database untouched.
+
+Results are plain JSON (with the commit they were measured on) so two runs
+can be diffed with ``compare_results``.
+
+Usage:
+    results = run_benchmarks(["availability", "standings"], repeat=10)
+    regressions = compare_results(baseline, results)
+"""
+
+import logging
+import math
+import statistics
+import subprocess
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .dataset import BENCHMARK_SLUG_PREFIX
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS: "OrderedDict[str, Callable]" = OrderedDict()
+
+
+class BenchmarkError(Exception):
+    """The database holds no generated dataset to benchmark against."""
+
+
+def benchmark(name: str):
+    """Register a benchmark function under ``name``."""
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+class BenchmarkContext:
+    """Inputs shared by the benchmarks, loaded once per run."""
+
+    def __init__(self, club=None, today=None):
+        from apps.clubs.models import Club
+
+        if club is None:
+            club = (
+                Club.objects.filter(slug__startswith=BENCHMARK_SLUG_PREFIX)
+                .order_by("slug")
+                .first()
+            )
+        if club is None:
+            raise BenchmarkError(
+                "No benchmark data found, run generate_benchmark_data first"
+            )
+        self.club = club
+        self.today = today or timezone.localdate()
+
+    @cached_property
+    def courts(self) -> List:
+        return list(self.club.courts.filter(is_active=True).order_by("number"))
+
+    @cached_property
+    def tournament(self):
+        from apps.tournaments.models import Tournament
+
+        return (
+            Tournament.objects.select_related("category")
+            .filter(club=self.club)
+            .order_by("slug")
+            .first()
+        )
+
+    @cached_property
+    def season(self):
+        from apps.leagues.models import LeagueSeason
+
+        return (
+            LeagueSeason.objects.select_related("league")
+            .filter(league__club=self.club)
+            .order_by("league__slug")
+            .first()
+        )
+
+    @cached_property
+    def channel(self):
+        from apps.notifications.models import NotificationChannel
+
+        return NotificationChannel.objects.get(slug="benchmark-in-app")
+
+    @cached_property
+    def delivery_ids(self) -> List[str]:
+        from apps.notifications.models import NotificationDelivery
+
+        return [
+            str(delivery_id)
+            for delivery_id in NotificationDelivery.objects.filter(
+                channel=self.channel, notification__club=self.club, status="pending"
+            ).values_list("id", flat=True)
+        ]
+
+    @cached_property
+    def metrics(self) -> List:
+        from apps.bi.models import Metric
+
+        # Unsaved: the calculator only reads their scope and type
+        return [
+            Metric(
+                organization_id=self.club.organization_id,
+                club=self.club,
+                name=metric_type,
+                metric_type=metric_type,
+                calculation_type="sum",
+            )
+            for metric_type in ("revenue", "occupancy", "customers", "financial")
+        ]
+
+
+# Benchmarks
+
+
+@benchmark("availability")
+def availability(context):
+    from apps.reservations.services import ReservationService
+
+    ReservationService.check_availability(
+        context.club, context.today + timedelta(days=1)
+    )
+
+
+@benchmark("pricing")
+def pricing(context):
+    from apps.clubs.read_models import CourtReadModel
+
+    read_model = CourtReadModel(context.courts)
+    for court in context.courts:
+        read_model.current_price(court)
+
+
+@benchmark("occupancy")
+def occupancy(context):
+    from apps.clubs.occupancy import OccupancyEngine
+
+    OccupancyEngine(context.club).compute(
+        context.today - timedelta(days=30), context.today
+    )
+
+
+@benchmark("standings")
+def standings(context):
+    from apps.leagues.services import LeagueStandingsService
+
+    for standing in LeagueStandingsService(context.season).get_standings_table():
+        standing.team.team_name
+
+
+@benchmark("bracket_generation")
+def bracket_generation(context):
+    from apps.tournaments.bracket_generator import BracketGenerator
+
+    BracketGenerator(context.tournament).generate()
+
+
+@benchmark("fixture_scheduling")
+def fixture_scheduling(context):
+    from apps.leagues.services import LeagueFixtureGenerator
+
+    LeagueFixtureGenerator(context.season).generate(dry_run=True)
+
+
+@benchmark("bi_kpis")
+def bi_kpis(context):
+    from apps.bi.services import MetricsCalculator
+
+    for metric in context.metrics:
+        MetricsCalculator(metric).calculate()
+
+
+@benchmark("notification_fanout")
+def notification_fanout(context):
+    from apps.notifications.delivery import DeliveryWorker
+
+    DeliveryWorker(context.channel).run(context.delivery_ids)
+
+
+@benchmark("finance_monthly_report")
+def finance_monthly_report(context):
+    from apps.finance.reports import RevenueReportService
+
+    last_month = context.today.replace(day=1) - timedelta(days=1)
+    RevenueReportService.monthly_report(last_month.year, last_month.month, context.club)
+
+
+@benchmark("finance_utilization_report")
+def finance_utilization_report(context):
+    from apps.finance.reports import RevenueReportService
+
+    RevenueReportService.court_utilization_report(
+        context.today - timedelta(days=30), context.today, context.club
+    )
+
+
+# Runner
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile, stable for the handful of runs measured."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _measure(func: Callable, context) -> Dict:
+    savepoint = transaction.savepoint()
+    try:
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            func(context)
+            elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        transaction.savepoint_rollback(savepoint)
+    return {"ms": elapsed, "queries": len(captured)}
+
+
+def run_benchmark(name: str, context, repeat: int = 5, warmup: int = 1) -> Dict:
+    """Time one benchmark; failures are reported instead of raised."""
+    func = BENCHMARKS[name]
+    try:
+        for _ in range(warmup):
+            _measure(func, context)
+        runs = [_measure(func, context) for _ in range(repeat)]
+    except Exception as e:
+        logger.warning(f"Benchmark {name} failed: {str(e)}")
+        return {"error": f"{type(e).__name__}: {str(e)}"}
+
+    timings = [run["ms"] for run in runs]
+    return {
+        "runs": repeat,
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "queries": runs[0]["queries"],
+    }
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=str(settings.BASE_DIR),
+                capture_output=True,
+                text=True,
+                timeout=5,
+                check=True,
+            ).stdout.strip()
+            or None
+        )
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    context: Optional[BenchmarkContext] = None,
+) -> Dict:
+    """Run the selected (default: all) benchmarks; returns the JSON report."""
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise BenchmarkError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = {}
+    with transaction.atomic():
+        context = context or BenchmarkContext()
+        for name in names:
+            results[name] = run_benchmark(name, context, repeat=repeat, warmup=warmup)
+        transaction.set_rollback(True)
+
+    return {
+        "commit": get_commit(),
+        "created_at": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "club": context.club.slug,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Per benchmark present in both reports: median change and query delta.
+    ``regression`` is set when the median grew by more than ``threshold``
+    or any query was added.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+        change = (
+            (result["median_ms"] - before["median_ms"]) / before["median_ms"]
+            if before["median_ms"]
+            else 0.0
+        )
+        query_delta = result["queries"] - before["queries"]
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": before["median_ms"],
+                "current_ms": result["median_ms"],
+                "change": round(change, 4),
+                "baseline_queries": before["queries"],
+                "current_queries": result["queries"],
+                "regression": change > threshold or query_delta > 0,
+            }
+        )
+    return rows
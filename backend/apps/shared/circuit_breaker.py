@@ -0,0 +1,584 @@
+"""
+Shared circuit breaker registry.
+
+Breaker state lives in process memory so protecting a call costs an
+attribute read and a ``perf_counter`` pair instead of cache round-trips.
+Failures and state transitions are queued and pushed to the Django cache
+(Redis) in batches by a background flusher, which also pulls state back so
+a breaker tripped in one worker opens in the others on the next sync.
+
+Usage:
+    breaker = circuit_breaker_registry.get_or_create(
+        "stripe", namespace="finance", failure_threshold=3
+    )
+    result = breaker.call(charge_card, payment)
+
+    @breaker
+    def charge_card(payment): ...
+
+    with breaker.protect():
+        charge_card(payment)
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("shared.circuit_breaker")
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is +Inf.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Pending sync events kept while the cache is unreachable.
+MAX_PENDING_EVENTS = 10000
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreakerError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    pass
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float):
+        index = bisect.bisect_left(self.buckets, value_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value_ms
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts, Prometheus style."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+            count = self._count
+
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+
+        return {
+            "buckets": cumulative,
+            "sum_ms": round(total, 3),
+            "count": count,
+            "avg_ms": round(total / count, 3) if count else None,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+
+class CircuitBreaker:
+    """
+    In-process circuit breaker.
+
+    ``allow_request`` is lock-free while the circuit is closed; the lock is
+    only taken on failures and state transitions. Subclasses customise how
+    rejected calls and failures surface through ``error_class``,
+    ``_handle_blocked`` and ``fallback_on_failure``.
+    """
+
+    error_class = CircuitBreakerError
+    fallback_on_failure = False
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,  # seconds
+        success_threshold: int = 1,
+        expected_exception: Union[type, Tuple[type, ...]] = Exception,
+        fallback_function: Optional[Callable] = None,
+        slow_call_threshold: Optional[float] = None,  # seconds
+        namespace: str = "default",
+    ):
+        self.name = name
+        self.namespace = namespace
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.success_threshold = success_threshold
+        self.expected_exception = expected_exception
+        self.fallback_function = fallback_function
+        self.slow_call_threshold = slow_call_threshold
+
+        self.registry: Optional["CircuitBreakerRegistry"] = None
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failure_count = 0
+        self._half_open_successes = 0
+        self._opened_at: Optional[float] = None
+        self._last_failure_time: Optional[float] = None
+        self._total_failures = 0
+        self._rejected_calls = 0
+        self._cluster_failures = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.namespace}.{self.name}"
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @state.setter
+    def state(self, value: CircuitState):
+        """Manual override, e.g. from an admin action or a test."""
+        value = CircuitState(value.value if isinstance(value, Enum) else value)
+        with self._lock:
+            if value is CircuitState.OPEN:
+                self._open(self._last_failure_time or time.time())
+            elif value is CircuitState.CLOSED:
+                self._close()
+            else:
+                self._state = value
+                self._half_open_successes = 0
+
+    @property
+    def failure_count(self) -> int:
+        return self._failure_count
+
+    @failure_count.setter
+    def failure_count(self, value: int):
+        self._failure_count = value
+
+    @property
+    def half_open_successes(self) -> int:
+        return self._half_open_successes
+
+    @property
+    def last_failure_time(self) -> Optional[float]:
+        return self._last_failure_time
+
+    @last_failure_time.setter
+    def last_failure_time(self, value: Optional[float]):
+        self._last_failure_time = value
+        if self._state is CircuitState.OPEN and value is not None:
+            self._opened_at = value
+
+    # Decorator / call interfaces
+
+    def __call__(self, func: Callable) -> Callable:
+        """Decorator interface for circuit breaker."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Execute ``func`` with circuit breaker protection.
+
+        Only ``expected_exception`` counts as a failure; anything else is
+        re-raised without touching the breaker state.
+        """
+        if not self.allow_request():
+            return self._handle_blocked(func, args, kwargs)
+
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception as e:
+            self.record_failure(e, (time.perf_counter() - start) * 1000)
+            if self.fallback_on_failure and self.fallback_function:
+                logger.info(f"Circuit breaker {self.key} using fallback after failure")
+                return self.fallback_function(*args, **kwargs)
+            raise
+        except Exception:
+            self.latency.observe((time.perf_counter() - start) * 1000)
+            raise
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.slow_call_threshold and elapsed_ms > self.slow_call_threshold * 1000:
+            self.record_failure(None, elapsed_ms)
+            return self._handle_slow_call(result, elapsed_ms)
+
+        self.record_success(elapsed_ms)
+        return result
+
+    @contextmanager
+    def protect(self):
+        """Context manager interface; raises ``error_class`` when open."""
+        if not self.allow_request():
+            raise self.open_error()
+
+        start = time.perf_counter()
+        try:
+            yield self
+        except self.expected_exception as e:
+            self.record_failure(e, (time.perf_counter() - start) * 1000)
+            raise
+        except Exception:
+            self.latency.observe((time.perf_counter() - start) * 1000)
+            raise
+        else:
+            self.record_success((time.perf_counter() - start) * 1000)
+
+    def open_error(self) -> Exception:
+        return self.error_class(
+            f"Circuit breaker {self.name} is OPEN. Service is temporarily unavailable."
+        )
+
+    def _handle_blocked(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Handle a call rejected by the open circuit."""
+        if self.fallback_function:
+            return self.fallback_function(*args, **kwargs)
+        raise self.open_error()
+
+    def _handle_slow_call(self, result: Any, elapsed_ms: float) -> Any:
+        """Handle a call that succeeded but exceeded ``slow_call_threshold``."""
+        return result
+
+    # State machine
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through; lock-free when closed."""
+        state = self._state
+        if state is CircuitState.CLOSED or state is CircuitState.HALF_OPEN:
+            return True
+
+        opened_at = self._opened_at or 0
+        if time.time() - opened_at >= self.recovery_timeout:
+            with self._lock:
+                if self._state is CircuitState.OPEN:
+                    self._state = CircuitState.HALF_OPEN
+                    self._half_open_successes = 0
+                    logger.info(f"Circuit breaker {self.key} transitioning to HALF_OPEN")
+            return True
+
+        self._rejected_calls += 1
+        return False
+
+    def record_success(self, latency_ms: Optional[float] = None):
+        """Record a successful call."""
+        if latency_ms is not None:
+            self.latency.observe(latency_ms)
+
+        # Fast path: nothing to reset
+        if self._state is CircuitState.CLOSED and self._failure_count == 0:
+            return
+
+        closed = False
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.success_threshold:
+                    self._close()
+                    closed = True
+            elif self._state is CircuitState.CLOSED:
+                self._failure_count = 0
+
+        if closed:
+            logger.info(f"Circuit breaker {self.key} recovered - CLOSED")
+            self._publish("close")
+
+    def record_failure(
+        self, exception: Optional[BaseException] = None, latency_ms: Optional[float] = None
+    ):
+        """Record a failed call and open the circuit if needed."""
+        if latency_ms is not None:
+            self.latency.observe(latency_ms)
+
+        opened = False
+        with self._lock:
+            self._failure_count += 1
+            self._total_failures += 1
+            self._last_failure_time = time.time()
+            if self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED
+                and self._failure_count >= self.failure_threshold
+            ):
+                self._open(self._last_failure_time)
+                opened = True
+            failure_count = self._failure_count
+
+        self._publish("failure")
+        if opened:
+            logger.error(
+                f"Circuit breaker {self.key} OPENED after {failure_count} failures. "
+                f"Last error: {exception}"
+            )
+            self._publish("open")
+        else:
+            logger.warning(
+                f"Circuit breaker {self.key} failure "
+                f"{failure_count}/{self.failure_threshold}: {exception}"
+            )
+
+    def trip(self):
+        """Force the circuit open."""
+        with self._lock:
+            self._open(time.time())
+        self._publish("open")
+
+    def reset(self):
+        """Manually reset circuit breaker to closed state."""
+        with self._lock:
+            self._close()
+            self._last_failure_time = None
+            self._total_failures = 0
+            self._rejected_calls = 0
+        self.latency.reset()
+        self._publish("close")
+        logger.info(f"Circuit breaker {self.key} manually reset")
+
+    def _open(self, opened_at: float):
+        self._state = CircuitState.OPEN
+        self._opened_at = opened_at
+        self._half_open_successes = 0
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._opened_at = None
+        self._failure_count = 0
+        self._half_open_successes = 0
+
+    def _apply_remote_open(self, open_until: float):
+        """Open locally because another process tripped this breaker."""
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                self._open(open_until - self.recovery_timeout)
+                logger.warning(f"Circuit breaker {self.key} OPEN (tripped by another worker)")
+
+    def _publish(self, event: str):
+        if self.registry is not None:
+            self.registry.enqueue(self, event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics."""
+        now = time.time()
+        latency = self.latency.snapshot()
+        total_calls = latency["count"]
+        return {
+            "name": self.name,
+            "namespace": self.namespace,
+            "state": self._state.value,
+            "failure_count": self._failure_count,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "last_failure_time": self._last_failure_time,
+            "time_since_last_failure": (
+                now - self._last_failure_time if self._last_failure_time else None
+            ),
+            "total_calls": total_calls,
+            "total_failures": self._total_failures,
+            "rejected_calls": self._rejected_calls,
+            "failure_rate": self._total_failures / total_calls if total_calls else 0,
+            "cluster_failures": self._cluster_failures,
+            "latency": latency,
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide registry of circuit breakers with batched cache sync.
+
+    Breakers enqueue failure and transition events on a bounded deque; a
+    daemon thread started on the first event flushes them every
+    ``CIRCUIT_BREAKER_SYNC_INTERVAL`` seconds. With ``background=False``
+    the caller drives ``flush()`` itself.
+    """
+
+    def __init__(self, key_prefix: str = "cb", background: bool = True):
+        self.key_prefix = key_prefix
+        self.background = background
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._events: deque = deque(maxlen=MAX_PENDING_EVENTS)
+        self._flusher: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    @property
+    def sync_enabled(self) -> bool:
+        return getattr(settings, "CIRCUIT_BREAKER_SYNC_ENABLED", True)
+
+    @property
+    def sync_interval(self) -> float:
+        return getattr(settings, "CIRCUIT_BREAKER_SYNC_INTERVAL", 5.0)
+
+    def get_or_create(
+        self,
+        name: str,
+        namespace: str = "default",
+        breaker_class: type = CircuitBreaker,
+        **options,
+    ) -> CircuitBreaker:
+        """
+        Return the registered breaker for ``namespace.name``, creating it
+        with ``breaker_class(name=name, namespace=namespace, **options)`` if needed.
+        """
+        key = f"{namespace}.{name}"
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            return breaker
+
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = breaker_class(name=name, namespace=namespace, **options)
+                breaker.registry = self
+                self._breakers[key] = breaker
+        return breaker
+
+    def get(self, name: str, namespace: str = "default") -> Optional[CircuitBreaker]:
+        return self._breakers.get(f"{namespace}.{name}")
+
+    def all(self, namespace: Optional[str] = None) -> List[CircuitBreaker]:
+        breakers = list(self._breakers.values())
+        if namespace is not None:
+            breakers = [b for b in breakers if b.namespace == namespace]
+        return breakers
+
+    def get_all_stats(self, namespace: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        return {breaker.key: breaker.get_stats() for breaker in self.all(namespace)}
+
+    def reset_all(self, namespace: Optional[str] = None):
+        for breaker in self.all(namespace):
+            breaker.reset()
+
+    # Cache sync
+
+    def _cache_key(self, breaker_key: str, field: str) -> str:
+        return f"{self.key_prefix}:{breaker_key}:{field}"
+
+    def enqueue(self, breaker: CircuitBreaker, event: str):
+        """Queue a sync event; O(1), never touches the network."""
+        if not self.sync_enabled:
+            return
+        self._events.append((breaker.key, event))
+        if self.background and self._flusher is None:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="circuit-breaker-sync", daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._wakeup.wait(self.sync_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"Circuit breaker sync failed: {e}")
+
+    def flush(self) -> int:
+        """
+        Push queued events to the cache and pull remote state back.
+
+        Returns:
+            Number of events flushed
+        """
+        failures: Dict[str, int] = {}
+        transitions: Dict[str, str] = {}
+        flushed = 0
+        while True:
+            try:
+                key, event = self._events.popleft()
+            except IndexError:
+                break
+            flushed += 1
+            if event == "failure":
+                failures[key] = failures.get(key, 0) + 1
+            else:
+                transitions[key] = event
+
+        now = time.time()
+        for key, count in failures.items():
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                continue
+            cache_key = self._cache_key(key, "failures")
+            cache.add(cache_key, 0, timeout=max(breaker.recovery_timeout, 1))
+            try:
+                cache.incr(cache_key, count)
+            except ValueError:
+                cache.set(cache_key, count, timeout=max(breaker.recovery_timeout, 1))
+
+        closed = []
+        for key, event in transitions.items():
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                continue
+            cache_key = self._cache_key(key, "open_until")
+            if event == "open":
+                cache.set(
+                    cache_key,
+                    now + breaker.recovery_timeout,
+                    timeout=max(breaker.recovery_timeout, 1),
+                )
+            else:
+                closed.append(cache_key)
+        if closed:
+            cache.delete_many(closed)
+
+        self._pull_remote_state(now)
+        return flushed
+
+    def _pull_remote_state(self, now: float):
+        breakers = list(self._breakers.values())
+        if not breakers:
+            return
+        keys = []
+        for breaker in breakers:
+            keys.append(self._cache_key(breaker.key, "failures"))
+            keys.append(self._cache_key(breaker.key, "open_until"))
+        remote = cache.get_many(keys)
+
+        for breaker in breakers:
+            breaker._cluster_failures = remote.get(
+                self._cache_key(breaker.key, "failures"), 0
+            )
+            open_until = remote.get(self._cache_key(breaker.key, "open_until"))
+            if open_until and open_until > now:
+                breaker._apply_remote_open(open_until)
+
+
+# Global registry
+circuit_breaker_registry = CircuitBreakerRegistry()
+
+
+def get_circuit_breaker(name: str, namespace: str = "default", **options) -> CircuitBreaker:
+    """Convenience wrapper around ``circuit_breaker_registry.get_or_create``."""
+    return circuit_breaker_registry.get_or_create(name, namespace=namespace, **options)
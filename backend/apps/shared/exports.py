@@ -0,0 +1,346 @@
+"""
+Streaming tabular exports (CSV, XLSX, JSON).
+
+An ``Export`` pairs a queryset with its columns. Rows are read through a
+server-side cursor (``values_list(...).iterator(chunk_size=...)``) and
+encoded batch by batch by generator writers, so memory stays flat however
+many rows are exported and the header goes out before the first row is
+fetched.
+
+Exports estimated above ``EXPORT_STREAM_MAX_ROWS`` rows (or requested with
+``background``) are written to storage by the ``run_export`` task instead,
+which notifies the requester once the file is ready. Querysets cannot be
+queued, so exports are rebuilt in the worker from ``(name, params)``
+through the builders registered with ``@register_export``.
+
+Usage:
+    @register_export("finance.revenues")
+    def revenues_export(organization_id, start_date=None, ...):
+        return Export("revenues", Revenue.objects.filter(...), [("Fecha", "date"), ...])
+
+    return export_response(request, "finance.revenues", params, "csv")
+"""
+
+import csv
+import json
+import logging
+import re
+import tempfile
+import uuid
+import zipfile
+from datetime import date, datetime, time
+from decimal import Decimal
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+logger = logging.getLogger("shared.exports")
+
+CSV = "csv"
+XLSX = "excel"
+JSON = "json"
+
+CONTENT_TYPES = {
+    CSV: "text/csv; charset=utf-8",
+    XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    JSON: "application/json",
+}
+EXTENSIONS = {CSV: "csv", XLSX: "xlsx", JSON: "json"}
+
+# Rows encoded per yielded chunk
+WRITE_BATCH_ROWS = 500
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_EXPORTS: Dict[str, Callable[..., "Export"]] = {}
+
+
+def register_export(name: str):
+    """Register an export builder under ``"<app>.<dataset>"``."""
+
+    def decorator(builder):
+        _EXPORTS[name] = builder
+        return builder
+
+    return decorator
+
+
+def build_export(name: str, **params) -> "Export":
+    """
+    Build a registered export. Builders live in ``apps.<app>.exports`` and
+    are imported on first use, so workers need no import side effects.
+    """
+    if name not in _EXPORTS:
+        app = name.split(".", 1)[0]
+        try:
+            import_module(f"apps.{app}.exports")
+        except ImportError:
+            pass
+    try:
+        builder = _EXPORTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export '{name}'")
+    return builder(**params)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _batched(rows: Iterable[Sequence[Any]], size: int = WRITE_BATCH_ROWS) -> Iterator[List[Sequence[Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Echo:
+    """File-like object handing ``csv.writer`` output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Encode rows as UTF-8 CSV. A BOM leads the header so Excel detects the
+    encoding of accented names.
+    """
+    writer = csv.writer(_Echo())
+    yield ("\ufeff" + writer.writerow(headers)).encode("utf-8")
+    for batch in _batched(rows):
+        yield "".join(
+            writer.writerow([_text(value) for value in row]) for row in batch
+        ).encode("utf-8")
+
+
+def iter_json(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """Encode rows as a JSON array of objects keyed by header."""
+    yield b"["
+    first = True
+    for batch in _batched(rows):
+        parts = []
+        for row in batch:
+            item = json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder)
+            parts.append(item if first else "," + item)
+            first = False
+        yield "".join(parts).encode("utf-8")
+    yield b"]"
+
+
+class _ZipSink:
+    """Unseekable write target; ``zipfile`` then streams with data descriptors."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def _xlsx_cell(value: Any) -> str:
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_XML_ILLEGAL.sub("", _text(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values: Sequence[Any]) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+def iter_xlsx(
+    headers: Sequence[str], rows: Iterable[Sequence[Any]], sheet_name: str = "Export"
+) -> Iterator[bytes]:
+    """
+    Encode rows as a single-sheet XLSX workbook with inline strings.
+
+    The worksheet part is deflated as it is written; no shared-string table
+    or row buffer is kept, so memory does not grow with the row count.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        workbook.writestr(
+            "xl/workbook.xml",
+            _XLSX_WORKBOOK.format(name=escape(sheet_name[:31], {'"': "&quot;"})),
+        )
+        workbook.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_XLSX_SHEET_START + _xlsx_row(headers)).encode("utf-8"))
+            yield sink.drain()
+            for batch in _batched(rows):
+                sheet.write("".join(_xlsx_row(row) for row in batch).encode("utf-8"))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+            sheet.write(_XLSX_SHEET_END.encode("utf-8"))
+    yield sink.drain()
+
+
+WRITERS = {CSV: iter_csv, XLSX: iter_xlsx, JSON: iter_json}
+
+
+class Export:
+    """
+    A queryset plus its ``(header, lookup)`` columns.
+
+    Lookups are anything ``values_list`` accepts (``"court__name"``), so
+    related columns are joined in the same query instead of per row.
+    """
+
+    def __init__(self, name: str, queryset, columns: Sequence[Tuple[str, str]]):
+        self.name = name
+        self.queryset = queryset
+        self.columns = list(columns)
+
+    @property
+    def headers(self) -> List[str]:
+        return [header for header, _ in self.columns]
+
+    @property
+    def chunk_size(self) -> int:
+        return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        lookups = [lookup for _, lookup in self.columns]
+        return self.queryset.values_list(*lookups).iterator(chunk_size=self.chunk_size)
+
+    def estimated_rows(self) -> Optional[int]:
+        from .pagination import approximate_count
+
+        return approximate_count(self.queryset)
+
+    def stream(self, fmt: str) -> Iterator[bytes]:
+        try:
+            writer = WRITERS[fmt]
+        except KeyError:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        if fmt == XLSX:
+            return writer(self.headers, self.rows(), sheet_name=self.name)
+        return writer(self.headers, self.rows())
+
+    def filename(self, fmt: str) -> str:
+        return f"{self.name}_{timezone.now():%Y%m%d_%H%M}.{EXTENSIONS[fmt]}"
+
+    def response(self, fmt: str) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(self.stream(fmt), content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{self.filename(fmt)}"'
+        # Keep nginx from buffering the whole body before the first byte
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def save(self, fmt: str, folder: str = "exports") -> str:
+        """Write the export to default storage through a temp file; returns its path."""
+        with tempfile.TemporaryFile() as handle:
+            for chunk in self.stream(fmt):
+                handle.write(chunk)
+            handle.seek(0)
+            path = f"{folder}/{uuid.uuid4().hex}/{self.filename(fmt)}"
+            return default_storage.save(path, File(handle))
+
+
+def should_run_in_background(export: Export, requested: bool = False) -> bool:
+    """Background when asked to, or when the estimate exceeds the stream limit."""
+    if requested:
+        return True
+    estimate = export.estimated_rows()
+    return estimate is not None and estimate > getattr(
+        settings, "EXPORT_STREAM_MAX_ROWS", 100_000
+    )
+
+
+def export_response(request, name: str, params: Dict[str, Any], fmt: str, background: bool = False):
+    """
+    Stream the export, or queue it and answer ``202`` with the task id.
+
+    ``params`` must be JSON-serialisable; they are replayed in the worker.
+    """
+    from rest_framework import status
+    from rest_framework.response import Response
+
+    export = build_export(name, **params)
+    if not should_run_in_background(export, background):
+        return export.response(fmt)
+
+    from apps.root.tasks import run_export
+
+    task = run_export.delay(name, params, fmt, request.user.pk)
+    logger.info(f"Queued {name} export ({fmt}) for user {request.user.pk}")
+    return Response(
+        {
+            "status": "queued",
+            "task_id": task.id,
+            "format": fmt,
+            "message": "The export is being generated; you will be notified when it is ready",
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
@@ -0,0 +1,351 @@
+"""
+Parallel, budgeted health check runner.
+
+Checks are grouped by cost:
+
+* ``liveness``  - no I/O, answers "is the process alive".
+* ``readiness`` - cheap dependency pings (``SELECT 1``, cache read) that run
+  concurrently in a thread pool, each with its own timeout, under an overall
+  deadline. Results are memoised for a couple of seconds so a burst of load
+  balancer probes costs at most one round of pings.
+* ``deep``      - the per-module integrity suites (``apps/*/health.py``).
+  They are never run on the request path: a periodic task (or a single
+  background thread when the results go stale) refreshes them and the last
+  report is served from the cache.
+
+Usage:
+    health_runner.run(READINESS)
+    health_runner.get_deep_results()
+    health_runner.refresh_deep()
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("shared.health")
+
+LIVENESS = "liveness"
+READINESS = "readiness"
+DEEP = "deep"
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+TIMEOUT = "timeout"
+UNKNOWN = "unknown"
+
+# Module integrity suites refreshed in the background.
+DEFAULT_DEEP_CHECKS = {
+    "clubs": "apps.clubs.health.get_health_status",
+    "finance": "apps.finance.health.get_financial_health_status",
+    "leagues": "apps.leagues.health.run_league_health_check",
+    "reservations": "apps.reservations.health.get_reservation_health_status",
+    "tournaments": "apps.tournaments.health.get_tournament_health_status",
+}
+
+_STATUS_ALIASES = {
+    "healthy": HEALTHY,
+    "ok": HEALTHY,
+    "pass": HEALTHY,
+    "alive": HEALTHY,
+    "ready": HEALTHY,
+    "degraded": DEGRADED,
+    "warning": DEGRADED,
+    "unhealthy": UNHEALTHY,
+    "critical": UNHEALTHY,
+    "fail": UNHEALTHY,
+    "error": UNHEALTHY,
+}
+
+
+@dataclass
+class HealthCheckSpec:
+    """A registered health check."""
+
+    name: str
+    func: Callable[[], Any]
+    kind: str = READINESS
+    timeout: float = 2.0
+    critical: bool = True
+
+
+def normalize_status(result: Any) -> str:
+    """
+    Map the many result shapes used by the module health checks
+    (booleans, ``status``/``overall_status`` strings, ``healthy``/
+    ``overall_healthy`` flags) onto healthy/degraded/unhealthy.
+    """
+    if result is None or result is True:
+        return HEALTHY
+    if result is False:
+        return UNHEALTHY
+    if isinstance(result, str):
+        return _STATUS_ALIASES.get(result.lower(), UNKNOWN)
+    if isinstance(result, dict):
+        for key in ("overall_status", "status"):
+            value = result.get(key)
+            if hasattr(value, "value"):
+                value = value.value
+            if isinstance(value, str):
+                return _STATUS_ALIASES.get(value.lower(), UNKNOWN)
+        for key in ("overall_healthy", "healthy"):
+            if key in result:
+                return HEALTHY if result[key] else UNHEALTHY
+    return UNKNOWN
+
+
+def _run_check(spec: HealthCheckSpec) -> Any:
+    """Pool worker: run one check and release its thread's DB connection."""
+    try:
+        return spec.func()
+    finally:
+        connection.close()
+
+
+def database_check():
+    """Cheapest possible database round trip."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return True
+
+
+def cache_check():
+    """Read-only cache ping (a miss is fine, an exception is not)."""
+    cache.get("health_runner_ping")
+    return True
+
+
+class HealthRunner:
+    """Registry of health checks executed concurrently under a time budget."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        cache_key: str = "health:deep_results",
+        background: bool = True,
+    ):
+        self.max_workers = max_workers
+        self.cache_key = cache_key
+        self.background = background
+        self.readiness_ttl = getattr(settings, "HEALTH_READINESS_CACHE_SECONDS", 2.0)
+        self.deep_interval = getattr(settings, "HEALTH_DEEP_INTERVAL", 300)
+        self.deep_deadline = getattr(settings, "HEALTH_DEEP_DEADLINE", 120.0)
+
+        self._checks: Dict[str, HealthCheckSpec] = {}
+        self._inflight: Dict[str, Any] = {}
+        self._memo: Dict[str, Any] = {}
+        self._last_deep: Optional[Dict[str, Any]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    # Registration ------------------------------------------------------
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        kind: str = READINESS,
+        timeout: float = 2.0,
+        critical: bool = True,
+    ) -> HealthCheckSpec:
+        """Register (or replace) a check."""
+        spec = HealthCheckSpec(name, func, kind, timeout, critical)
+        self._checks[name] = spec
+        return spec
+
+    def register_path(self, name: str, dotted_path: str, **options) -> HealthCheckSpec:
+        """Register a check by dotted path; the module is imported on first run."""
+
+        def lazy_check():
+            return import_string(dotted_path)()
+
+        return self.register(name, lazy_check, **options)
+
+    def checks(self, kind: str) -> List[HealthCheckSpec]:
+        return [spec for spec in self._checks.values() if spec.kind == kind]
+
+    # Execution ---------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="health-check"
+                    )
+        return self._executor
+
+    def run(self, kind: str = READINESS, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run every check of ``kind`` concurrently.
+
+        Each check gets ``min(check.timeout, deadline)`` seconds; checks that
+        overrun are reported as ``timeout`` and left to finish in the pool.
+        A check still running from a previous round is not started again,
+        so a hung dependency never accumulates threads or connections.
+        """
+        if kind == READINESS and self.readiness_ttl:
+            memo = self._memo.get(kind)
+            if memo and time.monotonic() - memo[0] < self.readiness_ttl:
+                return memo[1]
+
+        specs = self.checks(kind)
+        start = time.monotonic()
+        budget = deadline if deadline is not None else max(
+            (spec.timeout for spec in specs), default=0
+        )
+
+        futures = {}
+        executor = self._get_executor()
+        for spec in specs:
+            running = self._inflight.get(spec.name)
+            if running is not None and not running.done():
+                futures[spec.name] = running
+                continue
+            future = executor.submit(_run_check, spec)
+            self._inflight[spec.name] = future
+            futures[spec.name] = future
+
+        results = {}
+        for spec in specs:
+            future = futures[spec.name]
+            remaining = start + min(spec.timeout, budget) - time.monotonic()
+            try:
+                value = future.result(timeout=max(remaining, 0))
+                result = {"status": normalize_status(value)}
+                if isinstance(value, dict):
+                    result["details"] = value
+            except FutureTimeoutError:
+                logger.warning(f"Health check '{spec.name}' timed out")
+                result = {"status": TIMEOUT}
+            except Exception as e:
+                logger.error(f"Health check '{spec.name}' failed: {e}")
+                result = {"status": UNHEALTHY, "error": str(e)}
+            result["critical"] = spec.critical
+            results[spec.name] = result
+
+        report = {
+            "kind": kind,
+            "status": self._overall_status(results),
+            "timestamp": timezone.now().isoformat(),
+            "duration_ms": round((time.monotonic() - start) * 1000, 2),
+            "checks": results,
+        }
+        if kind == READINESS:
+            self._memo[kind] = (time.monotonic(), report)
+        return report
+
+    @staticmethod
+    def _overall_status(results: Dict[str, Dict[str, Any]]) -> str:
+        status = HEALTHY
+        for result in results.values():
+            if result["status"] == HEALTHY:
+                continue
+            if result["critical"] and result["status"] in (UNHEALTHY, TIMEOUT):
+                return UNHEALTHY
+            status = DEGRADED
+        return status
+
+    # Deep checks -------------------------------------------------------
+
+    def refresh_deep(self) -> Dict[str, Any]:
+        """Run the deep checks now and publish the report to the cache."""
+        report = self.run(DEEP, deadline=self.deep_deadline)
+        report["checked_at"] = time.time()
+        self._last_deep = report
+        try:
+            cache.set(self.cache_key, report, self.deep_interval * 3)
+        except Exception as e:
+            logger.warning(f"Could not cache deep health results: {e}")
+        return report
+
+    def get_deep_results(self) -> Dict[str, Any]:
+        """
+        Return the last deep report without running any check.
+
+        When the report is missing or older than ``HEALTH_DEEP_INTERVAL``
+        a single background refresh is started (one per cluster, guarded by
+        a cache lock) and the stale report is returned as-is.
+        """
+        report = self._last_deep
+        if not self._is_fresh(report):
+            try:
+                report = cache.get(self.cache_key) or report
+            except Exception:
+                pass
+
+        if not self._is_fresh(report):
+            self._refresh_in_background()
+
+        if report is None:
+            return {
+                "kind": DEEP,
+                "status": UNKNOWN,
+                "checks": {},
+                "stale": True,
+                "message": "Deep health checks have not completed yet",
+            }
+        return {**report, "stale": not self._is_fresh(report)}
+
+    def _is_fresh(self, report: Optional[Dict[str, Any]]) -> bool:
+        return bool(report) and time.time() - report["checked_at"] < self.deep_interval
+
+    def _refresh_in_background(self):
+        if not self.background or not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            claimed = cache.add(f"{self.cache_key}:lock", 1, self.deep_interval)
+        except Exception:
+            claimed = True
+        if not claimed:
+            self._refreshing.release()
+            return
+
+        def refresh():
+            try:
+                self.refresh_deep()
+            except Exception as e:
+                logger.error(f"Background deep health refresh failed: {e}")
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=refresh, name="health-deep-refresh", daemon=True).start()
+
+
+def register_default_checks(runner: HealthRunner):
+    """Register the platform liveness, readiness and module integrity checks."""
+    runner.register("process", lambda: True, kind=LIVENESS, timeout=1.0)
+    runner.register(
+        "database",
+        database_check,
+        timeout=getattr(settings, "HEALTH_DATABASE_TIMEOUT", 1.0),
+    )
+    runner.register(
+        "cache",
+        cache_check,
+        timeout=getattr(settings, "HEALTH_CACHE_TIMEOUT", 0.5),
+        critical=False,
+    )
+
+    deep_checks = getattr(settings, "HEALTH_DEEP_CHECKS", DEFAULT_DEEP_CHECKS)
+    deep_timeout = getattr(settings, "HEALTH_DEEP_CHECK_TIMEOUT", 60.0)
+    for name, dotted_path in deep_checks.items():
+        runner.register_path(name, dotted_path, kind=DEEP, timeout=deep_timeout)
+
+
+# Global instance
+health_runner = HealthRunner()
+register_default_checks(health_runner)
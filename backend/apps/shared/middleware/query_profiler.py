@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.shared.query_profiler import RequestProfile, query_profiler
+from apps.shared.telemetry import route_label
+
+
+class QueryProfilerMiddleware:
+    """
+    Profile a sample of requests for N+1 patterns and slow queries.
+
+    Opt-in: removed from the stack at startup unless
+    ``QUERY_PROFILER_ENABLED`` is set; unsampled requests cost one
+    ``random()`` call.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not query_profiler.should_sample():
+            return self.get_response(request)
+
+        with RequestProfile() as profile:
+            response = self.get_response(request)
+        query_profiler.record(f"{request.method} {route_label(request)}", profile)
+        return response
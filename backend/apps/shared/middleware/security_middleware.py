@@ -134,6 +134,7 @@ class WebhookSignatureMiddleware:
             '/api/notifications/webhooks/resend/': 'RESEND_WEBHOOK_SECRET',
             '/api/notifications/webhooks/twilio/': 'TWILIO_WEBHOOK_SECRET', 
             '/api/finance/webhooks/stripe/': 'STRIPE_WEBHOOK_SECRET',
+            '/api/finance/webhooks/mercadopago/': 'MERCADOPAGO_WEBHOOK_SECRET',
         }
 
     def __call__(self, request):
@@ -0,0 +1,23 @@
+import time
+
+from apps.shared.telemetry import QueryTracker, record_request
+
+
+class TelemetryMiddleware:
+    """
+    Record latency, DB time and query count of every request.
+
+    The request's ``QueryTracker`` is exposed as ``request.query_tracker`` so
+    inner middleware and views can read the running totals.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with QueryTracker() as queries:
+            request.query_tracker = queries
+            response = self.get_response(request)
+        record_request(request, response.status_code, time.perf_counter() - started, queries)
+        return response
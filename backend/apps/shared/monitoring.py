@@ -6,13 +6,16 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 
 import psutil
 import redis
 
+from .health_runner import LIVENESS, READINESS, UNHEALTHY, health_runner
+from .telemetry import render_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,110 +113,42 @@ def health_check(request):
 @never_cache
 def liveness_check(request):
     """Simple liveness probe for Kubernetes/Docker."""
-    return JsonResponse({"status": "alive"})
+    report = health_runner.run(LIVENESS)
+    return JsonResponse({"status": "alive", "checks": report["checks"]})
 
 
 @never_cache
 def readiness_check(request):
-    """Readiness probe - checks if app is ready to serve requests."""
-    try:
-        # Quick database check
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-
-        # Quick cache check
-        cache.get("readiness_check")
-
-        return JsonResponse({"status": "ready"})
-    except Exception as e:
-        logger.error(f"Readiness check failed: {e}")
-        return JsonResponse({"status": "not_ready", "error": str(e)}, status=503)
-
-
-@csrf_exempt
-def metrics(request):
-    """Prometheus-compatible metrics endpoint."""
-    from django.core.cache import cache
-    from django.db import connection
-
-    metrics_data = []
-
-    # Request metrics
-    metrics_data.append(f"# HELP django_request_count Total HTTP requests")
-    metrics_data.append(f"# TYPE django_request_count counter")
-    request_count = cache.get("metrics_request_count", 0)
-    metrics_data.append(f"django_request_count {request_count}")
-
-    # Database metrics
-    metrics_data.append(f"# HELP django_db_query_count Total database queries")
-    metrics_data.append(f"# TYPE django_db_query_count counter")
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM django_migrations")
-        migration_count = cursor.fetchone()[0]
-    metrics_data.append(
-        f'django_db_query_count {{type="migrations"}} {migration_count}'
-    )
-
-    # Active users metric
-    metrics_data.append(f"# HELP django_active_users Number of active users")
-    metrics_data.append(f"# TYPE django_active_users gauge")
-    active_users = cache.get("metrics_active_users", 0)
-    metrics_data.append(f"django_active_users {active_users}")
-
-    # Response time metrics
-    metrics_data.append(f"# HELP django_response_time_seconds Response time in seconds")
-    metrics_data.append(f"# TYPE django_response_time_seconds histogram")
-
-    # System metrics
-    try:
-        cpu_percent = psutil.cpu_percent()
-        memory_percent = psutil.virtual_memory().percent
-
-        metrics_data.append(f"# HELP system_cpu_usage_percent CPU usage percentage")
-        metrics_data.append(f"# TYPE system_cpu_usage_percent gauge")
-        metrics_data.append(f"system_cpu_usage_percent {cpu_percent}")
-
-        metrics_data.append(
-            f"# HELP system_memory_usage_percent Memory usage percentage"
+    """
+    Readiness probe - checks if app is ready to serve requests.
+
+    Runs only the cheap dependency pings (in parallel, with timeouts) and
+    reuses the result for a couple of seconds across probes.
+    """
+    report = health_runner.run(READINESS)
+    if report["status"] == UNHEALTHY:
+        logger.error(f"Readiness check failed: {report['checks']}")
+        return JsonResponse(
+            {"status": "not_ready", "checks": report["checks"]}, status=503
         )
-        metrics_data.append(f"# TYPE system_memory_usage_percent gauge")
-        metrics_data.append(f"system_memory_usage_percent {memory_percent}")
-    except:
-        pass
-
-    return JsonResponse(
-        "\n".join(metrics_data), safe=False, content_type="text/plain; charset=utf-8"
-    )
-
-
-class MetricsMiddleware:
-    """Middleware to collect metrics."""
+    return JsonResponse({"status": "ready", "checks": report["checks"]})
 
-    def __init__(self, get_response):
-        self.get_response = get_response
 
-    def __call__(self, request):
-        # Track request count
-        request_count = cache.get("metrics_request_count", 0)
-        cache.set("metrics_request_count", request_count + 1, 3600)
-
-        # Track active users
-        if request.user.is_authenticated:
-            active_users_key = f"active_user_{request.user.id}"
-            cache.set(active_users_key, True, 300)  # 5 minute TTL
-
-            # Count active users
-            # Note: This is a simplified approach. In production, use a more sophisticated method
-            active_count = cache.get("metrics_active_users", 0)
-            cache.set("metrics_active_users", active_count, 300)
+@never_cache
+def deep_health_check(request):
+    """
+    Module integrity report (clubs, finance, leagues, ...).
 
-        # Process request
-        start_time = time.time()
-        response = self.get_response(request)
-        duration = time.time() - start_time
+    Served from the last background run; never executes the checks inline.
+    """
+    report = health_runner.get_deep_results()
+    status_code = 503 if report["status"] == UNHEALTHY else 200
+    return JsonResponse(report, status=status_code)
 
-        # Track response time
-        # In production, you'd want to use a proper metrics library
-        response["X-Response-Time"] = f"{duration:.3f}s"
 
-        return response
+@csrf_exempt
+@never_cache
+def metrics(request):
+    """Prometheus metrics endpoint (text exposition format)."""
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -2,8 +2,23 @@
 Pagination classes for the application.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.encoding import force_str
+
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -92,3 +107,230 @@ class LargeResultsSetPagination(StandardResultsSetPagination):
 
     page_size = 50
     max_page_size = 200
+
+
+def counts_are_estimated(queryset) -> bool:
+    """Whether ``approximate_count`` estimates rather than counts ``queryset``."""
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def approximate_count(queryset) -> Optional[int]:
+    """
+    Planner row estimate for ``queryset`` (PostgreSQL statistics, no scan).
+
+    Other backends get an exact ``COUNT`` (development databases are small).
+    """
+    connection = connections[queryset.db]
+    if not counts_are_estimated(queryset):
+        return queryset.count()
+
+    try:
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Could not estimate row count: {e}")
+        return None
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a unique, stable ordering.
+
+    Pages are fetched with ``WHERE (date, id) < (last_date, last_id)`` style
+    predicates instead of ``OFFSET``, so deep pages cost the same as the
+    first one and no ``COUNT(*)`` is run. Cursors are opaque tokens.
+
+    Views opt in with ``pagination_class = KeysetPagination`` and set
+    ``keyset_ordering`` (non-null fields ending in a unique one, ``id`` by
+    default appended). ``count`` is null unless ``?include_count=true`` asks
+    for it; it is then a planner estimate on PostgreSQL, flagged by
+    ``count_is_approximate``. Clients still sending ``?page=``, or an
+    ``?ordering=`` handled by the view's OrderingFilter, get page-number
+    pagination with an exact count.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "include_count"
+    ordering = ("-created_at", "-id")
+    fallback_class = StandardResultsSetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if self.fallback_class and self.use_fallback(request, view):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        self.count = None
+        self.count_is_approximate = False
+        if request.query_params.get(self.count_query_param) in ("1", "true", "True"):
+            self.count = approximate_count(queryset)
+            self.count_is_approximate = self.count is not None and counts_are_estimated(
+                queryset
+            )
+
+        values, reverse = self.decode_cursor(request)
+        fields = [(name.lstrip("-"), name.startswith("-") != reverse) for name in self.ordering]
+
+        if values is not None:
+            queryset = queryset.filter(self._after(fields, values, queryset.model))
+        queryset = queryset.order_by(
+            *[f"-{name}" if descending else name for name, descending in fields]
+        )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Going forward there is a previous page if we came from a cursor;
+        # going backward there is always a next page (the one we came from).
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        self.first_values = self._position(results[0]) if results else None
+        self.last_values = self._position(results[-1]) if results else None
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        return Response(
+            {
+                "count": self.count,
+                "count_is_approximate": self.count_is_approximate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "page_size": self.page_size,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {
+                    "type": "integer",
+                    "nullable": True,
+                    "description": "Total, only with include_count=true; null otherwise",
+                },
+                "count_is_approximate": {
+                    "type": "boolean",
+                    "description": "Whether count is a planner estimate",
+                },
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "page_size": {"type": "integer", "example": 20},
+                "results": schema,
+            },
+        }
+
+    def use_fallback(self, request, view) -> bool:
+        """
+        Page numbers were asked for, or a client ordering the keyset can't
+        follow; both are served by ``fallback_class``.
+        """
+        params = request.query_params
+        if self.fallback_class.page_query_param in params:
+            return True
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, OrderingFilter) and params.get(backend.ordering_param):
+                return True
+        return False
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, view) -> Tuple[str, ...]:
+        ordering = tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering += ("-id" if ordering[-1].startswith("-") else "id",)
+        return ordering
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or self.last_values is None:
+            return None
+        return self._link(self.last_values, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or self.first_values is None:
+            return None
+        return self._link(self.first_values, reverse=True)
+
+    def encode_cursor(self, values: List[str], reverse: bool) -> str:
+        payload = {"v": values}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request) -> Tuple[Optional[List[str]], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = [str(value) for value in payload["v"]]
+            if len(values) != len(self.ordering):
+                raise ValueError("cursor does not match ordering")
+            return values, bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor")
+
+    def _link(self, values: List[str], reverse: bool) -> str:
+        url = remove_query_param(self.base_url, self.fallback_class.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(values, reverse)
+        )
+
+    def _position(self, obj) -> List[str]:
+        position = []
+        for name in self.ordering:
+            value = getattr(obj, name.lstrip("-"))
+            position.append(value.isoformat() if hasattr(value, "isoformat") else force_str(value))
+        return position
+
+    @staticmethod
+    def _after(fields, values, model) -> Q:
+        """Rows strictly after ``values`` in the (possibly reversed) ordering."""
+        values = [_to_python(model, name, value) for (name, _), value in zip(fields, values)]
+        condition = Q()
+        for i, (name, descending) in enumerate(fields):
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+            for j in range(i):
+                step &= Q(**{fields[j][0]: values[j]})
+            condition |= step
+
+        # Redundant bound on the leading column so the index range scan starts
+        # at the cursor instead of filtering from the top.
+        name, descending = fields[0]
+        return Q(**{f"{name}__{'lte' if descending else 'gte'}": values[0]}) & condition
+
+
+def _to_python(model, name: str, value: str):
+    """Parse a cursor value with the model field it belongs to."""
+    try:
+        field = model._meta.get_field("id" if name == "pk" else name)
+        return field.to_python(value)
+    except (FieldDoesNotExist, ValidationError):
+        raise NotFound("Invalid cursor")
@@ -0,0 +1,313 @@
+"""
+Sampled slow-query and N+1 profiler for live traffic.
+
+A sampled request runs with a ``RequestProfile`` execute wrapper that
+fingerprints every query (literals and placeholders normalised away) and
+remembers the first call site in project code. When the request finishes,
+fingerprints repeated ``QUERY_PROFILER_N_PLUS_ONE_THRESHOLD`` times (N+1)
+and queries slower than ``QUERY_PROFILER_SLOW_MS`` are folded into the
+worker's aggregate, keyed by view.
+
+Each worker publishes its aggregate to the cache under a slot it claimed
+with ``cache.add``, so workers never overwrite each other; the report
+merges every slot for the current and previous window.
+"""
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger("shared.query_profiler")
+
+CACHE_PREFIX = "query_profiler"
+MAX_WORKER_SLOTS = 64
+N_PLUS_ONE = "n_plus_one"
+SLOW = "slow"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_PROJECT_ROOT = str(getattr(settings, "BASE_DIR", os.getcwd()))
+_SKIP_PATHS = (
+    "site-packages",
+    "dist-packages",
+    __file__,
+    os.path.join("apps", "shared", "middleware"),
+)
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalise SQL so queries differing only in literals compare equal.
+
+    ``SELECT ... WHERE id = 42`` and ``... WHERE id = 7`` share a
+    fingerprint, and so do ``IN (%s, %s)`` and ``IN (%s, %s, %s)``.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _VALUE_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _call_site() -> str:
+    """First frame in project code (outside Django and this module)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PROJECT_ROOT) and not any(
+            part in filename for part in _SKIP_PATHS
+        ):
+            return f"{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class RequestProfile:
+    """Execute wrapper collecting per-fingerprint stats for one request."""
+
+    def __init__(self):
+        # fingerprint -> [count, total_ms, max_ms, call_site, sample_sql]
+        self.fingerprints: Dict[str, List[Any]] = {}
+        self.query_count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.query_count += 1
+            key = fingerprint(sql)
+            stats = self.fingerprints.get(key)
+            if stats is None:
+                self.fingerprints[key] = [1, elapsed_ms, elapsed_ms, _call_site(), sql[:500]]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed_ms
+                stats[2] = max(stats[2], elapsed_ms)
+
+    def __enter__(self) -> "RequestProfile":
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def offenders(self, n_plus_one_threshold: int, slow_ms: float) -> List[Dict[str, Any]]:
+        """N+1 and slow fingerprints of this request."""
+        found = []
+        for key, (count, total_ms, max_ms, call_site, sql) in self.fingerprints.items():
+            kinds = []
+            if count >= n_plus_one_threshold:
+                kinds.append(N_PLUS_ONE)
+            if max_ms >= slow_ms:
+                kinds.append(SLOW)
+            for kind in kinds:
+                found.append(
+                    {
+                        "kind": kind,
+                        "fingerprint": key,
+                        "count": count,
+                        "total_ms": total_ms,
+                        "max_ms": max_ms,
+                        "call_site": call_site,
+                        "sample_sql": sql,
+                    }
+                )
+        return found
+
+
+class QueryProfiler:
+    """Sampling decision plus the worker's rolling aggregate."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._window: Optional[int] = None
+        self._dirty = False
+        self._last_flush = 0.0
+        self._slot: Optional[int] = None
+        self._worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "QUERY_PROFILER_ENABLED", False)
+
+    @property
+    def sample_rate(self) -> float:
+        return getattr(settings, "QUERY_PROFILER_SAMPLE_RATE", 0.01)
+
+    @property
+    def window_seconds(self) -> int:
+        return getattr(settings, "QUERY_PROFILER_WINDOW_SECONDS", 3600)
+
+    def should_sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    def record(self, view: str, profile: RequestProfile):
+        """Fold one sampled request's offenders into the aggregate."""
+        offenders = profile.offenders(
+            getattr(settings, "QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 5),
+            getattr(settings, "QUERY_PROFILER_SLOW_MS", 100),
+        )
+        if not offenders:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._roll_window(now)
+            for offender in offenders:
+                key = (view, offender["kind"], offender["fingerprint"])
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = {
+                        "view": view,
+                        "kind": offender["kind"],
+                        "fingerprint": offender["fingerprint"],
+                        "call_site": offender["call_site"],
+                        "sample_sql": offender["sample_sql"],
+                        "requests": 0,
+                        "queries": 0,
+                        "max_per_request": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                    }
+                entry["requests"] += 1
+                entry["queries"] += offender["count"]
+                entry["max_per_request"] = max(entry["max_per_request"], offender["count"])
+                entry["total_ms"] += offender["total_ms"]
+                entry["max_ms"] = max(entry["max_ms"], offender["max_ms"])
+                entry["last_seen"] = now
+            self._dirty = True
+
+        if now - self._last_flush >= getattr(settings, "QUERY_PROFILER_FLUSH_SECONDS", 30):
+            self.flush()
+
+    def _roll_window(self, now: float):
+        window = int(now // self.window_seconds)
+        if window != self._window:
+            if self._window is not None and self._dirty:
+                self._publish(self._window, list(self._entries.values()))
+            self._window = window
+            self._entries = {}
+
+    def flush(self) -> bool:
+        """Publish the aggregate to this worker's cache slot."""
+        with self._lock:
+            if not self._dirty or self._window is None:
+                return False
+            window, entries = self._window, list(self._entries.values())
+            self._dirty = False
+            self._last_flush = time.time()
+        return self._publish(window, entries)
+
+    def _publish(self, window: int, entries: List[Dict[str, Any]]) -> bool:
+        slot = self._claim_slot()
+        if slot is None:
+            logger.warning("No free query profiler slot; report not published")
+            return False
+        try:
+            cache.set(
+                f"{CACHE_PREFIX}:{window}:{slot}",
+                entries,
+                self.window_seconds * 2,
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Could not publish query profile: {e}")
+            return False
+
+    def _claim_slot(self) -> Optional[int]:
+        timeout = self.window_seconds * 2
+        try:
+            if self._slot is not None:
+                owner = f"{CACHE_PREFIX}:slot:{self._slot}"
+                if cache.get(owner) == self._worker_id:
+                    cache.touch(owner, timeout)
+                    return self._slot
+                self._slot = None
+
+            for slot in range(MAX_WORKER_SLOTS):
+                if cache.add(f"{CACHE_PREFIX}:slot:{slot}", self._worker_id, timeout):
+                    self._slot = slot
+                    return slot
+        except Exception as e:
+            logger.warning(f"Could not claim query profiler slot: {e}")
+        return None
+
+    def get_report(self, limit: int = 20, view: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Top offenders across all workers for the current and previous window,
+        worst (by total time) first, plus the same grouped by view.
+        """
+        window = int(time.time() // self.window_seconds)
+        keys = [
+            f"{CACHE_PREFIX}:{w}:{slot}"
+            for w in (window - 1, window)
+            for slot in range(MAX_WORKER_SLOTS)
+        ]
+
+        merged: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for entries in cache.get_many(keys).values():
+            for entry in entries:
+                if view and entry["view"] != view:
+                    continue
+                key = (entry["view"], entry["kind"], entry["fingerprint"])
+                if key not in merged:
+                    merged[key] = dict(entry)
+                    continue
+                total = merged[key]
+                for field in ("requests", "queries", "total_ms"):
+                    total[field] += entry[field]
+                for field in ("max_per_request", "max_ms", "last_seen"):
+                    total[field] = max(total[field], entry[field])
+
+        offenders = sorted(merged.values(), key=lambda e: e["total_ms"], reverse=True)
+        for entry in offenders:
+            entry["total_ms"] = round(entry["total_ms"], 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+            entry["avg_per_request"] = round(entry["queries"] / entry["requests"], 1)
+
+        by_view: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in offenders:
+            by_view.setdefault(entry["view"], []).append(entry)
+
+        return {
+            "window_seconds": self.window_seconds,
+            "offenders": offenders[:limit],
+            "by_view": {name: entries[:limit] for name, entries in by_view.items()},
+        }
+
+    def reset(self):
+        """Drop this worker's aggregate and every published report."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+        window = int(time.time() // self.window_seconds)
+        cache.delete_many(
+            [
+                f"{CACHE_PREFIX}:{w}:{slot}"
+                for w in (window - 1, window)
+                for slot in range(MAX_WORKER_SLOTS)
+            ]
+        )
+
+
+query_profiler = QueryProfiler()
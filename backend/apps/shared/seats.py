@@ -0,0 +1,212 @@
+"""
+Contention-safe seat allocation with a FIFO waitlist.
+
+Capacity lives on one parent row (a class session, a tournament) as a
+"seats taken" counter next to the capacity column. A seat is taken with a
+single conditional UPDATE::
+
+    UPDATE ... SET taken = taken + 1 WHERE id = %s AND taken < capacity
+
+which the database serialises on the row: concurrent requests for the last
+seat cannot both succeed, and nobody reads a count and writes it back.
+Releasing a seat is the mirror UPDATE guarded by ``taken > 0``.
+
+Requests that find the pool full join the waitlist. Joining the waitlist and
+promoting from it lock the parent row (``select_for_update``), so positions
+are handed out in arrival order and a freed seat goes to the head of the
+queue instead of back to the pool. The lock-free path is only taken while
+nobody waits: seats that appear otherwise (raised capacity, a reconciled
+counter) are handed to the waitlist before any newcomer.
+
+Status changes of an existing entry (confirm, cancel, delete) must read the
+status they act on from ``lock_entry()``, not from the caller's instance: two
+concurrent cancels of one seat would otherwise both vacate it and promote
+two waitlisted entries into a single freed seat.
+
+All methods must run inside the caller's transaction (they open a savepoint
+otherwise), so the row that takes the seat and the seat itself commit or
+roll back together.
+
+Usage:
+    allocator = SeatAllocator(
+        ClassSession, session.pk, "enrolled_count", "max_participants",
+        entries=ClassEnrollment.objects.filter(session_id=session.pk),
+        seated="enrolled", waiting="waitlisted", position_field="waitlist_position",
+    )
+    status, position = allocator.allocate(waitlist_size=5)
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class SeatsUnavailable(Exception):
+    """Neither a seat nor a waitlist place is left."""
+
+
+class SeatAllocator:
+    """Seat counter on one parent row plus the waitlist of its entries."""
+
+    def __init__(
+        self,
+        model,
+        pk,
+        taken_field: str,
+        capacity_field: str,
+        entries,
+        seated: str,
+        waiting: str,
+        status_field: str = "status",
+        position_field: Optional[str] = None,
+    ):
+        self.model = model
+        self.pk = pk
+        self.taken_field = taken_field
+        self.capacity_field = capacity_field
+        self.entries = entries
+        self.seated = seated
+        self.waiting = waiting
+        self.status_field = status_field
+        self.position_field = position_field
+
+    # Counter
+
+    def acquire(self) -> bool:
+        """Take one seat if any is left; one conditional UPDATE."""
+        return bool(
+            self.model.objects.filter(
+                pk=self.pk, **{f"{self.taken_field}__lt": F(self.capacity_field)}
+            ).update(**{self.taken_field: F(self.taken_field) + 1})
+        )
+
+    def release(self) -> bool:
+        """Give one seat back to the pool."""
+        return bool(
+            self.model.objects.filter(
+                pk=self.pk, **{f"{self.taken_field}__gt": 0}
+            ).update(**{self.taken_field: F(self.taken_field) - 1})
+        )
+
+    def lock(self):
+        return self.model.objects.select_for_update().get(pk=self.pk)
+
+    def lock_entry(self, entry):
+        """
+        Lock the parent row, then ``entry``; returns the entry as stored
+        now, or None once it is gone. The parent goes first, in the same
+        order as allocation and promotion take their locks.
+        """
+        self.lock()
+        return self.entries.select_for_update().filter(pk=entry.pk).first()
+
+    # Waitlist
+
+    def _waitlist(self):
+        ordering = [self.position_field] if self.position_field else []
+        return self.entries.filter(**{self.status_field: self.waiting}).order_by(
+            *ordering, "created_at", "pk"
+        )
+
+    def allocate(self, waitlist_size: Optional[int] = None) -> Tuple[str, Optional[int]]:
+        """
+        A seat (``(seated, None)``) or the next waitlist place
+        (``(waiting, position)``). ``waitlist_size`` caps the waitlist, 0
+        disables it; raises ``SeatsUnavailable`` when both are exhausted.
+        """
+        with transaction.atomic():
+            if not self._waitlist().exists() and self.acquire():
+                return self.seated, None
+
+            # Serialise waitlisters; free seats go to those already waiting
+            self.lock()
+            self._promote()
+            if not self._waitlist().exists() and self.acquire():
+                return self.seated, None
+            if waitlist_size == 0:
+                raise SeatsUnavailable()
+            position = self._waitlist().count() + 1
+            if waitlist_size is not None and position > waitlist_size:
+                raise SeatsUnavailable()
+            return self.waiting, position
+
+    def vacate(self, entry, previous_status: str):
+        """
+        ``entry`` left (already saved with its new status). A freed seat goes
+        to the head of the waitlist, or back to the pool when nobody waits.
+        Returns the promoted entry, if any.
+        """
+        with transaction.atomic():
+            if previous_status == self.waiting:
+                self._close_gap(entry)
+                return None
+            if previous_status != self.seated:
+                return None
+
+            self.lock()
+            promoted = self._waitlist().select_for_update().first()
+            if promoted is None:
+                self.release()
+                return None
+
+            # The seat changes hands, the counter stays the same
+            self._close_gap(promoted)
+            self._seat(promoted)
+            return promoted
+
+    def promote(self) -> list:
+        """Hand free seats to the head of the waitlist; returns the promoted entries."""
+        with transaction.atomic():
+            self.lock()
+            return self._promote()
+
+    def _promote(self) -> list:
+        # Caller holds the parent row lock
+        promoted = []
+        for entry in self._waitlist().select_for_update():
+            if not self.acquire():
+                break
+            self._seat(entry)
+            promoted.append(entry)
+        if promoted and self.position_field:
+            # The promoted entries were the first places of the queue
+            self.entries.filter(**{self.status_field: self.waiting}).update(
+                **{self.position_field: F(self.position_field) - len(promoted)}
+            )
+        return promoted
+
+    def _seat(self, entry):
+        setattr(entry, self.status_field, self.seated)
+        update_fields = [self.status_field, "updated_at"]
+        if self.position_field:
+            update_fields.append(self.position_field)
+            setattr(entry, self.position_field, None)
+        entry.save(update_fields=update_fields)
+        logger.info(f"Promoted waitlisted entry {entry.pk} of {self.model.__name__} {self.pk}")
+
+    def _close_gap(self, entry):
+        """Move everybody behind ``entry`` one place up the waitlist."""
+        position = getattr(entry, self.position_field, None) if self.position_field else None
+        if position is None:
+            return
+        self.entries.filter(
+            **{
+                self.status_field: self.waiting,
+                f"{self.position_field}__gt": position,
+            }
+        ).update(**{self.position_field: F(self.position_field) - 1})
+
+    def reconcile(self) -> int:
+        """
+        Reset the counter to the seated entries, e.g. after bulk imports, and
+        hand any seat that frees up to the waitlist. Returns the seats taken.
+        """
+        with transaction.atomic():
+            self.lock()
+            taken = self.entries.filter(**{self.status_field: self.seated}).count()
+            self.model.objects.filter(pk=self.pk).update(**{self.taken_field: taken})
+            return taken + len(self._promote())
@@ -0,0 +1,192 @@
+"""
+Per-endpoint request telemetry.
+
+Queries are counted and timed with ``connection.execute_wrapper`` (works
+with DEBUG off, unlike ``connection.queries``), and latency, DB time and
+query count are observed into Prometheus histograms labelled by URL route
+pattern. Histograms live in process memory; under gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` (see ``gunicorn.conf.py``) and each worker
+writes its samples to its own mmap file, which the metrics endpoint merges
+at scrape time. Recording a request never touches Redis.
+
+Usage:
+    with QueryTracker() as queries:
+        run_report()
+    queries.count, queries.duration
+"""
+
+import logging
+import os
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger("shared.telemetry")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# Label for requests that did not resolve to a URL pattern; raw paths are
+# never used as labels so 404 scans cannot blow up the series count.
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = Counter(
+    "django_http_requests_total",
+    "HTTP requests by route, method and status code",
+    ["route", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "django_http_request_duration_seconds",
+    "Request latency by route",
+    ["route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "django_http_request_db_duration_seconds",
+    "Time spent in database queries per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "django_http_request_db_queries",
+    "Database queries per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+
+
+class QueryTracker:
+    """
+    Count and time the queries run while active, on every DB alias.
+
+    With ``capture_sql`` the SQL and duration of each query are kept too
+    (for per-request analysis only; never enable it globally).
+    """
+
+    def __init__(self, capture_sql: bool = False):
+        self.capture_sql = capture_sql
+        self.count = 0
+        self.duration = 0.0
+        self.queries: List[Tuple[str, float]] = []
+        self._stack: Optional[ExitStack] = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.capture_sql:
+                self.queries.append((sql, elapsed))
+
+    def __enter__(self) -> "QueryTracker":
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+
+
+def route_label(request) -> str:
+    """URL pattern the request resolved to, e.g. ``api/v1/clubs/<pk>/``."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.route or match.view_name or UNMATCHED_ROUTE
+
+
+def record_request(request, status_code: int, duration: float, queries: QueryTracker):
+    """Observe one finished request."""
+    route = route_label(request)
+    REQUESTS.labels(route, request.method, str(status_code)).inc()
+    REQUEST_LATENCY.labels(route, request.method).observe(duration)
+    DB_TIME.labels(route).observe(queries.duration)
+    DB_QUERIES.labels(route).observe(queries.count)
+
+
+def sample_totals(metric, label: str) -> Dict[str, Dict[str, float]]:
+    """
+    This process's samples of ``metric`` summed per value of ``label``,
+    e.g. ``{"api/v1/clubs/": {"count": 12, "sum": 0.84}}`` for a histogram
+    or ``{...: {"total": 3}}`` for a counter.
+
+    For in-app dashboards; cross-worker totals come from the metrics endpoint.
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    for family in metric.collect():
+        for sample in family.samples:
+            suffix = sample.name[len(family.name):].lstrip("_")
+            if label not in sample.labels or suffix in ("bucket", "created"):
+                continue
+            entry = totals.setdefault(sample.labels[label], {})
+            entry[suffix] = entry.get(suffix, 0) + sample.value
+    return totals
+
+
+class SystemCollector:
+    """Host and circuit breaker gauges, read at scrape time."""
+
+    def collect(self):
+        try:
+            import psutil
+
+            cpu = GaugeMetricFamily("system_cpu_usage_percent", "CPU usage percentage")
+            cpu.add_metric([], psutil.cpu_percent())
+            memory = GaugeMetricFamily(
+                "system_memory_usage_percent", "Memory usage percentage"
+            )
+            memory.add_metric([], psutil.virtual_memory().percent)
+            yield cpu
+            yield memory
+        except Exception as e:
+            logger.debug(f"System metrics unavailable: {e}")
+
+        from .circuit_breaker import CircuitState, circuit_breaker_registry
+
+        breakers = GaugeMetricFamily(
+            "circuit_breaker_open",
+            "1 when the circuit breaker is open or half open",
+            labels=["breaker"],
+        )
+        for breaker in circuit_breaker_registry.all():
+            breakers.add_metric(
+                [breaker.key], 0 if breaker.state == CircuitState.CLOSED else 1
+            )
+        yield breakers
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus text exposition of every worker's metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = CollectorRegistry()
+        registry.register(_ProcessRegistry())
+    registry.register(SystemCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class _ProcessRegistry:
+    """Adapter exposing the default registry inside a scrape registry."""
+
+    def collect(self):
+        return REGISTRY.collect()
@@ -7,6 +7,8 @@ from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
+from core.conditional import tracked_update
+
 from .models import (
     Match,
     Prize,
@@ -17,6 +19,7 @@ from .models import (
     TournamentRules,
     TournamentStats,
 )
+from .services import RegistrationService
 
 
 @admin.register(TournamentCategory)
@@ -278,7 +281,7 @@ class TournamentAdmin(admin.ModelAdmin):
 
     def cancel_tournament(self, request, queryset):
         """Action to cancel tournaments."""
-        updated = queryset.update(status="cancelled")
+        updated = tracked_update(queryset, status="cancelled")
         self.message_user(request, f"{updated} tournaments cancelled.")
 
     cancel_tournament.short_description = "Cancelar torneos seleccionados"
@@ -340,7 +343,11 @@ class TournamentRegistrationAdmin(admin.ModelAdmin):
 
     def cancel_registrations(self, request, queryset):
         """Action to cancel registrations."""
-        updated = queryset.update(status="cancelled")
+        # One at a time so freed seats go to the waitlist
+        updated = 0
+        for registration in queryset.exclude(status="cancelled"):
+            RegistrationService.cancel(registration)
+            updated += 1
         self.message_user(request, f"{updated} registrations cancelled.")
 
     cancel_registrations.short_description = "Cancelar inscripciones seleccionadas"
@@ -457,14 +464,14 @@ class MatchAdmin(admin.ModelAdmin):
 
     def mark_completed(self, request, queryset):
         """Action to mark matches as completed."""
-        updated = queryset.update(status="completed")
+        updated = tracked_update(queryset, status="completed")
         self.message_user(request, f"{updated} matches marked as completed.")
 
     mark_completed.short_description = "Marcar como completados"
 
     def mark_cancelled(self, request, queryset):
         """Action to mark matches as cancelled."""
-        updated = queryset.update(status="cancelled")
+        updated = tracked_update(queryset, status="cancelled")
         self.message_user(request, f"{updated} matches marked as cancelled.")
 
     mark_cancelled.short_description = "Marcar como cancelados"
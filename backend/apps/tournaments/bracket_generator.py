@@ -6,6 +6,8 @@ Supports multiple tournament formats with automatic seeding and bye assignment.
 import math
 import random
 from typing import List, Dict, Optional, Tuple
+
+import numpy as np
 from django.db import transaction
 from django.utils import timezone
 
@@ -14,6 +16,7 @@ from .models import (
     Match, MatchSchedule
 )
 from apps.clients.models import ClientProfile
+from .ratings import RatingEngine
 
 
 class BracketGenerator:
@@ -25,7 +28,7 @@ class BracketGenerator:
         self.tournament = tournament
         self.registrations = list(
             tournament.registrations.filter(status="confirmed")
-            .select_related('player1', 'player2')
+            .select_related('player1__user', 'player2')
             .order_by('seed', 'created_at')
         )
     
@@ -110,6 +113,7 @@ class BracketGenerator:
                     match = Match.objects.create(
                         tournament=self.tournament,
                         club=self.tournament.club,
+                        organization=self.tournament.organization,
                         round_number=1,
                         match_number=i,
                         team1=players[player_idx],
@@ -214,6 +218,7 @@ class BracketGenerator:
                     match = Match.objects.create(
                         tournament=self.tournament,
                         club=self.tournament.club,
+                        organization=self.tournament.organization,
                         round_number=round_num + 1,
                         match_number=len(round_matches),
                         team1=players[home],
@@ -289,6 +294,7 @@ class BracketGenerator:
                             match = Match.objects.create(
                                 tournament=self.tournament,
                                 club=self.tournament.club,
+                                organization=self.tournament.organization,
                                 round_number=round_num,
                                 match_number=len(round_matches),
                                 team1=player1,
@@ -322,7 +328,9 @@ class BracketGenerator:
     # Helper methods
     def _seed_players(self, registrations: List[TournamentRegistration]) -> List[TournamentRegistration]:
         """Seed players based on seeding method."""
-        seeding_strategy = SeedingStrategy()
+        seeding_strategy = SeedingStrategy(
+            RatingEngine(self.tournament.organization_id, self.tournament.category_id)
+        )
         
         if self.tournament.category.category_type == "level":
             return seeding_strategy.seed_by_elo(registrations)
@@ -380,6 +388,7 @@ class BracketGenerator:
                 match = Match.objects.create(
                     tournament=self.tournament,
                     club=self.tournament.club,
+                    organization=self.tournament.organization,
                     round_number=1,
                     match_number=node.position,
                     team1=players[player_idx],
@@ -408,12 +417,12 @@ class BracketGenerator:
                 structure["rounds"][round_key] = []
             
             node_data = {
-                "id": node.id,
+                "id": str(node.id),
                 "position": node.position,
                 "has_bye": node.has_bye,
-                "match_id": node.match.id if node.match else None,
-                "parent_1_id": node.parent_node_1.id if node.parent_node_1 else None,
-                "parent_2_id": node.parent_node_2.id if node.parent_node_2 else None,
+                "match_id": str(node.match.id) if node.match else None,
+                "parent_1_id": str(node.parent_node_1.id) if node.parent_node_1 else None,
+                "parent_2_id": str(node.parent_node_2.id) if node.parent_node_2 else None,
                 "is_losers": node.is_losers_bracket
             }
             
@@ -432,57 +441,78 @@ class BracketGenerator:
 class SeedingStrategy:
     """
     Strategies for seeding players in tournaments.
+    Team strength is the mean rating of both players, read from the rating
+    engine of the tournament category when given, else from the profiles.
     """
-    
+
+    def __init__(self, engine: Optional[RatingEngine] = None):
+        self.engine = engine
+
+    def team_ratings(self, players: List[TournamentRegistration]) -> np.ndarray:
+        """Average rating of each team, as an array."""
+        if not players:
+            return np.empty(0)
+        if self.engine is not None:
+            player_ids = [p for reg in players for p in (reg.player1_id, reg.player2_id)]
+            ratings = self.engine.lookup(player_ids)
+        else:
+            ratings = np.array(
+                [
+                    getattr(player, 'rating', 1200)
+                    for reg in players
+                    for player in (reg.player1, reg.player2)
+                ],
+                dtype=np.float64,
+            )
+        return ratings.reshape(-1, 2).mean(axis=1)
+
     def seed_by_elo(self, players: List[TournamentRegistration]) -> List[TournamentRegistration]:
         """Seed players by their ELO rating."""
-        # Calculate average ELO for each team
-        for reg in players:
-            player1_elo = getattr(reg.player1, 'rating', 1200)
-            player2_elo = getattr(reg.player2, 'rating', 1200)
-            reg._avg_elo = (player1_elo + player2_elo) / 2
-        
-        # Sort by average ELO (highest first)
-        return sorted(players, key=lambda x: x._avg_elo, reverse=True)
-    
+        ratings = self.team_ratings(players)
+        for reg, rating in zip(players, ratings.tolist()):
+            reg._avg_elo = rating
+
+        # Highest first, registration order on ties
+        return [players[i] for i in np.argsort(-ratings, kind='stable')]
+
     def distribute_geographically(self, players: List[TournamentRegistration]) -> List[TournamentRegistration]:
-        """Distribute players to avoid same club matchups in early rounds."""
-        # Group by club
+        """
+        Seed by rating while keeping teams of the same club apart.
+
+        The bracket pairs consecutive positions, so positions a and b meet in
+        round (a ^ b).bit_length(). Each team, strongest first, takes the
+        first free position that meets its clubmates as late as possible.
+        """
+        seeded = self.seed_by_elo(players)
         clubs = {}
-        for reg in players:
-            club_id = reg.player1.user.club_id if hasattr(reg.player1.user, 'club_id') else 'no_club'
-            if club_id not in clubs:
-                clubs[club_id] = []
-            clubs[club_id].append(reg)
-        
-        # Sort each club's players by ELO
-        for club_players in clubs.values():
-            self.seed_by_elo(club_players)
-        
-        # Interleave players from different clubs
-        result = []
-        while any(clubs.values()):
-            for club_id in list(clubs.keys()):
-                if clubs[club_id]:
-                    result.append(clubs[club_id].pop(0))
-                if not clubs[club_id]:
-                    del clubs[club_id]
-        
-        return result
-    
+        codes = np.array(
+            [
+                clubs.setdefault(club_id, len(clubs)) if club_id is not None else -1
+                for club_id in (getattr(reg.player1.user, 'club_id', None) for reg in seeded)
+            ],
+            dtype=np.int64,
+        )
+
+        positions = np.arange(len(seeded))
+        position_club = np.full(len(seeded), -2)
+        order = np.empty(len(seeded), dtype=np.int64)
+        for team, club in enumerate(codes.tolist()):
+            candidates = positions[position_club == -2]
+            clubmates = positions[position_club == club] if club >= 0 else positions[:0]
+            if len(clubmates):
+                # frexp's exponent is the bit length of a positive integer
+                meets = np.frexp(candidates[:, None] ^ clubmates[None, :])[1].min(axis=1)
+                candidates = candidates[meets == meets.max()]
+            position_club[candidates[0]] = club
+            order[candidates[0]] = team
+
+        return [seeded[i] for i in order]
+
     def assign_byes(self, bracket_size: int, player_count: int) -> List[int]:
         """Calculate which positions should receive byes."""
         num_byes = bracket_size - player_count
-        if num_byes == 0:
+        if num_byes <= 0:
             return []
-        
-        # Distribute byes to avoid consecutive byes
-        bye_positions = []
-        # Place byes at regular intervals
-        interval = player_count / (num_byes + 1)
-        
-        for i in range(num_byes):
-            position = int((i + 1) * interval)
-            bye_positions.append(position)
-        
-        return bye_positions
\ No newline at end of file
+
+        # Place byes at regular intervals to avoid consecutive byes
+        return (np.arange(1, num_byes + 1) * player_count // (num_byes + 1)).tolist()
\ No newline at end of file
@@ -9,13 +9,19 @@ Higher thresholds than finance since tournaments are less critical than money op
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from contextlib import contextmanager
 
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from apps.shared.circuit_breaker import (
+    CircuitBreakerError,
+    CircuitState,
+    circuit_breaker_registry,
+)
+
 logger = logging.getLogger('tournaments.circuit_breaker')
 
 # Circuit breaker thresholds - Higher than finance since tournaments are less critical
@@ -30,7 +36,7 @@ BRACKET_GENERATION_RATE_LIMIT = 2  # Max 2 bracket generations per minute per to
 RESULT_PROCESSING_RATE_LIMIT = 20  # Max 20 result submissions per minute per tournament
 
 
-class TournamentCircuitBreakerError(Exception):
+class TournamentCircuitBreakerError(CircuitBreakerError):
     """Exception raised when circuit breaker is open."""
     pass
 
@@ -38,7 +44,8 @@ class TournamentCircuitBreakerError(Exception):
 class BaseTournamentCircuitBreaker:
     """
     Base circuit breaker for tournament operations.
-    Adapted from finance circuit breaker with tournament-specific logic.
+    Breaker state lives in the shared registry (``apps.shared.circuit_breaker``);
+    this class adds per-operation rate limiting and the tournament API.
     """
     
     def __init__(
@@ -55,58 +62,53 @@ class BaseTournamentCircuitBreaker:
         self.timeout = timeout
         self.half_open_timeout = half_open_timeout
         
+        self.breaker = circuit_breaker_registry.get_or_create(
+            name,
+            namespace='tournaments',
+            failure_threshold=failure_threshold,
+            recovery_timeout=timeout,
+            success_threshold=success_threshold,
+        )
+        
         # Cache keys
-        self.state_key = f"tournament_cb_state_{name}"
-        self.failure_count_key = f"tournament_cb_failures_{name}"
-        self.success_count_key = f"tournament_cb_successes_{name}"
-        self.last_failure_time_key = f"tournament_cb_last_failure_{name}"
         self.rate_limit_key = f"tournament_cb_rate_limit_{name}"
     
     def get_state(self) -> str:
         """Get current circuit breaker state."""
-        return cache.get(self.state_key, 'closed')
+        return self.breaker.state.value
     
     def set_state(self, state: str):
         """Set circuit breaker state."""
-        cache.set(self.state_key, state, timeout=3600)  # 1 hour cache
+        self.breaker.state = CircuitState(state)
         logger.info(f"Tournament circuit breaker '{self.name}' state changed to: {state}")
     
     def get_failure_count(self) -> int:
         """Get current failure count."""
-        return cache.get(self.failure_count_key, 0)
+        return self.breaker.failure_count
     
     def increment_failure_count(self):
         """Increment failure count."""
-        current_failures = self.get_failure_count()
-        cache.set(self.failure_count_key, current_failures + 1, timeout=3600)
-        cache.set(self.last_failure_time_key, time.time(), timeout=3600)
-        
-        logger.warning(
-            f"Tournament circuit breaker '{self.name}' failure count: {current_failures + 1}"
-        )
+        self.breaker.record_failure()
     
     def get_success_count(self) -> int:
         """Get current success count in half-open state."""
-        return cache.get(self.success_count_key, 0)
+        return self.breaker.half_open_successes
     
     def increment_success_count(self):
         """Increment success count."""
-        current_successes = self.get_success_count()
-        cache.set(self.success_count_key, current_successes + 1, timeout=3600)
+        self.breaker.record_success()
     
     def reset_counts(self):
         """Reset all counts."""
-        cache.delete(self.failure_count_key)
-        cache.delete(self.success_count_key)
-        cache.delete(self.last_failure_time_key)
+        self.breaker.failure_count = 0
+        self.breaker.last_failure_time = None
     
     def should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset from open state."""
-        state = self.get_state()
-        if state != 'open':
+        if self.breaker.state is not CircuitState.OPEN:
             return False
         
-        last_failure_time = cache.get(self.last_failure_time_key, 0)
+        last_failure_time = self.breaker.last_failure_time or 0
         return time.time() - last_failure_time > self.timeout
     
     def check_rate_limit(self, operation_key: str, rate_limit: int, window_seconds: int = 60) -> bool:
@@ -144,19 +146,12 @@ class BaseTournamentCircuitBreaker:
             operation_key: Optional key for rate limiting
             rate_limit: Optional rate limit for this operation
         """
-        state = self.get_state()
-        
-        # Check if circuit breaker is open
-        if state == 'open':
-            if self.should_attempt_reset():
-                self.set_state('half_open')
-                self.reset_counts()
-                logger.info(f"Tournament circuit breaker '{self.name}' moved to half-open")
-            else:
-                logger.error(f"Tournament circuit breaker '{self.name}' is OPEN - blocking operation")
-                raise TournamentCircuitBreakerError(
-                    f"Tournament operation '{self.name}' temporarily unavailable"
-                )
+        # Check if circuit breaker is open (moves to half-open after timeout)
+        if not self.breaker.allow_request():
+            logger.error(f"Tournament circuit breaker '{self.name}' is OPEN - blocking operation")
+            raise TournamentCircuitBreakerError(
+                f"Tournament operation '{self.name}' temporarily unavailable"
+            )
         
         # Check rate limits if specified
         if operation_key and rate_limit:
@@ -166,45 +161,29 @@ class BaseTournamentCircuitBreaker:
                 )
         
         # Execute operation
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             yield
-            
-            # Operation succeeded
-            execution_time = time.time() - start_time
-            
-            if state == 'half_open':
-                self.increment_success_count()
-                if self.get_success_count() >= self.success_threshold:
-                    self.set_state('closed')
-                    self.reset_counts()
-                    logger.info(f"Tournament circuit breaker '{self.name}' CLOSED after recovery")
-            
-            logger.debug(
-                f"Tournament operation '{self.name}' succeeded in {execution_time:.3f}s"
-            )
-            
         except Exception as e:
             # Operation failed
-            execution_time = time.time() - start_time
-            self.increment_failure_count()
-            
-            if self.get_failure_count() >= self.failure_threshold:
-                self.set_state('open')
-                logger.error(
-                    f"Tournament circuit breaker '{self.name}' OPENED after "
-                    f"{self.get_failure_count()} failures"
-                )
-            
+            execution_time = time.perf_counter() - start_time
+            self.breaker.record_failure(e, execution_time * 1000)
             logger.error(
                 f"Tournament operation '{self.name}' failed in {execution_time:.3f}s: {e}"
             )
             raise
+        else:
+            # Operation succeeded
+            execution_time = time.perf_counter() - start_time
+            self.breaker.record_success(execution_time * 1000)
+            logger.debug(
+                f"Tournament operation '{self.name}' succeeded in {execution_time:.3f}s"
+            )
     
     def get_status(self) -> Dict[str, Any]:
         """Get circuit breaker status information."""
         state = self.get_state()
-        last_failure_time = cache.get(self.last_failure_time_key, 0)
+        last_failure_time = self.breaker.last_failure_time
         
         return {
             'name': self.name,
@@ -215,6 +194,7 @@ class BaseTournamentCircuitBreaker:
             'success_threshold': self.success_threshold,
             'last_failure_ago_seconds': int(time.time() - last_failure_time) if last_failure_time else None,
             'timeout_seconds': self.timeout,
+            'latency': self.breaker.latency.snapshot(),
             'healthy': state == 'closed'
         }
 
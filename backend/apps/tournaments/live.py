@@ -0,0 +1,401 @@
+"""
+Live tournament scores.
+
+Score and progression events are published to a per-tournament channel once
+the transaction that produced them commits, fanned out by a broker (Redis
+pub/sub across worker processes, in-process for tests and development) and
+pushed to spectators as server-sent events. Each subscriber only keeps the
+latest pending event per match, so a slow client skips stale scores instead
+of queueing them.
+
+Streams need an ASGI server (the deploy runs uvicorn workers). EventSource
+cannot send an Authorization header, so API clients fetch a short-lived
+signed watch token and pass it as ?token= to follow private tournaments.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from redis import asyncio as aioredis
+
+from .models import Match, Tournament
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "live:tournament:"
+TOKEN_SALT = "tournaments.live"
+
+
+def channel_name(tournament_id):
+    return f"{CHANNEL_PREFIX}{tournament_id}"
+
+
+def team_state(team):
+    if team is None:
+        return None
+    return {"id": str(team.id), "name": team.team_display_name}
+
+
+def match_state(match):
+    """Full state of a match, so any single event can replace the previous."""
+    return {
+        "id": str(match.id),
+        "round": match.round_number,
+        "number": match.match_number,
+        "status": match.status,
+        "team1": team_state(match.team1),
+        "team2": team_state(match.team2),
+        "team1_score": match.team1_score or [],
+        "team2_score": match.team2_score or [],
+        "winner": str(match.winner_id) if match.winner_id else None,
+    }
+
+
+def match_event(event_type, match):
+    return {
+        "type": event_type,
+        "key": f"match:{match.id}",
+        "tournament": str(match.tournament_id),
+        "at": timezone.now(),
+        "data": match_state(match),
+    }
+
+
+def tournament_event(event_type, tournament):
+    return {
+        "type": event_type,
+        "key": f"tournament:{tournament.id}",
+        "tournament": str(tournament.id),
+        "at": timezone.now(),
+        "data": {"id": str(tournament.id), "status": tournament.status},
+    }
+
+
+def publish(event):
+    """Publish an event once the current transaction commits."""
+    transaction.on_commit(lambda: _send(event))
+
+
+def publish_match(match, event_type="match.score"):
+    publish(match_event(event_type, match))
+
+
+def publish_tournament(tournament, event_type):
+    publish(tournament_event(event_type, tournament))
+
+
+def _send(event):
+    # Spectators are best effort: a broker outage must not fail the write
+    try:
+        get_broker().publish(channel_name(event["tournament"]), encode(event))
+    except Exception as e:
+        logger.warning(f"Could not publish live event {event['type']}: {e}")
+
+
+def encode(event):
+    return json.dumps(event, cls=DjangoJSONEncoder)
+
+
+class Subscription:
+    """
+    Pending events of one subscriber, coalesced by key.
+
+    push() may be called from any thread; get() runs on the event loop the
+    subscription was created on.
+    """
+
+    def __init__(self, channel, keys=None):
+        self.channel = channel
+        self.keys = keys
+        self.coalesced = 0
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def push(self, event):
+        """Buffer an event, replacing the pending one with the same key."""
+        key = event["key"]
+        if self.keys is not None and key not in self.keys:
+            return
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+            self._pending[key] = event
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The stream already ended and its loop is closed
+            pass
+
+    def seed(self, events):
+        """Buffer initial state without overwriting newer pending events."""
+        with self._lock:
+            for event in events:
+                if self.keys is None or event["key"] in self.keys:
+                    self._pending.setdefault(event["key"], event)
+            if self._pending:
+                self._ready.set()
+
+    async def get(self, timeout=None):
+        """Wait for pending events and drain them; [] when the wait times out."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        with self._lock:
+            self._ready.clear()
+            events = list(self._pending.values())
+            self._pending.clear()
+        return events
+
+
+class InMemoryBroker:
+    """Fans events out to the subscribers of the current process."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.dispatch(channel, message)
+
+    def dispatch(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        if not subscribers:
+            return
+        event = json.loads(message)
+        for subscription in subscribers:
+            subscription.push(event)
+
+    async def subscribe(self, channel, keys=None):
+        subscription = Subscription(channel, keys)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+class RedisBroker(InMemoryBroker):
+    """
+    Publishes through Redis pub/sub so every worker process sees every event.
+
+    Each process keeps a single pattern subscription and relays messages to
+    its local subscribers, so Redis connections don't grow with spectators.
+    """
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._relay = None
+
+    def publish(self, channel, message):
+        if self._client is None:
+            self._client = redis.from_url(self.url)
+        self._client.publish(channel, message)
+
+    async def subscribe(self, channel, keys=None):
+        subscription = await super().subscribe(channel, keys)
+        loop = asyncio.get_running_loop()
+        if self._relay is None or self._relay.done() or self._relay.get_loop() is not loop:
+            self._relay = loop.create_task(self._listen())
+        return subscription
+
+    async def _listen(self):
+        while True:
+            client = aioredis.from_url(self.url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        self.dispatch(message["channel"].decode(), message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live scores relay lost Redis, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+_brokers = {}
+
+
+def get_broker():
+    """Broker configured by LIVE_SCORES_BROKER ("redis" or "memory")."""
+    backend = getattr(settings, "LIVE_SCORES_BROKER", "redis")
+    if backend not in _brokers:
+        if backend == "redis":
+            _brokers[backend] = RedisBroker(settings.REDIS_URL)
+        else:
+            _brokers[backend] = InMemoryBroker()
+    return _brokers[backend]
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {encode(event)}\n\n"
+
+
+def can_watch(user, tournament):
+    if tournament.visibility == "public":
+        return True
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser or tournament.organizer_id == user.id:
+        return True
+    organization = user.organization
+    if organization is not None and organization.id == tournament.organization_id:
+        return True
+    return tournament.registrations.filter(
+        Q(player1__user=user) | Q(player2__user=user)
+    ).exists()
+
+
+def watch_token(user, tournament):
+    """Signed token that opens the stream of ``tournament`` as ``user``."""
+    return signing.dumps(
+        {"user": str(user.pk), "tournament": str(tournament.id)}, salt=TOKEN_SALT
+    )
+
+
+def token_user(token, tournament):
+    """
+    The active user a watch token was issued to; None when the token is
+    invalid, expired (LIVE_SCORES_TOKEN_MAX_AGE) or for another tournament.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=TOKEN_SALT,
+            max_age=getattr(settings, "LIVE_SCORES_TOKEN_MAX_AGE", 300),
+        )
+    except signing.BadSignature:
+        return None
+    if payload.get("tournament") != str(tournament.id):
+        return None
+    return get_user_model().objects.filter(pk=payload.get("user"), is_active=True).first()
+
+
+def current_state(tournament, match_id=None):
+    """State events of the matches being played right now."""
+    matches = Match.objects.filter(tournament=tournament, status="in_progress")
+    if match_id:
+        matches = Match.objects.filter(tournament=tournament, id=match_id)
+    matches = matches.select_related(
+        "team1__player1__user",
+        "team1__player2__user",
+        "team2__player1__user",
+        "team2__player2__user",
+    ).order_by("round_number", "match_number")
+    return [match_event("match.state", match) for match in matches]
+
+
+async def stream_events(tournament, match_id=None):
+    """
+    Yield server-sent events for a tournament until the stream lifetime ends.
+
+    Streams are closed after LIVE_SCORES_MAX_STREAM_SECONDS so that
+    disconnected clients release their subscription; EventSource reconnects
+    on its own and receives the current state again.
+    """
+    broker = get_broker()
+    keys = None
+    if match_id:
+        keys = {f"match:{match_id}", f"tournament:{tournament.id}"}
+    keepalive = getattr(settings, "LIVE_SCORES_KEEPALIVE_SECONDS", 15)
+    coalesce = getattr(settings, "LIVE_SCORES_COALESCE_SECONDS", 0.5)
+    deadline = time.monotonic() + getattr(settings, "LIVE_SCORES_MAX_STREAM_SECONDS", 300)
+
+    # Subscribe before reading the state so nothing committed in between is lost
+    subscription = await broker.subscribe(channel_name(tournament.id), keys)
+    try:
+        subscription.seed(await sync_to_async(current_state)(tournament, match_id))
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            events = await subscription.get(timeout=min(keepalive, remaining))
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield format_event(event)
+            # Updates arriving meanwhile collapse into one per match
+            await asyncio.sleep(coalesce)
+    finally:
+        await broker.unsubscribe(subscription)
+
+
+async def tournament_stream(request, tournament_id):
+    """
+    Stream live scores of a tournament as server-sent events.
+
+    ?token=<watch token> authenticates API clients, ?match=<id> restricts the
+    stream to one match.
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would buffer the whole stream before sending a byte
+        return HttpResponse("Live scores need an ASGI server", status=501)
+
+    tournament = await Tournament.objects.filter(id=tournament_id, is_active=True).afirst()
+    if tournament is None:
+        raise Http404("Tournament not found")
+    user = request.user
+    token = request.GET.get("token")
+    if token:
+        user = await sync_to_async(token_user)(token, tournament)
+        if user is None:
+            raise PermissionDenied("Invalid or expired watch token")
+    if not await sync_to_async(can_watch)(user, tournament):
+        raise Http404("Tournament not found")
+
+    match_id = request.GET.get("match")
+    if match_id:
+        try:
+            match_id = uuid.UUID(match_id)
+        except ValueError:
+            raise Http404("Match not found")
+
+    response = StreamingHttpResponse(
+        stream_events(tournament, match_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
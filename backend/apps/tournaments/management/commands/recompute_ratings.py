@@ -0,0 +1,42 @@
+"""
+Django management command to recompute player ratings from match history.
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from apps.root.models import Organization
+from apps.tournaments.ratings import replay
+
+
+class Command(BaseCommand):
+    help = "Replays every rated match to recompute player ratings, e.g. after a rules change"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            action="append",
+            dest="organizations",
+            type=uuid.UUID,
+            help="Only recompute the organization with this ID (repeatable)",
+        )
+        parser.add_argument(
+            "--category", type=uuid.UUID, help="Only recompute this tournament category ID"
+        )
+
+    def handle(self, *args, **options):
+        organizations = Organization.objects.all()
+        if options["organizations"]:
+            organizations = organizations.filter(id__in=options["organizations"])
+
+        started = time.monotonic()
+        rated = 0
+        for organization_id in organizations.values_list("id", flat=True):
+            rated += replay(organization_id, options["category"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {rated} matches in {time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:50
+#
+# Tournament.confirmed_teams is the seat counter of RegistrationService;
+# start it from the confirmed registrations already stored.
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_confirmed_teams(apps, schema_editor):
+    Tournament = apps.get_model("tournaments", "Tournament")
+
+    counts = Tournament.objects.annotate(
+        confirmed=Count("registrations", filter=Q(registrations__status="confirmed"))
+    ).filter(confirmed__gt=0)
+    for tournament_id, confirmed in counts.values_list("id", "confirmed"):
+        Tournament.objects.filter(id=tournament_id).update(confirmed_teams=confirmed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='confirmed_teams',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_confirmed_teams, migrations.RunPython.noop),
+    ]
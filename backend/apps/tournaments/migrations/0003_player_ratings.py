@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0002_tournament_confirmed_teams'),
+        ('clients', '0001_initial'),
+        ('root', '0003_auditlog_keyset_index'),
+        ('clubs', '0006_clubdashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerRating',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='root.organization')),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_set', to='clubs.club')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_ratings', to='clients.clientprofile')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_ratings', to='tournaments.tournamentcategory')),
+                ('rating', models.FloatField()),
+                ('matches_played', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['category', '-rating'],
+                'unique_together': {('organization', 'category', 'player')},
+            },
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='rated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
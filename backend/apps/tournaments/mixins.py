@@ -22,6 +22,8 @@ from django.db.models import Q, F, Sum, Count
 from django.utils import timezone
 from django.conf import settings
 
+from core.conditional import tracked_update
+
 # Configure tournament logger with highest severity
 logger = logging.getLogger('tournaments.critical')
 
@@ -419,27 +421,18 @@ class TournamentSafetyMixin:
     
     def _register_team_atomic(self, tournament, operation_data: Dict[str, Any], user):
         """Atomically register a team for the tournament."""
-        from apps.tournaments.models import TournamentRegistration
-        from apps.clients.models import ClientProfile
+        from apps.tournaments.services import RegistrationService
         
         with transaction.atomic():
-            # Lock tournament to prevent race conditions
-            locked_tournament = tournament.__class__.objects.select_for_update().get(id=tournament.id)
-            
-            # Double-check capacity after lock
-            if locked_tournament.is_full:
-                raise ValidationError("Tournament reached capacity during registration")
-            
-            # Create registration
-            registration = TournamentRegistration.objects.create(
-                tournament=locked_tournament,
+            # Seat taken with a conditional UPDATE, waitlisted when full
+            registration = RegistrationService.register(
+                tournament,
                 team_name=operation_data['team_name'],
                 player1_id=operation_data['player1'],
                 player2_id=operation_data['player2'],
                 contact_email=operation_data['contact_email'],
                 contact_phone=operation_data.get('contact_phone', ''),
                 notes=operation_data.get('notes', ''),
-                status='pending' if tournament.requires_approval else 'confirmed'
             )
             
             logger.info(f"Team registered: {registration.team_display_name} in tournament {tournament.id}")
@@ -547,10 +540,10 @@ class TournamentSafetyMixin:
             locked_tournament.save()
             
             # Mark all registrations as cancelled
-            locked_tournament.registrations.update(status='cancelled')
+            tracked_update(locked_tournament.registrations.all(), status='cancelled')
             
             # Cancel all scheduled matches
-            locked_tournament.matches.update(status='cancelled')
+            tracked_update(locked_tournament.matches.all(), status='cancelled')
             
             logger.info(f"Tournament {tournament.id} cancelled: {reason}")
     
@@ -166,6 +166,8 @@ class Tournament(MultiTenantModel):
     min_teams = models.IntegerField(
         default=4, validators=[MinValueValidator(2), MaxValueValidator(64)]
     )
+    # Seats taken by confirmed registrations, kept by RegistrationService
+    confirmed_teams = models.IntegerField(default=0, editable=False)
 
     # Registration Settings
     registration_fee = models.DecimalField(
@@ -220,6 +222,17 @@ class Tournament(MultiTenantModel):
     def __str__(self):
         return f"{self.name} - {self.start_date}"
 
+    def save(self, *args, **kwargs):
+        # confirmed_teams is owned by RegistrationService's conditional
+        # UPDATEs; a full save of a stale instance must not write it back
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "confirmed_teams"
+            ]
+        super().save(*args, **kwargs)
+
     def clean(self):
         if self.start_date > self.end_date:
             raise ValidationError("Start date cannot be after end date")
@@ -247,7 +260,7 @@ class Tournament(MultiTenantModel):
     @property
     def is_full(self):
         """Check if tournament is at capacity."""
-        return self.current_teams_count >= self.max_teams
+        return self.confirmed_teams >= self.max_teams
 
     @property
     def can_start(self):
@@ -403,13 +416,11 @@ class TournamentRegistration(BaseModel):
         )
 
     def confirm_registration(self):
-        """Confirm the registration."""
-        if self.status == "pending":
-            if self.tournament.is_full:
-                self.status = "waitlist"
-            else:
-                self.status = "confirmed"
-            self.save()
+        """Confirm the registration, or waitlist it when the tournament is full."""
+        from .services import RegistrationService
+
+        # The service re-checks the status under a row lock
+        RegistrationService.confirm(self)
 
 
 class TournamentBracket(BaseModel):
@@ -561,6 +572,9 @@ class Match(MultiTenantModel):
     notes = models.TextField(blank=True)
     walkover_reason = models.TextField(blank=True)
 
+    # Set once the result has been applied to player ratings
+    rated_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ["tournament", "round_number", "match_number"]
         unique_together = ["tournament", "round_number", "match_number"]
@@ -638,6 +652,32 @@ class Match(MultiTenantModel):
             self.determine_winner()
 
 
+class PlayerRating(MultiTenantModel):
+    """
+    Result-based rating of a player within a tournament category.
+    Maintained by apps.tournaments.ratings from match history, starting from
+    the player's ClientProfile.rating.
+    """
+
+    player = models.ForeignKey(
+        "clients.ClientProfile",
+        on_delete=models.CASCADE,
+        related_name="category_ratings",
+    )
+    category = models.ForeignKey(
+        TournamentCategory, on_delete=models.CASCADE, related_name="player_ratings"
+    )
+    rating = models.FloatField()
+    matches_played = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["category", "-rating"]
+        unique_together = ["organization", "category", "player"]
+
+    def __str__(self):
+        return f"{self.player} - {self.category.name}: {self.rating:.0f}"
+
+
 class Prize(BaseModel):
     """
     Prize structure for tournaments.
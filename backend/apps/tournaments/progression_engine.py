@@ -8,6 +8,7 @@ from django.db import transaction
 from django.db.models import Q, F, Sum, Count
 from django.utils import timezone
 
+from .live import publish_match, publish_tournament
 from .models import (
     Tournament, Match, TournamentRegistration, 
     Bracket, BracketNode, Prize
@@ -47,6 +48,7 @@ class ProgressionEngine:
             match.duration_minutes = duration
         
         match.save()
+        publish_match(match, "match.completed")
         
         # Handle different tournament formats
         if self.tournament.format == 'elimination':
@@ -95,6 +97,7 @@ class ProgressionEngine:
                 else:
                     next_node.match.team2 = winner
                 next_node.match.save()
+            publish_match(next_node.match, "match.advanced")
             
             return next_node
         else:
@@ -452,11 +455,13 @@ class ProgressionEngine:
             elif node.match.team2 is None:
                 node.match.team2 = team
             node.match.save()
+        publish_match(node.match, "match.advanced")
     
     def _complete_tournament(self, winner: TournamentRegistration):
         """Mark tournament as completed and assign prizes."""
         self.tournament.status = 'completed'
         self.tournament.save()
+        publish_tournament(self.tournament, "tournament.completed")
         
         # Award prizes
         standings = self.calculate_standings()
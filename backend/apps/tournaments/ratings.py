@@ -0,0 +1,277 @@
+"""
+Elo rating engine for tournament players.
+
+Ratings are kept per organization and tournament category in numpy arrays
+indexed by player. Results are applied in layers of matches that share no
+player: a layer is rated in a single vectorized step, and because a match
+always lands in a later layer than every earlier match of its players the
+outcome is identical to rating the results one by one in chronological
+order. Replaying the whole match history is therefore cheap enough to run
+after any rules change; new results are applied incrementally in between.
+"""
+
+import logging
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.clients.models import ClientProfile
+
+from .models import Match, PlayerRating
+
+logger = logging.getLogger(__name__)
+
+# Same bounds as ClientProfile.rating
+RATING_MIN = 0
+RATING_MAX = 1000
+
+RESULT_FIELDS = (
+    "id",
+    "organization_id",
+    "tournament__category_id",
+    "team1__player1_id",
+    "team1__player2_id",
+    "team2__player1_id",
+    "team2__player2_id",
+    "team1_id",
+    "winner_id",
+)
+
+
+def rated_matches(organization_id=None, category_id=None):
+    """Completed matches that count for ratings, in the order they are rated."""
+    matches = Match.objects.filter(
+        status="completed",
+        winner__isnull=False,
+        team1__isnull=False,
+        team2__isnull=False,
+        tournament__category__isnull=False,
+    )
+    if organization_id is not None:
+        matches = matches.filter(organization_id=organization_id)
+    if category_id is not None:
+        matches = matches.filter(tournament__category_id=category_id)
+    return matches.annotate(
+        played_at=Coalesce("actual_end_time", "scheduled_date")
+    ).order_by("played_at", "round_number", "match_number", "id")
+
+
+def match_layers(teams):
+    """
+    Assign each match the earliest layer after the previous matches of its
+    players; matches within a layer are player-disjoint.
+    """
+    next_layer = defaultdict(int)
+    layers = np.empty(len(teams), dtype=np.int64)
+    for position, players in enumerate(teams.tolist()):
+        layer = max(next_layer[player] for player in players)
+        layers[position] = layer
+        for player in players:
+            next_layer[player] = layer + 1
+    return layers
+
+
+def apply_results(ratings, played, teams, team1_won):
+    """
+    Rate matches in place.
+
+    teams holds one row of array indexes per match (team1 players, then
+    team2 players), team1_won one boolean per match, in chronological order.
+    """
+    if not len(teams):
+        return
+    k_factor = getattr(settings, "RATING_K_FACTOR", 16)
+    provisional_k = getattr(settings, "RATING_PROVISIONAL_K_FACTOR", 32)
+    provisional_matches = getattr(settings, "RATING_PROVISIONAL_MATCHES", 10)
+    scale = getattr(settings, "RATING_SCALE", 200)
+
+    layers = match_layers(teams)
+    order = np.argsort(layers, kind="stable")
+    bounds = np.flatnonzero(np.diff(layers[order])) + 1
+    score = team1_won.astype(np.float64)
+
+    for batch in np.split(order, bounds):
+        players = teams[batch]
+        current = ratings[players]
+        gap = current[:, 2:].mean(axis=1) - current[:, :2].mean(axis=1)
+        expected = 1.0 / (1.0 + 10.0 ** (gap / scale))
+        delta = (score[batch] - expected)[:, None] * np.array([1.0, 1.0, -1.0, -1.0])
+        k = np.where(played[players] < provisional_matches, provisional_k, k_factor)
+        ratings[players] = np.clip(current + k * delta, RATING_MIN, RATING_MAX)
+        played[players] += 1
+
+
+class RatingEngine:
+    """
+    Ratings of one organization's players in one category.
+
+    Players are added to the arrays on demand, from their stored
+    PlayerRating or, when they have none yet, from ClientProfile.rating.
+    """
+
+    def __init__(self, organization_id, category_id):
+        self.organization_id = organization_id
+        self.category_id = category_id
+        self.index = {}
+        self.player_ids = []
+        self.ratings = np.empty(0, dtype=np.float64)
+        self.played = np.empty(0, dtype=np.int64)
+
+    def load(self, player_ids, fresh=False):
+        """Add players to the arrays; fresh ignores stored ratings."""
+        new = list(dict.fromkeys(p for p in player_ids if p not in self.index))
+        if not new:
+            return
+
+        stored = {}
+        if not fresh and self.category_id is not None:
+            stored = {
+                player_id: (rating, played)
+                for player_id, rating, played in PlayerRating.objects.filter(
+                    organization_id=self.organization_id,
+                    category_id=self.category_id,
+                    player_id__in=new,
+                ).values_list("player_id", "rating", "matches_played")
+            }
+        missing = [p for p in new if p not in stored]
+        priors = dict(
+            ClientProfile.objects.filter(id__in=missing).values_list("id", "rating")
+        )
+
+        ratings = np.empty(len(new), dtype=np.float64)
+        played = np.zeros(len(new), dtype=np.int64)
+        for position, player_id in enumerate(new):
+            if player_id in stored:
+                ratings[position], played[position] = stored[player_id]
+            else:
+                ratings[position] = priors[player_id]
+            self.index[player_id] = len(self.player_ids)
+            self.player_ids.append(player_id)
+        self.ratings = np.concatenate([self.ratings, ratings])
+        self.played = np.concatenate([self.played, played])
+
+    def lookup(self, player_ids):
+        """Ratings of the given players, in the same order."""
+        self.load(player_ids)
+        return self.ratings[[self.index[p] for p in player_ids]]
+
+    def process(self, results, fresh=False):
+        """Apply results given as rows of RESULT_FIELDS, oldest first."""
+        if not results:
+            return
+        players = [row[3:7] for row in results]
+        self.load([p for row in players for p in row], fresh=fresh)
+        teams = np.array(
+            [[self.index[p] for p in row] for row in players], dtype=np.int64
+        ).reshape(-1, 4)
+        team1_won = np.array([row[8] == row[7] for row in results], dtype=bool)
+        apply_results(self.ratings, self.played, teams, team1_won)
+
+    def save(self, replace=False):
+        """
+        Write the arrays back to PlayerRating; replace also drops the
+        ratings of players that no longer have any rated match.
+        """
+        rows = PlayerRating.objects.filter(
+            organization_id=self.organization_id, category_id=self.category_id
+        )
+        if not replace:
+            rows = rows.filter(player_id__in=self.player_ids)
+        existing = {row.player_id: row for row in rows}
+        now = timezone.now()
+        changed, created = [], []
+        for player_id, rating, played in zip(
+            self.player_ids, self.ratings.tolist(), self.played.tolist()
+        ):
+            row = existing.pop(player_id, None)
+            if row is None:
+                created.append(
+                    PlayerRating(
+                        organization_id=self.organization_id,
+                        category_id=self.category_id,
+                        player_id=player_id,
+                        rating=rating,
+                        matches_played=played,
+                    )
+                )
+            elif (row.rating, row.matches_played) != (rating, played):
+                row.rating, row.matches_played, row.updated_at = rating, played, now
+                changed.append(row)
+
+        batch_size = getattr(settings, "RATING_BULK_BATCH_SIZE", 1000)
+        PlayerRating.objects.bulk_update(
+            changed, ["rating", "matches_played", "updated_at"], batch_size=batch_size
+        )
+        PlayerRating.objects.bulk_create(created, batch_size=batch_size)
+        if replace and existing:
+            PlayerRating.objects.filter(id__in=[row.id for row in existing.values()]).delete()
+        return len(changed) + len(created)
+
+
+def _by_category(results):
+    groups = defaultdict(list)
+    for row in results:
+        groups[(row[1], row[2])].append(row)
+    return groups
+
+
+def _mark_rated(match_ids, now):
+    batch_size = getattr(settings, "RATING_BULK_BATCH_SIZE", 1000)
+    for start in range(0, len(match_ids), batch_size):
+        Match.objects.filter(id__in=match_ids[start : start + batch_size]).update(
+            rated_at=now
+        )
+
+
+@transaction.atomic
+def replay(organization_id, category_id=None):
+    """
+    Recompute ratings from the full match history, e.g. after changing the
+    rating rules. Returns the number of matches rated.
+    """
+    results = list(rated_matches(organization_id, category_id).values_list(*RESULT_FIELDS))
+    groups = _by_category(results)
+    categories = set(
+        PlayerRating.objects.filter(organization_id=organization_id)
+        .values_list("category_id", flat=True)
+        .distinct()
+    )
+    if category_id is not None:
+        categories &= {category_id}
+
+    for category in categories | {category for _, category in groups}:
+        engine = RatingEngine(organization_id, category)
+        engine.process(groups.get((organization_id, category), []), fresh=True)
+        engine.save(replace=True)
+
+    _mark_rated([row[0] for row in results], timezone.now())
+    logger.info(f"Replayed {len(results)} matches for organization {organization_id}")
+    return len(results)
+
+
+@transaction.atomic
+def apply_pending(organization_id=None):
+    """
+    Rate completed matches that have not been rated yet, oldest first.
+    Returns the number of matches rated.
+    """
+    pending = rated_matches(organization_id).filter(rated_at__isnull=True)
+    match_ids = list(
+        Match.objects.select_for_update(skip_locked=True)
+        .filter(id__in=pending.values("id"))
+        .values_list("id", flat=True)
+    )
+    results = list(
+        rated_matches(organization_id).filter(id__in=match_ids).values_list(*RESULT_FIELDS)
+    )
+    for (organization, category), rows in _by_category(results).items():
+        engine = RatingEngine(organization, category)
+        engine.process(rows)
+        engine.save()
+
+    _mark_rated([row[0] for row in results], timezone.now())
+    return len(results)
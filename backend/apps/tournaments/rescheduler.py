@@ -9,11 +9,12 @@ from typing import List, Dict, Tuple, Optional, Set
 from dataclasses import dataclass
 
 from django.utils import timezone
-from django.db import transaction
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 
 from .models import League, LeagueMatch, ScheduleConstraint, ScheduleOptimization
 from .league_scheduler import LeagueScheduler
+from .slot_assignment import SlotAssignmentSolver
 
 logger = logging.getLogger(__name__)
 
@@ -121,39 +122,22 @@ class MatchRescheduler:
                 # Sort matches by priority
                 prioritized_matches = self._prioritize_matches_for_rescheduling(matches, reason)
                 
-                # Find alternative slots for all matches
-                match_alternatives = {}
-                for match in prioritized_matches:
-                    alternatives = self._find_alternative_slots(match, reason)
-                    if alternatives:
-                        match_alternatives[match] = alternatives
-                    else:
-                        results["failed_to_reschedule"].append(match)
-                
-                # Optimize global assignment
-                optimal_assignments = self._optimize_bulk_assignment(match_alternatives, reason)
+                # Score every match against one shared slot pool and solve globally
+                slots = self._generate_candidate_slots(reason)
+                optimal_assignments, unplaceable = self._solve_assignment(
+                    prioritized_matches, slots, reason
+                )
+                results["failed_to_reschedule"].extend(unplaceable)
                 
                 # Apply assignments
-                for match, slot in optimal_assignments.items():
-                    try:
-                        original_datetime = match.scheduled_datetime
-                        original_court = match.court
-                        
-                        match.scheduled_datetime = slot.datetime
-                        match.court = slot.court
-                        match.status = "scheduled"
-                        match.save()
-                        
-                        self._log_reschedule(match, original_datetime, original_court, reason, slot)
-                        results["successfully_rescheduled"].append(match)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to apply assignment for match {match.id}: {str(e)}")
-                        results["requires_manual_intervention"].append(match)
+                self._apply_assignments(optimal_assignments, reason)
+                results["successfully_rescheduled"].extend(optimal_assignments)
                 
                 # Handle unassigned matches
-                unassigned = set(match_alternatives.keys()) - set(optimal_assignments.keys())
-                results["requires_manual_intervention"].extend(unassigned)
+                results["requires_manual_intervention"].extend(
+                    match for match in prioritized_matches
+                    if match not in optimal_assignments and match not in unplaceable
+                )
                 
         except Exception as e:
             logger.error(f"Bulk reschedule failed: {str(e)}")
@@ -199,11 +183,14 @@ class MatchRescheduler:
             affects_multiple=True
         )
         
+        # Load before postponing: the status filter no longer matches afterwards
+        matches = list(affected_matches.select_related('home_team', 'away_team', 'court'))
+        
         # Set matches as postponed first
-        affected_matches.update(status="postponed")
+        LeagueMatch.objects.filter(id__in=[match.id for match in matches]).update(status="postponed")
         
         # Attempt to reschedule
-        return self.bulk_reschedule(list(affected_matches), reason)
+        return self.bulk_reschedule(matches, reason)
     
     def compress_schedule(
         self, 
@@ -216,11 +203,13 @@ class MatchRescheduler:
         logger.info(f"Compressing schedule to end by {target_end_date}")
         
         # Get all remaining matches
-        remaining_matches = LeagueMatch.objects.filter(
-            league=self.league,
-            status__in=["scheduled", "postponed"],
-            scheduled_datetime__date__gt=timezone.now().date()
-        ).order_by('scheduled_datetime')
+        remaining_matches = list(
+            LeagueMatch.objects.filter(
+                league=self.league,
+                status__in=["scheduled", "postponed"],
+                scheduled_datetime__date__gt=timezone.now().date()
+            ).select_related('home_team', 'away_team', 'court').order_by('scheduled_datetime')
+        )
         
         if not remaining_matches:
             return True
@@ -241,14 +230,16 @@ class MatchRescheduler:
                     return False
                 
                 # Assign matches to slots
-                assignments = self._optimize_compressed_assignment(remaining_matches, available_slots)
+                reason = RescheduleReason(
+                    type="compression",
+                    description=f"Schedule compressed to end by {target_end_date}",
+                    priority=3,
+                    affects_multiple=True
+                )
+                assignments, _ = self._solve_assignment(remaining_matches, available_slots, reason)
                 
                 # Apply assignments
-                for match, slot in assignments.items():
-                    match.scheduled_datetime = slot.datetime
-                    match.court = slot.court
-                    match.status = "scheduled"
-                    match.save()
+                self._apply_assignments(assignments, reason)
                 
                 logger.info(f"Successfully compressed {len(assignments)} matches")
                 return True
@@ -305,8 +296,8 @@ class MatchRescheduler:
             with transaction.atomic():
                 # Find all matches involving this team
                 team_matches = LeagueMatch.objects.filter(
-                    league=self.league,
                     models.Q(home_team=team) | models.Q(away_team=team),
+                    league=self.league,
                     status__in=["scheduled", "postponed"]
                 )
                 
@@ -580,35 +571,110 @@ class MatchRescheduler:
         
         return sorted(matches, key=priority_key, reverse=True)
     
-    def _optimize_bulk_assignment(
-        self, 
-        match_alternatives: Dict[LeagueMatch, List[AlternativeSlot]], 
-        reason: RescheduleReason
-    ) -> Dict[LeagueMatch, AlternativeSlot]:
-        """Optimize assignment of matches to slots globally."""
-        # This is a simplified assignment algorithm
-        # In practice, this could use more sophisticated optimization
-        
-        assignments = {}
-        used_slots = set()
-        
-        # Sort matches by number of available alternatives (least flexible first)
-        sorted_matches = sorted(
-            match_alternatives.items(),
-            key=lambda x: len(x[1])
+    def _generate_candidate_slots(self, reason: RescheduleReason) -> List[AlternativeSlot]:
+        """Generate the slot pool shared by every match in a bulk reschedule."""
+        slots = []
+        end_date = reason.deadline.date() if reason.deadline else self.league.end_date
+        current_date = timezone.now().date() + timedelta(days=1)
+        
+        while current_date <= end_date:
+            if self.scheduler._is_date_allowed(current_date):
+                for slot_data in self.scheduler._generate_date_time_slots(current_date):
+                    slots.append(AlternativeSlot(
+                        datetime=slot_data['datetime'],
+                        court=slot_data.get('court'),
+                        quality_score=slot_data['quality_score']
+                    ))
+            
+            current_date += timedelta(days=1)
+        
+        return slots
+    
+    def _load_team_commitments(
+        self,
+        matches: List[LeagueMatch],
+        slots: List[AlternativeSlot],
+        min_rest_hours: int
+    ) -> Tuple[Dict, Set]:
+        """
+        Preload, in two queries, the existing matches of every team involved
+        and the courts already taken in the slot window.
+        """
+        moving_ids = [match.id for match in matches]
+        team_ids = {match.home_team_id for match in matches} | {match.away_team_id for match in matches}
+        window_start = min(slot.datetime for slot in slots) - timedelta(hours=min_rest_hours)
+        window_end = max(slot.datetime for slot in slots) + timedelta(hours=min_rest_hours)
+        
+        commitments = {team_id: [] for team_id in team_ids}
+        team_matches = LeagueMatch.objects.filter(
+            models.Q(home_team_id__in=team_ids) | models.Q(away_team_id__in=team_ids),
+            scheduled_datetime__range=(window_start, window_end),
+            status__in=["scheduled", "completed", "in_progress"]
+        ).exclude(id__in=moving_ids).values_list('home_team_id', 'away_team_id', 'scheduled_datetime')
+        
+        for home_team_id, away_team_id, scheduled in team_matches:
+            for team_id in (home_team_id, away_team_id):
+                if team_id in commitments:
+                    commitments[team_id].append(scheduled)
+        
+        occupied = set(
+            LeagueMatch.objects.filter(
+                scheduled_datetime__range=(window_start, window_end),
+                court__isnull=False,
+                status__in=["scheduled", "in_progress"]
+            ).exclude(id__in=moving_ids).values_list('scheduled_datetime', 'court_id')
         )
         
-        for match, alternatives in sorted_matches:
-            # Find best available slot
-            for alt in alternatives:
-                slot_key = (alt.datetime, alt.court)
-                
-                if slot_key not in used_slots:
-                    assignments[match] = alt
-                    used_slots.add(slot_key)
-                    break
+        return commitments, occupied
+    
+    def _solve_assignment(
+        self,
+        matches: List[LeagueMatch],
+        slots: List[AlternativeSlot],
+        reason: RescheduleReason,
+        min_rest_hours: int = 48
+    ) -> Tuple[Dict[LeagueMatch, AlternativeSlot], List[LeagueMatch]]:
+        """
+        Optimal global assignment of matches to slots (Hungarian algorithm
+        over a match x slot cost matrix built from preloaded commitments).
         
-        return assignments
+        Returns ``(assignments, unplaceable)``.
+        """
+        if not matches or not slots:
+            return {}, list(matches)
+        
+        commitments, occupied = self._load_team_commitments(matches, slots, min_rest_hours)
+        solver = SlotAssignmentSolver(
+            slots,
+            commitments=commitments,
+            occupied=occupied,
+            min_rest_hours=min_rest_hours,
+            hard_rest=reason.priority <= 2,  # Critical or high priority
+            prefer_sooner=reason.priority <= 2,
+            today=timezone.now().date()
+        )
+        return solver.solve(matches)
+    
+    def _apply_assignments(
+        self,
+        assignments: Dict[LeagueMatch, AlternativeSlot],
+        reason: RescheduleReason
+    ):
+        """Write all new slots in one bulk update and log the moves together."""
+        if not assignments:
+            return
+        
+        moves = []
+        for match, slot in assignments.items():
+            moves.append((match, match.scheduled_datetime, match.court, slot))
+            match.scheduled_datetime = slot.datetime
+            match.court = slot.court
+            match.status = "scheduled"
+        
+        LeagueMatch.objects.bulk_update(
+            list(assignments), ['scheduled_datetime', 'court', 'status'], batch_size=500
+        )
+        self._log_reschedules(moves, reason)
     
     def _generate_compressed_slots(
         self, 
@@ -642,10 +708,10 @@ class MatchRescheduler:
         slot_duration = timedelta(minutes=90)  # Match duration
         slot_interval = timedelta(minutes=45)  # Reduced interval
         
+        available_courts = self.scheduler._get_available_courts(date)
+        
         slot_count = 0
         while current_time + slot_duration <= end_time and slot_count < max_slots:
-            available_courts = self.scheduler._get_available_courts(date)
-            
             for court in available_courts:
                 if slot_count >= max_slots:
                     break
@@ -662,42 +728,6 @@ class MatchRescheduler:
         
         return slots
     
-    def _optimize_compressed_assignment(
-        self, 
-        matches: List[LeagueMatch], 
-        slots: List[AlternativeSlot]
-    ) -> Dict[LeagueMatch, AlternativeSlot]:
-        """Optimize assignment for compressed schedule."""
-        # Simple greedy assignment for now
-        assignments = {}
-        used_slots = set()
-        
-        for match in matches:
-            best_slot = None
-            best_score = float('-inf')
-            
-            for slot in slots:
-                slot_key = (slot.datetime, slot.court)
-                if slot_key in used_slots:
-                    continue
-                
-                # Score this assignment
-                score = slot.quality_score
-                
-                # Prefer slots that don't conflict with team constraints
-                conflicts = self._check_slot_conflicts(slot.datetime, slot.court, match)
-                score -= len(conflicts) * 50
-                
-                if score > best_score:
-                    best_score = score
-                    best_slot = slot
-            
-            if best_slot:
-                assignments[match] = best_slot
-                used_slots.add((best_slot.datetime, best_slot.court))
-        
-        return assignments
-    
     def _log_reschedule(
         self, 
         match: LeagueMatch, 
@@ -714,6 +744,17 @@ class MatchRescheduler:
             f"Reason: {reason.description}"
         )
     
+    def _log_reschedules(self, moves: List[Tuple], reason: RescheduleReason):
+        """Log a batch of rescheduling actions as a single record."""
+        lines = [
+            f"Match {match.id} moved from {original_datetime} at {original_court} "
+            f"to {slot.datetime} at {slot.court}"
+            for match, original_datetime, original_court, slot in moves
+        ]
+        logger.info(
+            f"RESCHEDULE: {len(moves)} matches. Reason: {reason.description}\n" + "\n".join(lines)
+        )
+    
     def _check_cascading_effects(
         self, 
         match: LeagueMatch, 
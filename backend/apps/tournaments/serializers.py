@@ -25,6 +25,7 @@ from .models import (
     BracketNode,
     MatchSchedule,
 )
+from .services import RegistrationService
 
 # Import League models from leagues app
 from apps.leagues.models import League
@@ -254,8 +255,11 @@ class TournamentRegistrationDetailSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        # Seats change hands only through RegistrationService
         read_only_fields = [
             "id",
+            "tournament",
+            "status",
             "seed",
             "team_display_name",
             "created_at",
@@ -303,7 +307,10 @@ class TournamentRegistrationCreateSerializer(serializers.ModelSerializer):
         if substitute2_id:
             validated_data["substitute2_id"] = substitute2_id
 
-        return super().create(validated_data)
+        # Takes a seat, or a waitlist place when the tournament is full
+        return RegistrationService.register(
+            validated_data.pop("tournament"), **validated_data
+        )
 
     def validate(self, data):
         # Check if tournament registration is open
@@ -313,10 +320,6 @@ class TournamentRegistrationCreateSerializer(serializers.ModelSerializer):
                 "Registration is not open for this tournament"
             )
 
-        # Check if tournament is full
-        if tournament.is_full:
-            raise serializers.ValidationError("Tournament is full")
-
         # Check if players are different
         if data["player1_id"] == data["player2_id"]:
             raise serializers.ValidationError("Player 1 and Player 2 must be different")
@@ -10,6 +10,8 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 
+from apps.shared.seats import SeatAllocator
+
 from .models import Match, Tournament, TournamentBracket, TournamentRegistration
 
 
@@ -359,6 +361,91 @@ class TournamentService:
             self.tournament.save()
 
 
+class RegistrationService:
+    """
+    Seat allocation for tournament registrations.
+
+    ``Tournament.confirmed_teams`` is the seat counter: confirming a
+    registration takes a seat with a conditional UPDATE, a full tournament
+    puts the team on the waitlist in arrival order, and cancelling a
+    confirmed team promotes the oldest waitlisted one. Tournaments that
+    require approval keep new registrations pending until confirmed.
+    """
+
+    CANCELLABLE = ("pending", "confirmed", "waitlist")
+
+    @staticmethod
+    def seats(tournament) -> SeatAllocator:
+        return SeatAllocator(
+            Tournament,
+            tournament.pk,
+            taken_field="confirmed_teams",
+            capacity_field="max_teams",
+            entries=TournamentRegistration.objects.filter(tournament_id=tournament.pk),
+            seated="confirmed",
+            waiting="waitlist",
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def register(tournament, **fields) -> TournamentRegistration:
+        """Create a registration: pending, confirmed or waitlisted."""
+        if tournament.requires_approval:
+            status = "pending"
+        else:
+            status, _ = RegistrationService.seats(tournament).allocate()
+        return TournamentRegistration.objects.create(
+            tournament=tournament, status=status, **fields
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def confirm(registration: TournamentRegistration) -> TournamentRegistration:
+        """Move a pending registration to confirmed, or to the waitlist."""
+        seats = RegistrationService.seats(registration.tournament)
+        locked = seats.lock_entry(registration)
+        if locked is None or locked.status != "pending":
+            # Already confirmed or cancelled by a concurrent request
+            if locked is not None:
+                registration.status = locked.status
+            return registration
+
+        status, _ = seats.allocate()
+        registration.status = status
+        registration.save(update_fields=["status", "updated_at"])
+        return registration
+
+    @staticmethod
+    @transaction.atomic
+    def cancel(registration: TournamentRegistration):
+        """Cancel ``registration``; returns the waitlisted registration promoted, if any."""
+        seats = RegistrationService.seats(registration.tournament)
+        locked = seats.lock_entry(registration)
+        if locked is None or locked.status not in RegistrationService.CANCELLABLE:
+            return None
+
+        registration.status = "cancelled"
+        registration.save(update_fields=["status", "updated_at"])
+        return seats.vacate(locked, locked.status)
+
+    @staticmethod
+    @transaction.atomic
+    def delete(registration: TournamentRegistration):
+        """Delete ``registration``, handing its seat on like a cancellation."""
+        seats = RegistrationService.seats(registration.tournament)
+        locked = seats.lock_entry(registration)
+        if locked is None:
+            return None
+
+        registration.delete()
+        return seats.vacate(locked, locked.status)
+
+    @staticmethod
+    def reconcile(tournament) -> int:
+        """Recount the seat counter from confirmed registrations."""
+        return RegistrationService.seats(tournament).reconcile()
+
+
 class MatchService:
     """
     Service for match operations.
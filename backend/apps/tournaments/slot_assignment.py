@@ -0,0 +1,213 @@
+"""
+Optimal match-to-slot assignment for league rescheduling.
+
+Builds a matches x slots cost matrix once, vectorised with NumPy, from
+preloaded team commitments, occupied courts, rest windows and travel impact,
+and solves it with the Hungarian algorithm (``linear_sum_assignment``).
+No database access happens while scoring or solving.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+logger = logging.getLogger(__name__)
+
+# Cost of an assignment that must never be chosen.
+INFEASIBLE = 1e9
+
+# Slack for float hours, so back-to-back matches don't count as overlapping.
+EPSILON_HOURS = 1e-6
+
+
+@dataclass
+class AssignmentWeights:
+    """Weights of the assignment cost (mirrors the single-match slot score)."""
+    quality: float = 0.3
+    conflict: float = 20.0
+    travel: float = 0.2
+    sooner: float = 1.0
+
+
+class SlotAssignmentSolver:
+    """
+    Assign matches to slots at minimum total cost.
+
+    ``matches`` need ``home_team_id``, ``away_team_id`` and
+    ``scheduled_datetime``; ``slots`` need ``datetime``, ``court`` and
+    ``quality_score`` (see ``rescheduler.AlternativeSlot``). ``occupied``
+    holds the ``(start, court)`` of booked matches; each keeps its court for
+    ``match_duration_minutes``, as does every match placed.
+    """
+
+    def __init__(
+        self,
+        slots: List[Any],
+        commitments: Optional[Dict[Any, Iterable[datetime]]] = None,
+        occupied: Optional[Set[Tuple[datetime, Any]]] = None,
+        min_rest_hours: float = 48,
+        match_duration_minutes: int = 90,
+        hard_rest: bool = True,
+        prefer_sooner: bool = False,
+        today: Optional[date] = None,
+        weights: Optional[AssignmentWeights] = None,
+    ):
+        self.slots = slots
+        self.commitments = commitments or {}
+        self.occupied = occupied or set()
+        self.min_rest_hours = min_rest_hours
+        self.duration_hours = match_duration_minutes / 60
+        self.hard_rest = hard_rest
+        self.prefer_sooner = prefer_sooner
+        self.today = today or date.today()
+        self.weights = weights or AssignmentWeights()
+
+        self.slot_hours = np.array([_to_hours(slot.datetime) for slot in slots], dtype=float)
+        self._team_gaps: Dict[Any, np.ndarray] = {}
+
+    def build_cost_matrix(self, matches: List[Any]) -> np.ndarray:
+        """Cost of placing each match (rows) in each slot (columns)."""
+        weights = self.weights
+        if not matches or not self.slots:
+            return np.zeros((len(matches), len(self.slots)))
+
+        # Slot-only terms, shared by every row
+        quality = np.array([slot.quality_score or 0.0 for slot in self.slots], dtype=float)
+        base = -weights.quality * quality
+        if self.prefer_sooner:
+            days_away = np.array(
+                [(slot.datetime.date() - self.today).days for slot in self.slots], dtype=float
+            )
+            base -= weights.sooner * np.clip(10 - days_away, 0, None)
+        base[self._occupied_mask()] = INFEASIBLE
+
+        # Travel impact: shift from the original time, in days, capped at 10
+        original = np.array(
+            [
+                _to_hours(match.scheduled_datetime) if match.scheduled_datetime else np.nan
+                for match in matches
+            ],
+            dtype=float,
+        )
+        travel = np.minimum(np.abs(self.slot_hours[None, :] - original[:, None]) / 24, 10.0)
+        cost = base[None, :] + weights.travel * np.nan_to_num(travel)
+
+        # Distance to each team's nearest other commitment
+        teams = sorted(
+            {m.home_team_id for m in matches} | {m.away_team_id for m in matches}, key=str
+        )
+        team_index = {team: i for i, team in enumerate(teams)}
+        gaps = np.vstack([self._gap_to_commitments(team) for team in teams])
+        gap = np.minimum(
+            gaps[[team_index[m.home_team_id] for m in matches]],
+            gaps[[team_index[m.away_team_id] for m in matches]],
+        )
+
+        rest_violation = gap < self.min_rest_hours
+        if self.hard_rest:
+            cost[rest_violation] = INFEASIBLE
+        else:
+            cost[rest_violation] += weights.conflict
+        cost[gap < self.duration_hours] = INFEASIBLE
+        cost[cost >= INFEASIBLE] = INFEASIBLE
+
+        return cost
+
+    def solve(self, matches: List[Any], max_repairs: int = 20) -> Tuple[Dict[Any, Any], List[Any]]:
+        """
+        Returns:
+            (assignments, unplaceable) - ``{match: slot}`` for every match
+            placed, and the matches that have no feasible slot at all.
+            Matches in neither were squeezed out by better placements.
+        """
+        if not matches or not self.slots:
+            return {}, list(matches)
+
+        cost = self.build_cost_matrix(matches)
+        unplaceable = [matches[i] for i in np.flatnonzero((cost >= INFEASIBLE).all(axis=1))]
+
+        # The assignment itself cannot express "a team plays once per rest
+        # window" between two moved matches, so forbid clashing picks and
+        # re-solve until the batch is consistent.
+        for _ in range(max_repairs):
+            rows, cols = linear_sum_assignment(cost)
+            clashes = self._batch_clashes(matches, rows, cols)
+            for row, col in clashes:
+                cost[row, col] = INFEASIBLE
+            if not clashes:
+                break
+
+        assignments = {
+            matches[row]: self.slots[col]
+            for row, col in zip(rows, cols)
+            if cost[row, col] < INFEASIBLE
+        }
+        return assignments, unplaceable
+
+    def _occupied_mask(self) -> np.ndarray:
+        """Slots whose court is still, or already, in use by a booked match."""
+        booked: Dict[Any, List[float]] = {}
+        for start, court in self.occupied:
+            booked.setdefault(_court_id(court), []).append(_to_hours(start))
+
+        slot_courts = [_court_id(slot.court) for slot in self.slots]
+        mask = np.zeros(len(self.slots), dtype=bool)
+        for court, starts in booked.items():
+            columns = np.array([i for i, c in enumerate(slot_courts) if c == court], dtype=int)
+            if columns.size:
+                gap = _nearest_gap(np.sort(starts), self.slot_hours[columns])
+                mask[columns] = gap < self.duration_hours - EPSILON_HOURS
+        return mask
+
+    def _gap_to_commitments(self, team) -> np.ndarray:
+        """Hours from every slot to the team's nearest existing match."""
+        if team not in self._team_gaps:
+            booked = np.sort(np.array([_to_hours(dt) for dt in self.commitments.get(team, ())]))
+            self._team_gaps[team] = _nearest_gap(booked, self.slot_hours)
+        return self._team_gaps[team]
+
+    def _batch_clashes(self, matches, rows, cols) -> List[Tuple[int, int]]:
+        """
+        Later picks that break the rest window of a team moved twice, or that
+        put two moved matches on one court at overlapping times.
+        """
+        window = self.min_rest_hours if self.hard_rest else self.duration_hours
+        by_team: Dict[Any, List[Tuple[float, int, int]]] = {}
+        by_court: Dict[Any, List[Tuple[float, int, int]]] = {}
+        for row, col in zip(rows, cols):
+            match = matches[row]
+            pick = (self.slot_hours[col], row, col)
+            for team in (match.home_team_id, match.away_team_id):
+                by_team.setdefault(team, []).append(pick)
+            by_court.setdefault(_court_id(self.slots[col].court), []).append(pick)
+
+        clashes = set()
+        for groups, gap in ((by_team, window), (by_court, self.duration_hours)):
+            for picks in groups.values():
+                picks.sort()
+                for (prev_hour, _, _), (hour, row, col) in zip(picks, picks[1:]):
+                    if hour - prev_hour < gap - EPSILON_HOURS:
+                        clashes.add((row, col))
+        return sorted(clashes)
+
+
+def _to_hours(value: datetime) -> float:
+    return value.timestamp() / 3600
+
+
+def _nearest_gap(booked: np.ndarray, hours: np.ndarray) -> np.ndarray:
+    """Hours from each of ``hours`` to the nearest of the sorted ``booked``."""
+    if booked.size == 0:
+        return np.full(hours.shape, np.inf)
+    idx = np.searchsorted(booked, hours)
+    before = booked[np.clip(idx - 1, 0, booked.size - 1)]
+    after = booked[np.clip(idx, 0, booked.size - 1)]
+    return np.minimum(np.abs(hours - before), np.abs(after - hours))
+
+
+def _court_id(court):
+    return getattr(court, 'id', court)
@@ -0,0 +1,45 @@
+"""
+Celery tasks for tournaments module.
+"""
+
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from . import ratings
+from .models import Tournament
+from .services import RegistrationService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def apply_player_ratings():
+    """Periodic task rating the matches completed since the last run."""
+    rated = ratings.apply_pending()
+    logger.info(f"Applied {rated} match results to player ratings")
+    return rated
+
+
+@shared_task
+def reconcile_registration_seats():
+    """
+    Periodic task recounting the seats of tournaments still taking
+    registrations, promoting waitlisted teams into seats that free up.
+    """
+    tournaments = Tournament.objects.filter(
+        is_active=True,
+        status__in=["published", "registration_open"],
+        end_date__gte=timezone.localdate(),
+    )
+    reconciled = 0
+    for tournament in tournaments.iterator():
+        try:
+            RegistrationService.reconcile(tournament)
+        except Exception as e:
+            logger.error(f"Error reconciling seats of tournament {tournament.id}: {str(e)}")
+            continue
+        reconciled += 1
+    logger.info(f"Reconciled registration seats of {reconciled} tournaments")
+    return reconciled
@@ -0,0 +1,211 @@
+"""
+Tests for live tournament score streaming.
+"""
+
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.clients.models import ClientProfile
+from apps.root.models import Organization
+from apps.tournaments.live import (
+    Subscription,
+    channel_name,
+    encode,
+    get_broker,
+    match_event,
+    tournament_stream,
+    watch_token,
+)
+from apps.tournaments.models import Match, Tournament, TournamentCategory
+from apps.tournaments.progression_engine import ProgressionEngine
+from apps.tournaments.services import RegistrationService
+
+User = get_user_model()
+
+
+def parse(chunks):
+    """Decode server-sent event chunks into (event type, payload) pairs."""
+    events = []
+    for chunk in chunks:
+        lines = dict(
+            line.split(": ", 1)
+            for line in chunk.decode().strip().splitlines()
+            if ": " in line
+        )
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@override_settings(
+    LIVE_SCORES_BROKER="memory",
+    LIVE_SCORES_KEEPALIVE_SECONDS=0.05,
+    LIVE_SCORES_COALESCE_SECONDS=0,
+    LIVE_SCORES_MAX_STREAM_SECONDS=0.3,
+)
+class LiveScoresTest(TestCase):
+    """Test event publishing, per-subscriber coalescing and the SSE stream."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Live Org", business_name="Live Org LLC"
+        )
+        organizer = User.objects.create_user(
+            username="live-organizer", email="organizer@example.com", password="TEST_PASSWORD"
+        )
+        start = timezone.localdate()
+        cls.tournament = Tournament.objects.create(
+            organization=cls.organization,
+            name="Open en Vivo",
+            description="Torneo con marcador en vivo",
+            slug="open-en-vivo",
+            format="round_robin",
+            category=TournamentCategory.objects.create(name="Open", category_type="open"),
+            start_date=start,
+            end_date=start + timedelta(days=1),
+            registration_start=timezone.now() - timedelta(days=5),
+            registration_end=timezone.now() + timedelta(days=1),
+            max_teams=4,
+            organizer=organizer,
+            contact_email="torneos@example.com",
+        )
+        teams = []
+        for index in range(2):
+            players = [
+                ClientProfile.objects.create(
+                    organization=cls.organization,
+                    user=User.objects.create_user(
+                        username=f"live{index}-{number}",
+                        email=f"live{index}-{number}@example.com",
+                        password="TEST_PASSWORD",
+                    ),
+                )
+                for number in range(2)
+            ]
+            teams.append(
+                RegistrationService.register(
+                    cls.tournament,
+                    team_name=f"Pareja {index}",
+                    player1=players[0],
+                    player2=players[1],
+                    contact_phone="+5255000000",
+                    contact_email=f"pareja{index}@example.com",
+                )
+            )
+        cls.teams = teams
+        cls.match = Match.objects.create(
+            organization=cls.organization,
+            tournament=cls.tournament,
+            round_number=1,
+            match_number=1,
+            team1=teams[0],
+            team2=teams[1],
+            scheduled_date=timezone.now(),
+            status="in_progress",
+            actual_start_time=timezone.now(),
+        )
+
+    def stream(self, user=None, factory=AsyncRequestFactory, **params):
+        request = factory().get(f"/tournaments/{self.tournament.id}/live/", params)
+        request.user = user or AnonymousUser()
+        return tournament_stream(request, self.tournament.id)
+
+    def advance_winner(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ProgressionEngine(self.tournament).advance_winner(self.match, self.teams[0])
+        return callbacks
+
+    async def test_subscription_keeps_the_latest_event_per_match(self):
+        subscription = Subscription(channel_name(self.tournament.id))
+        event = await sync_to_async(match_event)("match.score", self.match)
+        for games in (1, 2, 3):
+            subscription.push(dict(event, data=dict(event["data"], team1_score=[games])))
+        subscription.push(dict(event, key="match:other"))
+
+        events = await subscription.get(timeout=1)
+
+        self.assertEqual([e["key"] for e in events], [f"match:{self.match.id}", "match:other"])
+        self.assertEqual(events[0]["data"]["team1_score"], [3])
+        self.assertEqual(subscription.coalesced, 2)
+        self.assertEqual(await subscription.get(timeout=0.01), [])
+
+    async def test_advancing_a_winner_publishes_once_the_transaction_commits(self):
+        broker = get_broker()
+        subscription = await broker.subscribe(channel_name(self.tournament.id))
+
+        callbacks = await sync_to_async(self.advance_winner)()
+        self.assertEqual(await subscription.get(timeout=0.01), [])
+        for callback in callbacks:
+            callback()
+        events = await subscription.get(timeout=1)
+        await broker.unsubscribe(subscription)
+
+        completed = next(e for e in events if e["type"] == "match.completed")
+        self.assertEqual(completed["data"]["status"], "completed")
+        self.assertEqual(completed["data"]["winner"], str(self.teams[0].id))
+
+    async def test_stream_sends_state_then_pushed_updates(self):
+        response = await self.stream()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = response.streaming_content
+
+        self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+        (state,) = parse([await anext(chunks)])
+        self.assertEqual(state[0], "match.state")
+        self.assertEqual(state[1]["data"]["team1"]["name"], "Pareja 0")
+
+        event = await sync_to_async(match_event)("match.score", self.match)
+        event["data"]["team1_score"] = [6]
+        get_broker().publish(channel_name(self.tournament.id), encode(event))
+        rest = [chunk async for chunk in chunks]
+
+        self.assertEqual(parse(rest)[0][1]["data"]["team1_score"], [6])
+        self.assertIn(b": keepalive\n\n", rest)
+        # The subscription is released when the stream ends
+        self.assertEqual(get_broker().subscriber_count(channel_name(self.tournament.id)), 0)
+
+    async def test_match_filter_and_private_tournaments(self):
+        response = await self.stream(match="00000000-0000-0000-0000-000000000000")
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(parse(chunks), [])
+
+        with self.assertRaises(Http404):
+            await self.stream(match="not-a-uuid")
+
+        await Tournament.objects.filter(pk=self.tournament.pk).aupdate(visibility="private")
+        with self.assertRaises(Http404):
+            await self.stream()
+
+    async def test_wsgi_requests_are_refused(self):
+        response = await self.stream(factory=RequestFactory)
+
+        self.assertEqual(response.status_code, 501)
+
+    async def test_watch_token_opens_a_private_tournament(self):
+        await Tournament.objects.filter(pk=self.tournament.pk).aupdate(visibility="private")
+        player = await User.objects.aget(username="live0-0")
+        token = await sync_to_async(watch_token)(player, self.tournament)
+
+        response = await self.stream(token=token)
+        self.assertTrue((await anext(response.streaming_content)).startswith(b"retry:"))
+        await response.streaming_content.aclose()
+
+        stranger = await sync_to_async(User.objects.create_user)(
+            username="stranger", email="stranger@example.com", password="TEST_PASSWORD"
+        )
+        with self.assertRaises(Http404):
+            await self.stream(token=await sync_to_async(watch_token)(stranger, self.tournament))
+        with self.assertRaises(PermissionDenied):
+            await self.stream(token=token + "x")
+        with override_settings(LIVE_SCORES_TOKEN_MAX_AGE=-1):
+            with self.assertRaises(PermissionDenied):
+                await self.stream(token=token)
@@ -0,0 +1,207 @@
+"""
+Tests for the vectorized rating engine and rating-based seeding.
+"""
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.clients.models import ClientProfile
+from apps.root.models import Organization
+from apps.tournaments.bracket_generator import SeedingStrategy
+from apps.tournaments.models import Match, PlayerRating, Tournament, TournamentCategory
+from apps.tournaments.ratings import RatingEngine, apply_pending, apply_results, replay
+from apps.tournaments.services import RegistrationService
+
+User = get_user_model()
+
+
+def rate_one_by_one(ratings, played, teams, team1_won, k=16, provisional_k=32, scale=200):
+    """Reference implementation: plain Elo, one match after another."""
+    for players, won in zip(teams.tolist(), team1_won.tolist()):
+        team1 = (ratings[players[0]] + ratings[players[1]]) / 2
+        team2 = (ratings[players[2]] + ratings[players[3]]) / 2
+        expected = 1 / (1 + 10 ** ((team2 - team1) / scale))
+        for slot, player in enumerate(players):
+            sign = 1 if slot < 2 else -1
+            factor = provisional_k if played[player] < 10 else k
+            change = factor * sign * (float(won) - expected)
+            ratings[player] = min(max(ratings[player] + change, 0), 1000)
+            played[player] += 1
+
+
+class ApplyResultsTest(TestCase):
+    """Test that the layered pass matches sequential Elo."""
+
+    def test_layers_reproduce_chronological_updates(self):
+        generator = np.random.default_rng(7)
+        players, matches = 60, 2000
+        teams = np.array([generator.choice(players, 4, replace=False) for _ in range(matches)])
+        team1_won = generator.random(matches) < 0.5
+        start = generator.uniform(200, 800, players)
+
+        ratings, played = start.copy(), np.zeros(players, dtype=np.int64)
+        apply_results(ratings, played, teams, team1_won)
+        expected, expected_played = start.copy(), np.zeros(players, dtype=np.int64)
+        rate_one_by_one(expected, expected_played, teams, team1_won)
+
+        np.testing.assert_allclose(ratings, expected)
+        np.testing.assert_array_equal(played, expected_played)
+
+
+class RatingEngineTest(TestCase):
+    """Test incremental rating, history replay and rating-based seeding."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Ratings Org", business_name="Ratings Org LLC"
+        )
+        cls.organizer = User.objects.create_user(
+            username="ratings-organizer", email="organizer@example.com", password="TEST_PASSWORD"
+        )
+        cls.category = TournamentCategory.objects.create(name="Cuarta", category_type="level")
+        cls.tournament = Tournament.objects.create(
+            organization=cls.organization,
+            name="Liga de Otoño",
+            description="Torneo por nivel",
+            slug="liga-de-otono",
+            format="round_robin",
+            category=cls.category,
+            start_date=timezone.localdate(),
+            end_date=timezone.localdate() + timedelta(days=7),
+            registration_start=timezone.now() - timedelta(days=10),
+            registration_end=timezone.now() + timedelta(days=1),
+            max_teams=8,
+            organizer=cls.organizer,
+            contact_email="torneos@example.com",
+        )
+        cls.teams = []
+        for index in range(4):
+            players = [
+                ClientProfile.objects.create(
+                    organization=cls.organization,
+                    rating=500,
+                    user=User.objects.create_user(
+                        username=f"rated{index}-{number}",
+                        email=f"rated{index}-{number}@example.com",
+                        password="TEST_PASSWORD",
+                    ),
+                )
+                for number in range(2)
+            ]
+            cls.teams.append(
+                RegistrationService.register(
+                    cls.tournament,
+                    team_name=f"Pareja {index}",
+                    player1=players[0],
+                    player2=players[1],
+                    contact_phone="+5255000000",
+                    contact_email=f"pareja{index}@example.com",
+                )
+            )
+
+    def play(self, number, team1, team2, winner, status="completed"):
+        return Match.objects.create(
+            organization=self.organization,
+            tournament=self.tournament,
+            round_number=1,
+            match_number=number,
+            team1=self.teams[team1],
+            team2=self.teams[team2],
+            winner=self.teams[winner],
+            scheduled_date=timezone.now(),
+            actual_end_time=timezone.now() + timedelta(hours=number),
+            status=status,
+        )
+
+    def ratings(self):
+        return dict(
+            PlayerRating.objects.filter(category=self.category).values_list(
+                "player_id", "rating"
+            )
+        )
+
+    def test_pending_results_are_rated_once(self):
+        self.play(1, 0, 1, winner=0)
+        self.play(2, 2, 3, winner=3)
+        self.play(3, 0, 2, winner=0, status="walkover")
+
+        self.assertEqual(apply_pending(self.organization.id), 2)
+        self.assertEqual(apply_pending(self.organization.id), 0)
+
+        ratings = self.ratings()
+        self.assertEqual(len(ratings), 8)
+        # Even teams: the winners take half of the provisional K factor
+        self.assertEqual(ratings[self.teams[0].player1_id], 516)
+        self.assertEqual(ratings[self.teams[1].player2_id], 484)
+        self.assertEqual(ratings[self.teams[3].player1_id], 516)
+        self.assertFalse(Match.objects.filter(status="completed", rated_at__isnull=True).exists())
+
+    def test_replay_matches_incremental_rating_and_follows_rule_changes(self):
+        self.play(1, 0, 1, winner=0)
+        apply_pending(self.organization.id)
+        self.play(2, 0, 2, winner=2)
+        self.play(3, 1, 3, winner=1)
+        apply_pending(self.organization.id)
+        incremental = self.ratings()
+
+        self.assertEqual(replay(self.organization.id), 3)
+        self.assertEqual(self.ratings().keys(), incremental.keys())
+        for player_id, rating in self.ratings().items():
+            self.assertAlmostEqual(rating, incremental[player_id])
+
+        with override_settings(RATING_PROVISIONAL_K_FACTOR=64):
+            replay(self.organization.id)
+        # Won the first match (+32), then lost as the favourite
+        self.assertAlmostEqual(
+            self.ratings()[self.teams[0].player1_id], 532 - 64 / (1 + 10 ** (-32 / 200))
+        )
+
+        # Results that no longer count drop their players' ratings
+        Match.objects.all().delete()
+        replay(self.organization.id)
+        self.assertEqual(self.ratings(), {})
+
+    def test_seeding_reads_category_ratings(self):
+        self.play(1, 3, 0, winner=3)
+        apply_pending(self.organization.id)
+        registrations = list(self.teams)
+
+        engine = RatingEngine(self.organization.id, self.category.id)
+        seeded = SeedingStrategy(engine).seed_by_elo(registrations)
+
+        self.assertEqual(seeded[0], self.teams[3])
+        self.assertEqual(seeded[-1], self.teams[0])
+        self.assertEqual(seeded[0]._avg_elo, 516)
+
+
+class GeographicSeedingTest(TestCase):
+    """Test that teams of the same club meet as late as possible."""
+
+    def team(self, rating, club_id):
+        player = SimpleNamespace(rating=rating, user=SimpleNamespace(club_id=club_id))
+        return SimpleNamespace(player1=player, player2=player)
+
+    def test_clubmates_are_spread_across_the_bracket(self):
+        # Strongest four from club A, then four from club B
+        teams = [self.team(900 - 10 * i, "A" if i < 4 else "B") for i in range(8)]
+
+        seeded = SeedingStrategy().distribute_geographically(teams)
+
+        clubs = [team.player1.user.club_id for team in seeded]
+        # No first round match between clubmates, each club in every quarter
+        self.assertEqual(clubs, ["A", "B"] * 4)
+        # The two strongest clubmates can only meet in the final
+        self.assertEqual([team._avg_elo for team in seeded[::2]], [900, 880, 890, 870])
+
+    def test_teams_without_club_are_unconstrained(self):
+        teams = [self.team(rating, None) for rating in (600, 800, 700)]
+
+        seeded = SeedingStrategy().distribute_geographically(teams)
+
+        self.assertEqual([team._avg_elo for team in seeded], [800, 700, 600])
@@ -0,0 +1,205 @@
+"""
+Tests for tournament registration seat allocation and waitlist promotion.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.clients.models import ClientProfile
+from apps.root.models import Organization
+from apps.tournaments.models import Tournament, TournamentCategory, TournamentRegistration
+from apps.tournaments.serializers import TournamentRegistrationDetailSerializer
+from apps.tournaments.services import RegistrationService
+from apps.tournaments.tasks import reconcile_registration_seats
+
+User = get_user_model()
+
+
+class RegistrationSeatsTest(TestCase):
+    """Test the confirmed_teams counter, waitlist and promotion."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Tournament Org", business_name="Tournament Org LLC"
+        )
+        cls.organizer = User.objects.create_user(
+            username="organizer", email="organizer@example.com", password="TEST_PASSWORD"
+        )
+        cls.category = TournamentCategory.objects.create(name="Open", category_type="open")
+        cls.players = []
+        for index in range(12):
+            user = User.objects.create_user(
+                username=f"player{index}",
+                email=f"player{index}@example.com",
+                password="TEST_PASSWORD",
+            )
+            cls.players.append(
+                ClientProfile.objects.create(organization=cls.organization, user=user)
+            )
+
+    def create_tournament(self, **kwargs):
+        start = timezone.localdate() + timedelta(days=10)
+        values = {
+            "organization": self.organization,
+            "name": "Open de Otoño",
+            "description": "Torneo abierto",
+            "slug": f"open-{Tournament.objects.count()}",
+            "format": "elimination",
+            "category": self.category,
+            "start_date": start,
+            "end_date": start + timedelta(days=2),
+            "registration_start": timezone.now() - timedelta(days=1),
+            "registration_end": timezone.now() + timedelta(days=5),
+            "max_teams": 4,
+            "organizer": self.organizer,
+            "contact_email": "torneos@example.com",
+        }
+        values.update(kwargs)
+        return Tournament.objects.create(**values)
+
+    def register(self, tournament, index):
+        return RegistrationService.register(
+            tournament,
+            team_name=f"Equipo {index}",
+            player1=self.players[2 * index],
+            player2=self.players[2 * index + 1],
+            contact_phone="+5255000000",
+            contact_email=f"equipo{index}@example.com",
+        )
+
+    def test_teams_past_capacity_are_waitlisted(self):
+        tournament = self.create_tournament()
+
+        statuses = [self.register(tournament, index).status for index in range(6)]
+
+        self.assertEqual(statuses, ["confirmed"] * 4 + ["waitlist"] * 2)
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 4)
+        self.assertTrue(tournament.is_full)
+
+    def test_cancelling_a_confirmed_team_promotes_the_oldest_waitlisted(self):
+        tournament = self.create_tournament()
+        registrations = [self.register(tournament, index) for index in range(6)]
+
+        promoted = RegistrationService.cancel(registrations[1])
+
+        self.assertEqual(promoted.pk, registrations[4].pk)
+        self.assertEqual(
+            list(
+                TournamentRegistration.objects.filter(status="waitlist").values_list(
+                    "pk", flat=True
+                )
+            ),
+            [registrations[5].pk],
+        )
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 4)
+
+        # Nobody left waiting: the next cancellation frees a seat
+        RegistrationService.cancel(registrations[5])
+        RegistrationService.cancel(registrations[0])
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 3)
+
+    def test_stale_double_cancel_promotes_only_once(self):
+        tournament = self.create_tournament(max_teams=1)
+        registrations = [self.register(tournament, index) for index in range(3)]
+        stale = TournamentRegistration.objects.get(pk=registrations[0].pk)
+
+        promoted = RegistrationService.cancel(registrations[0])
+        # A second request still holding the confirmed instance
+        self.assertIsNone(RegistrationService.cancel(stale))
+
+        self.assertEqual(promoted.pk, registrations[1].pk)
+        registrations[2].refresh_from_db()
+        self.assertEqual(registrations[2].status, "waitlist")
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 1)
+
+    def test_stale_double_confirm_takes_one_seat(self):
+        tournament = self.create_tournament(requires_approval=True)
+        registration = self.register(tournament, 0)
+        stale = TournamentRegistration.objects.get(pk=registration.pk)
+
+        registration.confirm_registration()
+        stale.confirm_registration()
+
+        self.assertEqual(stale.status, "confirmed")
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 1)
+
+    def test_approval_keeps_registrations_pending_until_confirmed(self):
+        tournament = self.create_tournament(requires_approval=True)
+        pending = [self.register(tournament, index) for index in range(5)]
+        self.assertEqual({registration.status for registration in pending}, {"pending"})
+
+        for registration in pending:
+            registration.confirm_registration()
+
+        self.assertEqual(
+            [registration.status for registration in pending],
+            ["confirmed"] * 4 + ["waitlist"],
+        )
+
+    def test_reconcile_recounts_confirmed_registrations(self):
+        tournament = self.create_tournament()
+        self.register(tournament, 0)
+        Tournament.objects.filter(pk=tournament.pk).update(confirmed_teams=3)
+
+        self.assertEqual(RegistrationService.reconcile(tournament), 1)
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 1)
+
+    def test_raised_capacity_goes_to_the_waitlist_first(self):
+        tournament = self.create_tournament(max_teams=2)
+        registrations = [self.register(tournament, index) for index in range(4)]
+        Tournament.objects.filter(pk=tournament.pk).update(max_teams=3)
+
+        newcomer = self.register(tournament, 4)
+
+        self.assertEqual(newcomer.status, "waitlist")
+        registrations[2].refresh_from_db()
+        self.assertEqual(registrations[2].status, "confirmed")
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 3)
+
+    def test_deleting_a_confirmed_team_promotes_the_oldest_waitlisted(self):
+        tournament = self.create_tournament(max_teams=2)
+        registrations = [self.register(tournament, index) for index in range(3)]
+
+        promoted = RegistrationService.delete(registrations[0])
+
+        self.assertEqual(promoted.pk, registrations[2].pk)
+        self.assertFalse(TournamentRegistration.objects.filter(pk=registrations[0].pk).exists())
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 2)
+
+    def test_status_cannot_be_written_through_the_api(self):
+        tournament = self.create_tournament(max_teams=1)
+        waitlisted = [self.register(tournament, index) for index in range(2)][1]
+
+        serializer = TournamentRegistrationDetailSerializer(
+            waitlisted, data={"status": "confirmed"}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        waitlisted.refresh_from_db()
+        self.assertEqual(waitlisted.status, "waitlist")
+
+    def test_periodic_reconcile_frees_leaked_seats(self):
+        tournament = self.create_tournament(max_teams=2, status="registration_open")
+        registrations = [self.register(tournament, index) for index in range(3)]
+        # A confirmed team removed behind the service's back
+        TournamentRegistration.objects.filter(pk=registrations[0].pk).delete()
+
+        self.assertEqual(reconcile_registration_seats(), 1)
+
+        registrations[2].refresh_from_db()
+        self.assertEqual(registrations[2].status, "confirmed")
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.confirmed_teams, 2)
@@ -0,0 +1,129 @@
+"""
+Tests for the cost-matrix slot assignment used by MatchRescheduler.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from apps.tournaments.slot_assignment import INFEASIBLE, SlotAssignmentSolver
+
+START = datetime(2030, 5, 6, 18, 0)
+
+
+def make_slot(hours, court=1, quality=50.0):
+    return SimpleNamespace(
+        datetime=START + timedelta(hours=hours), court=court, quality_score=quality
+    )
+
+
+@dataclass(eq=False)
+class StubMatch:
+    id: int
+    home_team_id: str
+    away_team_id: str
+    scheduled_datetime: datetime
+
+
+def make_match(pk, home, away, hours=0):
+    return StubMatch(pk, home, away, START + timedelta(hours=hours))
+
+
+class SlotAssignmentSolverTest(TestCase):
+    """Test cases for SlotAssignmentSolver."""
+
+    def test_global_optimum_beats_first_fit(self):
+        # First-fit would give match 1 the good slot and leave match 2 stuck
+        # with a rest violation; the optimum swaps them.
+        slots = [make_slot(0, quality=100), make_slot(72, quality=0)]
+        matches = [make_match(1, "a", "b"), make_match(2, "c", "d")]
+        solver = SlotAssignmentSolver(
+            slots, commitments={"c": [START + timedelta(hours=60)]}, hard_rest=False
+        )
+
+        assignments, unplaceable = solver.solve(matches)
+
+        self.assertEqual(unplaceable, [])
+        self.assertIs(assignments[matches[0]], slots[1])
+        self.assertIs(assignments[matches[1]], slots[0])
+
+    def test_occupied_courts_and_rest_windows_are_infeasible(self):
+        slots = [make_slot(0, court=1), make_slot(0, court=2), make_slot(24, court=1)]
+        solver = SlotAssignmentSolver(
+            slots,
+            commitments={"a": [START + timedelta(hours=60)]},
+            occupied={(slots[1].datetime, 2)},
+        )
+
+        cost = solver.build_cost_matrix([make_match(1, "a", "b")])
+
+        self.assertLess(cost[0, 0], INFEASIBLE)
+        self.assertEqual(cost[0, 1], INFEASIBLE)
+        self.assertEqual(cost[0, 2], INFEASIBLE)
+
+    def test_team_is_not_booked_twice_in_one_batch(self):
+        slots = [make_slot(0, court=1), make_slot(0, court=2), make_slot(96, court=1)]
+        matches = [make_match(1, "a", "b"), make_match(2, "a", "c")]
+
+        assignments, _ = SlotAssignmentSolver(slots).solve(matches)
+
+        hours = sorted(slot.datetime for slot in assignments.values())
+        self.assertEqual(len(assignments), 2)
+        self.assertGreaterEqual(hours[1] - hours[0], timedelta(hours=48))
+
+    def test_booked_matches_block_their_court_for_the_whole_match(self):
+        # 45-minute slots, 90-minute matches: a match booked at 0:45 keeps
+        # court 1 busy from 0:45 to 2:15
+        slots = [make_slot(quarter * 0.75, court=1) for quarter in range(5)]
+        solver = SlotAssignmentSolver(
+            slots, occupied={(START + timedelta(minutes=45), 1)}, match_duration_minutes=90
+        )
+
+        cost = solver.build_cost_matrix([make_match(1, "a", "b")])
+
+        self.assertEqual(
+            [value < INFEASIBLE for value in cost[0]], [False, False, False, True, True]
+        )
+
+    def test_court_is_not_double_booked_in_one_batch(self):
+        slots = [make_slot(0, court=1, quality=100), make_slot(0.75, court=1, quality=100)]
+        slots.append(make_slot(0, court=2, quality=0))
+        matches = [make_match(1, "a", "b"), make_match(2, "c", "d")]
+
+        assignments, _ = SlotAssignmentSolver(slots, match_duration_minutes=90).solve(matches)
+
+        self.assertEqual(len(assignments), 2)
+        self.assertEqual(sorted(slot.court for slot in assignments.values()), [1, 2])
+
+    def test_unplaceable_matches_reported(self):
+        slots = [make_slot(0)]
+        matches = [make_match(1, "a", "b")]
+        solver = SlotAssignmentSolver(slots, commitments={"b": [START]})
+
+        assignments, unplaceable = solver.solve(matches)
+
+        self.assertEqual(assignments, {})
+        self.assertEqual(unplaceable, matches)
+
+    def test_two_hundred_matches_solve_quickly(self):
+        slots = [
+            make_slot(day * 24 + hour, court=court, quality=float((hour * 7 + court) % 100))
+            for day in range(30)
+            for hour in range(8, 22, 2)
+            for court in range(1, 5)
+        ]
+        matches = [
+            make_match(i, f"team-{i * 2}", f"team-{i * 2 + 1}", hours=i) for i in range(200)
+        ]
+        solver = SlotAssignmentSolver(slots, today=date(2030, 5, 1), prefer_sooner=True)
+
+        started = time.perf_counter()
+        assignments, unplaceable = solver.solve(matches)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(assignments), 200)
+        self.assertEqual(len({id(slot) for slot in assignments.values()}), 200)
+        self.assertLess(elapsed, 2.0)
@@ -16,6 +16,7 @@ from rest_framework.test import APITestCase
 from apps.clients.models import ClientProfile
 from apps.clubs.models import Club
 from apps.root.models import Organization
+from apps.tournaments.live import token_user
 from apps.tournaments.models import (
     Match,
     Prize,
@@ -176,6 +177,46 @@ class TournamentViewSetTest(APITestCase):
         self.assertEqual(registration.team_name, "Dream Team")
 
 
+    def test_registered_player_gets_a_live_token(self):
+        """Test that a registered player outside the club can watch live scores."""
+        organizer = User.objects.create_user(
+            username="organizer", email="organizer@example.com"
+        )
+        tournament = Tournament.objects.create(
+            name="Private Tournament",
+            description="A private tournament",
+            slug="private-tournament",
+            format="elimination",
+            category=self.category,
+            start_date=date.today() + timedelta(days=7),
+            end_date=date.today() + timedelta(days=9),
+            registration_start=timezone.now(),
+            registration_end=timezone.now() + timedelta(days=5),
+            max_teams=16,
+            organizer=organizer,
+            contact_email="organizer@example.com",
+            organization=self.organization,
+            club=self.club,
+            visibility="private",
+        )
+        partner = User.objects.create_user(username="partner", email="partner@example.com")
+        TournamentRegistration.objects.create(
+            tournament=tournament,
+            team_name="Visitors",
+            player1=ClientProfile.objects.create(user=self.user),
+            player2=ClientProfile.objects.create(user=partner),
+            contact_phone="1234567890",
+            contact_email="visitors@example.com",
+        )
+        self.assertFalse(self.user.club_memberships.exists())
+
+        url = reverse("tournaments:tournaments-live-token", kwargs={"pk": tournament.id})
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_user(response.data["token"], tournament), self.user)
+
+
 class TournamentRegistrationViewSetTest(APITestCase):
     """Test tournament registration viewset."""
 
@@ -6,6 +6,7 @@ from django.urls import include, path
 
 from rest_framework.routers import DefaultRouter
 
+from .live import tournament_stream
 from .views import (
     MatchViewSet,
     PrizeViewSet,
@@ -39,6 +40,8 @@ router.register(r"schedules", MatchScheduleViewSet, basename="schedules")
 
 # ProgressionViewSet uses custom actions, so we add it separately
 urlpatterns = [
+    # Server-sent live scores (ASGI only)
+    path("<uuid:tournament_id>/live/", tournament_stream, name="tournament-live"),
     path("", include(router.urls)),
     # Progression endpoints
     path("progression/matches/<uuid:match_id>/result/", 
@@ -2,6 +2,8 @@
 Views for tournaments module.
 """
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Avg, Count, Q, Sum
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -13,6 +15,7 @@ from rest_framework.response import Response
 
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.conditional import ConditionalGetMixin
 from core.mixins import MultiTenantViewMixin
 from core.permissions import IsClubMemberOrReadOnly
 
@@ -53,8 +56,9 @@ from .serializers import (
     TournamentStartSerializer,
     TournamentStatsSerializer,
 )
-from .services import MatchService, TournamentService
+from .services import MatchService, RegistrationService, TournamentService
 from .bracket_generator import BracketGenerator
+from .live import publish_match, watch_token
 from .match_scheduler import MatchScheduler
 from .progression_engine import ProgressionEngine
 from .league_scheduler import LeagueScheduler
@@ -77,12 +81,19 @@ class TournamentCategoryViewSet(viewsets.ModelViewSet):
     ordering = ["name"]
 
 
-class TournamentViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
+class TournamentViewSet(ConditionalGetMixin, MultiTenantViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for tournaments.
     """
 
     permission_classes = [permissions.IsAuthenticated, IsClubMemberOrReadOnly]
+    conditional_dependencies = [
+        "tournaments.TournamentRegistration",
+        "tournaments.TournamentCategory",
+        "clubs.Club",
+    ]
+    # is_registration_open follows the clock
+    conditional_time_bucket = 300
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = TournamentFilter
     search_fields = [
@@ -297,6 +308,22 @@ class TournamentViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
         serializer = TournamentRulesSerializer(rules, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def live_token(self, request, pk=None):
+        """
+        Short-lived token to open the live score stream with EventSource.
+
+        Any user who can see the tournament may watch it, club member or not;
+        get_object() already limits the lookup to visible tournaments.
+        """
+        tournament = self.get_object()
+        return Response(
+            {
+                "token": watch_token(request.user, tournament),
+                "expires_in": getattr(settings, "LIVE_SCORES_TOKEN_MAX_AGE", 300),
+            }
+        )
+
 
 class TournamentRegistrationViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
     """
@@ -354,8 +381,7 @@ class TournamentRegistrationViewSet(MultiTenantViewMixin, viewsets.ModelViewSet)
         """Cancel a registration."""
         registration = self.get_object()
         if registration.status in ["pending", "confirmed", "waitlist"]:
-            registration.status = "cancelled"
-            registration.save()
+            RegistrationService.cancel(registration)
             return Response({"message": "Registration cancelled successfully"})
 
         return Response(
@@ -363,6 +389,20 @@ class TournamentRegistrationViewSet(MultiTenantViewMixin, viewsets.ModelViewSet)
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    def perform_update(self, serializer):
+        # status is read-only; a PATCH to "cancelled" cancels through the service
+        with transaction.atomic():
+            registration = serializer.save()
+            if self.request.data.get("status") == "cancelled" and registration.status in [
+                "pending",
+                "confirmed",
+                "waitlist",
+            ]:
+                RegistrationService.cancel(registration)
+
+    def perform_destroy(self, instance):
+        RegistrationService.delete(instance)
+
 
 class MatchViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
     """
@@ -407,6 +447,7 @@ class MatchViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
             match.status = "in_progress"
             match.actual_start_time = timezone.now()
             match.save()
+            publish_match(match, "match.started")
             return Response({"message": "Match started successfully"})
 
         return Response(
@@ -428,6 +469,7 @@ class MatchViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
 
             match.determine_winner()
             match.save()
+            publish_match(match, "match.completed")
 
             # Update player stats
             service = MatchService(match)
@@ -451,6 +493,7 @@ class MatchViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
                 serializer.validated_data["team1_games"],
                 serializer.validated_data["team2_games"],
             )
+            publish_match(match, "match.score")
             detail_serializer = MatchDetailSerializer(match)
             return Response(detail_serializer.data)
 
@@ -480,6 +523,7 @@ class MatchViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
         match.status = "walkover"
         match.walkover_reason = reason
         match.save()
+        publish_match(match, "match.walkover")
 
         return Response({"message": "Walkover recorded successfully"})
 
@@ -568,7 +612,7 @@ class TournamentStatsViewSet(MultiTenantViewMixin, viewsets.ReadOnlyModelViewSet
         return Response(serializer.data)
 
 
-class BracketViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
+class BracketViewSet(ConditionalGetMixin, MultiTenantViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for tournament bracket management.
     Notion ref: Tournament Bracket System
@@ -581,6 +625,13 @@ class BracketViewSet(MultiTenantViewMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsClubMemberOrReadOnly]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     ordering = ['-tournament__start_date']
+    conditional_dependencies = [
+        'tournaments.Tournament',
+        'tournaments.BracketNode',
+        'tournaments.Match',
+        'tournaments.TournamentRegistration',
+    ]
+    conditional_time_bucket = 300
     
     def get_queryset(self):
         return Bracket.objects.filter(
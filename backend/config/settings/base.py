@@ -67,6 +67,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "apps.shared.middleware.security_middleware.RateLimitingMiddleware",  # SECURITY: Rate limiting
+    "apps.shared.middleware.telemetry.TelemetryMiddleware",  # Per-route latency/DB histograms
+    "apps.shared.middleware.query_profiler.QueryProfilerMiddleware",  # Sampled N+1 detection (opt-in)
     "apps.shared.middleware.security_middleware.SecurityHeadersMiddleware",  # SECURITY: Additional headers
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -77,7 +79,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "apps.shared.middleware.security_middleware.WebhookSignatureMiddleware",  # SECURITY: Webhook validation
     "apps.shared.middleware.error_handler.ErrorHandlerMiddleware",  # Error handling
-    # 'apps.shared.middleware.monitoring.MetricsMiddleware',  # Metrics collection
     # 'apps.shared.middleware.APIDebugMiddleware',  # API debug logging
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -149,6 +150,78 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Mexico_City"
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Periodic tasks (synced into django_celery_beat on beat startup)
+from celery.schedules import crontab  # noqa: E402
+
+CELERY_BEAT_SCHEDULE = {
+    "root-platform-metrics-hourly": {
+        "task": "apps.root.tasks.capture_platform_metrics",
+        "schedule": crontab(minute=5),
+        "kwargs": {"granularity": "hourly"},
+    },
+    "root-platform-metrics-daily": {
+        "task": "apps.root.tasks.capture_platform_metrics",
+        "schedule": crontab(hour=0, minute=15),
+        "kwargs": {"granularity": "daily"},
+    },
+    "bi-reconcile-fact-tables": {
+        "task": "apps.bi.tasks.reconcile_fact_tables",
+        "schedule": crontab(hour=2, minute=30),
+        "kwargs": {"days": 3},
+    },
+    "finance-process-webhook-inbox": {
+        "task": "apps.finance.tasks.process_webhook_inbox",
+        "schedule": crontab(),
+    },
+    "notifications-digests-hourly": {
+        "task": "apps.notifications.tasks.send_digest_notifications",
+        "schedule": crontab(minute=0),
+        "kwargs": {"frequency": "hourly"},
+    },
+    "notifications-digests-daily": {
+        "task": "apps.notifications.tasks.send_digest_notifications",
+        "schedule": crontab(hour=8, minute=0),
+        "kwargs": {"frequency": "daily"},
+    },
+    "notifications-digests-weekly": {
+        "task": "apps.notifications.tasks.send_digest_notifications",
+        "schedule": crontab(hour=8, minute=0, day_of_week=1),
+        "kwargs": {"frequency": "weekly"},
+    },
+    "root-refresh-deep-health-checks": {
+        "task": "apps.root.tasks.refresh_deep_health_checks",
+        "schedule": crontab(minute="*/5"),
+    },
+    "root-prune-audit-logs": {
+        "task": "apps.root.tasks.prune_audit_logs",
+        "schedule": crontab(hour=3, minute=45),
+    },
+    "clubs-generate-maintenance-records": {
+        "task": "apps.clubs.tasks.generate_maintenance_records",
+        "schedule": crontab(hour=1, minute=30),
+    },
+    "clubs-prune-sync-changes": {
+        "task": "apps.clubs.tasks.prune_sync_changes",
+        "schedule": crontab(hour=4, minute=15),
+    },
+    "clubs-reconcile-dashboard-snapshots": {
+        "task": "apps.clubs.tasks.reconcile_dashboard_snapshots",
+        "schedule": crontab(minute=10),
+    },
+    "tournaments-apply-player-ratings": {
+        "task": "apps.tournaments.tasks.apply_player_ratings",
+        "schedule": crontab(minute="*/15"),
+    },
+    "tournaments-reconcile-registration-seats": {
+        "task": "apps.tournaments.tasks.reconcile_registration_seats",
+        "schedule": crontab(minute=20),
+    },
+    "classes-reconcile-enrollment-seats": {
+        "task": "apps.classes.tasks.reconcile_enrollment_seats",
+        "schedule": crontab(minute=25),
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -264,6 +337,7 @@ STRIPE_WEBHOOK_SECRET = env("STRIPE_WEBHOOK_SECRET", default="")
 
 MERCADOPAGO_ACCESS_TOKEN = env("MERCADOPAGO_ACCESS_TOKEN", default="")
 MERCADOPAGO_PUBLIC_KEY = env("MERCADOPAGO_PUBLIC_KEY", default="")
+MERCADOPAGO_WEBHOOK_SECRET = env("MERCADOPAGO_WEBHOOK_SECRET", default="")
 
 # Communication services
 TWILIO_ACCOUNT_SID = env("TWILIO_ACCOUNT_SID", default="")
@@ -276,6 +350,11 @@ RESEND_FROM_EMAIL = env("RESEND_FROM_EMAIL", default="noreply@padelyzer.com")
 WHATSAPP_API_KEY = env("WHATSAPP_API_KEY", default="")
 WHATSAPP_PHONE_NUMBER = env("WHATSAPP_PHONE_NUMBER", default="")
 
+# Deliveries per channel-batched send task (see apps.notifications.delivery)
+NOTIFICATION_DELIVERY_BATCH_SIZE = env.int(
+    "NOTIFICATION_DELIVERY_BATCH_SIZE", default=500
+)
+
 # Google Cloud Storage
 GS_BUCKET_NAME = env("GS_BUCKET_NAME", default="")
 GS_PROJECT_ID = env("GS_PROJECT_ID", default="")
@@ -290,6 +369,63 @@ SENTRY_ENVIRONMENT = env("SENTRY_ENVIRONMENT", default="development")
 SENTRY_TRACES_SAMPLE_RATE = env("SENTRY_TRACES_SAMPLE_RATE", default=0.1)
 SENTRY_PROFILES_SAMPLE_RATE = env("SENTRY_PROFILES_SAMPLE_RATE", default=0.1)
 
+# Sampled N+1 / slow query profiler (see apps.shared.query_profiler)
+QUERY_PROFILER_ENABLED = env.bool("QUERY_PROFILER_ENABLED", default=False)
+QUERY_PROFILER_SAMPLE_RATE = env.float("QUERY_PROFILER_SAMPLE_RATE", default=0.01)
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = 5
+QUERY_PROFILER_SLOW_MS = 100
+
+# Streaming exports (see apps.shared.exports). Larger exports are written to
+# storage by a background task instead of streamed in the response.
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_STREAM_MAX_ROWS = env.int("EXPORT_STREAM_MAX_ROWS", default=100_000)
+
+# Write-behind audit logging (see apps.shared.audit). Audit rows are buffered
+# in process and bulk-inserted by a flusher thread; rows older than the
+# retention (rounded down to whole months) are pruned nightly.
+AUDIT_WRITE_BEHIND = env.bool("AUDIT_WRITE_BEHIND", default=True)
+AUDIT_BUFFER_SIZE = env.int("AUDIT_BUFFER_SIZE", default=10_000)
+AUDIT_FLUSH_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0
+AUDIT_RETENTION_DAYS = env.int("AUDIT_RETENTION_DAYS", default=365)
+AUDIT_PRUNE_BATCH_SIZE = 5000
+
+# Incremental offline sync for mobile clients (see apps.clubs.sync). Cursors
+# older than the retention, or with more pending changes than the maximum,
+# get a full snapshot; cursors only advance past changes older than the
+# settle window so late-committing transactions are not skipped.
+SYNC_CHANGE_RETENTION_DAYS = env.int("SYNC_CHANGE_RETENTION_DAYS", default=30)
+SYNC_MAX_CHANGES = 1000
+SYNC_SETTLE_SECONDS = 5
+SYNC_PRUNE_BATCH_SIZE = 5000
+
+# Conditional GET on read-mostly viewsets (see core.conditional): CDN cache
+# lifetime of anonymous responses
+CONDITIONAL_PUBLIC_MAX_AGE = env.int("CONDITIONAL_PUBLIC_MAX_AGE", default=60)
+
+# Offline benchmarks (see apps.shared.benchmarks): rows per bulk insert when
+# generating the synthetic dataset
+BENCHMARK_BULK_BATCH_SIZE = 2000
+
+# Live tournament scores (see apps.tournaments.live): "redis" fans events out
+# across workers, "memory" within one process; streams coalesce updates per
+# match for COALESCE seconds and close after MAX_STREAM seconds; watch tokens
+# for API clients are accepted for TOKEN_MAX_AGE seconds after being issued
+LIVE_SCORES_BROKER = env("LIVE_SCORES_BROKER", default="redis")
+LIVE_SCORES_KEEPALIVE_SECONDS = 15
+LIVE_SCORES_COALESCE_SECONDS = 0.5
+LIVE_SCORES_MAX_STREAM_SECONDS = 300
+LIVE_SCORES_TOKEN_MAX_AGE = 300
+
+# Player ratings (see apps.tournaments.ratings): Elo K factors, the larger one
+# for a player's first provisional matches; SCALE is the team rating gap at
+# which the stronger team is expected to win 10 of 11 matches
+RATING_K_FACTOR = 16
+RATING_PROVISIONAL_K_FACTOR = 32
+RATING_PROVISIONAL_MATCHES = 10
+RATING_SCALE = 200
+RATING_BULK_BATCH_SIZE = 1000
+
 # Email configuration
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="noreply@padelyzer.com")
 EMAIL_BACKEND = env(
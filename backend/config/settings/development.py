@@ -47,6 +47,9 @@ CSRF_TRUSTED_ORIGINS = [
 # Allow all origins in development (more permissive)
 
 
+# Save audit rows inline so they are visible right away
+AUDIT_WRITE_BEHIND = env.bool("AUDIT_WRITE_BEHIND", default=False)
+
 # Email backend for development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
@@ -16,6 +16,7 @@ from drf_spectacular.views import (
 
 from apps.shared.monitoring import health_check as monitoring_health_check
 from apps.shared.monitoring import (
+    deep_health_check,
     liveness_check,
     metrics,
     readiness_check,
@@ -73,6 +74,7 @@ urlpatterns = [
     ),
     # Monitoring endpoints
     path("health/", monitoring_health_check, name="monitoring-health"),
+    path("health/deep/", deep_health_check, name="deep-health"),
     path("healthz/", liveness_check, name="liveness"),
     path("ready/", readiness_check, name="readiness"),
     path("metrics/", metrics, name="metrics"),
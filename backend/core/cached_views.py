@@ -3,15 +3,14 @@ Example implementations of cached views and viewsets.
 Shows how to use caching utilities in Padelyzer views.
 """
 
-from datetime import timedelta
-from django.db.models import Sum, Count, Avg, Q
+from django.db.models import Count, Avg, Q
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from core.cache_utils import (
-    cache_queryset, cache_method_result, cache_dashboard_stats,
+    cache_queryset, cache_method_result,
     cache_tournament_standings, cache_revenue_report, CacheKeyBuilder,
     QueryCacheManager
 )
@@ -19,202 +18,38 @@ from core.query_optimizations import OptimizedQueryMixin
 
 
 class CachedDashboardViewSet(OptimizedQueryMixin, viewsets.ViewSet):
-    """Example of cached dashboard implementation."""
+    """Dashboard statistics read from the club's dashboard snapshot."""
     
     @action(detail=False, methods=['get'])
-    @cache_dashboard_stats(timeout=300)  # 5 minutes
     def stats(self, request):
-        """Get cached dashboard statistics."""
+        """Get dashboard statistics (one snapshot row, see apps.clubs.snapshots)."""
         club_id = request.query_params.get('club_id')
         if not club_id:
             return Response({'error': 'club_id required'}, status=400)
         
-        today = timezone.now().date()
+        from apps.clubs.models import Club
+        from apps.clubs.snapshots import ClubSnapshotService, percent_change
         
-        # These queries will be cached
+        club = Club.objects.select_related('dashboard_snapshot').filter(id=club_id).first()
+        if club is None:
+            return Response({'error': 'Club not found'}, status=404)
+        snapshot = ClubSnapshotService.get(club)
+        
+        capacity = snapshot.today_capacity_minutes
         stats = {
-            'today_reservations': self._get_today_reservations_count(club_id, today),
-            'week_revenue': self._get_week_revenue(club_id),
-            'month_growth': self._get_month_growth(club_id),
-            'occupancy_rate': self._get_occupancy_rate(club_id, today),
-            'top_clients': self._get_top_clients(club_id),
-            'court_usage': self._get_court_usage_stats(club_id)
+            'today_reservations': snapshot.today_reservations,
+            'week_revenue': float(snapshot.last_7_days_revenue + snapshot.today_revenue),
+            'month_growth': percent_change(
+                snapshot.month_reservations, snapshot.last_month_reservations
+            ) if snapshot.last_month_reservations else 0,
+            'occupancy_rate': (
+                snapshot.today_booked_minutes / capacity * 100 if capacity else 0
+            ),
+            'top_clients': snapshot.top_clients,
+            'court_usage': snapshot.court_usage
         }
         
         return Response(stats)
-    
-    def _get_today_reservations_count(self, club_id, date):
-        """Get today's reservation count with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'today_reservations',
-            club_id=club_id,
-            date=str(date)
-        )
-        
-        from apps.reservations.models import Reservation
-        queryset = Reservation.objects.filter(
-            club_id=club_id,
-            date=date,
-            status__in=['confirmed', 'pending']
-        )
-        
-        return QueryCacheManager.cache_count(cache_key, queryset, timeout=300)
-    
-    def _get_week_revenue(self, club_id):
-        """Get week's revenue with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'week_revenue',
-            club_id=club_id,
-            week=timezone.now().isocalendar()[1]
-        )
-        
-        from apps.finance.models import Revenue
-        start_date = timezone.now().date() - timedelta(days=7)
-        
-        queryset = Revenue.objects.filter(
-            club_id=club_id,
-            date__gte=start_date
-        )
-        
-        aggregation = {'total': Sum('amount')}
-        result = QueryCacheManager.cache_aggregation(
-            cache_key, queryset, aggregation, timeout=600
-        )
-        
-        return float(result['total'] or 0)
-    
-    def _get_month_growth(self, club_id):
-        """Calculate month-over-month growth with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'month_growth',
-            club_id=club_id,
-            month=timezone.now().month,
-            year=timezone.now().year
-        )
-        
-        from django.core.cache import cache
-        growth = cache.get(cache_key)
-        
-        if growth is None:
-            # Calculate growth (expensive operation)
-            from apps.reservations.models import Reservation
-            
-            current_month_start = timezone.now().replace(day=1).date()
-            last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-            
-            current_count = Reservation.objects.filter(
-                club_id=club_id,
-                date__gte=current_month_start,
-                status='confirmed'
-            ).count()
-            
-            last_count = Reservation.objects.filter(
-                club_id=club_id,
-                date__gte=last_month_start,
-                date__lt=current_month_start,
-                status='confirmed'
-            ).count()
-            
-            if last_count > 0:
-                growth = ((current_count - last_count) / last_count) * 100
-            else:
-                growth = 0
-            
-            cache.set(cache_key, growth, 3600)  # 1 hour
-        
-        return growth
-    
-    def _get_occupancy_rate(self, club_id, date):
-        """Calculate occupancy rate with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'occupancy_rate',
-            club_id=club_id,
-            date=str(date)
-        )
-        
-        from django.core.cache import cache
-        rate = cache.get(cache_key)
-        
-        if rate is None:
-            from apps.reservations.models import Reservation
-            from apps.clubs.models import Court
-            
-            # Get total available slots
-            courts = Court.objects.filter(club_id=club_id, is_active=True).count()
-            # Assume 14 slots per day (7am-9pm, 1-hour slots)
-            total_slots = courts * 14
-            
-            # Get occupied slots
-            occupied = Reservation.objects.filter(
-                club_id=club_id,
-                date=date,
-                status__in=['confirmed', 'pending']
-            ).count()
-            
-            rate = (occupied / total_slots * 100) if total_slots > 0 else 0
-            cache.set(cache_key, rate, 300)  # 5 minutes
-        
-        return rate
-    
-    def _get_top_clients(self, club_id):
-        """Get top clients with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'top_clients',
-            club_id=club_id,
-            month=timezone.now().month
-        )
-        
-        from django.core.cache import cache
-        top_clients = cache.get(cache_key)
-        
-        if top_clients is None:
-            from apps.reservations.models import Reservation
-            from django.db.models import Count
-            
-            top_clients = list(
-                Reservation.objects.filter(
-                    club_id=club_id,
-                    date__month=timezone.now().month,
-                    status='confirmed'
-                ).values('created_by__first_name', 'created_by__last_name')
-                .annotate(total=Count('id'))
-                .order_by('-total')[:5]
-            )
-            
-            cache.set(cache_key, top_clients, 1800)  # 30 minutes
-        
-        return top_clients
-    
-    def _get_court_usage_stats(self, club_id):
-        """Get court usage statistics with caching."""
-        cache_key = CacheKeyBuilder.build_key(
-            'court_usage',
-            club_id=club_id,
-            week=timezone.now().isocalendar()[1]
-        )
-        
-        from django.core.cache import cache
-        usage_stats = cache.get(cache_key)
-        
-        if usage_stats is None:
-            from apps.reservations.models import Reservation
-            from django.db.models import Count
-            
-            start_date = timezone.now().date() - timedelta(days=7)
-            
-            usage_stats = list(
-                Reservation.objects.filter(
-                    club_id=club_id,
-                    date__gte=start_date,
-                    status='confirmed'
-                ).values('court__name')
-                .annotate(usage_count=Count('id'))
-                .order_by('-usage_count')
-            )
-            
-            cache.set(cache_key, usage_stats, 600)  # 10 minutes
-        
-        return usage_stats
 
 
 class CachedTournamentViewSet(OptimizedQueryMixin, viewsets.ModelViewSet):
@@ -0,0 +1,226 @@
+"""
+Conditional GET support for read-mostly viewsets.
+
+``ConditionalGetMixin`` gives ``list`` and ``retrieve`` an ``ETag`` computed
+from a cheap validator instead of the response body, and answers
+``If-None-Match`` with ``304 Not Modified`` before anything is serialized
+(``Last-Modified`` / ``If-Modified-Since`` too, for single objects whose
+timestamp covers the whole response):
+
+- collections: ``Max(updated_at)`` and ``Count`` over the filtered queryset,
+  one aggregate query;
+- single objects: the object's own ``updated_at``, once ``get_object()`` has
+  checked permissions.
+
+Serializers often embed related rows (a tournament's registrations, the
+matches of a bracket) whose changes do not touch the viewset's own
+``updated_at``. Viewsets list those models in ``conditional_dependencies``;
+saving or deleting any of them bumps a version counter in the cache that is
+part of the validator. Responses whose content drifts with the clock (current
+prices) set ``conditional_time_bucket`` so their validator also rolls over
+every that many seconds. Viewsets whose responses embed different models per
+action narrow the list in ``get_conditional_dependencies()``.
+
+``QuerySet.update()`` and ``bulk_create()`` send no signals and the former
+leaves ``updated_at`` alone: writes to models that feed a validator go
+through ``tracked_update()``, or call ``bump_resource_version()`` after a
+bulk insert.
+
+Anonymous responses are ``Cache-Control: public`` with
+``CONDITIONAL_PUBLIC_MAX_AGE`` so a CDN can serve public pages; authenticated
+ones are ``private, no-cache`` so clients always revalidate.
+
+Usage:
+    class ClubViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+        conditional_dependencies = ["clubs.Court"]
+"""
+
+import hashlib
+import logging
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "conditional:version"
+
+
+def _version_key(label: str) -> str:
+    return f"{VERSION_KEY_PREFIX}:{label.lower()}"
+
+
+def get_resource_versions(labels: Iterable[str]) -> List:
+    """
+    Current version of each model label. Missing counters start from the
+    clock, so a flushed cache never brings back an earlier version.
+    """
+    keys = [_version_key(label) for label in labels]
+    if not keys:
+        return []
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns())
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_resource_version(label: str):
+    """Invalidate every validator depending on the model ``label``."""
+    key = _version_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns())
+    except Exception as e:
+        logger.warning(f"Error bumping conditional version for {label}: {str(e)}")
+
+
+def tracked_update(queryset, **values) -> int:
+    """
+    ``queryset.update(**values)`` that validators notice: also sets
+    ``updated_at`` when the model has one and bumps the model's version.
+    """
+    model = queryset.model
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        values.setdefault("updated_at", timezone.now())
+    updated = queryset.update(**values)
+    if updated:
+        bump_resource_version(model._meta.label)
+    return updated
+
+
+def _connect_dependency(label: str):
+    def bump(sender, **kwargs):
+        bump_resource_version(label)
+
+    uid = f"conditional-version:{label.lower()}"
+    post_save.connect(bump, sender=label, weak=False, dispatch_uid=uid)
+    post_delete.connect(bump, sender=label, weak=False, dispatch_uid=uid)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validation for ``list`` and ``retrieve``.
+    """
+
+    # "app_label.ModelName" of related models embedded in the responses
+    conditional_dependencies: List[str] = []
+    # Roll the validator over every N seconds for time-dependent content
+    conditional_time_bucket: Optional[int] = None
+    conditional_timestamp_field = "updated_at"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for label in cls.conditional_dependencies:
+            _connect_dependency(label)
+
+    def get_conditional_dependencies(self) -> List[str]:
+        """Dependencies of the current action, a subset of the declared ones."""
+        return self.conditional_dependencies
+
+    def get_collection_validator(self, queryset) -> Tuple:
+        """``(last_modified, token)`` for a filtered queryset, one query."""
+        values = queryset.order_by().aggregate(
+            last_modified=Max(self.conditional_timestamp_field), count=Count("pk")
+        )
+        return values["last_modified"], values["count"]
+
+    def get_object_validator(self, instance) -> Tuple:
+        """``(last_modified, token)`` for a single object."""
+        last_modified = getattr(instance, self.conditional_timestamp_field, None)
+        return last_modified, instance.pk
+
+    def _conditional_etag(self, request, last_modified, token) -> Optional[str]:
+        try:
+            versions = get_resource_versions(self.get_conditional_dependencies())
+        except Exception as e:
+            # Without dependency versions a validator could go stale
+            logger.warning(f"Conditional versions unavailable: {str(e)}")
+            return None
+
+        parts = [
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", ""),
+            last_modified.isoformat() if last_modified else "",
+            token,
+            *versions,
+        ]
+        if request.user.is_authenticated:
+            # Querysets are filtered per user
+            parts.append(request.user.pk)
+        if self.conditional_time_bucket:
+            parts.append(int(time.time()) // self.conditional_time_bucket)
+        digest = hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    def _patch_conditional_headers(self, request, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=getattr(settings, "CONDITIONAL_PUBLIC_MAX_AGE", 60),
+            )
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+        return response
+
+    def _conditional(self, request, validator, render, use_last_modified=False):
+        last_modified, token = validator
+        etag = self._conditional_etag(request, last_modified, token)
+        if etag is None:
+            return render()
+
+        # If-Modified-Since alone is only trusted when the timestamp covers
+        # the whole response; otherwise clients revalidate by ETag
+        if not (
+            use_last_modified
+            and last_modified
+            and not self.get_conditional_dependencies()
+            and not self.conditional_time_bucket
+        ):
+            last_modified = None
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is None:
+            response = render()
+            if response.status_code != 200:
+                return response
+        return self._patch_conditional_headers(request, response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        validator = self.get_collection_validator(
+            self.filter_queryset(self.get_queryset())
+        )
+        return self._conditional(
+            request,
+            validator,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self._conditional(
+            request,
+            self.get_object_validator(instance),
+            lambda: Response(self.get_serializer(instance).data),
+            use_last_modified=True,
+        )
@@ -37,8 +37,9 @@ class APILoggingMiddleware(MiddlewareMixin):
             'user_agent': request.META.get('HTTP_USER_AGENT', '')
         }
         
-        # Log del body si es JSON
-        if request.method in ['POST', 'PUT', 'PATCH']:
+        # Log del body si es JSON (solo en DEBUG: parsear y volcar cada
+        # payload en producción cuesta CPU y expone datos personales)
+        if settings.DEBUG and request.method in ['POST', 'PUT', 'PATCH']:
             try:
                 if request.content_type == 'application/json':
                     request.api_log['request_body'] = json.loads(request.body.decode('utf-8'))
@@ -75,9 +76,15 @@ class APILoggingMiddleware(MiddlewareMixin):
                 except:
                     pass
                     
-            # Log completo para debugging
-            if settings.DEBUG or response.status_code >= 400:
-                logger.info(f"API Response: {json.dumps(request.api_log, indent=2)}")
+            # Log completo solo en DEBUG; en producción una línea compacta
+            if settings.DEBUG:
+                logger.debug(f"API Response: {json.dumps(request.api_log, default=str)}")
+            elif response.status_code >= 400:
+                logger.info(
+                    f"API Response: {request.api_log['request_id']} - "
+                    f"{request.method} {request.path} - {response.status_code} - "
+                    f"{request.api_log['response_time']:.3f}s"
+                )
                 
         return response
         
@@ -133,22 +133,25 @@ class AuditLogMixin:
     """
 
     def log_action(self, action, organization=None, changes=None):
-        """Create an audit log entry."""
+        """Queue an audit log entry for the next batched write."""
         from apps.root.models import AuditLog
+        from apps.shared.audit import enqueue_audit
 
         request = self.request
         obj = getattr(self, "object", None)
 
-        AuditLog.objects.create(
-            user=request.user,
-            ip_address=self.get_client_ip(),
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            action=action,
-            model_name=obj.__class__.__name__ if obj else "",
-            object_id=str(obj.id) if obj else "",
-            object_repr=str(obj) if obj else "",
-            changes=changes or {},
-            organization=organization,
+        enqueue_audit(
+            AuditLog(
+                user=request.user,
+                ip_address=self.get_client_ip(),
+                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+                action=action,
+                model_name=obj.__class__.__name__ if obj else "",
+                object_id=str(obj.id) if obj else "",
+                object_repr=str(obj) if obj else "",
+                changes=changes or {},
+                organization=organization,
+            )
         )
 
     def get_client_ip(self):
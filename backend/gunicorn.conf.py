@@ -0,0 +1,24 @@
+"""
+Gunicorn settings (loaded automatically from the working directory).
+
+Prometheus metrics are aggregated across workers through per-process files
+in PROMETHEUS_MULTIPROC_DIR; the directory is wiped on start and a dead
+worker's live gauges are dropped when it exits.
+"""
+
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/padelyzer-prometheus")
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -10,12 +10,41 @@ from typing import Any, Dict, Optional
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db import connection
 from django.utils import timezone
 from django.utils.deprecation import MiddlewareMixin
 
+from prometheus_client import Counter, Histogram
+
+from apps.shared.telemetry import LATENCY_BUCKETS, QUERY_COUNT_BUCKETS, QueryTracker, sample_totals
+
 logger = logging.getLogger(__name__)
 
+ENDPOINT_TYPES = ["dashboard_analytics", "auth_context", "availability", "default"]
+
+# In-process (per worker, merged at scrape time) BFF metrics
+BFF_RESPONSE_TIME = Histogram(
+    "bff_response_time_seconds",
+    "BFF endpoint latency",
+    ["endpoint_type"],
+    buckets=LATENCY_BUCKETS,
+)
+BFF_QUERIES = Histogram(
+    "bff_db_queries",
+    "Database queries per BFF request",
+    ["endpoint_type"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+BFF_SLOW_REQUESTS = Counter(
+    "bff_slow_requests_total",
+    "BFF requests over their latency threshold",
+    ["endpoint_type"],
+)
+BFF_CACHE_LOOKUPS = Counter(
+    "bff_cache_lookups_total",
+    "Cache lookups made by BFF requests",
+    ["endpoint_type", "result"],
+)
+
 
 class BFFPerformanceMiddleware(MiddlewareMixin):
     """
@@ -48,7 +77,7 @@ class BFFPerformanceMiddleware(MiddlewareMixin):
         """Initialize performance tracking for the request."""
         if self._is_bff_request(request):
             request._bff_start_time = time.time()
-            request._bff_start_queries = len(connection.queries)
+            request._bff_queries = QueryTracker(capture_sql=True).__enter__()
             request._bff_endpoint_type = self._identify_endpoint_type(request)
 
             # Track cache operations
@@ -58,6 +87,7 @@ class BFFPerformanceMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         """Process and log performance metrics after response."""
         if hasattr(request, "_bff_start_time"):
+            request._bff_queries.__exit__(None, None, None)
             self._log_performance_metrics(request, response)
 
         return response
@@ -87,9 +117,8 @@ class BFFPerformanceMiddleware(MiddlewareMixin):
             end_time = time.time()
             response_time_ms = (end_time - request._bff_start_time) * 1000
 
-            # Calculate database queries
-            end_queries = len(connection.queries)
-            query_count = end_queries - request._bff_start_queries
+            # Database queries (counted by the execute wrapper, DEBUG not needed)
+            query_count = request._bff_queries.count
 
             # Get endpoint type and threshold
             endpoint_type = getattr(request, "_bff_endpoint_type", "default")
@@ -149,12 +178,13 @@ class BFFPerformanceMiddleware(MiddlewareMixin):
 
     def _analyze_queries(self, request) -> Dict[str, Any]:
         """Analyze database queries for optimization opportunities."""
-        start_idx = getattr(request, "_bff_start_queries", 0)
-        queries = connection.queries[start_idx:]
+        queries = [
+            {"sql": sql, "time": elapsed} for sql, elapsed in request._bff_queries.queries
+        ]
 
         analysis = {
             "total_queries": len(queries),
-            "total_time": sum(float(q["time"]) for q in queries),
+            "total_time": sum(q["time"] for q in queries),
             "slow_queries": [],
             "duplicate_queries": [],
             "optimization_suggestions": [],
@@ -226,80 +256,19 @@ class BFFPerformanceMiddleware(MiddlewareMixin):
             logger.debug(f"BFF Metrics: {metrics}")
 
     def _store_metrics_for_dashboard(self, metrics: Dict[str, Any]):
-        """Store metrics in cache for dashboard display."""
-        try:
-            # Store recent metrics (last 100 requests per endpoint type)
-            endpoint_type = metrics["endpoint_type"]
-            cache_key = f"bff:performance_metrics:{endpoint_type}"
-
-            # Get existing metrics
-            existing_metrics = cache.get(cache_key, [])
-
-            # Add new metric
-            existing_metrics.append(metrics)
-
-            # Keep only last 100 entries
-            if len(existing_metrics) > 100:
-                existing_metrics = existing_metrics[-100:]
-
-            # Store back to cache (1 hour TTL)
-            cache.set(cache_key, existing_metrics, 3600)
-
-            # Store aggregated stats
-            self._update_aggregated_stats(endpoint_type, metrics)
-
-        except Exception as e:
-            logger.error(f"Error storing BFF metrics: {str(e)}")
-
-    def _update_aggregated_stats(self, endpoint_type: str, metrics: Dict[str, Any]):
-        """Update aggregated performance statistics."""
-        try:
-            stats_key = f"bff:performance_stats:{endpoint_type}"
-            stats = cache.get(
-                stats_key,
-                {
-                    "total_requests": 0,
-                    "total_response_time": 0,
-                    "total_queries": 0,
-                    "slow_requests": 0,
-                    "cache_hits": 0,
-                    "cache_misses": 0,
-                },
-            )
-
-            # Update stats
-            stats["total_requests"] += 1
-            stats["total_response_time"] += metrics["response_time_ms"]
-            stats["total_queries"] += metrics["query_count"]
-
-            if metrics["exceeded_threshold"]:
-                stats["slow_requests"] += 1
-
-            cache_perf = metrics["cache_performance"]
-            stats["cache_hits"] += cache_perf["hits"]
-            stats["cache_misses"] += cache_perf["misses"]
-
-            # Calculate averages
-            stats["avg_response_time"] = (
-                stats["total_response_time"] / stats["total_requests"]
-            )
-            stats["avg_queries"] = stats["total_queries"] / stats["total_requests"]
-            stats["slow_request_rate"] = (
-                stats["slow_requests"] / stats["total_requests"]
-            ) * 100
-
-            total_cache_ops = stats["cache_hits"] + stats["cache_misses"]
-            stats["cache_hit_rate"] = (
-                (stats["cache_hits"] / total_cache_ops * 100)
-                if total_cache_ops > 0
-                else 0
-            )
+        """Record metrics in the in-process histograms (no cache round-trips)."""
+        endpoint_type = metrics["endpoint_type"]
+        BFF_RESPONSE_TIME.labels(endpoint_type).observe(metrics["response_time_ms"] / 1000)
+        BFF_QUERIES.labels(endpoint_type).observe(metrics["query_count"])
 
-            # Store updated stats (24 hour TTL)
-            cache.set(stats_key, stats, 86400)
+        if metrics["exceeded_threshold"]:
+            BFF_SLOW_REQUESTS.labels(endpoint_type).inc()
 
-        except Exception as e:
-            logger.error(f"Error updating BFF stats: {str(e)}")
+        cache_perf = metrics["cache_performance"]
+        if cache_perf["hits"]:
+            BFF_CACHE_LOOKUPS.labels(endpoint_type, "hit").inc(cache_perf["hits"])
+        if cache_perf["misses"]:
+            BFF_CACHE_LOOKUPS.labels(endpoint_type, "miss").inc(cache_perf["misses"])
 
     def _alert_performance_issue(self, metrics: Dict[str, Any]):
         """Alert on critical performance issues."""
@@ -370,6 +339,9 @@ def get_bff_performance_stats(endpoint_type: str = None) -> Dict[str, Any]:
     """
     Get BFF performance statistics.
 
+    Read from this worker's histograms; the metrics endpoint has the totals
+    across all workers.
+
     Args:
         endpoint_type: Optional endpoint type filter
 
@@ -377,23 +349,46 @@ def get_bff_performance_stats(endpoint_type: str = None) -> Dict[str, Any]:
         Performance statistics dictionary
     """
     try:
+        response_times = sample_totals(BFF_RESPONSE_TIME, "endpoint_type")
+        queries = sample_totals(BFF_QUERIES, "endpoint_type")
+        slow = sample_totals(BFF_SLOW_REQUESTS, "endpoint_type")
+        cache_lookups: Dict[str, Dict[str, float]] = {}
+        for family in BFF_CACHE_LOOKUPS.collect():
+            for sample in family.samples:
+                if sample.name.endswith("_total"):
+                    labels = sample.labels
+                    cache_lookups.setdefault(labels["endpoint_type"], {})[
+                        labels["result"]
+                    ] = sample.value
+
+        all_stats = {}
+        for ep_type in ENDPOINT_TYPES:
+            total_requests = int(response_times.get(ep_type, {}).get("count", 0))
+            if not total_requests:
+                continue
+
+            hits = cache_lookups.get(ep_type, {}).get("hit", 0)
+            misses = cache_lookups.get(ep_type, {}).get("miss", 0)
+            total_response_time = response_times[ep_type].get("sum", 0) * 1000
+            total_queries = queries.get(ep_type, {}).get("sum", 0)
+            slow_requests = int(slow.get(ep_type, {}).get("total", 0))
+
+            all_stats[ep_type] = {
+                "total_requests": total_requests,
+                "total_response_time": total_response_time,
+                "total_queries": total_queries,
+                "slow_requests": slow_requests,
+                "cache_hits": int(hits),
+                "cache_misses": int(misses),
+                "avg_response_time": total_response_time / total_requests,
+                "avg_queries": total_queries / total_requests,
+                "slow_request_rate": slow_requests / total_requests * 100,
+                "cache_hit_rate": (hits / (hits + misses) * 100) if hits + misses else 0,
+            }
+
         if endpoint_type:
-            stats_key = f"bff:performance_stats:{endpoint_type}"
-            return cache.get(stats_key, {})
-        else:
-            # Get stats for all endpoint types
-            all_stats = {}
-            for ep_type in [
-                "dashboard_analytics",
-                "auth_context",
-                "availability",
-                "default",
-            ]:
-                stats_key = f"bff:performance_stats:{ep_type}"
-                stats = cache.get(stats_key)
-                if stats:
-                    all_stats[ep_type] = stats
-            return all_stats
+            return all_stats.get(endpoint_type, {})
+        return all_stats
 
     except Exception as e:
         logger.error(f"Error getting BFF performance stats: {str(e)}")
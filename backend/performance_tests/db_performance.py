@@ -42,8 +42,12 @@ class DatabasePerformanceTest(TransactionTestCase):
     @classmethod
     def create_test_data(cls):
         """Create realistic amount of test data."""
-        # This would normally be done with fixtures
+        from apps.shared.benchmarks import SyntheticDataset
+
         print("Creating test data for performance testing...")
+        cls.dataset_counts = SyntheticDataset(
+            clubs_per_organization=1, players_per_club=50, reservation_days=90
+        ).generate()
     
     def setUp(self):
         """Reset queries before each test."""
@@ -0,0 +1,100 @@
+"""
+Tests for write-behind audit logging.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from apps.authentication.models import AuthAuditLog
+from apps.root.models import AuditLog
+from apps.shared.audit import AuditBuffer, prune_audit_logs
+
+
+def audit_row(i=0):
+    return AuditLog(
+        ip_address="127.0.0.1",
+        user_agent="tests",
+        action="update",
+        model_name="Club",
+        object_id=str(i),
+        object_repr=f"Club {i}",
+    )
+
+
+@override_settings(AUDIT_WRITE_BEHIND=True)
+@patch.object(AuditBuffer, "_ensure_worker")
+class AuditBufferTest(TestCase):
+    """Test buffering, batched flushes and the drop policy."""
+
+    def test_rows_are_written_in_one_batch(self, ensure_worker):
+        buffer = AuditBuffer()
+        for i in range(5):
+            self.assertTrue(buffer.enqueue(audit_row(i)))
+        buffer.enqueue(
+            AuthAuditLog(event_type="logout", ip_address="127.0.0.1", user_agent="")
+        )
+
+        self.assertEqual(AuditLog.objects.count(), 0)
+        with self.assertNumQueries(2):
+            written = buffer.flush()
+
+        self.assertEqual(written, 6)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(AuditLog.objects.count(), 5)
+        self.assertEqual(AuthAuditLog.objects.filter(event_type="logout").count(), 1)
+
+    @override_settings(AUDIT_BUFFER_SIZE=2)
+    def test_full_buffer_drops_all_but_critical_events(self, ensure_worker):
+        buffer = AuditBuffer()
+        buffer.enqueue(audit_row(1))
+        buffer.enqueue(audit_row(2))
+
+        self.assertFalse(buffer.enqueue(audit_row(3)))
+        self.assertTrue(buffer.enqueue(audit_row(4), critical=True))
+
+        # The critical event was written inline, the dropped one never is
+        self.assertEqual(
+            list(AuditLog.objects.values_list("object_id", flat=True)), ["4"]
+        )
+        buffer.flush()
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("object_id", flat=True)),
+            ["1", "2", "4"],
+        )
+
+    def test_log_event_is_queued_not_saved(self, ensure_worker):
+        with patch("apps.shared.audit.audit_buffer", AuditBuffer()) as buffer:
+            log = AuthAuditLog.log_event(
+                event_type="login_success",
+                ip_address="192.168.1.1",
+                user_agent="TestBrowser/1.0",
+            )
+
+            self.assertEqual(log.event_type, "login_success")
+            self.assertFalse(AuthAuditLog.objects.exists())
+            buffer.flush()
+
+        self.assertTrue(AuthAuditLog.objects.filter(pk=log.pk).exists())
+
+
+class PruneAuditLogsTest(TestCase):
+    """Test month-aligned retention pruning."""
+
+    @override_settings(AUDIT_RETENTION_DAYS=30, AUDIT_PRUNE_BATCH_SIZE=2)
+    def test_prunes_whole_months_past_retention(self):
+        now = datetime(2026, 6, 15, 12, 0, tzinfo=dt_timezone.utc)
+        AuditLog.objects.bulk_create(audit_row(i) for i in range(5))
+        ages = [400, 60, 45, 20, 1]
+        for log, days in zip(AuditLog.objects.order_by("object_id"), ages):
+            AuditLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(days=days))
+
+        deleted = prune_audit_logs(now=now)
+
+        # Cutoff is May 1st: 30 days back rounded down to the month start
+        self.assertEqual(deleted["root.AuditLog"], 2)
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("object_id", flat=True)),
+            ["2", "3", "4"],
+        )
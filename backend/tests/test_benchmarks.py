@@ -0,0 +1,119 @@
+"""
+Tests for the synthetic benchmark dataset and the benchmark runner.
+"""
+
+from django.test import TestCase
+
+from apps.clubs.models import Club, Court
+from apps.finance.models import Payment
+from apps.reservations.models import Reservation
+from apps.root.models import Organization
+from apps.shared.benchmarks import (
+    BENCHMARKS,
+    BenchmarkError,
+    SyntheticDataset,
+    compare_results,
+    run_benchmarks,
+)
+from apps.tournaments.models import Bracket, TournamentRegistration
+
+
+def small_dataset(**kwargs):
+    values = {
+        "organizations": 1,
+        "clubs_per_organization": 2,
+        "courts_per_club": 2,
+        "players_per_club": 12,
+        "reservation_days": 40,
+        "tournaments_per_club": 1,
+        "teams_per_tournament": 4,
+        "teams_per_league": 4,
+        "notifications_per_club": 5,
+    }
+    values.update(kwargs)
+    return SyntheticDataset(**values)
+
+
+class SyntheticDatasetTest(TestCase):
+    """Test the generated dataset shape and flushing."""
+
+    def test_generates_requested_scale(self):
+        counts = small_dataset().generate()
+
+        self.assertEqual(Club.objects.count(), 2)
+        self.assertEqual(Court.objects.count(), 4)
+        self.assertEqual(counts["reservations.Reservation"], Reservation.objects.count())
+        self.assertGreater(counts["reservations.Reservation"], 0)
+        # Every paid reservation has its payment
+        self.assertEqual(
+            Payment.objects.count(),
+            Reservation.objects.filter(payment_status="paid").count(),
+        )
+        self.assertEqual(
+            TournamentRegistration.objects.filter(status="confirmed").count(), 8
+        )
+
+    def test_same_seed_generates_same_reservations(self):
+        first = small_dataset().generate()["reservations.Reservation"]
+        SyntheticDataset.flush()
+        second = small_dataset().generate()["reservations.Reservation"]
+
+        self.assertEqual(first, second)
+
+    def test_flush_removes_generated_data(self):
+        small_dataset().generate()
+
+        self.assertEqual(SyntheticDataset.flush(), 1)
+
+        self.assertFalse(Organization.objects.exists())
+        self.assertFalse(Reservation.objects.exists())
+
+
+class RunBenchmarksTest(TestCase):
+    """Test timing, query counting, rollback and comparison of reports."""
+
+    def test_runs_every_benchmark_and_rolls_back(self):
+        small_dataset().generate()
+
+        report = run_benchmarks(repeat=2, warmup=0)
+
+        self.assertEqual(list(report["results"]), list(BENCHMARKS))
+        for name, result in report["results"].items():
+            self.assertNotIn("error", result, name)
+            self.assertEqual(result["runs"], 2)
+            self.assertLessEqual(result["min_ms"], result["median_ms"])
+            self.assertLessEqual(result["median_ms"], result["p95_ms"])
+        self.assertGreater(report["results"]["availability"]["queries"], 0)
+        # Bracket generation writes, inside a rolled back savepoint
+        self.assertFalse(Bracket.objects.exists())
+
+    def test_without_dataset_or_with_unknown_names(self):
+        with self.assertRaises(BenchmarkError):
+            run_benchmarks()
+        with self.assertRaises(BenchmarkError):
+            run_benchmarks(["nope"])
+
+    def test_compare_flags_slower_or_chattier_benchmarks(self):
+        baseline = {
+            "results": {
+                "pricing": {"median_ms": 10.0, "queries": 3},
+                "standings": {"median_ms": 10.0, "queries": 2},
+                "availability": {"median_ms": 10.0, "queries": 5},
+            }
+        }
+        current = {
+            "results": {
+                "pricing": {"median_ms": 10.5, "queries": 3},
+                "standings": {"median_ms": 15.0, "queries": 2},
+                "availability": {"median_ms": 9.0, "queries": 6},
+                "bi_kpis": {"median_ms": 1.0, "queries": 1},
+            }
+        }
+
+        rows = {row["name"]: row for row in compare_results(baseline, current)}
+
+        self.assertEqual(set(rows), {"pricing", "standings", "availability"})
+        self.assertFalse(rows["pricing"]["regression"])
+        self.assertTrue(rows["standings"]["regression"])
+        self.assertEqual(rows["standings"]["change"], 0.5)
+        self.assertTrue(rows["availability"]["regression"])
@@ -0,0 +1,115 @@
+"""
+Tests for the shared circuit breaker registry.
+"""
+
+import time
+
+from django.test import TestCase, override_settings
+
+from apps.shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerError,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "circuit-breaker-tests",
+    }
+}
+
+
+def failing():
+    raise ConnectionError("service down")
+
+
+@override_settings(CIRCUIT_BREAKER_SYNC_ENABLED=False)
+class CircuitBreakerTest(TestCase):
+    """Test the in-process breaker state machine."""
+
+    def test_opens_after_threshold_and_rejects(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(failing)
+
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        with self.assertRaises(CircuitBreakerError):
+            breaker.call(lambda: "ok")
+        self.assertEqual(breaker.get_stats()["rejected_calls"], 1)
+
+    def test_fallback_used_when_open(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, fallback_function=lambda: "fallback"
+        )
+        with self.assertRaises(ConnectionError):
+            breaker.call(failing)
+
+        self.assertEqual(breaker.call(lambda: "ok"), "fallback")
+
+    def test_half_open_closes_after_successes(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, recovery_timeout=0, success_threshold=2
+        )
+        with self.assertRaises(ConnectionError):
+            breaker.call(failing)
+
+        self.assertEqual(breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        breaker.call(lambda: "ok")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_unexpected_exception_not_counted(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, expected_exception=ConnectionError
+        )
+        with self.assertRaises(KeyError):
+            breaker.call(lambda: {}["missing"])
+
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.failure_count, 0)
+
+    def test_latency_histogram(self):
+        breaker = CircuitBreaker("test")
+        breaker.call(lambda: "ok")
+        with breaker.protect():
+            pass
+
+        latency = breaker.get_stats()["latency"]
+        self.assertEqual(latency["count"], 2)
+        self.assertEqual(latency["buckets"][-1], ("+Inf", 2))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, CIRCUIT_BREAKER_SYNC_ENABLED=True)
+class CircuitBreakerRegistryTest(TestCase):
+    """Test the registry and batched cache sync."""
+
+    def setUp(self):
+        self.prefix = f"cb-test-{time.time_ns()}"
+
+    def test_get_or_create_returns_same_breaker(self):
+        registry = CircuitBreakerRegistry(key_prefix=self.prefix, background=False)
+        first = registry.get_or_create("stripe", namespace="finance", failure_threshold=3)
+        second = registry.get_or_create("stripe", namespace="finance")
+
+        self.assertIs(first, second)
+        self.assertEqual(list(registry.get_all_stats("finance")), ["finance.stripe"])
+
+    def test_flush_propagates_open_state(self):
+        worker_a = CircuitBreakerRegistry(key_prefix=self.prefix, background=False)
+        worker_b = CircuitBreakerRegistry(key_prefix=self.prefix, background=False)
+        breaker_a = worker_a.get_or_create("stripe", failure_threshold=2)
+        breaker_b = worker_b.get_or_create("stripe", failure_threshold=2)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                breaker_a.call(failing)
+
+        self.assertEqual(worker_a.flush(), 3)  # two failures and one open
+        worker_b.flush()
+
+        self.assertEqual(breaker_b.state, CircuitState.OPEN)
+        self.assertEqual(breaker_b.get_stats()["cluster_failures"], 2)
@@ -0,0 +1,165 @@
+"""
+Tests for conditional GET support on viewsets.
+"""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from rest_framework import serializers, viewsets
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.clubs.models import Club, Court
+from apps.clubs.views import CourtViewSet
+from apps.root.models import Organization
+from core.conditional import ConditionalGetMixin, tracked_update
+
+User = get_user_model()
+
+
+class ClubRowSerializer(serializers.ModelSerializer):
+    courts_count = serializers.IntegerField(source="courts.count", read_only=True)
+
+    class Meta:
+        model = Club
+        fields = ["id", "name", "courts_count"]
+
+
+class ClubConditionalViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Club.objects.order_by("name")
+    serializer_class = ClubRowSerializer
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    conditional_dependencies = ["clubs.Court"]
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CONDITIONAL_PUBLIC_MAX_AGE=120,
+)
+class ConditionalGetMixinTest(TestCase):
+    """Test ETag validation, 304 short-circuits and cache headers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(
+            trade_name="Conditional Org", business_name="Conditional Org LLC"
+        )
+        cls.club = Club.objects.create(
+            organization=cls.organization,
+            name="Conditional Club",
+            slug="conditional-club",
+            email="club@example.com",
+            phone="+5255000000",
+        )
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def list(self, user=None, **headers):
+        request = self.factory.get("/clubs/", **headers)
+        if user:
+            force_authenticate(request, user=user)
+        return ClubConditionalViewSet.as_view({"get": "list"})(request)
+
+    def retrieve(self, **headers):
+        request = self.factory.get(f"/clubs/{self.club.pk}/", **headers)
+        view = ClubConditionalViewSet.as_view({"get": "retrieve"})
+        return view(request, pk=self.club.pk)
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        response = self.list()
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=120", response["Cache-Control"])
+
+        # Only the validator aggregate runs
+        with self.assertNumQueries(1):
+            response = self.list(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_changes_to_rows_or_dependencies_change_the_etag(self):
+        etag = self.list()["ETag"]
+
+        self.club.name = "Renamed Club"
+        self.club.save()
+        renamed = self.list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(renamed.status_code, 200)
+        self.assertNotEqual(renamed["ETag"], etag)
+
+        # Adding a court leaves Club.updated_at and the count untouched
+        etag = renamed["ETag"]
+        Court.objects.create(
+            club=self.club,
+            organization=self.organization,
+            name="Cancha 1",
+            number=1,
+            price_per_hour=Decimal("100.00"),
+        )
+        response = self.list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["courts_count"], 1)
+
+    def test_retrieve_honours_if_modified_since_when_there_are_no_dependencies(self):
+        response = self.retrieve()
+        self.assertEqual(response.status_code, 200)
+        # Court dependency: Last-Modified alone could miss a new court
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        ClubConditionalViewSet.conditional_dependencies = []
+        try:
+            response = self.retrieve()
+            last_modified = response["Last-Modified"]
+            response = self.retrieve(HTTP_IF_MODIFIED_SINCE=last_modified)
+        finally:
+            ClubConditionalViewSet.conditional_dependencies = ["clubs.Court"]
+        self.assertEqual(response.status_code, 304)
+
+    def test_authenticated_responses_are_private(self):
+        user = User.objects.create_user(
+            username="viewer", email="viewer@example.com", password="TEST_PASSWORD"
+        )
+        anonymous = self.list()["ETag"]
+
+        response = self.list(user=user)
+
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertNotEqual(response["ETag"], anonymous)
+
+    def test_tracked_updates_change_the_etag(self):
+        court = Court.objects.create(
+            club=self.club,
+            organization=self.organization,
+            name="Cancha 1",
+            number=1,
+            price_per_hour=Decimal("100.00"),
+        )
+        etag = self.list()["ETag"]
+
+        # A plain update() sends no signal: the Court version stays put
+        Court.objects.filter(pk=court.pk).update(is_maintenance=True)
+        self.assertEqual(self.list(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        updated = tracked_update(Court.objects.filter(pk=court.pk), is_maintenance=False)
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(self.list(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        refreshed = Court.objects.get(pk=court.pk)
+        self.assertGreater(refreshed.updated_at, court.updated_at)
+
+    def test_court_lists_do_not_depend_on_reservations(self):
+        def dependencies(action, **params):
+            view = CourtViewSet(action=action, request=SimpleNamespace(query_params=params))
+            return view.get_conditional_dependencies()
+
+        self.assertNotIn("reservations.Reservation", dependencies("list"))
+        self.assertIn("reservations.Reservation", dependencies("list", detail="true"))
+        self.assertIn("reservations.Reservation", dependencies("retrieve"))
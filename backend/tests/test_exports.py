@@ -0,0 +1,176 @@
+"""
+Tests for streaming CSV/XLSX/JSON exports.
+"""
+
+import csv
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from apps.notifications.models import Notification
+from apps.root.models import AuditLog, Organization
+from apps.root.tasks import run_export
+from apps.shared.exports import (
+    CSV,
+    JSON,
+    XLSX,
+    Export,
+    export_response,
+    iter_xlsx,
+    register_export,
+)
+
+User = get_user_model()
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+COLUMNS = [("Objeto", "object_id"), ("Acción", "action"), ("Fecha", "created_at")]
+
+
+@register_export("tests.audit_logs")
+def audit_logs_export(organization_id=None):
+    return Export("auditoria", AuditLog.objects.order_by("object_id"), COLUMNS)
+
+
+def read_xlsx_rows(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as workbook:
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+    rows = []
+    for row in sheet.iter(f"{SHEET_NS}row"):
+        values = []
+        for cell in row:
+            value = cell.find(f"{SHEET_NS}v")
+            values.append(value.text if value is not None else cell.find(f".//{SHEET_NS}t").text)
+        rows.append(values)
+    return rows
+
+
+class ExportWritersTest(TestCase):
+    """Test the generator writers and the streamed response."""
+
+    @classmethod
+    def setUpTestData(cls):
+        AuditLog.objects.bulk_create(
+            AuditLog(
+                ip_address="127.0.0.1",
+                user_agent="tests",
+                action="update",
+                model_name="Club",
+                object_id=f"{i:03d}",
+                object_repr=f'Club "Peñón" {i}',
+            )
+            for i in range(25)
+        )
+
+    def export(self):
+        return audit_logs_export()
+
+    @override_settings(EXPORT_CHUNK_SIZE=10)
+    def test_csv_header_streams_before_query(self):
+        stream = self.export().stream(CSV)
+
+        with CaptureQueriesContext(connection) as queries:
+            header = next(stream)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(header.decode("utf-8"), "\ufeffObjeto,Acción,Fecha\r\n")
+
+        body = b"".join(stream).decode("utf-8")
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0][:2], ["000", "update"])
+
+    def test_xlsx_is_a_readable_workbook(self):
+        content = b"".join(self.export().stream(XLSX))
+
+        rows = read_xlsx_rows(content)
+
+        self.assertEqual(rows[0], ["Objeto", "Acción", "Fecha"])
+        self.assertEqual(len(rows), 26)
+        self.assertEqual(rows[1][0], "000")
+
+    def test_xlsx_numbers_and_escaping(self):
+        content = b"".join(iter_xlsx(["A", "B"], [(1.5, "<x & \x01y>")]))
+
+        self.assertEqual(read_xlsx_rows(content)[1], ["1.5", "<x & y>"])
+
+    def test_json_array(self):
+        content = b"".join(self.export().stream(JSON))
+
+        data = json.loads(content)
+        self.assertEqual(len(data), 25)
+        self.assertEqual(data[0]["Objeto"], "000")
+
+    def test_response_is_streaming_attachment(self):
+        request = APIRequestFactory().get("/export/")
+        request.user = User(pk=1)
+
+        response = export_response(request, "tests.audit_logs", {}, XLSX)
+
+        self.assertTrue(response.streaming)
+        self.assertIn(".xlsx", response["Content-Disposition"])
+        self.assertEqual(len(read_xlsx_rows(b"".join(response.streaming_content))), 26)
+
+
+class BackgroundExportTest(TestCase):
+    """Test the storage-backed export task and its notification."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.organization = Organization.objects.create(
+            trade_name="Export Org", business_name="Export Org LLC"
+        )
+        self.user = User.objects.create_user(
+            username="exporter", email="exporter@example.com"
+        )
+        AuditLog.objects.create(
+            ip_address="127.0.0.1",
+            user_agent="tests",
+            action="create",
+            model_name="Club",
+            object_id="1",
+            object_repr="Club 1",
+        )
+
+    def test_large_export_is_queued(self):
+        request = APIRequestFactory().get("/export/")
+        request.user = self.user
+
+        with override_settings(EXPORT_STREAM_MAX_ROWS=0):
+            with mock.patch.object(run_export, "delay") as delay:
+                delay.return_value.id = "task-1"
+                response = export_response(request, "tests.audit_logs", {}, CSV)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["task_id"], "task-1")
+        delay.assert_called_once_with("tests.audit_logs", {}, CSV, self.user.pk)
+
+    def test_task_writes_file_and_notifies_user(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            path = run_export.apply(
+                args=(
+                    "tests.audit_logs",
+                    {"organization_id": str(self.organization.id)},
+                    CSV,
+                    self.user.pk,
+                )
+            ).get()
+
+            with default_storage.open(path) as handle:
+                lines = handle.read().decode("utf-8").splitlines()
+            self.assertEqual(lines[1].split(",")[:2], ["1", "create"])
+
+        notification = Notification.objects.get(recipient=self.user)
+        self.assertEqual(notification.notification_type.slug, "export-ready")
+        self.assertTrue(notification.data["download_url"].endswith(".csv"))
@@ -0,0 +1,139 @@
+"""
+Tests for the parallel health check runner.
+"""
+
+import threading
+import time
+
+from django.test import TestCase, override_settings
+
+from apps.shared.health_runner import (
+    DEEP,
+    DEGRADED,
+    HEALTHY,
+    READINESS,
+    TIMEOUT,
+    UNHEALTHY,
+    UNKNOWN,
+    HealthRunner,
+    normalize_status,
+)
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "health-runner-tests",
+    }
+}
+
+
+def sleeper(seconds, value=True):
+    def check():
+        time.sleep(seconds)
+        return value
+
+    return check
+
+
+def broken():
+    raise ConnectionError("database unreachable")
+
+
+@override_settings(CACHES=LOCMEM_CACHE, HEALTH_READINESS_CACHE_SECONDS=0)
+class HealthRunnerTest(TestCase):
+    """Test concurrent execution, timeouts and status aggregation."""
+
+    def setUp(self):
+        self.runner = HealthRunner(
+            cache_key=f"health-test-{time.time_ns()}", background=False
+        )
+
+    def test_checks_run_concurrently(self):
+        for name in ("a", "b", "c"):
+            self.runner.register(name, sleeper(0.2), timeout=2)
+
+        report = self.runner.run(READINESS)
+
+        self.assertEqual(report["status"], HEALTHY)
+        self.assertLess(report["duration_ms"], 500)
+
+    def test_slow_check_times_out(self):
+        self.runner.register("fast", sleeper(0), timeout=1)
+        self.runner.register("slow", sleeper(1), timeout=0.1)
+
+        report = self.runner.run(READINESS)
+
+        self.assertEqual(report["checks"]["fast"]["status"], HEALTHY)
+        self.assertEqual(report["checks"]["slow"]["status"], TIMEOUT)
+        self.assertEqual(report["status"], UNHEALTHY)
+        self.assertLess(report["duration_ms"], 500)
+
+    def test_overall_deadline_caps_check_timeouts(self):
+        self.runner.register("slow", sleeper(1), timeout=5)
+
+        report = self.runner.run(READINESS, deadline=0.1)
+
+        self.assertEqual(report["checks"]["slow"]["status"], TIMEOUT)
+        self.assertLess(report["duration_ms"], 500)
+
+    def test_non_critical_failure_degrades(self):
+        self.runner.register("database", sleeper(0))
+        self.runner.register("cache", broken, critical=False)
+
+        report = self.runner.run(READINESS)
+
+        self.assertEqual(report["status"], DEGRADED)
+        self.assertIn("unreachable", report["checks"]["cache"]["error"])
+
+    def test_hung_check_is_not_resubmitted(self):
+        release = threading.Event()
+        calls = []
+
+        def hung():
+            calls.append(1)
+            release.wait(2)
+            return True
+
+        self.runner.register("hung", hung, timeout=0.05)
+        self.runner.run(READINESS)
+        self.runner.run(READINESS)
+        release.set()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_normalize_status(self):
+        self.assertEqual(normalize_status({"overall_status": "critical"}), UNHEALTHY)
+        self.assertEqual(normalize_status({"overall_healthy": True}), HEALTHY)
+        self.assertEqual(normalize_status({"status": "warning"}), DEGRADED)
+        self.assertEqual(normalize_status(False), UNHEALTHY)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DeepHealthTest(TestCase):
+    """Test that deep checks are served from the last background run."""
+
+    def setUp(self):
+        self.calls = []
+        self.runner = HealthRunner(
+            cache_key=f"health-test-{time.time_ns()}", background=False
+        )
+        self.runner.register(
+            "integrity", lambda: self.calls.append(1) or {"status": "healthy"}, kind=DEEP
+        )
+
+    def test_results_served_without_running_checks(self):
+        self.assertEqual(self.runner.get_deep_results()["status"], UNKNOWN)
+        self.assertEqual(self.calls, [])
+
+        self.runner.refresh_deep()
+        report = self.runner.get_deep_results()
+
+        self.assertEqual(report["status"], HEALTHY)
+        self.assertFalse(report["stale"])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_results_shared_through_cache(self):
+        self.runner.refresh_deep()
+        other_worker = HealthRunner(cache_key=self.runner.cache_key, background=False)
+
+        self.assertEqual(other_worker.get_deep_results()["status"], HEALTHY)
@@ -0,0 +1,122 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import filters, generics, serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+
+from apps.root.models import AuditLog
+from apps.shared.pagination import KeysetPagination
+
+
+class AuditLogRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditLog
+        fields = ["id", "object_id", "created_at"]
+
+
+class AuditLogList(generics.ListAPIView):
+    queryset = AuditLog.objects.all()
+    serializer_class = AuditLogRowSerializer
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ["object_id"]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+
+
+class KeysetPaginationTest(TestCase):
+    """Test stable cursor walks, links and the page-number fallback."""
+
+    @classmethod
+    def setUpTestData(cls):
+        AuditLog.objects.bulk_create(
+            AuditLog(
+                ip_address="127.0.0.1",
+                user_agent="tests",
+                action="update",
+                model_name="Club",
+                object_id=str(i),
+                object_repr=f"Club {i}",
+            )
+            for i in range(10)
+        )
+        # Several rows share a timestamp, so ordering must fall back to id
+        base = timezone.now()
+        for i, log in enumerate(AuditLog.objects.order_by("object_id")):
+            AuditLog.objects.filter(pk=log.pk).update(
+                created_at=base - timedelta(minutes=i // 4)
+            )
+
+        cls.expected = [
+            str(pk) for pk in AuditLog.objects.order_by("-created_at", "-id").values_list("pk", flat=True)
+        ]
+
+    def get(self, url):
+        request = APIRequestFactory().get(url)
+        return AuditLogList.as_view()(request)
+
+    def test_walk_covers_every_row_once_without_count(self):
+        seen = []
+        url = "/audit-logs/?page_size=3"
+
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                response = self.get(url)
+                seen.extend(row["id"] for row in response.data["results"])
+                url = response.data["next"]
+
+        self.assertEqual(seen, self.expected)
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in queries))
+        self.assertIsNone(response.data["count"])
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.get("/audit-logs/?page_size=4")
+        second = self.get(first.data["next"])
+        back = self.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in second.data["results"]], self.expected[4:8]
+        )
+        self.assertEqual(
+            [row["id"] for row in back.data["results"]], self.expected[:4]
+        )
+        self.assertIsNotNone(back.data["next"])
+
+    def test_cursor_is_opaque_and_validated(self):
+        first = self.get("/audit-logs/?page_size=4")
+        self.assertNotIn(self.expected[3], first.data["next"])
+
+        self.assertEqual(self.get("/audit-logs/?cursor=not-a-cursor").status_code, 404)
+
+    def test_include_count_and_page_number_fallback(self):
+        counted = self.get("/audit-logs/?include_count=true")
+        self.assertEqual(counted.data["count"], 10)
+        # Only PostgreSQL estimates, other backends count exactly
+        self.assertEqual(
+            counted.data["count_is_approximate"], connection.vendor == "postgresql"
+        )
+        self.assertFalse(self.get("/audit-logs/").data["count_is_approximate"])
+
+        legacy = self.get("/audit-logs/?page=2&page_size=4")
+        self.assertEqual(legacy.data["current_page"], 2)
+        self.assertEqual(legacy.data["total_pages"], 3)
+
+    def test_client_ordering_falls_back_to_page_numbers(self):
+        ordered = self.get("/audit-logs/?ordering=object_id&page_size=4")
+
+        self.assertEqual(ordered.data["count"], 10)
+        self.assertEqual(
+            [row["object_id"] for row in ordered.data["results"]], ["0", "1", "2", "3"]
+        )
+        self.assertIn("page=2", ordered.data["next"])
@@ -0,0 +1,104 @@
+"""
+Tests for the sampled N+1 / slow query profiler.
+"""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.shared.middleware.query_profiler import QueryProfilerMiddleware
+from apps.shared.query_profiler import (
+    N_PLUS_ONE,
+    QueryProfiler,
+    RequestProfile,
+    fingerprint,
+    query_profiler,
+)
+
+User = get_user_model()
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "query-profiler-tests",
+    }
+}
+
+
+def n_plus_one_view(request):
+    for user in User.objects.all():
+        User.objects.filter(pk=user.pk).exists()
+    return HttpResponse("ok")
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    QUERY_PROFILER_ENABLED=True,
+    QUERY_PROFILER_SAMPLE_RATE=1.0,
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD=3,
+    QUERY_PROFILER_FLUSH_SECONDS=0,
+)
+class QueryProfilerTest(TestCase):
+    """Test fingerprinting, N+1 detection and the merged report."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(4):
+            User.objects.create_user(username=f"profiled{i}", email=f"p{i}@example.com")
+
+    def setUp(self):
+        query_profiler.reset()
+
+    def test_fingerprint_normalizes_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'ana'"),
+            fingerprint("SELECT *  FROM t WHERE id = 7 AND name = 'o''brien'"),
+        )
+        self.assertEqual(
+            fingerprint('SELECT "t1"."id" FROM "t1" WHERE "id" IN (%s, %s)'),
+            'SELECT "t1"."id" FROM "t1" WHERE "id" IN (...)',
+        )
+
+    def test_repeated_fingerprint_reported_with_call_site(self):
+        with RequestProfile() as profile:
+            n_plus_one_view(None)
+
+        offenders = profile.offenders(n_plus_one_threshold=3, slow_ms=10_000)
+
+        self.assertEqual(len(offenders), 1)
+        self.assertEqual(offenders[0]["kind"], N_PLUS_ONE)
+        self.assertEqual(offenders[0]["count"], 4)
+        self.assertIn("test_query_profiler.py", offenders[0]["call_site"])
+        self.assertIn("n_plus_one_view", offenders[0]["call_site"])
+
+    def test_middleware_feeds_report_across_workers(self):
+        request = RequestFactory().get("/api/v1/users/")
+        QueryProfilerMiddleware(n_plus_one_view)(request)
+        query_profiler.flush()
+
+        other_worker = QueryProfiler()
+        with RequestProfile() as profile:
+            n_plus_one_view(None)
+        other_worker.record("GET <unmatched>", profile)
+        other_worker.flush()
+
+        report = query_profiler.get_report()
+
+        self.assertEqual(len(report["offenders"]), 1)
+        entry = report["offenders"][0]
+        self.assertEqual(entry["requests"], 2)
+        self.assertEqual(entry["queries"], 8)
+        self.assertIn("GET <unmatched>", report["by_view"])
+
+        output = StringIO()
+        call_command("query_profile_report", stdout=output)
+        self.assertIn("[N+1] GET <unmatched>: 8 queries in 2 requests", output.getvalue())
+
+    @override_settings(QUERY_PROFILER_ENABLED=False)
+    def test_disabled_middleware_is_removed(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryProfilerMiddleware(n_plus_one_view)
@@ -0,0 +1,80 @@
+"""
+Tests for request telemetry and the Prometheus endpoint.
+"""
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import resolve
+
+from apps.shared.middleware.telemetry import TelemetryMiddleware
+from apps.shared.monitoring import metrics
+from apps.shared.telemetry import (
+    DB_QUERIES,
+    REQUEST_LATENCY,
+    UNMATCHED_ROUTE,
+    QueryTracker,
+    route_label,
+    sample_totals,
+)
+
+User = get_user_model()
+
+
+class QueryTrackerTest(TestCase):
+    """Test query counting through the execute wrapper."""
+
+    def test_counts_queries_with_debug_off(self):
+        with QueryTracker(capture_sql=True) as queries:
+            User.objects.count()
+            list(User.objects.filter(is_staff=True))
+
+        self.assertEqual(queries.count, 2)
+        self.assertGreater(queries.duration, 0)
+        self.assertTrue(queries.queries[0][0].startswith("SELECT"))
+
+    def test_inactive_after_exit(self):
+        with QueryTracker() as queries:
+            User.objects.exists()
+        User.objects.exists()
+
+        self.assertEqual(queries.count, 1)
+
+
+class TelemetryMiddlewareTest(TestCase):
+    """Test per-route histograms and exposition."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def view(self, request):
+        request.resolver_match = resolve("/health/")
+        User.objects.count()
+        User.objects.count()
+        return HttpResponse("ok")
+
+    def test_request_observed_under_route_pattern(self):
+        route = resolve("/health/").route
+        before = sample_totals(DB_QUERIES, "route").get(route, {})
+
+        TelemetryMiddleware(self.view)(self.factory.get("/health/"))
+
+        after = sample_totals(DB_QUERIES, "route")[route]
+        self.assertEqual(after["count"] - before.get("count", 0), 1)
+        self.assertEqual(after["sum"] - before.get("sum", 0), 2)
+        self.assertIn(route, sample_totals(REQUEST_LATENCY, "route"))
+
+    def test_unresolved_requests_share_one_label(self):
+        self.assertEqual(route_label(self.factory.get("/wp-login.php")), UNMATCHED_ROUTE)
+
+    def test_metrics_endpoint_serves_exposition_format(self):
+        TelemetryMiddleware(self.view)(self.factory.get("/health/"))
+
+        response = metrics(self.factory.get("/metrics/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn("# TYPE django_http_request_duration_seconds histogram", body)
+        self.assertIn("django_http_request_db_queries_bucket{", body)
+        self.assertNotIn('"', body.splitlines()[0])